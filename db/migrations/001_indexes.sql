@@ -0,0 +1,76 @@
+-- Indexes of the foreign keys and of every sortable field (common/order_by_enums.py).
+--
+-- CREATE INDEX CONCURRENTLY doesn't block writes but can't run in a transaction: run the file
+-- with psql (autocommit), e.g. `make migrate-indexes`. A build that fails leaves an INVALID
+-- index behind, which IF NOT EXISTS skips: drop it and run the file again.
+
+-- foreign keys: joins, ON DELETE CASCADE and the checks of deletes in the referenced table
+-- (users_companies.user_id leads its primary key)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS orders_payer_id_idx ON orders (payer_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS orders_payee_id_idx ON orders (payee_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS documents_user_id_idx ON documents (user_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS users_profession_id_idx ON users (profession_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS users_companies_company_id_idx ON users_companies (company_id);
+
+-- sortable fields: lists are sorted `<field> ASC|DESC NULLS LAST` with `id` as the tie-break
+-- of keyset pagination, a backward scan would give NULLS FIRST, hence one index per direction
+CREATE INDEX CONCURRENTLY IF NOT EXISTS companies_name_id_idx ON companies (
+    name ASC NULLS LAST, id
+);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS companies_name_desc_id_idx ON companies (
+    name DESC NULLS LAST, id
+);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS companies_created_at_id_idx ON companies (
+    created_at ASC NULLS LAST, id
+);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS companies_created_at_desc_id_idx ON companies (
+    created_at DESC NULLS LAST, id
+);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS companies_last_updated_at_id_idx ON companies (
+    last_updated_at ASC NULLS LAST, id
+);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS companies_last_updated_at_desc_id_idx ON companies (
+    last_updated_at DESC NULLS LAST, id
+);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS documents_created_at_id_idx ON documents (
+    created_at ASC NULLS LAST, id
+);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS documents_created_at_desc_id_idx ON documents (
+    created_at DESC NULLS LAST, id
+);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS documents_last_updated_at_id_idx ON documents (
+    last_updated_at ASC NULLS LAST, id
+);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS documents_last_updated_at_desc_id_idx ON documents (
+    last_updated_at DESC NULLS LAST, id
+);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS orders_amount_id_idx ON orders (
+    amount ASC NULLS LAST, id
+);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS orders_amount_desc_id_idx ON orders (
+    amount DESC NULLS LAST, id
+);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS professions_name_id_idx ON professions (
+    name ASC NULLS LAST, id
+);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS professions_name_desc_id_idx ON professions (
+    name DESC NULLS LAST, id
+);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS users_name_id_idx ON users (
+    name ASC NULLS LAST, id
+);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS users_name_desc_id_idx ON users (
+    name DESC NULLS LAST, id
+);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS users_created_at_id_idx ON users (
+    created_at ASC NULLS LAST, id
+);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS users_created_at_desc_id_idx ON users (
+    created_at DESC NULLS LAST, id
+);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS users_last_updated_at_id_idx ON users (
+    last_updated_at ASC NULLS LAST, id
+);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS users_last_updated_at_desc_id_idx ON users (
+    last_updated_at DESC NULLS LAST, id
+);
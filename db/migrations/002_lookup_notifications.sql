@@ -0,0 +1,40 @@
+-- Notifications of the changes of the lookup tables (professions, companies), which the API
+-- processes cache in memory and keep current over `LISTEN lookup_changed`.
+--
+-- Databases created from an older db/schema.sql don't have the triggers: without them, the
+-- cached rows are only evicted by the writes of the same process. The file is idempotent,
+-- e.g. `make migrate-lookup-notifications`.
+
+CREATE OR REPLACE FUNCTION notify_lookup_change() RETURNS trigger AS $$
+DECLARE
+    changed_row json;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        changed_row := row_to_json(OLD);
+    ELSIF TG_OP IN ('INSERT', 'UPDATE') THEN
+        changed_row := row_to_json(NEW);
+    END IF;
+
+    PERFORM pg_notify(
+        'lookup_changed',
+        json_build_object('table', TG_TABLE_NAME, 'op', TG_OP, 'row', changed_row)::text
+    );
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER professions_notify_lookup_change
+    AFTER INSERT OR UPDATE OR DELETE ON professions
+    FOR EACH ROW EXECUTE FUNCTION notify_lookup_change();
+
+CREATE OR REPLACE TRIGGER professions_notify_lookup_truncate
+    AFTER TRUNCATE ON professions
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_lookup_change();
+
+CREATE OR REPLACE TRIGGER companies_notify_lookup_change
+    AFTER INSERT OR UPDATE OR DELETE ON companies
+    FOR EACH ROW EXECUTE FUNCTION notify_lookup_change();
+
+CREATE OR REPLACE TRIGGER companies_notify_lookup_truncate
+    AFTER TRUNCATE ON companies
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_lookup_change();
@@ -46,3 +46,38 @@ CREATE TABLE IF NOT EXISTS documents (
     last_updated_at TIMESTAMP,
     user_id UUID REFERENCES users (id) NOT NULL
 );
+
+-- professions and companies are cached by the API processes, which LISTEN for changes
+CREATE OR REPLACE FUNCTION notify_lookup_change() RETURNS trigger AS $$
+DECLARE
+    changed_row json;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        changed_row := row_to_json(OLD);
+    ELSIF TG_OP IN ('INSERT', 'UPDATE') THEN
+        changed_row := row_to_json(NEW);
+    END IF;
+
+    PERFORM pg_notify(
+        'lookup_changed',
+        json_build_object('table', TG_TABLE_NAME, 'op', TG_OP, 'row', changed_row)::text
+    );
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER professions_notify_lookup_change
+    AFTER INSERT OR UPDATE OR DELETE ON professions
+    FOR EACH ROW EXECUTE FUNCTION notify_lookup_change();
+
+CREATE OR REPLACE TRIGGER professions_notify_lookup_truncate
+    AFTER TRUNCATE ON professions
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_lookup_change();
+
+CREATE OR REPLACE TRIGGER companies_notify_lookup_change
+    AFTER INSERT OR UPDATE OR DELETE ON companies
+    FOR EACH ROW EXECUTE FUNCTION notify_lookup_change();
+
+CREATE OR REPLACE TRIGGER companies_notify_lookup_truncate
+    AFTER TRUNCATE ON companies
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_lookup_change();
@@ -1,7 +1,10 @@
 import os
 
 from fastapi import FastAPI
+from psycopg.errors import LockNotAvailable, QueryCanceled
+from psycopg_pool import PoolTimeout
 
+from app_psycopg.api.deadlines import timeout_handler
 from app_psycopg.api.lifespan import lifespan
 from app_psycopg.api.routes import users
 from app_psycopg.api.routes import orders
@@ -9,8 +12,31 @@ from app_psycopg.api.routes import documents
 from app_psycopg.api.routes import professions
 from app_psycopg.api.routes import companies
 from app_psycopg.api.routes import user_company_links
+from app_psycopg.api.routes import admin
+from common.deadlines import DeadlineExceeded, deadline_exceeded_handler
+from common.integrity import ConstraintViolation, constraint_violation_handler
+from common.db_cost import DatabaseCostMiddleware
+from common.disconnect import DisconnectMiddleware
+from common import metrics
+from common.metrics import MetricsMiddleware
+from common.replica import ReadYourWritesMiddleware
+from common.slow_queries import SlowQueryMiddleware
 
 app: FastAPI = FastAPI(lifespan=lifespan)
+# innermost: the statement hooks find the route of a request in its scope
+app.add_middleware(SlowQueryMiddleware)
+# sees the response before ReadYourWritesMiddleware holds back writes
+app.add_middleware(DisconnectMiddleware)
+app.add_middleware(ReadYourWritesMiddleware)
+# sees the response of a write after its commit (ReadYourWritesMiddleware holds it back)
+app.add_middleware(DatabaseCostMiddleware)
+# outermost: the latency includes every other middleware
+app.add_middleware(MetricsMiddleware)
+app.add_exception_handler(ConstraintViolation, constraint_violation_handler)
+app.add_exception_handler(DeadlineExceeded, deadline_exceeded_handler)
+app.add_exception_handler(PoolTimeout, timeout_handler)
+app.add_exception_handler(LockNotAvailable, timeout_handler)
+app.add_exception_handler(QueryCanceled, timeout_handler)
 
 app.include_router(router=users.router)
 app.include_router(router=orders.router)
@@ -18,6 +44,8 @@ app.include_router(router=documents.router)
 app.include_router(router=professions.router)
 app.include_router(router=companies.router)
 app.include_router(router=user_company_links.router)
+app.include_router(router=admin.router)
+app.include_router(router=metrics.router)
 
 if __name__ == "__main__":  # pragma: no cover
     import uvicorn
@@ -0,0 +1,45 @@
+import time
+from typing import Optional
+
+from psycopg import AsyncCursor
+from psycopg.abc import Params, Query
+from psycopg.sql import Composable
+
+from common.db_cost import record_statement
+from common.slow_queries import observe_slow_query
+
+
+class CostTrackingCursor(AsyncCursor):
+    """
+    The cursor of the pooled connections (`cursor_factory`): adds every statement,
+    including those built outside of `Database`, to the cost of the running request
+    (common.db_cost) and passes slow or sampled queries that succeeded on to be
+    explained (common.slow_queries).
+    """
+
+    async def execute(
+        self,
+        query: Query,
+        params: Optional[Params] = None,
+        *,
+        prepare: Optional[bool] = None,
+        binary: Optional[bool] = None,
+    ) -> "CostTrackingCursor":
+        start: float = time.perf_counter()
+        try:
+            await super().execute(query, params, prepare=prepare, binary=binary)
+        finally:
+            seconds: float = time.perf_counter() - start
+            # rows of a SELECT are known after execute (client-side cursor)
+            record_statement(seconds, max(self.rowcount, 0))
+
+        # failed or cancelled statements (e.g. timed out) aren't run again
+        observe_slow_query(lambda: self._get_query_text(query), params, seconds * 1000)
+        return self
+
+    def _get_query_text(self, query: Query) -> str:
+        if isinstance(query, Composable):
+            return query.as_string(self.connection)
+        if isinstance(query, bytes):
+            return query.decode()
+        return str(query)
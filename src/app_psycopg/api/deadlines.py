@@ -0,0 +1,59 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from psycopg import AsyncConnection
+from psycopg.errors import LockNotAvailable, QueryCanceled
+from psycopg_pool import PoolTimeout
+
+from app_psycopg.db.db_statements import reset_timeouts_stmt, set_timeouts_stmt
+from common.deadlines import Deadline, TimeoutPhase, create_timeout_response
+
+
+@asynccontextmanager
+async def statement_deadline(
+    conn: AsyncConnection, deadline: Optional[Deadline], lock_timeout: int
+) -> AsyncIterator[AsyncConnection]:
+    """
+    Limits the statements of a request to the remaining budget (statement_timeout,
+    lock_timeout), for its transaction or, in autocommit mode, until the request ends.
+
+    Args:
+        conn (AsyncConnection): A checked out connection.
+        deadline (Optional[Deadline]): The deadline of the request, None keeps the defaults.
+        lock_timeout (int): The configured lock timeout (ms), 0 for the remaining budget.
+
+    Yields:
+        AsyncConnection: The connection.
+
+    Raises:
+        DeadlineExceeded: If nothing of the budget is left.
+    """
+
+    if deadline is None:
+        yield conn
+        return
+
+    is_local: bool = not conn.autocommit
+    await conn.execute(
+        set_timeouts_stmt, {**deadline.get_timeouts(lock_timeout), "is_local": is_local}
+    )
+    try:
+        yield conn
+    finally:
+        # the pool doesn't reset session settings
+        if not is_local and not conn.closed:
+            await conn.execute(reset_timeouts_stmt)
+
+
+async def timeout_handler(
+    request: Request, exc: PoolTimeout | LockNotAvailable | QueryCanceled
+) -> JSONResponse:
+    """Answers a request that waited too long for the pool, a lock or a statement."""
+
+    if isinstance(exc, PoolTimeout):
+        return create_timeout_response(request, TimeoutPhase.POOL)
+    if isinstance(exc, LockNotAvailable):
+        return create_timeout_response(request, TimeoutPhase.LOCK)
+    return create_timeout_response(request, TimeoutPhase.STATEMENT)
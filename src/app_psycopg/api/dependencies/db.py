@@ -1,15 +1,66 @@
-from typing import Annotated, AsyncGenerator
+import time
+from contextlib import asynccontextmanager
+from typing import Annotated, AsyncGenerator, AsyncIterator, Optional
 
 from fastapi import Depends, Request
-from psycopg import Connection, AsyncConnection
+from psycopg import AsyncConnection, Connection, IsolationLevel
 
+from app_psycopg.api.deadlines import statement_deadline
+from app_psycopg.api.replica import get_current_lsn, has_replayed_lsn
 from app_psycopg.db.db import Database
+from common.deadlines import Deadline, get_deadline
+from common.disconnect import cancel_on_disconnect
+from common.pool_metrics import elapsed_ms
+from common.replica import get_required_lsn, tracks_write_lsn, use_replica
+from common.settings import DatabaseSettings, ReadTransactions, get_settings
+from common.transactions import is_read_only
+
+
+@asynccontextmanager
+async def read_mode(
+    connection: AsyncConnection, read_transactions: ReadTransactions
+) -> AsyncIterator[AsyncConnection]:
+    """
+    Runs the statements of a read-only request without a read-write transaction.
+
+    Args:
+        connection (AsyncConnection): An idle connection of a pool.
+        read_transactions (ReadTransactions): Autocommit, READ ONLY or a regular transaction.
+
+    Yields:
+        AsyncConnection: The connection.
+    """
+
+    if read_transactions == ReadTransactions.AUTOCOMMIT:
+        await connection.set_autocommit(True)
+    elif read_transactions == ReadTransactions.READ_ONLY:
+        await connection.set_read_only(True)
+
+    try:
+        yield connection
+    finally:
+        # nothing to commit, the pool expects its connections idle and in their defaults
+        if not connection.closed and read_transactions != ReadTransactions.READ_WRITE:
+            await connection.rollback()
+            await connection.set_autocommit(False)
+            await connection.set_read_only(None)
 
 
 async def get_db_conn(request: Request) -> AsyncGenerator[Connection, None]:
     """
     Provides a single-use asynchronous database connection from the request's connection pool.
 
+    With a replica, safe requests get a connection to the replica (see common.replica)
+    unless it lags behind or hasn't replayed the client's last write yet. Everything
+    else uses the primary.
+
+    Read-only requests (common.transactions) run in autocommit mode or in a READ ONLY
+    transaction (`DB_READ_TRANSACTIONS`), all others in a transaction committed by the pool.
+
+    The deadline of the request (common.deadlines) bounds the wait for the pool and
+    limits its statements (SET LOCAL statement_timeout and lock_timeout). The statements
+    of read-only requests are cancelled if the client disconnects (common.disconnect).
+
     Args:
         request (Request): The incoming FastAPI request containing the connection pool.
 
@@ -17,19 +68,127 @@ async def get_db_conn(request: Request) -> AsyncGenerator[Connection, None]:
         AsyncGenerator[Connection, None]: An asynchronous generator yielding a database connection.
     """
 
-    async with request.state.conn_pool.connection() as connection:
-        yield connection
+    settings: DatabaseSettings = get_settings()
+    read_only: bool = is_read_only(request)
+    deadline: Optional[Deadline] = get_deadline(request=request, settings=settings)
+
+    if use_replica(request=request, settings=settings):
+        async with (
+            request.state.replica_pool.connection(
+                timeout=deadline.remaining if deadline else None
+            ) as connection,
+            read_mode(connection, settings.read_transactions),
+            statement_deadline(connection, deadline, settings.lock_timeout),
+            cancel_on_disconnect(request, connection.cancel_safe),
+        ):
+            lsn: Optional[str] = get_required_lsn(request=request, settings=settings)
+            if lsn is None or await has_replayed_lsn(conn=connection, lsn=lsn):
+                yield connection
+                return
+
+    checkout_start: float = time.perf_counter()
+    async with request.state.conn_pool.connection(
+        timeout=deadline.remaining if deadline else None
+    ) as connection:
+        request.state.pool_monitor.observe_checkout_wait(elapsed_ms(checkout_start))
 
+        if read_only:
+            async with (
+                read_mode(connection, settings.read_transactions),
+                statement_deadline(connection, deadline, settings.lock_timeout),
+                cancel_on_disconnect(request, connection.cancel_safe),
+            ):
+                yield connection
+            return
 
-async def get_db(conn: Annotated[AsyncConnection, Depends(get_db_conn)]) -> Database:
+        async with statement_deadline(connection, deadline, settings.lock_timeout):
+            yield connection
+
+        if tracks_write_lsn(request=request, settings=settings):
+            # reads of the client wait for the replica to replay this commit
+            await connection.commit()
+            request.state.write_lsn = await get_current_lsn(conn=connection)
+
+
+async def get_export_conn(request: Request) -> AsyncGenerator[AsyncConnection, None]:
+    """
+    Provides a connection of the primary in a REPEATABLE READ, READ ONLY transaction
+    for the export endpoints.
+
+    The whole export (a COPY or a server-side cursor) reads a single snapshot, which
+    is released when the response is complete or the client disconnects. The deadline
+    of the request limits its statements (SET LOCAL statement_timeout and lock_timeout).
+
+    Args:
+        request (Request): The incoming FastAPI request containing the connection pool.
+
+    Yields:
+        AsyncGenerator[AsyncConnection, None]: The connection, its transaction is rolled back.
+    """
+
+    settings: DatabaseSettings = get_settings()
+    deadline: Optional[Deadline] = get_deadline(request=request, settings=settings)
+
+    checkout_start: float = time.perf_counter()
+    async with request.state.conn_pool.connection(
+        timeout=deadline.remaining if deadline else None
+    ) as connection:
+        request.state.pool_monitor.observe_checkout_wait(elapsed_ms(checkout_start))
+
+        await connection.set_isolation_level(IsolationLevel.REPEATABLE_READ)
+        await connection.set_read_only(True)
+        try:
+            # the first statement (SET LOCAL) begins the transaction
+            async with (
+                statement_deadline(connection, deadline, settings.lock_timeout),
+                cancel_on_disconnect(request, connection.cancel_safe),
+            ):
+                yield connection
+        finally:
+            # nothing to commit, the pool expects its connections idle and in their defaults
+            if not connection.closed:
+                await connection.rollback()
+                await connection.set_isolation_level(None)
+                await connection.set_read_only(None)
+
+
+async def get_db(
+    request: Request, conn: Annotated[AsyncConnection, Depends(get_db_conn)]
+) -> Database:
     """
     Creates a Database instance using the provided asynchronous connection.
 
     Args:
+        request (Request): The incoming FastAPI request containing the lookup cache.
         conn (AsyncConnection): The database connection obtained via dependency injection.
 
     Returns:
         Database: An instance of the Database wrapper using the given connection.
     """
 
-    return Database(conn)
+    return Database(
+        conn,
+        trusted_rows=get_settings().trusted_rows,
+        lookup_cache=getattr(request.state, "lookup_cache", None),
+    )
+
+
+async def get_export_db(
+    request: Request, conn: Annotated[AsyncConnection, Depends(get_export_conn)]
+) -> Database:
+    """
+    Creates a Database instance for the export endpoints (see `get_export_conn`).
+
+    Args:
+        request (Request): The incoming FastAPI request containing the lookup cache.
+        conn (AsyncConnection): The connection in a REPEATABLE READ, READ ONLY transaction.
+
+    Returns:
+        Database: An instance of the Database wrapper using the given connection.
+    """
+
+    return Database(
+        conn,
+        trusted_rows=get_settings().trusted_rows,
+        lookup_cache=getattr(request.state, "lookup_cache", None),
+    )
@@ -5,7 +5,6 @@ from pydantic import UUID4
 from starlette import status
 
 from app_psycopg.api.dependencies.db import get_db
-from app_psycopg.api.dependencies.users import validate_user_id
 from app_psycopg.db.db import Database
 from common.schemas import (
     DocumentInput,
@@ -30,11 +29,10 @@ async def validate_document_id(
 
 
 async def validate_document_input(
-    db: Annotated[Database, Depends(get_db)],
     document_input: Annotated[DocumentInput, Body(...)],
 ) -> DocumentInput:
-    # Validate user_id
-    await validate_user_id(db=db, user_id=document_input.user_id)
+    # user_id is checked by its foreign key when the document is inserted
+    # (common.integrity)
     return document_input
 
 
@@ -5,12 +5,9 @@ from pydantic import UUID4
 from starlette import status
 
 from app_psycopg.api.dependencies.db import get_db
-from app_psycopg.api.dependencies.users import validate_user_id
 from app_psycopg.db.db import Database
 from common.schemas import (
     OrderInput,
-    User,
-    OrderInputValidated,
     Order,
 )
 
@@ -31,16 +28,25 @@ async def validate_order_id(
     return order
 
 
-async def validate_order_input(
+async def validate_order_id_json(
     db: Annotated[Database, Depends(get_db)],
-    order_input: Annotated[OrderInput, Body(...)],
-) -> OrderInputValidated:
-    # Validate payer_id
-    payer: User = await validate_user_id(db=db, user_id=order_input.payer_id)
-    # Validate payee_id
-    payee: User = await validate_user_id(db=db, user_id=order_input.payee_id)
+    order_id: UUID4,
+) -> bytes:
+    order_json: bytes | None = await db.get_order_json(order_id)
+    if order_json is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Order '{order_id}' not found!",
+        )
+    return order_json
+
 
-    return OrderInputValidated(order_input=order_input, payer=payer, payee=payee)
+async def validate_order_input(
+    order_input: Annotated[OrderInput, Body(...)],
+) -> OrderInput:
+    # payer_id and payee_id are checked by their foreign keys when the order is
+    # inserted (common.integrity)
+    return order_input
 
 
 # endregion
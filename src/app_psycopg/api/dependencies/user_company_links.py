@@ -4,9 +4,7 @@ from fastapi import Depends, HTTPException, Body
 from pydantic import UUID4
 from starlette import status
 
-from app_psycopg.api.dependencies.companies import validate_company_id
 from app_psycopg.api.dependencies.db import get_db
-from app_psycopg.api.dependencies.users import validate_user_id
 from app_psycopg.db.db import Database
 from common.schemas import (
     UserCompanyLinkInput,
@@ -21,15 +19,26 @@ async def validate_user_company_link_input(
     db: Annotated[Database, Depends(get_db)],
     user_company_link_input: Annotated[UserCompanyLinkInput, Body(...)],
 ) -> UserCompanyLinkInput:
+    # Look up user, company and the user's link count in a single round trip
+    user, company, count = await db.get_user_company_link_references(
+        user_id=user_company_link_input.user_id,
+        company_id=user_company_link_input.company_id,
+    )
+
     # Validate user_id
-    await validate_user_id(db=db, user_id=user_company_link_input.user_id)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User '{user_company_link_input.user_id}' not found!",
+        )
     # Validate company_id
-    await validate_company_id(db=db, company_id=user_company_link_input.company_id)
+    if company is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Company '{user_company_link_input.company_id}' not found!",
+        )
 
     # Check if the user already has 3 company links
-    count: int = await db.get_user_company_links_count_by_user(
-        user_id=user_company_link_input.user_id
-    )
     if count >= 3:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
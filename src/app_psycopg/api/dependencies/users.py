@@ -30,10 +30,22 @@ async def validate_user_id(
     return user
 
 
-async def validate_user_input(
-    db: Annotated[Database, Depends(get_db)], user_input: UserInput
-) -> UserInput:
-    await validate_profession_id(db=db, profession_id=user_input.profession_id)
+async def validate_user_id_json(
+    db: Annotated[Database, Depends(get_db)],
+    user_id: UUID4,
+) -> bytes:
+    user_json: bytes | None = await db.get_user_json(user_id)
+    if user_json is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User '{user_id}' not found!",
+        )
+    return user_json
+
+
+async def validate_user_input(user_input: UserInput) -> UserInput:
+    # profession_id is checked by its foreign key when the user is inserted
+    # (common.integrity)
     return user_input
 
 
@@ -0,0 +1,43 @@
+from psycopg import sql
+from psycopg.abc import Query
+
+from app_psycopg.api.json_passthrough import DEFAULT_JSON_ROW
+from app_psycopg.api.pagination import _to_composable
+
+
+def create_ndjson_export_query(
+    query: Query, row: Query = DEFAULT_JSON_ROW
+) -> sql.Composed:
+    """
+    Wraps a list statement so that Postgres renders every row as a line of JSON.
+
+    Each row is returned as a UTF-8 encoded `bytea` value, which psycopg hands over
+    as bytes (binary format) without decoding the JSON.
+
+    Args:
+        query (Query): The list statement (str, bytes, or psycopg.sql object).
+        row (Query): The JSON expression of a single item (the row is `page`).
+
+    Returns:
+        sql.Composed: The statement returning one JSON line per row.
+    """
+
+    return sql.SQL(
+        "SELECT convert_to({}::text || E'\\n', 'UTF8') FROM ({}) AS page"
+    ).format(_to_composable(row), _to_composable(query))
+
+
+def create_csv_export_query(query: Query) -> sql.Composed:
+    """
+    Wraps a list statement into a COPY TO STDOUT statement with CSV output.
+
+    Args:
+        query (Query): The list statement (str, bytes, or psycopg.sql object).
+
+    Returns:
+        sql.Composed: The COPY statement, with a header line.
+    """
+
+    return sql.SQL("COPY ({}) TO STDOUT (FORMAT csv, HEADER)").format(
+        _to_composable(query)
+    )
@@ -0,0 +1,72 @@
+from typing import Any, Dict, List, Tuple
+
+from psycopg import sql
+from psycopg.abc import Query
+
+from app_psycopg.api.pagination import _to_composable
+
+# the subset of the operators of common.filtering.apply_filters
+FILTER_OPERATORS: Dict[str, str] = {
+    "eq": "=",
+    "not_eq": "<>",
+    "lt": "<",
+    "lte": "<=",
+    "gt": ">",
+    "gte": ">=",
+}
+
+
+def create_filter_query(
+    query: Query, filters: Dict[str, Any]
+) -> Tuple[sql.Composed, Dict[str, Any]]:
+    """
+    Wraps a SQL query into a filtered query.
+
+    The query is used as a subquery so that the output column names can be referenced
+    in the WHERE clause. Filter keys follow `common.filtering.apply_filters`
+    ("<column>__<op>", e.g. {"created_at__gte": ...}), None values are skipped.
+
+    Supported operators: eq, not_eq, lt, lte, gt, gte, in_
+
+    Args:
+        query (Query): The SQL query to filter (str, bytes, or psycopg.sql object).
+        filters (Dict[str, Any]): Mapping of filter expressions to values.
+
+    Returns:
+        Tuple[sql.Composed, Dict[str, Any]]: The query and the parameters it references.
+
+    Raises:
+        ValueError: If a filter uses an unsupported operator.
+    """
+
+    params: Dict[str, Any] = {}
+    conditions: List[sql.Composable] = []
+    for i, (field_op, value) in enumerate(filters.items()):
+        if value is None:
+            continue
+
+        field, _, op = field_op.partition("__")
+        column: sql.Identifier = sql.Identifier(field)
+        placeholder: sql.Placeholder = sql.Placeholder(f"filter_{i}")
+        params[f"filter_{i}"] = value
+
+        if op == "in_":
+            conditions.append(sql.SQL("{} = ANY({})").format(column, placeholder))
+        elif (operator := FILTER_OPERATORS.get(op or "eq")) is not None:
+            conditions.append(
+                sql.SQL("{} {} {}").format(column, sql.SQL(operator), placeholder)
+            )
+        else:
+            raise ValueError(f"Unsupported filter operator: {op}")
+
+    where_sql: sql.Composable = (
+        sql.SQL(" WHERE {}").format(sql.SQL(" AND ").join(conditions))
+        if conditions
+        else sql.SQL("")
+    )
+
+    filter_query: sql.Composed = sql.SQL("SELECT * FROM ({}) AS filtered{}").format(
+        _to_composable(query), where_sql
+    )
+
+    return filter_query, params
@@ -0,0 +1,112 @@
+from typing import List, Optional
+
+from fastapi import Request
+from psycopg import AsyncConnection
+from psycopg.errors import ObjectNotInPrerequisiteState, UndefinedTable
+
+from app_psycopg.db.db_statements import (
+    get_index_usage_stmt,
+    get_statement_stats_stmt,
+    get_table_scans_stmt,
+)
+from app_psycopg.db.statement_registry import STATEMENT_TEXTS
+from common.index_advisor import (
+    MAX_STATEMENTS,
+    IndexAdvice,
+    IndexUsage,
+    StatementStats,
+    TableScans,
+    advise_indexes,
+    get_statement_name,
+)
+
+
+async def get_statement_stats(conn: AsyncConnection) -> Optional[List[StatementStats]]:
+    """
+    Reads the most expensive statements from pg_stat_statements, named after the
+    statements of db_statements they were built from.
+
+    Args:
+        conn (AsyncConnection): A connection to the primary.
+
+    Returns:
+        Optional[List[StatementStats]]: The statements, None without the extension.
+    """
+
+    try:
+        # a savepoint: the transaction stays usable without the extension
+        async with conn.transaction():
+            cursor = await conn.execute(
+                get_statement_stats_stmt, {"limit": MAX_STATEMENTS}
+            )
+            rows: List[tuple] = await cursor.fetchall()
+    except (UndefinedTable, ObjectNotInPrerequisiteState):
+        # not created, or not in shared_preload_libraries
+        return None
+
+    return [
+        StatementStats(
+            name=get_statement_name(query, STATEMENT_TEXTS),
+            query=query,
+            calls=calls,
+            total_ms=total_ms,
+            mean_ms=mean_ms,
+            rows=row_count,
+        )
+        for query, calls, total_ms, mean_ms, row_count in rows
+    ]
+
+
+async def get_index_advice(request: Request) -> IndexAdvice:
+    """
+    Provides the index advice (common.index_advisor) from the statistics of the primary.
+
+    Args:
+        request (Request): The incoming FastAPI request containing the connection pool.
+
+    Returns:
+        IndexAdvice: The proposed indexes, seq-scanned tables and unused indexes.
+    """
+
+    conn: AsyncConnection
+    # the statistics of the primary, also for GET requests routed to a replica
+    async with request.state.conn_pool.connection() as conn:
+        statements: Optional[List[StatementStats]] = await get_statement_stats(conn)
+
+        cursor = await conn.execute(get_table_scans_stmt)
+        tables: List[TableScans] = [
+            TableScans(
+                table=table,
+                seq_scan=seq_scan,
+                seq_tup_read=seq_tup_read,
+                idx_scan=idx_scan,
+                live_rows=live_rows,
+            )
+            for table, seq_scan, seq_tup_read, idx_scan, live_rows in (
+                await cursor.fetchall()
+            )
+        ]
+
+        cursor = await conn.execute(get_index_usage_stmt)
+        indexes: List[IndexUsage] = [
+            IndexUsage(
+                table=table,
+                index=index,
+                idx_scan=idx_scan,
+                size_bytes=size_bytes,
+                is_unique=is_unique,
+                leads_foreign_key=leads_foreign_key,
+                definition=definition,
+            )
+            for (
+                table,
+                index,
+                idx_scan,
+                size_bytes,
+                is_unique,
+                leads_foreign_key,
+                definition,
+            ) in await cursor.fetchall()
+        ]
+
+    return advise_indexes(statements=statements, tables=tables, indexes=indexes)
@@ -0,0 +1,103 @@
+from typing import List, LiteralString, Optional
+
+from starlette.responses import Response
+
+from app_psycopg.api.pagination import LIMIT_PARAM, OFFSET_PARAM
+from app_psycopg.api.sorting import get_order_by_clauses
+from common.pagination import CountStrategy
+from common.sorting import OrderByField
+
+# the rows of the wrapped statement are available as `page`
+DEFAULT_JSON_ROW: LiteralString = "to_json(page)"
+ESTIMATED_COUNT_PARAM: LiteralString = "estimated_count"
+
+
+def _check_query(query: LiteralString) -> None:
+    if not isinstance(query, str):
+        raise TypeError("Query must be a LiteralString")
+
+
+def create_json_page_query(
+    query: LiteralString,
+    count_query: Optional[LiteralString],
+    count: CountStrategy = CountStrategy.EXACT,
+    row: LiteralString = DEFAULT_JSON_ROW,
+    order_by: Optional[List[OrderByField]] = None,
+) -> LiteralString:
+    """
+    Wraps a paginated list statement so that Postgres renders the whole LimitOffsetPage.
+
+    The page is returned as a single UTF-8 encoded `bytea` value, which psycopg hands
+    over as bytes (binary format) without decoding the JSON.
+
+    Args:
+        query (LiteralString): The list statement with ORDER BY, LIMIT and OFFSET.
+        count_query (Optional[LiteralString]): The COUNT(*) statement (for the exact count).
+        count (CountStrategy): How `total_count` is rendered. The estimate is bound as
+            the `estimated_count` parameter, none omits `total_count`.
+        row (LiteralString): The JSON expression of a single item (the row is `page`).
+        order_by (Optional[List[OrderByField]]): The fields the statement is ordered by,
+            json_agg doesn't keep the order of the subquery otherwise.
+
+    Returns:
+        LiteralString: The statement returning the page as JSON bytes.
+    """
+
+    _check_query(query)
+
+    total_count: LiteralString = ""
+    if count == CountStrategy.EXACT:
+        _check_query(count_query)
+        total_count = f"'total_count', ({count_query}),"
+    elif count == CountStrategy.ESTIMATE:
+        # the estimate can't be lower than the rows we have already seen
+        total_count = (
+            f"'total_count', GREATEST(%({ESTIMATED_COUNT_PARAM})s::bigint, "
+            f"%({OFFSET_PARAM})s::bigint + COUNT(*)),"
+        )
+
+    items_order: LiteralString = (
+        f" ORDER BY {get_order_by_clauses(order_by, relation='page')}"
+        if order_by
+        else ""
+    )
+
+    return f"""
+    SELECT convert_to(json_build_object(
+        'items', COALESCE(json_agg({row}{items_order}), '[]'::json),
+        'items_count', COUNT(*),
+        {total_count}
+        'limit', %({LIMIT_PARAM})s::integer,
+        'offset', %({OFFSET_PARAM})s::integer
+    )::text, 'UTF8')
+    FROM ({query}) AS page
+"""
+
+
+def create_json_row_query(
+    query: LiteralString, row: LiteralString = DEFAULT_JSON_ROW
+) -> LiteralString:
+    """
+    Wraps a single-row statement so that Postgres renders the row as JSON bytes.
+
+    Args:
+        query (LiteralString): The statement returning at most one row.
+        row (LiteralString): The JSON expression of the row (the row is `page`).
+
+    Returns:
+        LiteralString: The statement returning the row as JSON bytes (no row if not found).
+    """
+
+    _check_query(query)
+
+    return f"SELECT convert_to({row}::text, 'UTF8') FROM ({query}) AS page"
+
+
+class JSONPassthroughResponse(Response):
+    """
+    Response with a JSON body rendered by Postgres, sent as is.
+
+    Keep the `response_model` on the route for the OpenAPI schema.
+    """
+
+    media_type: str = "application/json"
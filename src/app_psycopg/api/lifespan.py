@@ -1,24 +1,121 @@
-from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Any, AsyncGenerator, Dict, Optional
 
 from fastapi import FastAPI
 from psycopg.conninfo import make_conninfo
 from psycopg_pool import AsyncConnectionPool
 
+from app_psycopg.api.db_cost import CostTrackingCursor
+from app_psycopg.api.lookup_cache import LookupCacheListener
+from app_psycopg.api.pool_metrics import get_pool_counters, sample_pool
+from app_psycopg.api.replica import measure_replica_lag
+from app_psycopg.api.slow_queries import explain_statement
+from app_psycopg.db.statement_registry import (
+    configure_prepared_statements,
+    get_prepare_threshold,
+)
+from common.lookup_cache import LookupCache
+from common.pool_metrics import PoolMonitor
+from common.replica import ReplicaMonitor
+from common.settings import DatabaseSettings, get_settings
+from common.slow_queries import (
+    SlowQueryLog,
+    create_slow_query_log,
+    get_explain_timeout,
+)
+
+
+def create_conninfo(dsn: str, settings: DatabaseSettings) -> str:
+    return make_conninfo(
+        dsn,
+        connect_timeout=settings.connect_timeout,
+        options=settings.connection_options,
+    )
+
+
+def create_pool(dsn: str, settings: DatabaseSettings) -> AsyncConnectionPool:
+    """
+    Creates a connection pool to the primary or the replica.
+
+    Args:
+        dsn (str): The URL of the server.
+        settings (DatabaseSettings): The pool sizes and timeouts.
+
+    Returns:
+        AsyncConnectionPool: The pool, opened when entered.
+    """
+
+    return AsyncConnectionPool(
+        conninfo=create_conninfo(dsn, settings),
+        min_size=settings.pool_min_size,
+        max_size=settings.pool_max_size,
+        timeout=settings.pool_timeout,
+        max_idle=settings.max_idle,
+        max_lifetime=settings.max_lifetime,
+        # use the "disabled" prepare policy behind PgBouncer in transaction pooling mode
+        kwargs={
+            "prepare_threshold": get_prepare_threshold(settings.prepare_policy),
+            "cursor_factory": CostTrackingCursor,
+        },
+        configure=configure_prepared_statements,
+        check=AsyncConnectionPool.check_connection,  # https://www.psycopg.org/psycopg3/docs/advanced/pool.html#connection-quality
+    )
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator:
-    conn_info: str = make_conninfo(
-        host="localhost", port=5432, dbname="postgres", password="admin", user="admin"
-    )
+    settings: DatabaseSettings = get_settings()
     async with (
-        AsyncConnectionPool(
-            conninfo=conn_info,
-            min_size=1,
-            max_size=2,
-            check=AsyncConnectionPool.check_connection,  # https://www.psycopg.org/psycopg3/docs/advanced/pool.html#connection-quality
-        ) as conn_pool
+        create_pool(settings.dsn, settings) as conn_pool,
+        PoolMonitor(
+            sample=lambda: sample_pool(conn_pool),
+            counters=lambda: get_pool_counters(conn_pool),
+            interval=settings.pool_stats_interval,
+        ) as pool_monitor,
+        AsyncExitStack() as optional_stack,
     ):
-        yield {"conn_pool": conn_pool}
+        state: Dict[str, Any] = {"conn_pool": conn_pool, "pool_monitor": pool_monitor}
+
+        # professions and companies are answered from memory once loaded
+        if settings.lookup_cache:
+            lookup_cache: LookupCache = LookupCache()
+            await optional_stack.enter_async_context(
+                LookupCacheListener(
+                    conninfo=create_conninfo(settings.dsn, settings),
+                    lookup_cache=lookup_cache,
+                )
+            )
+            state["lookup_cache"] = lookup_cache
+
+        # GET requests read from the replica (app_psycopg.api.dependencies.db)
+        if settings.replica_dsn is not None:
+            replica_pool: AsyncConnectionPool = (
+                await optional_stack.enter_async_context(
+                    create_pool(settings.replica_dsn, settings)
+                )
+            )
+            state["replica_pool"] = replica_pool
+            state["replica_monitor"] = await optional_stack.enter_async_context(
+                ReplicaMonitor(
+                    measure=lambda: measure_replica_lag(replica_pool),
+                    max_lag=settings.replica_max_lag,
+                    interval=settings.replica_lag_interval,
+                )
+            )
+
+        # slow or sampled queries are explained on the primary (common.slow_queries)
+        explain_timeout: int = get_explain_timeout(settings)
+        slow_query_log: Optional[SlowQueryLog] = create_slow_query_log(
+            explain=lambda statement, params: explain_statement(
+                conn_pool, statement, params, explain_timeout
+            ),
+            settings=settings,
+        )
+        if slow_query_log is not None:
+            state["slow_query_log"] = await optional_stack.enter_async_context(
+                slow_query_log
+            )
+
+        yield state
 
     print("Shutdown")
@@ -0,0 +1,76 @@
+import asyncio
+import logging
+from contextlib import suppress
+from typing import List, Optional, Self
+
+from psycopg import AsyncConnection
+from psycopg.rows import class_row
+
+from app_psycopg.db.db_statements import (
+    get_companies_stmt,
+    get_professions_stmt,
+    listen_lookup_changes_stmt,
+)
+from common.lookup_cache import LookupCache
+from common.schemas import Company, Profession
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+class LookupCacheListener:
+    """
+    Keeps a LookupCache current over a dedicated connection (outside the pool).
+
+    The connection LISTENs before the tables are loaded, so that no change between
+    the load and the first notification is lost. If the connection is lost, the
+    cache is invalidated (reads go to Postgres) and reloaded once reconnected.
+    """
+
+    def __init__(
+        self, conninfo: str, lookup_cache: LookupCache, retry_interval: float = 5.0
+    ):
+        self._conninfo: str = conninfo
+        self._lookup_cache: LookupCache = lookup_cache
+        self._retry_interval: float = retry_interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def __aenter__(self) -> Self:
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                async with await AsyncConnection.connect(
+                    self._conninfo, autocommit=True
+                ) as conn:
+                    await conn.execute(listen_lookup_changes_stmt)
+                    await self._load(conn)
+                    async for notify in conn.notifies():
+                        self._lookup_cache.apply(notify.payload)
+            except Exception:
+                logger.exception(
+                    "Lookup cache listener failed, retrying in %ss.",
+                    self._retry_interval,
+                )
+
+            # notifications missed while disconnected can't be replayed
+            self._lookup_cache.invalidate()
+            await asyncio.sleep(self._retry_interval)
+
+    async def _load(self, conn: AsyncConnection) -> None:
+        async with conn.cursor(row_factory=class_row(Profession)) as cursor:
+            await cursor.execute(get_professions_stmt)
+            professions: List[Profession] = await cursor.fetchall()
+
+        async with conn.cursor(row_factory=class_row(Company)) as cursor:
+            await cursor.execute(get_companies_stmt)
+            companies: List[Company] = await cursor.fetchall()
+
+        self._lookup_cache.load(professions=professions, companies=companies)
@@ -1,11 +1,31 @@
-from typing import LiteralString
+from typing import Any, Dict, List, LiteralString, Optional, Tuple
 
 from psycopg import sql
 from psycopg.abc import Query
 
+from common.pagination import NULLABLE_CURSOR_KEYS, get_cursor_keys
+from common.sorting import Direction, OrderByField
 
-def create_paginate_query(query: Query, limit: int, offset: int) -> Query:
-    suffix: LiteralString = f" LIMIT {limit} OFFSET {offset}"
+TOTAL_COUNT_COLUMN: LiteralString = "total_count"
+LIMIT_PARAM: LiteralString = "limit"
+OFFSET_PARAM: LiteralString = "offset"
+
+
+def create_paginate_query(query: Query) -> Query:
+    """
+    Appends LIMIT and OFFSET clauses with bound parameters to a SQL query.
+
+    The values are passed as the `limit` and `offset` parameters, so that every page
+    of a list shares the same statement (and its server-side prepared plan).
+
+    Args:
+        query (Query): The SQL query to paginate (str, bytes, or psycopg.sql object).
+
+    Returns:
+        Query: The query with `LIMIT %(limit)s OFFSET %(offset)s` appended.
+    """
+
+    suffix: LiteralString = f" LIMIT %({LIMIT_PARAM})s OFFSET %({OFFSET_PARAM})s"
 
     if isinstance(query, bytes):
         return query + suffix.encode()
@@ -17,3 +37,206 @@ def create_paginate_query(query: Query, limit: int, offset: int) -> Query:
         raise TypeError(
             "Query must be a LiteralString, bytes, sql.SQL, or sql.Composed"
         )
+
+
+def create_total_count_query(query: Query) -> Query:
+    """
+    Wraps a SQL query so that every row carries the total number of rows of the query.
+
+    The `COUNT(*) OVER()` window is evaluated before LIMIT and OFFSET are applied,
+    so a page and its total count can be fetched with a single statement.
+
+    Args:
+        query (Query): The SQL query to wrap (str, bytes, or psycopg.sql object).
+
+    Returns:
+        Query: The wrapped query with an additional `total_count` column.
+    """
+
+    prefix: LiteralString = f"SELECT *, COUNT(*) OVER() AS {TOTAL_COUNT_COLUMN} FROM ("
+    suffix: LiteralString = ") AS page"
+
+    if isinstance(query, bytes):
+        return prefix.encode() + query + suffix.encode()
+    elif isinstance(query, (sql.SQL, sql.Composed)):
+        return sql.Composed([sql.SQL(prefix), query, sql.SQL(suffix)])
+    elif isinstance(query, str):
+        return f"{prefix}{query}{suffix}"
+    else:
+        raise TypeError(
+            "Query must be a LiteralString, bytes, sql.SQL, or sql.Composed"
+        )
+
+
+def create_explain_query(query: Query) -> Query:
+    """
+    Prefixes a SQL query with EXPLAIN (FORMAT JSON) to get the planner's estimates.
+
+    Args:
+        query (Query): The SQL query to explain (str, bytes, or psycopg.sql object).
+
+    Returns:
+        Query: The EXPLAIN query, returning a single JSON plan.
+    """
+
+    prefix: LiteralString = "EXPLAIN (FORMAT JSON) "
+
+    if isinstance(query, bytes):
+        return prefix.encode() + query
+    elif isinstance(query, (sql.SQL, sql.Composed)):
+        return sql.Composed([sql.SQL(prefix), query])
+    elif isinstance(query, str):
+        return f"{prefix}{query}"
+    else:
+        raise TypeError(
+            "Query must be a LiteralString, bytes, sql.SQL, or sql.Composed"
+        )
+
+
+def _to_composable(query: Query) -> sql.Composable:
+    if isinstance(query, bytes):
+        return sql.SQL(query.decode())
+    elif isinstance(query, (sql.SQL, sql.Composed)):
+        return query
+    elif isinstance(query, str):
+        return sql.SQL(query)
+    else:
+        raise TypeError(
+            "Query must be a LiteralString, bytes, sql.SQL, or sql.Composed"
+        )
+
+
+def _after(
+    key: str,
+    direction: Direction,
+    placeholder: sql.Placeholder,
+    inclusive: bool = False,
+) -> sql.Composable:
+    """
+    Creates the condition of the rows sorted after a value of a keyset column.
+
+    Args:
+        key (str): The column name.
+        direction (Direction): The sort direction of the column.
+        placeholder (sql.Placeholder): The placeholder of the (non-NULL) value.
+        inclusive (bool): Whether the rows equal to the value are included.
+
+    Returns:
+        sql.Composable: The condition, including the NULLs (sorted last) of a nullable column.
+    """
+
+    operator: str = ">" if direction == Direction.ASC else "<"
+    after: sql.Composable = sql.SQL("{} {} {}").format(
+        sql.Identifier(key),
+        sql.SQL(f"{operator}=" if inclusive else operator),
+        placeholder,
+    )
+    if key in NULLABLE_CURSOR_KEYS:
+        return sql.SQL("({} OR {} IS NULL)").format(after, sql.Identifier(key))
+    return after
+
+
+def create_keyset_query(
+    query: Query,
+    order_by_fields: List[OrderByField],
+    cursor_values: Optional[List[Any]],
+    limit: int,
+) -> Tuple[sql.Composed, Dict[str, Any]]:
+    """
+    Wraps a SQL query into a keyset (seek) paginated query.
+
+    The query is used as a subquery so that the output column names can be referenced
+    in the WHERE clause. The `id` column is always appended as the last sort key
+    (ascending) to make page boundaries stable. NULL values are sorted last, which
+    matches the ORDER BY clauses created by `create_order_by_query`.
+
+    Args:
+        query (Query): The SQL query to paginate (str, bytes, or psycopg.sql object).
+        order_by_fields (List[OrderByField]): A list of fields to order by.
+        cursor_values (Optional[List[Any]]): The keyset of the last row of the previous page.
+        limit (int): The maximum number of rows to return.
+
+    Returns:
+        Tuple[sql.Composed, Dict[str, Any]]: The query and the parameters it references.
+    """
+
+    keys: List[str] = get_cursor_keys(order_by_fields)
+    directions: List[Direction] = [field.direction for field in order_by_fields] + [
+        Direction.ASC
+    ]
+    params: Dict[str, Any] = {"keyset_limit": limit}
+
+    order_by_clauses: List[sql.Composable] = [
+        sql.SQL("{} {} NULLS LAST").format(
+            sql.Identifier(key),
+            sql.SQL("ASC" if direction == Direction.ASC else "DESC"),
+        )
+        for key, direction in zip(keys, directions, strict=True)
+    ]
+
+    where_sql: sql.Composable = sql.SQL("")
+    if cursor_values is not None:
+        columns: List[sql.Identifier] = [sql.Identifier(key) for key in keys]
+        placeholders: List[sql.Placeholder] = [
+            sql.Placeholder(f"keyset_{i}") for i in range(len(keys))
+        ]
+        params.update(
+            (f"keyset_{i}", value)
+            for i, value in enumerate(cursor_values)
+            if value is not None
+        )
+
+        if (
+            all(direction == Direction.ASC for direction in directions)
+            and None not in cursor_values
+            and NULLABLE_CURSOR_KEYS.isdisjoint(keys)
+        ):
+            # (k1, ..., id) > (v1, ..., v2) is a single range of the (k1, ..., id) index
+            predicate: sql.Composable = sql.SQL("({}) > ({})").format(
+                sql.SQL(", ").join(columns), sql.SQL(", ").join(placeholders)
+            )
+        else:
+            # (k1 after v1) OR (k1 = v1 AND k2 after v2) OR ...
+            disjuncts: List[sql.Composable] = []
+            equalities: List[sql.Composable] = []
+            for key, direction, value, column, placeholder in zip(
+                keys, directions, cursor_values, columns, placeholders, strict=True
+            ):
+                # nothing comes after a NULL value because NULLs are sorted last
+                if value is not None:
+                    disjuncts.append(
+                        sql.SQL(" AND ").join(
+                            [*equalities, _after(key, direction, placeholder)]
+                        )
+                    )
+
+                equalities.append(
+                    sql.SQL("{} IS NULL").format(column)
+                    if value is None
+                    else sql.SQL("{} = {}").format(column, placeholder)
+                )
+
+            # the redundant bound of the leading key is the range of its index scan
+            bound: sql.Composable = (
+                sql.SQL("{} IS NULL").format(columns[0])
+                if cursor_values[0] is None
+                else _after(keys[0], directions[0], placeholders[0], inclusive=True)
+            )
+            predicate = sql.SQL("{} AND ({})").format(
+                bound,
+                sql.SQL(" OR ").join(sql.SQL("({})").format(d) for d in disjuncts)
+                if disjuncts
+                else sql.SQL("FALSE"),
+            )
+        where_sql = sql.SQL(" WHERE {}").format(predicate)
+
+    keyset_query: sql.Composed = sql.SQL(
+        "SELECT * FROM ({}) AS keyset{} ORDER BY {} LIMIT {}"
+    ).format(
+        _to_composable(query),
+        where_sql,
+        sql.SQL(", ").join(order_by_clauses),
+        sql.Placeholder("keyset_limit"),
+    )
+
+    return keyset_query, params
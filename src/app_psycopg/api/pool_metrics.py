@@ -0,0 +1,71 @@
+from typing import Dict
+
+from psycopg_pool import AsyncConnectionPool
+
+from common.pool_metrics import PoolSample, create_pool_sample
+
+# gauges of get_stats(), every other key is a cumulative counter
+_POOL_GAUGES: tuple[str, ...] = (
+    "pool_min",
+    "pool_max",
+    "pool_size",
+    "pool_available",
+    "requests_waiting",
+)
+
+
+# cumulative counters of get_stats(), only reported once they were incremented
+POOL_COUNTERS: tuple[str, ...] = (
+    "requests_num",
+    "requests_queued",
+    "requests_wait_ms",
+    "requests_errors",
+    "usage_ms",
+    "returns_bad",
+    "connections_num",
+    "connections_ms",
+    "connections_errors",
+    "connections_lost",
+)
+
+
+def sample_pool(conn_pool: AsyncConnectionPool) -> PoolSample:
+    """
+    Takes a PoolSample of a psycopg connection pool.
+
+    Args:
+        conn_pool (AsyncConnectionPool): The connection pool.
+
+    Returns:
+        PoolSample: The sample taken now.
+    """
+
+    stats: Dict[str, int] = conn_pool.get_stats()
+    pool_size: int = stats.get("pool_size", 0)
+
+    return create_pool_sample(
+        size=pool_size,
+        max_size=stats.get("pool_max", conn_pool.max_size),
+        in_use=pool_size - stats.get("pool_available", 0),
+        waiting=stats.get("requests_waiting", 0),
+    )
+
+
+def get_pool_counters(conn_pool: AsyncConnectionPool) -> Dict[str, int]:
+    """
+    Returns the cumulative counters of a psycopg connection pool, e.g.
+    `requests_queued`, `requests_wait_ms`, `requests_errors` or `connections_lost`.
+
+    Args:
+        conn_pool (AsyncConnectionPool): The connection pool.
+
+    Returns:
+        Dict[str, int]: The counters since the pool was opened.
+    """
+
+    stats: Dict[str, int] = conn_pool.get_stats()
+
+    return {
+        **dict.fromkeys(POOL_COUNTERS, 0),
+        **{name: value for name, value in stats.items() if name not in _POOL_GAUGES},
+    }
@@ -0,0 +1,58 @@
+from psycopg import AsyncConnection
+from psycopg_pool import AsyncConnectionPool
+
+from app_psycopg.db.db_statements import (
+    get_current_lsn_stmt,
+    get_replica_lag_stmt,
+    has_replayed_lsn_stmt,
+)
+
+
+async def measure_replica_lag(replica_pool: AsyncConnectionPool) -> float:
+    """
+    Measures the replay lag of the replica (the `measure` of a ReplicaMonitor).
+
+    Args:
+        replica_pool (AsyncConnectionPool): The connection pool of the replica.
+
+    Returns:
+        float: The replay lag in seconds.
+    """
+
+    async with replica_pool.connection() as conn:
+        cursor = await conn.execute(get_replica_lag_stmt)
+        result: tuple = await cursor.fetchone()
+        return result[0]
+
+
+async def get_current_lsn(conn: AsyncConnection) -> str:
+    """
+    Returns the current WAL location of the primary (call it after the commit).
+
+    Args:
+        conn (AsyncConnection): A connection to the primary.
+
+    Returns:
+        str: The LSN, e.g. "16/B374D848".
+    """
+
+    cursor = await conn.execute(get_current_lsn_stmt)
+    result: tuple = await cursor.fetchone()
+    return result[0]
+
+
+async def has_replayed_lsn(conn: AsyncConnection, lsn: str) -> bool:
+    """
+    Checks whether the replica has replayed the WAL up to an LSN.
+
+    Args:
+        conn (AsyncConnection): A connection to the replica.
+        lsn (str): The LSN of a write on the primary.
+
+    Returns:
+        bool: True if the write is visible on the replica.
+    """
+
+    cursor = await conn.execute(has_replayed_lsn_stmt, {"lsn": lsn})
+    result: tuple = await cursor.fetchone()
+    return bool(result[0])
@@ -1,6 +1,6 @@
-from typing import Annotated, List
+from typing import Annotated, Any, List
 
-from fastapi import APIRouter, Depends, status, Query
+from fastapi import APIRouter, Depends, status, Query, Request, Response
 from pydantic import UUID4
 
 from app_psycopg.api.dependencies.companies import (
@@ -11,8 +11,32 @@ from app_psycopg.api.dependencies.companies import (
 )
 from app_psycopg.api.dependencies.db import get_db
 from app_psycopg.db.db import Database
+from common.trusted_rows import TrustedJSONResponse
+from common.http_cache import (
+    LOOKUP_CACHE_CONTROL,
+    CacheValidators,
+    add_cache_headers,
+    create_not_modified_response,
+    create_list_response,
+    get_resource_validators,
+    is_not_modified,
+)
+from common.batch import (
+    BatchResult,
+    BatchParams,
+    get_batch_params,
+    create_batch_result,
+)
+from common.sorting import OrderByField
 from common.order_by_enums import OrderByCompany
-from common.pagination import LimitOffsetPage, PaginationParams
+from common.pagination import (
+    LimitOffsetPage,
+    PaginationParams,
+    CursorPage,
+    CursorPaginationParams,
+    decode_cursor,
+    create_cursor_page,
+)
 from common.schemas import (
     CompanyInput,
     Company,
@@ -35,15 +59,60 @@ async def create_company(
     return company_id
 
 
+@router.get(
+    path=":batch",
+    response_model=BatchResult[Company],
+    status_code=status.HTTP_200_OK,
+)
+async def get_companies_batch(
+    db: Annotated[Database, Depends(get_db)],
+    batch: Annotated[BatchParams, Depends(get_batch_params)],
+) -> TrustedJSONResponse:
+    companies: List[Company] = await db.get_companies_by_ids(ids=batch.ids)
+    return TrustedJSONResponse(create_batch_result(ids=batch.ids, items=companies))
+
+
+@router.get(
+    path="/cursor",
+    response_model=CursorPage[Company],
+    status_code=status.HTTP_200_OK,
+)
+async def get_companies_by_cursor(
+    db: Annotated[Database, Depends(get_db)],
+    pagination: Annotated[CursorPaginationParams, Depends()],
+    order_by: Annotated[OrderByCompany, Query()] = None,
+) -> TrustedJSONResponse:
+    order_by_fields: List[OrderByField] = order_by or []
+    cursor_values: List[Any] | None = decode_cursor(
+        cursor=pagination.cursor, order_by_fields=order_by_fields
+    )
+
+    companies: List[Company] = await db.get_companies_by_cursor(
+        limit=pagination.limit, order_by=order_by_fields, cursor_values=cursor_values
+    )
+
+    return TrustedJSONResponse(
+        create_cursor_page(
+            items=companies, limit=pagination.limit, order_by_fields=order_by_fields
+        )
+    )
+
+
 @router.get(
     path="/{company_id}",
     response_model=Company,
     status_code=status.HTTP_200_OK,
 )
 async def get_company(
+    request: Request,
     company: Annotated[Company, Depends(validate_company_id)],
-) -> Company:
-    return company
+) -> Response:
+    validators: CacheValidators = get_resource_validators(company)
+    if is_not_modified(request, validators):
+        return create_not_modified_response(validators, LOOKUP_CACHE_CONTROL)
+    return add_cache_headers(
+        TrustedJSONResponse(company), validators, LOOKUP_CACHE_CONTROL
+    )
 
 
 @router.get(
@@ -52,21 +121,22 @@ async def get_company(
     status_code=status.HTTP_200_OK,
 )
 async def get_companies(
+    request: Request,
     db: Annotated[Database, Depends(get_db)],
     pagination: Annotated[PaginationParams, Depends()],
     order_by: Annotated[OrderByCompany, Query()] = None,
-) -> LimitOffsetPage[Company]:
-    companies: List[Company] = await db.get_companies(
-        limit=pagination.limit, offset=pagination.offset, order_by=order_by
-    )
-    total: int = await db.get_companies_count()
-
-    return LimitOffsetPage(
-        items=companies,
-        items_count=len(companies),
-        total_count=total,
-        limit=pagination.limit,
-        offset=pagination.offset,
+) -> Response:
+    return create_list_response(
+        request,
+        TrustedJSONResponse(
+            await db.get_companies_page(
+                limit=pagination.limit,
+                offset=pagination.offset,
+                order_by=order_by,
+                count=pagination.count,
+            )
+        ),
+        LOOKUP_CACHE_CONTROL,
     )
 
 
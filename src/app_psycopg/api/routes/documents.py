@@ -1,18 +1,58 @@
-from typing import Annotated, List
+from typing import Annotated, Any, List
 
-from fastapi import APIRouter, Depends, status, Query
+from fastapi import APIRouter, Depends, status, Query, Request, Response
 from pydantic import UUID4
+from starlette.responses import StreamingResponse
 
-from app_psycopg.api.dependencies.db import get_db
+from app_psycopg.api.dependencies.db import get_db, get_export_db
 from app_psycopg.api.dependencies.documents import (
     validate_document_input,
     validate_document_id,
     validate_document_update,
 )
 from app_psycopg.db.db import Database
+from common.trusted_rows import TrustedJSONResponse
+from common.deadlines import BULK_REQUEST_BUDGET, request_budget
+from common.http_cache import (
+    RESOURCE_CACHE_CONTROL,
+    CacheValidators,
+    add_cache_headers,
+    create_not_modified_response,
+    create_list_response,
+    get_resource_validators,
+    is_not_modified,
+)
+from common.export import (
+    EXPORT_RESPONSES,
+    ExportFormat,
+    DocumentExportFilters,
+    create_export_response,
+    get_export_format,
+)
+from common.bulk_import import (
+    ImportFormat,
+    IMPORT_OPENAPI_EXTRA,
+    get_import_format,
+    iter_records,
+)
+from common.batch import (
+    BatchResult,
+    BatchParams,
+    get_batch_params,
+    create_batch_result,
+)
+from common.sorting import OrderByField
 from common.order_by_enums import OrderByDocument
-from common.pagination import LimitOffsetPage, PaginationParams
+from common.pagination import (
+    LimitOffsetPage,
+    PaginationParams,
+    CursorPage,
+    CursorPaginationParams,
+    decode_cursor,
+    create_cursor_page,
+)
 from common.schemas import (
+    BulkImportResult,
     DocumentInput,
     Document,
     DocumentUpdate,
@@ -33,15 +73,109 @@ async def create_document(
     return document_id
 
 
+@router.post(
+    path="/import",
+    response_model=BulkImportResult,
+    status_code=status.HTTP_200_OK,
+    openapi_extra=IMPORT_OPENAPI_EXTRA,
+    dependencies=[Depends(request_budget(BULK_REQUEST_BUDGET))],
+)
+async def import_documents(
+    request: Request,
+    db: Annotated[Database, Depends(get_db)],
+    import_format: Annotated[ImportFormat, Depends(get_import_format)],
+) -> BulkImportResult:
+    result: BulkImportResult = BulkImportResult()
+    rows = iter_records(
+        chunks=request.stream(),
+        import_format=import_format,
+        model_class=DocumentInput,
+        result=result,
+        json_fields=["document"],
+    )
+    return await db.bulk_import_documents(rows=rows, result=result)
+
+
+@router.get(
+    path=":batch",
+    response_model=BatchResult[Document],
+    status_code=status.HTTP_200_OK,
+)
+async def get_documents_batch(
+    db: Annotated[Database, Depends(get_db)],
+    batch: Annotated[BatchParams, Depends(get_batch_params)],
+) -> TrustedJSONResponse:
+    documents: List[Document] = await db.get_documents_by_ids(ids=batch.ids)
+    return TrustedJSONResponse(create_batch_result(ids=batch.ids, items=documents))
+
+
+@router.get(
+    path="/cursor",
+    response_model=CursorPage[Document],
+    status_code=status.HTTP_200_OK,
+)
+async def get_documents_by_cursor(
+    db: Annotated[Database, Depends(get_db)],
+    pagination: Annotated[CursorPaginationParams, Depends()],
+    order_by: Annotated[OrderByDocument, Query()] = None,
+) -> TrustedJSONResponse:
+    order_by_fields: List[OrderByField] = order_by or []
+    cursor_values: List[Any] | None = decode_cursor(
+        cursor=pagination.cursor, order_by_fields=order_by_fields
+    )
+
+    documents: List[Document] = await db.get_documents_by_cursor(
+        limit=pagination.limit, order_by=order_by_fields, cursor_values=cursor_values
+    )
+
+    return TrustedJSONResponse(
+        create_cursor_page(
+            items=documents, limit=pagination.limit, order_by_fields=order_by_fields
+        )
+    )
+
+
+@router.get(
+    path="/export",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    responses=EXPORT_RESPONSES,
+    dependencies=[Depends(request_budget(BULK_REQUEST_BUDGET))],
+)
+async def export_documents(
+    db: Annotated[Database, Depends(get_export_db)],
+    export_format: Annotated[ExportFormat, Depends(get_export_format)],
+    filters: Annotated[DocumentExportFilters, Depends()],
+    order_by: Annotated[OrderByDocument, Query()] = None,
+) -> StreamingResponse:
+    return create_export_response(
+        chunks=db.export_documents(
+            export_format=export_format,
+            filters=filters.model_dump(exclude_none=True),
+            order_by=order_by,
+        ),
+        export_format=export_format,
+        name="documents",
+    )
+
+
 @router.get(
     path="/{document_id}",
     response_model=Document,
     status_code=status.HTTP_200_OK,
 )
 async def get_document(
+    request: Request,
     document: Annotated[Document, Depends(validate_document_id)],
-) -> Document:
-    return Document.model_validate(document)
+) -> Response:
+    validators: CacheValidators = get_resource_validators(document)
+    if is_not_modified(request, validators):
+        return create_not_modified_response(validators, RESOURCE_CACHE_CONTROL)
+    return add_cache_headers(
+        TrustedJSONResponse(Document.model_validate(document)),
+        validators,
+        RESOURCE_CACHE_CONTROL,
+    )
 
 
 @router.get(
@@ -50,25 +184,22 @@ async def get_document(
     status_code=status.HTTP_200_OK,
 )
 async def get_documents(
+    request: Request,
     db: Annotated[Database, Depends(get_db)],
     pagination: Annotated[PaginationParams, Depends()],
     order_by: Annotated[OrderByDocument, Query()] = None,
-) -> LimitOffsetPage[Document]:
-    documents: List[Document] = await db.get_documents(
-        limit=pagination.limit, offset=pagination.offset, order_by=order_by
-    )
-    total: int = await db.get_documents_count()
-
-    items: List[Document] = [
-        Document.model_validate(document) for document in documents
-    ]
-
-    return LimitOffsetPage(
-        items=items,
-        items_count=len(items),
-        total_count=total,
-        limit=pagination.limit,
-        offset=pagination.offset,
+) -> Response:
+    return create_list_response(
+        request,
+        TrustedJSONResponse(
+            await db.get_documents_page(
+                limit=pagination.limit,
+                offset=pagination.offset,
+                order_by=order_by,
+                count=pagination.count,
+            )
+        ),
+        RESOURCE_CACHE_CONTROL,
     )
 
 
@@ -1,14 +1,60 @@
-from typing import Annotated, List
+from typing import Annotated, Any, List
 
-from fastapi import APIRouter, Depends, status, Query
+from fastapi import APIRouter, Depends, status, Query, Request, Response
 from pydantic import UUID4
+from starlette.responses import StreamingResponse
 
-from app_psycopg.api.dependencies.db import get_db
-from app_psycopg.api.dependencies.orders import validate_order_input, validate_order_id
+from app_psycopg.api.dependencies.db import get_db, get_export_db
+from app_psycopg.api.dependencies.orders import (
+    validate_order_input,
+    validate_order_id,
+    validate_order_id_json,
+)
+from app_psycopg.api.json_passthrough import JSONPassthroughResponse
 from app_psycopg.db.db import Database
+from common.settings import get_settings
+from common.trusted_rows import TrustedJSONResponse
+from common.deadlines import BULK_REQUEST_BUDGET, request_budget
+from common.http_cache import (
+    RESOURCE_CACHE_CONTROL,
+    CacheValidators,
+    add_cache_headers,
+    create_etag,
+    create_not_modified_response,
+    create_list_response,
+    get_resource_validators,
+    is_not_modified,
+)
+from common.export import (
+    EXPORT_RESPONSES,
+    ExportFormat,
+    OrderExportFilters,
+    create_export_response,
+    get_export_format,
+)
+from common.bulk_import import (
+    ImportFormat,
+    IMPORT_OPENAPI_EXTRA,
+    get_import_format,
+    iter_records,
+)
+from common.batch import (
+    BatchResult,
+    BatchParams,
+    get_batch_params,
+    create_batch_result,
+)
+from common.sorting import OrderByField
 from common.order_by_enums import OrderByOrder
-from common.pagination import LimitOffsetPage, PaginationParams
-from common.schemas import Order, OrderInputValidated
+from common.pagination import (
+    LimitOffsetPage,
+    PaginationParams,
+    CursorPage,
+    CursorPaginationParams,
+    decode_cursor,
+    create_cursor_page,
+)
+from common.schemas import BulkImportResult, Order, OrderInput
 
 router: APIRouter = APIRouter(
     tags=["Orders"],
@@ -19,21 +65,122 @@ router: APIRouter = APIRouter(
 @router.post(path="", response_model=Order, status_code=status.HTTP_201_CREATED)
 async def create_order(
     db: Annotated[Database, Depends(get_db)],
-    order_input_validated: Annotated[
-        OrderInputValidated, Depends(validate_order_input)
-    ],
+    order_input: Annotated[OrderInput, Depends(validate_order_input)],
 ) -> Order:
-    order_id: UUID4 = await db.insert_order(order_input_validated.order_input)
+    order_id: UUID4 = await db.insert_order(order_input)
     order: Order = await db.get_order(order_id)
 
     return Order.model_validate(order)
 
 
+@router.post(
+    path="/import",
+    response_model=BulkImportResult,
+    status_code=status.HTTP_200_OK,
+    openapi_extra=IMPORT_OPENAPI_EXTRA,
+    dependencies=[Depends(request_budget(BULK_REQUEST_BUDGET))],
+)
+async def import_orders(
+    request: Request,
+    db: Annotated[Database, Depends(get_db)],
+    import_format: Annotated[ImportFormat, Depends(get_import_format)],
+) -> BulkImportResult:
+    result: BulkImportResult = BulkImportResult()
+    rows = iter_records(
+        chunks=request.stream(),
+        import_format=import_format,
+        model_class=OrderInput,
+        result=result,
+    )
+    return await db.bulk_import_orders(rows=rows, result=result)
+
+
+@router.get(
+    path=":batch",
+    response_model=BatchResult[Order],
+    status_code=status.HTTP_200_OK,
+)
+async def get_orders_batch(
+    db: Annotated[Database, Depends(get_db)],
+    batch: Annotated[BatchParams, Depends(get_batch_params)],
+) -> TrustedJSONResponse:
+    orders: List[Order] = await db.get_orders_by_ids(ids=batch.ids)
+    return TrustedJSONResponse(create_batch_result(ids=batch.ids, items=orders))
+
+
+@router.get(
+    path="/cursor",
+    response_model=CursorPage[Order],
+    status_code=status.HTTP_200_OK,
+)
+async def get_orders_by_cursor(
+    db: Annotated[Database, Depends(get_db)],
+    pagination: Annotated[CursorPaginationParams, Depends()],
+    order_by: Annotated[OrderByOrder, Query()] = None,
+) -> TrustedJSONResponse:
+    order_by_fields: List[OrderByField] = order_by or []
+    cursor_values: List[Any] | None = decode_cursor(
+        cursor=pagination.cursor, order_by_fields=order_by_fields
+    )
+
+    orders: List[Order] = await db.get_orders_by_cursor(
+        limit=pagination.limit, order_by=order_by_fields, cursor_values=cursor_values
+    )
+
+    return TrustedJSONResponse(
+        create_cursor_page(
+            items=orders, limit=pagination.limit, order_by_fields=order_by_fields
+        )
+    )
+
+
+@router.get(
+    path="/export",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    responses=EXPORT_RESPONSES,
+    dependencies=[Depends(request_budget(BULK_REQUEST_BUDGET))],
+)
+async def export_orders(
+    db: Annotated[Database, Depends(get_export_db)],
+    export_format: Annotated[ExportFormat, Depends(get_export_format)],
+    filters: Annotated[OrderExportFilters, Depends()],
+    order_by: Annotated[OrderByOrder, Query()] = None,
+) -> StreamingResponse:
+    return create_export_response(
+        chunks=db.export_orders(
+            export_format=export_format,
+            filters=filters.model_dump(exclude_none=True),
+            order_by=order_by,
+        ),
+        export_format=export_format,
+        name="orders",
+    )
+
+
 @router.get(path="/{order_id}", response_model=Order, status_code=status.HTTP_200_OK)
 async def get_order(
-    order: Annotated[Order, Depends(validate_order_id)],
-) -> Order:
-    return order
+    request: Request,
+    db: Annotated[Database, Depends(get_db)],
+    order_id: UUID4,
+) -> Response:
+    if get_settings().json_passthrough:
+        content: bytes = await validate_order_id_json(db=db, order_id=order_id)
+        # the body is rendered already, its hash is the ETag
+        validators: CacheValidators = CacheValidators(etag=create_etag(content))
+        if is_not_modified(request, validators):
+            return create_not_modified_response(validators, RESOURCE_CACHE_CONTROL)
+        return add_cache_headers(
+            JSONPassthroughResponse(content), validators, RESOURCE_CACHE_CONTROL
+        )
+
+    order: Order = await validate_order_id(db=db, order_id=order_id)
+    validators: CacheValidators = get_resource_validators(order, "payer", "payee")
+    if is_not_modified(request, validators):
+        return create_not_modified_response(validators, RESOURCE_CACHE_CONTROL)
+    return add_cache_headers(
+        TrustedJSONResponse(order), validators, RESOURCE_CACHE_CONTROL
+    )
 
 
 @router.get(
@@ -42,22 +189,31 @@ async def get_order(
     status_code=status.HTTP_200_OK,
 )
 async def get_orders(
+    request: Request,
     db: Annotated[Database, Depends(get_db)],
     pagination: Annotated[PaginationParams, Depends()],
     order_by: Annotated[OrderByOrder, Query()] = None,
-) -> LimitOffsetPage[Order]:
-    orders: List[Order] = await db.get_orders(
-        limit=pagination.limit, offset=pagination.offset, order_by=order_by
-    )
-    total: int = await db.get_orders_count()
-
-    return LimitOffsetPage(
-        items=orders,
-        items_count=len(orders),
-        total_count=total,
-        limit=pagination.limit,
-        offset=pagination.offset,
-    )
+) -> Response:
+    if get_settings().json_passthrough:
+        response: Response = JSONPassthroughResponse(
+            await db.get_orders_page_json(
+                limit=pagination.limit,
+                offset=pagination.offset,
+                order_by=order_by,
+                count=pagination.count,
+            )
+        )
+    else:
+        response: Response = TrustedJSONResponse(
+            await db.get_orders_page(
+                limit=pagination.limit,
+                offset=pagination.offset,
+                order_by=order_by,
+                count=pagination.count,
+            )
+        )
+
+    return create_list_response(request, response, RESOURCE_CACHE_CONTROL)
 
 
 @router.delete(
@@ -1,6 +1,6 @@
-from typing import Annotated, List
+from typing import Annotated, Any, List
 
-from fastapi import APIRouter, Depends, status, Query
+from fastapi import APIRouter, Depends, status, Query, Request, Response
 from pydantic import UUID4
 
 from app_psycopg.api.dependencies.db import get_db
@@ -10,8 +10,32 @@ from app_psycopg.api.dependencies.professions import (
     validate_profession_update,
 )
 from app_psycopg.db.db import Database
+from common.trusted_rows import TrustedJSONResponse
+from common.http_cache import (
+    LOOKUP_CACHE_CONTROL,
+    CacheValidators,
+    add_cache_headers,
+    create_not_modified_response,
+    create_list_response,
+    get_resource_validators,
+    is_not_modified,
+)
+from common.batch import (
+    BatchResult,
+    BatchParams,
+    get_batch_params,
+    create_batch_result,
+)
+from common.sorting import OrderByField
 from common.order_by_enums import OrderByProfession
-from common.pagination import LimitOffsetPage, PaginationParams
+from common.pagination import (
+    LimitOffsetPage,
+    PaginationParams,
+    CursorPage,
+    CursorPaginationParams,
+    decode_cursor,
+    create_cursor_page,
+)
 from common.schemas import (
     ProfessionInput,
     Profession,
@@ -33,15 +57,60 @@ async def create_profession(
     return profession_id
 
 
+@router.get(
+    path=":batch",
+    response_model=BatchResult[Profession],
+    status_code=status.HTTP_200_OK,
+)
+async def get_professions_batch(
+    db: Annotated[Database, Depends(get_db)],
+    batch: Annotated[BatchParams, Depends(get_batch_params)],
+) -> TrustedJSONResponse:
+    professions: List[Profession] = await db.get_professions_by_ids(ids=batch.ids)
+    return TrustedJSONResponse(create_batch_result(ids=batch.ids, items=professions))
+
+
+@router.get(
+    path="/cursor",
+    response_model=CursorPage[Profession],
+    status_code=status.HTTP_200_OK,
+)
+async def get_professions_by_cursor(
+    db: Annotated[Database, Depends(get_db)],
+    pagination: Annotated[CursorPaginationParams, Depends()],
+    order_by: Annotated[OrderByProfession, Query()] = None,
+) -> TrustedJSONResponse:
+    order_by_fields: List[OrderByField] = order_by or []
+    cursor_values: List[Any] | None = decode_cursor(
+        cursor=pagination.cursor, order_by_fields=order_by_fields
+    )
+
+    professions: List[Profession] = await db.get_professions_by_cursor(
+        limit=pagination.limit, order_by=order_by_fields, cursor_values=cursor_values
+    )
+
+    return TrustedJSONResponse(
+        create_cursor_page(
+            items=professions, limit=pagination.limit, order_by_fields=order_by_fields
+        )
+    )
+
+
 @router.get(
     path="/{profession_id}",
     response_model=Profession,
     status_code=status.HTTP_200_OK,
 )
 async def get_profession(
+    request: Request,
     profession: Annotated[Profession, Depends(validate_profession_id)],
-) -> Profession:
-    return profession
+) -> Response:
+    validators: CacheValidators = get_resource_validators(profession)
+    if is_not_modified(request, validators):
+        return create_not_modified_response(validators, LOOKUP_CACHE_CONTROL)
+    return add_cache_headers(
+        TrustedJSONResponse(profession), validators, LOOKUP_CACHE_CONTROL
+    )
 
 
 @router.get(
@@ -50,21 +119,22 @@ async def get_profession(
     status_code=status.HTTP_200_OK,
 )
 async def get_professions(
+    request: Request,
     db: Annotated[Database, Depends(get_db)],
     pagination: Annotated[PaginationParams, Depends()],
     order_by: Annotated[OrderByProfession, Query()] = None,
-) -> LimitOffsetPage[Profession]:
-    professions: List[Profession] = await db.get_professions(
-        limit=pagination.limit, offset=pagination.offset, order_by=order_by
-    )
-    total: int = await db.get_professions_count()
-
-    return LimitOffsetPage(
-        items=professions,
-        items_count=len(professions),
-        total_count=total,
-        limit=pagination.limit,
-        offset=pagination.offset,
+) -> Response:
+    return create_list_response(
+        request,
+        TrustedJSONResponse(
+            await db.get_professions_page(
+                limit=pagination.limit,
+                offset=pagination.offset,
+                order_by=order_by,
+                count=pagination.count,
+            )
+        ),
+        LOOKUP_CACHE_CONTROL,
     )
 
 
@@ -1,4 +1,4 @@
-from typing import Annotated, Tuple, List
+from typing import Annotated, Tuple
 
 from fastapi import APIRouter, Depends, status
 from pydantic import UUID4
@@ -11,6 +11,7 @@ from app_psycopg.api.dependencies.user_company_links import (
     validate_get_user_company_links,
 )
 from app_psycopg.api.dependencies.users import validate_user_id
+from common.trusted_rows import TrustedJSONResponse
 from common.schemas import (
     UserCompanyLinkInput,
     UserCompanyLinkWithCompany,
@@ -68,10 +69,7 @@ async def get_user_company_links(
     db: Annotated[Database, Depends(get_db)],
     params: Annotated[dict, Depends(validate_get_user_company_links)],
     pagination: Annotated[PaginationParams, Depends()],
-) -> (
-    LimitOffsetPage[UserCompanyLinkWithCompany]
-    | LimitOffsetPage[UserCompanyLinkWithUser]
-):
+) -> TrustedJSONResponse:
     # The validate_get_user_company_links dependency ensures that exactly one of
     # user_id or company_id is provided, so we can safely use an if-else structure
 
@@ -80,21 +78,13 @@ async def get_user_company_links(
         # Validate that the user exists
         await validate_user_id(db=db, user_id=params["user_id"])
 
-        links: List[
-            UserCompanyLinkWithCompany
-        ] = await db.get_user_company_links_by_user(
-            user_id=params["user_id"], limit=pagination.limit, offset=pagination.offset
-        )
-        total: int = await db.get_user_company_links_count_by_user(
-            user_id=params["user_id"]
-        )
-
-        return LimitOffsetPage[UserCompanyLinkWithCompany](
-            items=links,
-            items_count=len(links),
-            total_count=total,
-            limit=pagination.limit,
-            offset=pagination.offset,
+        return TrustedJSONResponse(
+            await db.get_user_company_links_by_user_page(
+                user_id=params["user_id"],
+                limit=pagination.limit,
+                offset=pagination.offset,
+                count=pagination.count,
+            )
         )
     # Else company_id is provided (guaranteed by validate_get_user_company_links)
     else:
@@ -104,19 +94,11 @@ async def get_user_company_links(
         # Validate that the company exists
         await validate_company_id(db=db, company_id=company_id)
 
-        links: List[
-            UserCompanyLinkWithUser
-        ] = await db.get_user_company_links_by_company(
-            company_id=company_id, limit=pagination.limit, offset=pagination.offset
-        )
-        total: int = await db.get_user_company_links_count_by_company(
-            company_id=company_id
-        )
-
-        return LimitOffsetPage[UserCompanyLinkWithUser](
-            items=links,
-            items_count=len(links),
-            total_count=total,
-            limit=pagination.limit,
-            offset=pagination.offset,
+        return TrustedJSONResponse(
+            await db.get_user_company_links_by_company_page(
+                company_id=company_id,
+                limit=pagination.limit,
+                offset=pagination.offset,
+                count=pagination.count,
+            )
         )
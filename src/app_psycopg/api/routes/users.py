@@ -1,19 +1,63 @@
-from typing import Annotated, List
+from typing import Annotated, Any, List
 
-from fastapi import APIRouter, Depends, status, Query
+from fastapi import APIRouter, Depends, status, Query, Request, Response
 from pydantic import UUID4
+from starlette.responses import StreamingResponse
 
-from app_psycopg.api.dependencies.db import get_db
+from app_psycopg.api.dependencies.db import get_db, get_export_db
 from app_psycopg.api.dependencies.users import (
     validate_user_input,
     validate_user_id,
+    validate_user_id_json,
     validate_user_update,
     validate_user_patch,
 )
+from app_psycopg.api.json_passthrough import JSONPassthroughResponse
 from app_psycopg.db.db import Database
+from common.settings import get_settings
+from common.trusted_rows import TrustedJSONResponse
+from common.deadlines import BULK_REQUEST_BUDGET, request_budget
+from common.http_cache import (
+    RESOURCE_CACHE_CONTROL,
+    CacheValidators,
+    add_cache_headers,
+    create_etag,
+    create_not_modified_response,
+    create_list_response,
+    get_resource_validators,
+    is_not_modified,
+)
+from common.export import (
+    EXPORT_RESPONSES,
+    ExportFormat,
+    UserExportFilters,
+    create_export_response,
+    get_export_format,
+)
+from common.bulk_import import (
+    ImportFormat,
+    IMPORT_OPENAPI_EXTRA,
+    get_import_format,
+    iter_records,
+)
+from common.batch import (
+    BatchResult,
+    BatchParams,
+    get_batch_params,
+    create_batch_result,
+)
+from common.sorting import OrderByField
 from common.order_by_enums import OrderByUser
-from common.pagination import LimitOffsetPage, PaginationParams
+from common.pagination import (
+    LimitOffsetPage,
+    PaginationParams,
+    CursorPage,
+    CursorPaginationParams,
+    decode_cursor,
+    create_cursor_page,
+)
 from common.schemas import (
+    BulkImportResult,
     UserInput,
     UserUpdate,
     User,
@@ -35,11 +79,114 @@ async def create_user(
     return user_id
 
 
+@router.post(
+    path="/import",
+    response_model=BulkImportResult,
+    status_code=status.HTTP_200_OK,
+    openapi_extra=IMPORT_OPENAPI_EXTRA,
+    dependencies=[Depends(request_budget(BULK_REQUEST_BUDGET))],
+)
+async def import_users(
+    request: Request,
+    db: Annotated[Database, Depends(get_db)],
+    import_format: Annotated[ImportFormat, Depends(get_import_format)],
+) -> BulkImportResult:
+    result: BulkImportResult = BulkImportResult()
+    rows = iter_records(
+        chunks=request.stream(),
+        import_format=import_format,
+        model_class=UserInput,
+        result=result,
+    )
+    return await db.bulk_import_users(rows=rows, result=result)
+
+
+@router.get(
+    path=":batch",
+    response_model=BatchResult[User],
+    status_code=status.HTTP_200_OK,
+)
+async def get_users_batch(
+    db: Annotated[Database, Depends(get_db)],
+    batch: Annotated[BatchParams, Depends(get_batch_params)],
+) -> TrustedJSONResponse:
+    users: List[User] = await db.get_users_by_ids(ids=batch.ids)
+    return TrustedJSONResponse(create_batch_result(ids=batch.ids, items=users))
+
+
+@router.get(
+    path="/cursor",
+    response_model=CursorPage[User],
+    status_code=status.HTTP_200_OK,
+)
+async def get_users_by_cursor(
+    db: Annotated[Database, Depends(get_db)],
+    pagination: Annotated[CursorPaginationParams, Depends()],
+    order_by: Annotated[OrderByUser, Query()] = None,
+) -> TrustedJSONResponse:
+    order_by_fields: List[OrderByField] = order_by or []
+    cursor_values: List[Any] | None = decode_cursor(
+        cursor=pagination.cursor, order_by_fields=order_by_fields
+    )
+
+    users: List[User] = await db.get_users_by_cursor(
+        limit=pagination.limit, order_by=order_by_fields, cursor_values=cursor_values
+    )
+
+    return TrustedJSONResponse(
+        create_cursor_page(
+            items=users, limit=pagination.limit, order_by_fields=order_by_fields
+        )
+    )
+
+
+@router.get(
+    path="/export",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    responses=EXPORT_RESPONSES,
+    dependencies=[Depends(request_budget(BULK_REQUEST_BUDGET))],
+)
+async def export_users(
+    db: Annotated[Database, Depends(get_export_db)],
+    export_format: Annotated[ExportFormat, Depends(get_export_format)],
+    filters: Annotated[UserExportFilters, Depends()],
+    order_by: Annotated[OrderByUser, Query()] = None,
+) -> StreamingResponse:
+    return create_export_response(
+        chunks=db.export_users(
+            export_format=export_format,
+            filters=filters.model_dump(exclude_none=True),
+            order_by=order_by,
+        ),
+        export_format=export_format,
+        name="users",
+    )
+
+
 @router.get(path="/{user_id}", response_model=User, status_code=status.HTTP_200_OK)
 async def get_user(
-    user: Annotated[User, Depends(validate_user_id)],
-) -> User:
-    return user
+    request: Request,
+    db: Annotated[Database, Depends(get_db)],
+    user_id: UUID4,
+) -> Response:
+    if get_settings().json_passthrough:
+        content: bytes = await validate_user_id_json(db=db, user_id=user_id)
+        # the body is rendered already, its hash is the ETag
+        validators: CacheValidators = CacheValidators(etag=create_etag(content))
+        if is_not_modified(request, validators):
+            return create_not_modified_response(validators, RESOURCE_CACHE_CONTROL)
+        return add_cache_headers(
+            JSONPassthroughResponse(content), validators, RESOURCE_CACHE_CONTROL
+        )
+
+    user: User = await validate_user_id(db=db, user_id=user_id)
+    validators: CacheValidators = get_resource_validators(user, "profession")
+    if is_not_modified(request, validators):
+        return create_not_modified_response(validators, RESOURCE_CACHE_CONTROL)
+    return add_cache_headers(
+        TrustedJSONResponse(user), validators, RESOURCE_CACHE_CONTROL
+    )
 
 
 @router.get(
@@ -48,22 +195,31 @@ async def get_user(
     status_code=status.HTTP_200_OK,
 )
 async def get_users(
+    request: Request,
     db: Annotated[Database, Depends(get_db)],
     pagination: Annotated[PaginationParams, Depends()],
     order_by: Annotated[OrderByUser, Query()] = None,
-) -> LimitOffsetPage[User]:
-    users: List[User] = await db.get_users(
-        limit=pagination.limit, offset=pagination.offset, order_by=order_by
-    )
-    total: int = await db.get_users_count()
-
-    return LimitOffsetPage(
-        items=users,
-        items_count=len(users),
-        total_count=total,
-        limit=pagination.limit,
-        offset=pagination.offset,
-    )
+) -> Response:
+    if get_settings().json_passthrough:
+        response: Response = JSONPassthroughResponse(
+            await db.get_users_page_json(
+                limit=pagination.limit,
+                offset=pagination.offset,
+                order_by=order_by,
+                count=pagination.count,
+            )
+        )
+    else:
+        response: Response = TrustedJSONResponse(
+            await db.get_users_page(
+                limit=pagination.limit,
+                offset=pagination.offset,
+                order_by=order_by,
+                count=pagination.count,
+            )
+        )
+
+    return create_list_response(request, response, RESOURCE_CACHE_CONTROL)
 
 
 @router.put(path="/{user_id}", response_model=UUID4, status_code=status.HTTP_200_OK)
@@ -0,0 +1,49 @@
+from typing import Any, Optional
+
+from psycopg import AsyncConnection, AsyncCursor
+from psycopg_pool import AsyncConnectionPool
+
+from app_psycopg.db.db_statements import (
+    set_timeouts_stmt,
+    set_transaction_read_only_stmt,
+)
+from common.slow_queries import EXPLAIN_PREFIX
+
+
+async def explain_statement(
+    conn_pool: AsyncConnectionPool, statement: str, params: Any, timeout_ms: int
+) -> Any:
+    """
+    Runs EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) of a query on a connection of the
+    primary, in a READ ONLY transaction that is rolled back.
+
+    Args:
+        conn_pool (AsyncConnectionPool): The pool of the primary.
+        statement (str): The query with placeholders.
+        params (Any): The parameters of the original execution.
+        timeout_ms (int): The statement_timeout (and lock_timeout) of the EXPLAIN.
+
+    Returns:
+        Any: The JSON plan.
+    """
+
+    conn: AsyncConnection
+    async with (
+        conn_pool.connection() as conn,
+        conn.transaction(force_rollback=True),
+    ):
+        await conn.execute(set_transaction_read_only_stmt)
+        await conn.execute(
+            set_timeouts_stmt,
+            {
+                "statement_timeout": str(timeout_ms),
+                "lock_timeout": str(timeout_ms),
+                "is_local": True,
+            },
+        )
+        cursor: AsyncCursor = await conn.execute(
+            EXPLAIN_PREFIX + statement,  # type: ignore[arg-type]
+            params,
+        )
+        row: Optional[tuple] = await cursor.fetchone()
+        return row[0] if row else None
@@ -6,6 +6,27 @@ from psycopg.abc import Query
 from common.sorting import OrderByField, Direction
 
 
+def get_order_by_clauses(
+    order_by_fields: List[OrderByField], relation: LiteralString = ""
+) -> LiteralString:
+    """
+    Renders the sort keys of an ORDER BY clause (NULLs are sorted last).
+
+    Args:
+        order_by_fields (List[OrderByField]): A list of fields to order by.
+        relation (LiteralString): The name (or alias) the fields are qualified with.
+
+    Returns:
+        LiteralString: The comma separated sort keys, e.g. `name DESC NULLS LAST`.
+    """
+
+    prefix: LiteralString = f"{relation}." if relation else ""
+    return ", ".join(
+        f"{prefix}{field.name} {'ASC' if field.direction == Direction.ASC else 'DESC'} NULLS LAST"
+        for field in order_by_fields
+    )
+
+
 def create_order_by_query(query: Query, order_by_fields: List[OrderByField]) -> Query:
     """
     Appends ORDER BY clauses to a SQL query based on the provided fields.
@@ -18,12 +39,7 @@ def create_order_by_query(query: Query, order_by_fields: List[OrderByField]) ->
         Query: The modified query with ORDER BY clauses.
     """
 
-    order_by_clauses: List[str] = [
-        f"{field.name} {'ASC' if field.direction == Direction.ASC else 'DESC'} NULLS LAST"
-        for field in order_by_fields
-    ]
-
-    order_by_sql: LiteralString = f" ORDER BY {', '.join(order_by_clauses)}"
+    order_by_sql: LiteralString = f" ORDER BY {get_order_by_clauses(order_by_fields)}"
 
     if isinstance(query, bytes):
         return query + order_by_sql.encode()
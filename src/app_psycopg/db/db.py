@@ -1,8 +1,26 @@
-from typing import TypeVar, List, cast, Tuple
+import time
+from contextlib import asynccontextmanager, contextmanager, suppress, AsyncExitStack
+from functools import wraps
+from uuid import UUID
+from typing import (
+    TypeVar,
+    List,
+    cast,
+    Tuple,
+    Any,
+    Optional,
+    Dict,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Sequence,
+    Iterator,
+)
 
-from psycopg import AsyncConnection
+from psycopg import AsyncConnection, AsyncCursor
 from psycopg.abc import Query
-from psycopg.rows import class_row
+from psycopg.errors import CheckViolation, ForeignKeyViolation
+from psycopg.rows import RowFactory, class_row, dict_row, tuple_row
 from pydantic import BaseModel, UUID4
 
 from common.schemas import (
@@ -26,9 +44,35 @@ from common.schemas import (
     UserCompanyLinkWithCompany,
     UserCompanyLinkWithUser,
     UserCompanyLink,
+    BulkImportResult,
+)
+from common.bulk_import import MAX_REPORTED_REJECTED_ROWS, reject_row
+from common.export import EXPORT_BATCH_SIZE, ExportFormat
+from common.integrity import ConstraintViolation
+from common.metrics import observe_statement
+from common.lookup_cache import (
+    COMPANIES_TABLE,
+    PROFESSIONS_TABLE,
+    LookupCache,
+    LookupCacheMiss,
+)
+from common.pagination import LimitOffsetPage, CountStrategy
+from common.sorting import OrderByField
+from app_psycopg.api.pagination import (
+    create_keyset_query,
+    create_explain_query,
+    TOTAL_COUNT_COLUMN,
 )
-from app_psycopg.api.pagination import create_paginate_query
+from app_psycopg.api.json_passthrough import (
+    DEFAULT_JSON_ROW,
+    ESTIMATED_COUNT_PARAM,
+    create_json_page_query,
+    create_json_row_query,
+)
+from app_psycopg.api.export import create_csv_export_query, create_ndjson_export_query
+from app_psycopg.api.filtering import create_filter_query
 from app_psycopg.api.sorting import create_order_by_query
+from app_psycopg.db.statement_registry import get_list_stmt, get_statement_name
 
 from app_psycopg.db.db_statements import (
     delete_user_stmt,
@@ -47,6 +91,7 @@ from app_psycopg.db.db_statements import (
     delete_document_stmt,
     get_documents_count_stmt,
     get_orders_count_stmt,
+    order_json_row,
     insert_profession_stmt,
     get_profession_stmt,
     get_professions_stmt,
@@ -69,95 +114,644 @@ from app_psycopg.db.db_statements import (
     get_user_company_links_count_by_company_stmt,
     delete_user_company_link_stmt,
     get_user_company_link_stmt,
+    get_users_by_ids_stmt,
+    get_users_plain_stmt,
+    get_user_plain_stmt,
+    get_users_by_ids_plain_stmt,
+    get_orders_by_ids_stmt,
+    get_documents_by_ids_stmt,
+    get_professions_by_ids_stmt,
+    get_companies_by_ids_stmt,
+    create_users_staging_stmt,
+    copy_users_staging_stmt,
+    reject_users_staging_stmt,
+    insert_users_from_staging_stmt,
+    create_orders_staging_stmt,
+    copy_orders_staging_stmt,
+    reject_orders_staging_stmt,
+    insert_orders_from_staging_stmt,
+    create_documents_staging_stmt,
+    copy_documents_staging_stmt,
+    reject_documents_staging_stmt,
+    insert_documents_from_staging_stmt,
 )
 
 T: TypeVar = TypeVar("T")
 
+# changes the dict of a row before it becomes a model (or a trusted row)
+RowTransform = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+def _identity_key(model_class: type, id: UUID | str) -> Tuple[type, UUID | str]:
+    # str and UUID ids of the same row share an entry
+    with suppress(ValueError):
+        id = id if isinstance(id, UUID) else UUID(id)
+    return model_class, id
+
+
+@contextmanager
+def _constraint_violations(params: Dict[str, Any]) -> Iterator[None]:
+    # answered with the 404/400 of the validators (common.integrity)
+    try:
+        yield
+    except (ForeignKeyViolation, CheckViolation) as error:
+        raise ConstraintViolation(error.diag.constraint_name, params) from error
+
+
+def _count_rows(result: Any) -> int:
+    if result is None:
+        return 0
+    if isinstance(result, list):
+        return len(result)
+    return 1
+
+
+def _observed(method: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+    # latency and rows per `db_statements` name (common.metrics)
+    @wraps(method)
+    async def observed_method(self, query: Query, *args, **kwargs) -> T:
+        start: float = time.perf_counter()
+        result: Any = None
+        try:
+            result = await method(self, query, *args, **kwargs)
+            return result
+        finally:
+            observe_statement(
+                get_statement_name(query),
+                time.perf_counter() - start,
+                _count_rows(result),
+            )
+
+    return observed_method
+
+
+def transformed_row(
+    row_transform: RowTransform, model_class: Optional[type[T]] = None
+) -> RowFactory:
+    """
+    Row factory building a dict per row, passing it through `row_transform` and
+    then into `model_class` (if given).
+
+    Args:
+        row_transform (RowTransform): Changes the dict of a row, e.g. attaches cached data.
+        model_class (Optional[type[T]]): The model of a row, None to keep the dict.
+
+    Returns:
+        RowFactory: The row factory.
+    """
+
+    def row_factory(cursor: AsyncCursor) -> Callable[[Sequence[Any]], Any]:
+        make_dict = dict_row(cursor)
+
+        def make_row(values: Sequence[Any]) -> Any:
+            row: Dict[str, Any] = row_transform(make_dict(values))
+            return row if model_class is None else model_class(**row)
+
+        return make_row
+
+    return row_factory
+
 
 class Database:
-    def __init__(self, connection: AsyncConnection):
+    def __init__(
+        self,
+        connection: AsyncConnection,
+        trusted_rows: bool = False,
+        lookup_cache: Optional[LookupCache] = None,
+    ):
         self.conn: AsyncConnection = connection
-
+        # list reads return plain dict rows instead of validated models (common.trusted_rows)
+        self.trusted_rows: bool = trusted_rows
+        # professions and companies are read from memory while the cache is ready
+        self.lookup_cache: Optional[LookupCache] = lookup_cache
+        # users, companies and professions read by this (request-scoped) instance,
+        # emptied by every write
+        self._identity_map: Dict[Tuple[type, UUID | str], Any] = {}
+
+    def _row_factory(
+        self, model_class: type[T], row_transform: Optional[RowTransform] = None
+    ) -> RowFactory:
+        if row_transform is not None:
+            return transformed_row(row_transform, model_class)
+        return class_row(cls=model_class)
+
+    def _list_row_factory(
+        self, model_class: type[T], row_transform: Optional[RowTransform] = None
+    ) -> RowFactory:
+        if row_transform is not None:
+            return transformed_row(
+                row_transform, None if self.trusted_rows else model_class
+            )
+        return dict_row if self.trusted_rows else class_row(cls=model_class)
+
+    def _cached_lookup(self) -> Optional[LookupCache]:
+        if self.lookup_cache is not None and self.lookup_cache.ready:
+            return self.lookup_cache
+        return None
+
+    async def _get_identity(
+        self,
+        model_class: type[T],
+        id: UUID | str,
+        get: Callable[[], Awaitable[T | None]],
+    ) -> T | None:
+        """
+        Returns the row read earlier in this request, reads it with `get` otherwise.
+        A missing row (None) is remembered too.
+        """
+
+        key: Tuple[type, UUID | str] = _identity_key(model_class, id)
+        if key not in self._identity_map:
+            self._identity_map[key] = await get()
+        return self._identity_map[key]
+
+    def _remember(self, item: Any) -> None:
+        if item is not None:
+            self._identity_map[_identity_key(type(item), item.id)] = item
+
+    def _evict(self, table: str, id: str) -> None:
+        # called once the write succeeded: read back from Postgres until the
+        # notification of the (committed) change arrives
+        if self.lookup_cache is not None:
+            self.lookup_cache.evict(table, id)
+
+    @_observed
     async def _get_resource(
-        self, query: Query, model_class: type[T], **kwargs
+        self,
+        query: Query,
+        model_class: type[T],
+        row_transform: Optional[RowTransform] = None,
+        **kwargs,
     ) -> T | None:
-        async with self.conn.cursor(row_factory=class_row(cls=model_class)) as cursor:
+        async with self.conn.cursor(
+            row_factory=self._row_factory(model_class, row_transform)
+        ) as cursor:
             await cursor.execute(query=query, params=kwargs)
             return await cursor.fetchone()
 
+    @_observed
     async def _insert_resource(self, query: Query, data: BaseModel) -> UUID4 | None:
+        self._identity_map.clear()
+        params: Dict[str, Any] = data.model_dump()
         async with self.conn.cursor() as cursor:
-            await cursor.execute(query=query, params=data.model_dump())
+            with _constraint_violations(params):
+                await cursor.execute(query=query, params=params)
             data_out: tuple = await cursor.fetchone()
             return data_out[0] if data_out else None
 
+    @_observed
     async def _insert_joint_resource(
         self, query: Query, data: BaseModel
     ) -> Tuple[UUID4, UUID4] | None:
+        self._identity_map.clear()
+        params: Dict[str, Any] = data.model_dump()
         async with self.conn.cursor() as cursor:
-            await cursor.execute(query=query, params=data.model_dump())
+            with _constraint_violations(params):
+                await cursor.execute(query=query, params=params)
             data_out: tuple = await cursor.fetchone()
 
             return data_out if data_out else None
 
+    @_observed
     async def _update_resource(
         self, query: Query, update: BaseModel, **kwargs
     ) -> UUID4:
+        self._identity_map.clear()
         async with self.conn.cursor() as cursor:
             kwargs.update(update.model_dump())
-            await cursor.execute(query=query, params=kwargs)
+            with _constraint_violations(kwargs):
+                await cursor.execute(query=query, params=kwargs)
             data_out: tuple = await cursor.fetchone()
             return data_out[0]
 
+    @_observed
     async def _patch_resource(self, query: Query, patch: BaseModel, **kwargs) -> UUID4:
+        self._identity_map.clear()
         async with self.conn.cursor() as cursor:
             kwargs.update(patch.model_dump())
-            await cursor.execute(query=query, params=kwargs)
+            with _constraint_violations(kwargs):
+                await cursor.execute(query=query, params=kwargs)
             data_out: tuple = await cursor.fetchone()
             return data_out[0]
 
+    @_observed
     async def _delete_resource(self, query: Query, **kwargs) -> None:
+        self._identity_map.clear()
         async with self.conn.cursor() as cursor:
             await cursor.execute(query=query, params=kwargs)
 
+    @_observed
     async def _get_resources(
-        self, query: Query, model_class: type[T], **kwargs
+        self,
+        query: Query,
+        model_class: type[T],
+        row_transform: Optional[RowTransform] = None,
+        **kwargs,
     ) -> List[T]:
-        if kwargs.get("order_by") is not None:
-            query: Query = create_order_by_query(
-                query=query, order_by_fields=kwargs.get("order_by")
+        query: Query = get_list_stmt(
+            stmt=query,
+            order_by=kwargs.get("order_by"),
+            paginate=kwargs.get("limit") is not None
+            and kwargs.get("offset") is not None,
+        )
+
+        async with self.conn.cursor(
+            row_factory=self._list_row_factory(model_class, row_transform)
+        ) as cursor:
+            await cursor.execute(
+                query=query,
+                params=kwargs,
             )
+            return await cursor.fetchall()
 
-        if kwargs.get("limit") is not None and kwargs.get("offset") is not None:
-            query: Query = create_paginate_query(
-                query=query, limit=kwargs["limit"], offset=kwargs["offset"]
+    async def _get_resources_page(
+        self,
+        query: Query,
+        count_query: Query,
+        model_class: type[T],
+        limit: int,
+        offset: int,
+        order_by: Optional[List[OrderByField]] = None,
+        count: CountStrategy = CountStrategy.EXACT,
+        row_transform: Optional[RowTransform] = None,
+        **kwargs,
+    ) -> LimitOffsetPage[T]:
+        if count != CountStrategy.EXACT:
+            items: List[T] = await self._get_resources(
+                query=query,
+                model_class=model_class,
+                row_transform=row_transform,
+                limit=limit,
+                offset=offset,
+                order_by=order_by,
+                **kwargs,
+            )
+
+            total: int | None = None
+            if count == CountStrategy.ESTIMATE:
+                estimate: int = await self._get_estimated_count(query=query, **kwargs)
+                # the estimate can't be lower than the rows we have already seen
+                total = max(estimate, offset + len(items))
+
+            return LimitOffsetPage(
+                items=items,
+                items_count=len(items),
+                total_count=total,
+                limit=limit,
+                offset=offset,
             )
 
-        async with self.conn.cursor(row_factory=class_row(cls=model_class)) as cursor:
+        # rows and total count in a single round trip
+        page_query: Query = get_list_stmt(
+            stmt=query, order_by=order_by, total_count=True
+        )
+
+        start: float = time.perf_counter()
+        async with self.conn.cursor(row_factory=dict_row) as cursor:
             await cursor.execute(
-                query=query,
-                params=kwargs,
+                query=page_query, params={**kwargs, "limit": limit, "offset": offset}
             )
+            rows: List[dict] = await cursor.fetchall()
+        observe_statement(
+            get_statement_name(query), time.perf_counter() - start, len(rows)
+        )
+
+        if rows:
+            total: int = rows[0][TOTAL_COUNT_COLUMN]
+        elif offset > 0:
+            # an offset beyond the last row returns no window count
+            total: int = await self._get_count(query=count_query, **kwargs)
+        else:
+            total: int = 0
+
+        items: List[T] = []
+        for row in rows:
+            del row[TOTAL_COUNT_COLUMN]
+            if row_transform is not None:
+                row = row_transform(row)
+            items.append(row if self.trusted_rows else model_class(**row))
+
+        return LimitOffsetPage(
+            items=items,
+            items_count=len(items),
+            total_count=total,
+            limit=limit,
+            offset=offset,
+        )
+
+    @_observed
+    async def _get_resources_by_cursor(
+        self,
+        query: Query,
+        model_class: type[T],
+        limit: int,
+        order_by: Optional[List[OrderByField]] = None,
+        cursor_values: Optional[List[Any]] = None,
+        row_transform: Optional[RowTransform] = None,
+        **kwargs,
+    ) -> List[T]:
+        # fetch one extra row to find out whether there is a next page
+        keyset_query, keyset_params = create_keyset_query(
+            query=query,
+            order_by_fields=order_by or [],
+            cursor_values=cursor_values,
+            limit=limit + 1,
+        )
+        kwargs.update(keyset_params)
+
+        async with self.conn.cursor(
+            row_factory=self._list_row_factory(model_class, row_transform)
+        ) as cursor:
+            await cursor.execute(query=keyset_query, params=kwargs)
             return await cursor.fetchall()
 
+    @_observed
+    async def _get_resource_json(
+        self, query: Query, row: Query = DEFAULT_JSON_ROW, **kwargs
+    ) -> bytes | None:
+        async with self.conn.cursor() as cursor:
+            await cursor.execute(
+                query=create_json_row_query(query=query, row=row),
+                params=kwargs,
+                binary=True,
+            )
+            result: tuple | None = await cursor.fetchone()
+            return result[0] if result else None
+
+    @_observed
+    async def _get_resources_page_json(
+        self,
+        query: Query,
+        count_query: Query,
+        limit: int,
+        offset: int,
+        order_by: Optional[List[OrderByField]] = None,
+        count: CountStrategy = CountStrategy.EXACT,
+        row: Query = DEFAULT_JSON_ROW,
+        **kwargs,
+    ) -> bytes:
+        """
+        Returns a LimitOffsetPage rendered by Postgres as JSON bytes (see json_passthrough).
+        """
+
+        params: Dict[str, Any] = {**kwargs, "limit": limit, "offset": offset}
+        if count == CountStrategy.ESTIMATE:
+            params[ESTIMATED_COUNT_PARAM] = await self._get_estimated_count(
+                query=query, **kwargs
+            )
+
+        page_query: Query = create_json_page_query(
+            query=get_list_stmt(stmt=query, order_by=order_by),
+            count_query=count_query,
+            count=count,
+            row=row,
+            order_by=order_by,
+        )
+
+        async with self.conn.cursor() as cursor:
+            await cursor.execute(query=page_query, params=params, binary=True)
+            result: tuple = await cursor.fetchone()
+            return result[0]
+
+    async def _export_resources(
+        self,
+        query: Query,
+        export_format: ExportFormat,
+        filters: Optional[Dict[str, Any]] = None,
+        order_by: Optional[List[OrderByField]] = None,
+        row: Query = DEFAULT_JSON_ROW,
+    ) -> AsyncIterator[bytes]:
+        """
+        Streams all (filtered) rows of a list statement as NDJSON or CSV chunks.
+
+        NDJSON is read through a server-side cursor, EXPORT_BATCH_SIZE rows at a time,
+        CSV through COPY TO STDOUT. Only one chunk is held in memory. Both run in the
+        transaction of the connection (`get_export_conn`: REPEATABLE READ, READ ONLY),
+        which the server-side cursor requires.
+        """
+
+        if self.conn.autocommit:
+            raise ValueError("Exports need a connection in a transaction.")
+
+        export_query, params = create_filter_query(query=query, filters=filters or {})
+        if order_by:
+            export_query: Query = create_order_by_query(
+                query=export_query, order_by_fields=order_by
+            )
+
+        if export_format == ExportFormat.CSV:
+            async with (
+                self.conn.cursor() as cursor,
+                cursor.copy(
+                    statement=create_csv_export_query(query=export_query),
+                    params=params,
+                ) as copy,
+            ):
+                async for data in copy:
+                    yield bytes(data)
+            return
+
+        async with self.conn.cursor(name="export") as cursor:
+            cursor.itersize = EXPORT_BATCH_SIZE
+            await cursor.execute(
+                query=create_ndjson_export_query(query=export_query, row=row),
+                params=params,
+                binary=True,
+            )
+            while rows := await cursor.fetchmany(EXPORT_BATCH_SIZE):
+                yield b"".join(line for (line,) in rows)
+
+    @_observed
     async def _get_count(self, query: Query, **kwargs) -> int:
         async with self.conn.cursor() as cursor:
             await cursor.execute(query=query, params=kwargs)
             result = await cursor.fetchone()
             return cast(int, result[0])
 
+    async def _get_estimated_count(self, query: Query, **kwargs) -> int:
+        # planner statistics instead of a full scan
+        async with self.conn.cursor() as cursor:
+            await cursor.execute(query=create_explain_query(query), params=kwargs)
+            result = await cursor.fetchone()
+            plan: list = result[0]
+            return int(plan[0]["Plan"]["Plan Rows"])
+
+    @asynccontextmanager
+    async def pipeline(self) -> AsyncIterator["Database"]:
+        """
+        Runs the statements of the block in psycopg's pipeline mode.
+
+        Statements whose results are not fetched (e.g. deletes) are sent back-to-back
+        and synced once when the block exits. Nested pipelines are allowed.
+
+        Yields:
+            Database: This Database instance.
+        """
+
+        async with self.conn.pipeline():
+            yield self
+
+    async def _get_resources_pipelined(
+        self, *lookups: Tuple[Query, Optional[type], Dict[str, Any]]
+    ) -> List[Any]:
+        """
+        Executes independent single-row lookups in one pipeline (one round trip).
+
+        Args:
+            *lookups: (query, model_class, params) per lookup. Without a model_class,
+                the row is returned as a tuple.
+
+        Returns:
+            List[Any]: The row of each lookup (None if not found), in the given order.
+        """
+
+        async with self.pipeline(), AsyncExitStack() as stack:
+            cursors: List[AsyncCursor] = []
+            for query, model_class, params in lookups:
+                row_factory = class_row(cls=model_class) if model_class else tuple_row
+                cursor: AsyncCursor = await stack.enter_async_context(
+                    self.conn.cursor(row_factory=row_factory)
+                )
+                await cursor.execute(query=query, params=params)
+                cursors.append(cursor)
+
+            # the first fetch syncs the pipeline and receives all results at once
+            return [await cursor.fetchone() for cursor in cursors]
+
+    async def _bulk_import(
+        self,
+        rows: AsyncIterator[Tuple[int, BaseModel]],
+        result: BulkImportResult,
+        columns: List[str],
+        create_staging_query: Query,
+        copy_query: Query,
+        reject_query: Query,
+        insert_query: Query,
+    ) -> BulkImportResult:
+        """
+        Imports validated rows via COPY into a staging table, then into the target table.
+
+        Rows are written to COPY as they arrive. Rows with missing references are
+        removed from the staging table set-wise (reported in `result`) before the
+        remaining rows are inserted with a single statement.
+
+        Args:
+            rows (AsyncIterator[Tuple[int, BaseModel]]): Line numbers and validated input models.
+            result (BulkImportResult): The report of the running import.
+            columns (List[str]): The model fields in the column order of `copy_query`.
+            create_staging_query (Query): Creates the temporary staging table.
+            copy_query (Query): COPY ... FROM STDIN into the staging table (line first).
+            reject_query (Query): Deletes rows with missing references, returning (line, error, total).
+            insert_query (Query): Moves the staging rows into the target table.
+
+        Returns:
+            BulkImportResult: The completed report.
+        """
+
+        self._identity_map.clear()
+        async with self.conn.cursor() as cursor:
+            await cursor.execute(query=create_staging_query)
+
+            async with cursor.copy(statement=copy_query) as copy:
+                async for line, data in rows:
+                    values: dict = data.model_dump()
+                    await copy.write_row((line, *(values[c] for c in columns)))
+
+            await cursor.execute(
+                query=reject_query,
+                params={"max_rejected": MAX_REPORTED_REJECTED_ROWS},
+            )
+            rejected_rows: List[Tuple[int, str, int]] = await cursor.fetchall()
+            for line, error, _ in rejected_rows:
+                reject_row(result, line, error)
+            if rejected_rows:
+                # rows beyond the report size are only counted
+                result.rejected_count += rejected_rows[0][2] - len(rejected_rows)
+
+            await cursor.execute(query=insert_query)
+            result.imported_count = cursor.rowcount
+
+        return result
+
+    async def _get_users(
+        self,
+        get: Callable[..., Awaitable[T]],
+        query: Query,
+        plain_query: Query,
+        **kwargs,
+    ) -> T:
+        """
+        Reads users with `plain_query` (without the professions join) and attaches the
+        professions from the lookup cache. Uses `query` (with the join) while the cache
+        is not ready or misses a profession.
+        """
+
+        lookup_cache: Optional[LookupCache] = self._cached_lookup()
+        if lookup_cache is not None:
+            with suppress(LookupCacheMiss):
+                return await get(
+                    query=plain_query,
+                    model_class=User,
+                    row_transform=lookup_cache.attach_profession,
+                    **kwargs,
+                )
+
+        return await get(query=query, model_class=User, **kwargs)
+
     # User
 
     async def get_users(self, **kwargs) -> List[User]:
-        query: Query = get_users_stmt
+        return await self._get_users(
+            self._get_resources, get_users_stmt, get_users_plain_stmt, **kwargs
+        )
 
-        return await self._get_resources(query=query, model_class=User, **kwargs)
+    async def get_users_page(self, **kwargs) -> LimitOffsetPage[User]:
+        return await self._get_users(
+            self._get_resources_page,
+            get_users_stmt,
+            get_users_plain_stmt,
+            count_query=get_users_count_stmt,
+            **kwargs,
+        )
+
+    async def get_users_by_cursor(self, **kwargs) -> List[User]:
+        return await self._get_users(
+            self._get_resources_by_cursor,
+            get_users_stmt,
+            get_users_plain_stmt,
+            **kwargs,
+        )
 
     async def get_users_count(self) -> int:
         return await self._get_count(query=get_users_count_stmt)
 
     async def get_user(self, id: str) -> User | None:
-        return await self._get_resource(query=get_user_stmt, model_class=User, id=id)
+        return await self._get_identity(
+            User,
+            id,
+            lambda: self._get_users(
+                self._get_resource, get_user_stmt, get_user_plain_stmt, id=id
+            ),
+        )
+
+    async def get_user_json(self, id: str) -> bytes | None:
+        return await self._get_resource_json(query=get_user_stmt, id=id)
+
+    async def get_users_page_json(self, **kwargs) -> bytes:
+        return await self._get_resources_page_json(
+            query=get_users_stmt, count_query=get_users_count_stmt, **kwargs
+        )
+
+    def export_users(self, **kwargs) -> AsyncIterator[bytes]:
+        return self._export_resources(query=get_users_stmt, **kwargs)
+
+    async def get_users_by_ids(self, ids: List[UUID4]) -> List[User]:
+        return await self._get_users(
+            self._get_resources,
+            get_users_by_ids_stmt,
+            get_users_by_ids_plain_stmt,
+            ids=ids,
+        )
 
     async def insert_user(self, data: UserInput) -> UUID4 | None:
         return await self._insert_resource(query=insert_user_stmt, data=data)
@@ -171,6 +765,19 @@ class Database:
     async def delete_user(self, id: str) -> None:
         return await self._delete_resource(delete_user_stmt, id=id)
 
+    async def bulk_import_users(
+        self, rows: AsyncIterator[Tuple[int, UserInput]], result: BulkImportResult
+    ) -> BulkImportResult:
+        return await self._bulk_import(
+            rows=rows,
+            result=result,
+            columns=["id", "name", "created_at", "profession_id"],
+            create_staging_query=create_users_staging_stmt,
+            copy_query=copy_users_staging_stmt,
+            reject_query=reject_users_staging_stmt,
+            insert_query=insert_users_from_staging_stmt,
+        )
+
     # Order
 
     async def insert_order(self, data: OrderInput) -> UUID4 | None:
@@ -179,17 +786,66 @@ class Database:
     async def get_order(self, id: str) -> Order | None:
         return await self._get_resource(query=get_order_stmt, model_class=Order, id=id)
 
+    async def get_order_json(self, id: str) -> bytes | None:
+        return await self._get_resource_json(
+            query=get_order_stmt, row=order_json_row, id=id
+        )
+
+    async def get_orders_page_json(self, **kwargs) -> bytes:
+        return await self._get_resources_page_json(
+            query=get_orders_stmt,
+            count_query=get_orders_count_stmt,
+            row=order_json_row,
+            **kwargs,
+        )
+
+    def export_orders(self, **kwargs) -> AsyncIterator[bytes]:
+        return self._export_resources(
+            query=get_orders_stmt, row=order_json_row, **kwargs
+        )
+
+    async def get_orders_by_ids(self, ids: List[UUID4]) -> List[Order]:
+        return await self._get_resources(
+            query=get_orders_by_ids_stmt, model_class=Order, ids=ids
+        )
+
     async def get_orders(self, **kwargs) -> List[Order]:
         query: Query = get_orders_stmt
 
         return await self._get_resources(query=query, model_class=Order, **kwargs)
 
+    async def get_orders_page(self, **kwargs) -> LimitOffsetPage[Order]:
+        return await self._get_resources_page(
+            query=get_orders_stmt,
+            count_query=get_orders_count_stmt,
+            model_class=Order,
+            **kwargs,
+        )
+
+    async def get_orders_by_cursor(self, **kwargs) -> List[Order]:
+        return await self._get_resources_by_cursor(
+            query=get_orders_stmt, model_class=Order, **kwargs
+        )
+
     async def get_orders_count(self) -> int:
         return await self._get_count(query=get_orders_count_stmt)
 
     async def delete_order(self, id: str) -> None:
         return await self._delete_resource(delete_order_stmt, id=id)
 
+    async def bulk_import_orders(
+        self, rows: AsyncIterator[Tuple[int, OrderInput]], result: BulkImportResult
+    ) -> BulkImportResult:
+        return await self._bulk_import(
+            rows=rows,
+            result=result,
+            columns=["id", "amount", "payer_id", "payee_id", "created_at"],
+            create_staging_query=create_orders_staging_stmt,
+            copy_query=copy_orders_staging_stmt,
+            reject_query=reject_orders_staging_stmt,
+            insert_query=insert_orders_from_staging_stmt,
+        )
+
     # Documents
 
     async def insert_document(self, data: DocumentInput) -> UUID4 | None:
@@ -205,17 +861,51 @@ class Database:
             query=get_document_stmt, model_class=Document, id=id
         )
 
+    async def get_documents_by_ids(self, ids: List[UUID4]) -> List[Document]:
+        return await self._get_resources(
+            query=get_documents_by_ids_stmt, model_class=Document, ids=ids
+        )
+
+    def export_documents(self, **kwargs) -> AsyncIterator[bytes]:
+        return self._export_resources(query=get_documents_stmt, **kwargs)
+
     async def get_documents(self, **kwargs) -> List[Document]:
         query: Query = get_documents_stmt
 
         return await self._get_resources(query=query, model_class=Document, **kwargs)
 
+    async def get_documents_page(self, **kwargs) -> LimitOffsetPage[Document]:
+        return await self._get_resources_page(
+            query=get_documents_stmt,
+            count_query=get_documents_count_stmt,
+            model_class=Document,
+            **kwargs,
+        )
+
+    async def get_documents_by_cursor(self, **kwargs) -> List[Document]:
+        return await self._get_resources_by_cursor(
+            query=get_documents_stmt, model_class=Document, **kwargs
+        )
+
     async def get_documents_count(self) -> int:
         return await self._get_count(query=get_documents_count_stmt)
 
     async def delete_document(self, id: str) -> None:
         return await self._delete_resource(delete_document_stmt, id=id)
 
+    async def bulk_import_documents(
+        self, rows: AsyncIterator[Tuple[int, DocumentInput]], result: BulkImportResult
+    ) -> BulkImportResult:
+        return await self._bulk_import(
+            rows=rows,
+            result=result,
+            columns=["id", "document", "created_at", "user_id"],
+            create_staging_query=create_documents_staging_stmt,
+            copy_query=copy_documents_staging_stmt,
+            reject_query=reject_documents_staging_stmt,
+            insert_query=insert_documents_from_staging_stmt,
+        )
+
     # Profession
 
     async def get_professions(self, **kwargs) -> List[Profession]:
@@ -223,24 +913,53 @@ class Database:
 
         return await self._get_resources(query=query, model_class=Profession, **kwargs)
 
+    async def get_professions_page(self, **kwargs) -> LimitOffsetPage[Profession]:
+        return await self._get_resources_page(
+            query=get_professions_stmt,
+            count_query=get_professions_count_stmt,
+            model_class=Profession,
+            **kwargs,
+        )
+
+    async def get_professions_by_cursor(self, **kwargs) -> List[Profession]:
+        return await self._get_resources_by_cursor(
+            query=get_professions_stmt, model_class=Profession, **kwargs
+        )
+
     async def get_professions_count(self) -> int:
         return await self._get_count(query=get_professions_count_stmt)
 
     async def get_profession(self, id: str) -> Profession | None:
-        return await self._get_resource(
-            query=get_profession_stmt, model_class=Profession, id=id
+        lookup_cache: Optional[LookupCache] = self._cached_lookup()
+        if lookup_cache is not None and (profession := lookup_cache.get_profession(id)):
+            return profession
+
+        return await self._get_identity(
+            Profession,
+            id,
+            lambda: self._get_resource(
+                query=get_profession_stmt, model_class=Profession, id=id
+            ),
+        )
+
+    async def get_professions_by_ids(self, ids: List[UUID4]) -> List[Profession]:
+        return await self._get_resources(
+            query=get_professions_by_ids_stmt, model_class=Profession, ids=ids
         )
 
     async def insert_profession(self, data: ProfessionInput) -> UUID4 | None:
         return await self._insert_resource(query=insert_profession_stmt, data=data)
 
     async def update_profession(self, id: str, update: ProfessionUpdate) -> UUID4:
-        return await self._update_resource(
+        updated_id: UUID4 = await self._update_resource(
             query=update_profession_stmt, update=update, id=id
         )
+        self._evict(PROFESSIONS_TABLE, id)
+        return updated_id
 
     async def delete_profession(self, id: str) -> None:
-        return await self._delete_resource(delete_profession_stmt, id=id)
+        await self._delete_resource(delete_profession_stmt, id=id)
+        self._evict(PROFESSIONS_TABLE, id)
 
     # Company
 
@@ -249,27 +968,60 @@ class Database:
 
         return await self._get_resources(query=query, model_class=Company, **kwargs)
 
+    async def get_companies_page(self, **kwargs) -> LimitOffsetPage[Company]:
+        return await self._get_resources_page(
+            query=get_companies_stmt,
+            count_query=get_companies_count_stmt,
+            model_class=Company,
+            **kwargs,
+        )
+
+    async def get_companies_by_cursor(self, **kwargs) -> List[Company]:
+        return await self._get_resources_by_cursor(
+            query=get_companies_stmt, model_class=Company, **kwargs
+        )
+
     async def get_companies_count(self) -> int:
         return await self._get_count(query=get_companies_count_stmt)
 
     async def get_company(self, id: str) -> Company | None:
-        return await self._get_resource(
-            query=get_company_stmt, model_class=Company, id=id
+        lookup_cache: Optional[LookupCache] = self._cached_lookup()
+        if lookup_cache is not None and (company := lookup_cache.get_company(id)):
+            return company
+
+        return await self._get_identity(
+            Company,
+            id,
+            lambda: self._get_resource(
+                query=get_company_stmt, model_class=Company, id=id
+            ),
+        )
+
+    async def get_companies_by_ids(self, ids: List[UUID4]) -> List[Company]:
+        return await self._get_resources(
+            query=get_companies_by_ids_stmt, model_class=Company, ids=ids
         )
 
     async def insert_company(self, data: CompanyInput) -> UUID4 | None:
         return await self._insert_resource(query=insert_company_stmt, data=data)
 
     async def update_company(self, id: str, update: CompanyUpdate) -> UUID4:
-        return await self._update_resource(
+        updated_id: UUID4 = await self._update_resource(
             query=update_company_stmt, update=update, id=id
         )
+        self._evict(COMPANIES_TABLE, id)
+        return updated_id
 
     async def patch_company(self, id: str, patch: CompanyPatch) -> UUID4:
-        return await self._patch_resource(query=patch_company_stmt, patch=patch, id=id)
+        patched_id: UUID4 = await self._patch_resource(
+            query=patch_company_stmt, patch=patch, id=id
+        )
+        self._evict(COMPANIES_TABLE, id)
+        return patched_id
 
     async def delete_company(self, id: str) -> None:
-        return await self._delete_resource(delete_company_stmt, id=id)
+        await self._delete_resource(delete_company_stmt, id=id)
+        self._evict(COMPANIES_TABLE, id)
 
     # UserCompanyLink
 
@@ -283,6 +1035,29 @@ class Database:
             model_class=UserCompanyLink,
         )
 
+    async def get_user_company_link_references(
+        self, user_id: UUID4, company_id: UUID4
+    ) -> Tuple[User | None, Company | None, int]:
+        lookup_cache: Optional[LookupCache] = self._cached_lookup()
+        if lookup_cache is not None and (
+            company := lookup_cache.get_company(company_id)
+        ):
+            user, count_row = await self._get_resources_pipelined(
+                (get_user_stmt, User, {"id": user_id}),
+                (get_user_company_links_count_by_user_stmt, None, {"user_id": user_id}),
+            )
+            self._remember(user)
+            return user, company, cast(int, count_row[0])
+
+        user, company, count_row = await self._get_resources_pipelined(
+            (get_user_stmt, User, {"id": user_id}),
+            (get_company_stmt, Company, {"id": company_id}),
+            (get_user_company_links_count_by_user_stmt, None, {"user_id": user_id}),
+        )
+        self._remember(user)
+        self._remember(company)
+        return user, company, cast(int, count_row[0])
+
     async def insert_user_company_link(
         self, data: UserCompanyLinkInput
     ) -> Tuple[UUID4, UUID4] | None:
@@ -312,6 +1087,30 @@ class Database:
             query=query, model_class=UserCompanyLinkWithUser, **kwargs
         )
 
+    async def get_user_company_links_by_user_page(
+        self, user_id: UUID4, **kwargs
+    ) -> LimitOffsetPage[UserCompanyLinkWithCompany]:
+        kwargs["user_id"] = user_id
+
+        return await self._get_resources_page(
+            query=get_user_company_links_by_user_stmt,
+            count_query=get_user_company_links_count_by_user_stmt,
+            model_class=UserCompanyLinkWithCompany,
+            **kwargs,
+        )
+
+    async def get_user_company_links_by_company_page(
+        self, company_id: UUID4, **kwargs
+    ) -> LimitOffsetPage[UserCompanyLinkWithUser]:
+        kwargs["company_id"] = company_id
+
+        return await self._get_resources_page(
+            query=get_user_company_links_by_company_stmt,
+            count_query=get_user_company_links_count_by_company_stmt,
+            model_class=UserCompanyLinkWithUser,
+            **kwargs,
+        )
+
     async def get_user_company_links_count_by_user(self, user_id: str) -> int:
         return await self._get_count(
             query=get_user_company_links_count_by_user_stmt, user_id=user_id
@@ -35,6 +35,37 @@ get_user_stmt: LiteralString = """
     WHERE u.id = %(id)s
 """
 
+get_users_by_ids_stmt: LiteralString = """
+    SELECT 
+        u.id, u.name, u.created_at, u.last_updated_at,
+        json_build_object(
+            'id', p.id,
+            'name', p.name
+        ) profession
+    FROM users u
+    JOIN professions p ON u.profession_id = p.id
+    WHERE u.id = ANY(%(ids)s)
+"""
+
+# user rows without the professions join, the profession is attached from the
+# lookup cache (common.lookup_cache)
+get_users_plain_stmt: LiteralString = """
+    SELECT u.id, u.name, u.created_at, u.last_updated_at, u.profession_id
+    FROM users u
+"""
+
+get_user_plain_stmt: LiteralString = """
+    SELECT u.id, u.name, u.created_at, u.last_updated_at, u.profession_id
+    FROM users u
+    WHERE u.id = %(id)s
+"""
+
+get_users_by_ids_plain_stmt: LiteralString = """
+    SELECT u.id, u.name, u.created_at, u.last_updated_at, u.profession_id
+    FROM users u
+    WHERE u.id = ANY(%(ids)s)
+"""
+
 update_user_stmt: LiteralString = """
     UPDATE users SET (name, last_updated_at, profession_id) = (%(name)s, %(last_updated_at)s, %(profession_id)s)
     WHERE id = %(id)s
@@ -55,6 +86,32 @@ delete_user_stmt: LiteralString = """
     DELETE FROM users WHERE id = %(id)s
 """
 
+create_users_staging_stmt: LiteralString = """
+    CREATE TEMPORARY TABLE users_staging (line INTEGER NOT NULL, LIKE users) ON COMMIT DROP
+"""
+
+copy_users_staging_stmt: LiteralString = """
+    COPY users_staging (line, id, name, created_at, profession_id) FROM STDIN
+"""
+
+reject_users_staging_stmt: LiteralString = """
+    WITH rejected AS (
+        DELETE FROM users_staging s
+        USING users_staging r
+        LEFT JOIN professions p ON p.id = r.profession_id
+        WHERE s.line = r.line AND p.id IS NULL
+        RETURNING s.line, 'Profession ' || quote_literal(s.profession_id) || ' not found!' AS error
+    )
+    SELECT line, error, COUNT(*) OVER () FROM rejected
+    ORDER BY line LIMIT %(max_rejected)s
+"""
+
+insert_users_from_staging_stmt: LiteralString = """
+    INSERT INTO users (id, name, created_at, profession_id)
+    SELECT id, name, created_at, profession_id FROM users_staging
+    ON CONFLICT (id) DO NOTHING
+"""
+
 # endregion
 
 # region Order
@@ -82,6 +139,23 @@ get_order_stmt: LiteralString = """
     WHERE t.id = %(id)s
 """
 
+get_orders_by_ids_stmt: LiteralString = """
+    SELECT 
+        t.id, t.amount, t.created_at,
+        json_build_object(
+            'id', u1.id,
+            'name', u1.name
+        ) payer,
+        json_build_object(
+            'id', u2.id,
+            'name', u2.name
+        ) payee
+    FROM orders t
+    JOIN users u1 ON t.payer_id = u1.id
+    JOIN users u2 ON t.payee_id = u2.id
+    WHERE t.id = ANY(%(ids)s)
+"""
+
 get_orders_stmt: LiteralString = """
     SELECT 
         t.id, t.amount, t.created_at,
@@ -102,10 +176,50 @@ get_orders_count_stmt: LiteralString = """
     SELECT COUNT(*) FROM orders
 """
 
+# JSON of an order row as rendered by the Order response model (amount as a string)
+order_json_row: LiteralString = """
+    json_build_object(
+        'id', page.id,
+        'amount', page.amount::text,
+        'payer', page.payer,
+        'payee', page.payee,
+        'created_at', page.created_at
+    )
+"""
+
 delete_order_stmt: LiteralString = """
     DELETE FROM orders WHERE id = %(id)s
 """
 
+create_orders_staging_stmt: LiteralString = """
+    CREATE TEMPORARY TABLE orders_staging (line INTEGER NOT NULL, LIKE orders) ON COMMIT DROP
+"""
+
+copy_orders_staging_stmt: LiteralString = """
+    COPY orders_staging (line, id, amount, payer_id, payee_id, created_at) FROM STDIN
+"""
+
+reject_orders_staging_stmt: LiteralString = """
+    WITH rejected AS (
+        DELETE FROM orders_staging s
+        USING orders_staging r
+        LEFT JOIN users u1 ON u1.id = r.payer_id
+        LEFT JOIN users u2 ON u2.id = r.payee_id
+        WHERE s.line = r.line AND (u1.id IS NULL OR u2.id IS NULL)
+        RETURNING s.line, 'User ' || quote_literal(
+            CASE WHEN u1.id IS NULL THEN s.payer_id ELSE s.payee_id END
+        ) || ' not found!' AS error
+    )
+    SELECT line, error, COUNT(*) OVER () FROM rejected
+    ORDER BY line LIMIT %(max_rejected)s
+"""
+
+insert_orders_from_staging_stmt: LiteralString = """
+    INSERT INTO orders (id, amount, payer_id, payee_id, created_at)
+    SELECT id, amount, payer_id, payee_id, created_at FROM orders_staging
+    ON CONFLICT (id) DO NOTHING
+"""
+
 # endregion
 
 # region Document
@@ -120,6 +234,10 @@ get_document_stmt: LiteralString = """
     SELECT * FROM documents WHERE id = %(id)s
 """
 
+get_documents_by_ids_stmt: LiteralString = """
+    SELECT * FROM documents WHERE id = ANY(%(ids)s)
+"""
+
 get_documents_stmt: LiteralString = """
     SELECT * FROM documents
 """
@@ -138,6 +256,32 @@ delete_document_stmt: LiteralString = """
     DELETE FROM documents WHERE id = %(id)s
 """
 
+create_documents_staging_stmt: LiteralString = """
+    CREATE TEMPORARY TABLE documents_staging (line INTEGER NOT NULL, LIKE documents) ON COMMIT DROP
+"""
+
+copy_documents_staging_stmt: LiteralString = """
+    COPY documents_staging (line, id, document, created_at, user_id) FROM STDIN
+"""
+
+reject_documents_staging_stmt: LiteralString = """
+    WITH rejected AS (
+        DELETE FROM documents_staging s
+        USING documents_staging r
+        LEFT JOIN users u ON u.id = r.user_id
+        WHERE s.line = r.line AND u.id IS NULL
+        RETURNING s.line, 'User ' || quote_literal(s.user_id) || ' not found!' AS error
+    )
+    SELECT line, error, COUNT(*) OVER () FROM rejected
+    ORDER BY line LIMIT %(max_rejected)s
+"""
+
+insert_documents_from_staging_stmt: LiteralString = """
+    INSERT INTO documents (id, document, created_at, user_id)
+    SELECT id, document, created_at, user_id FROM documents_staging
+    ON CONFLICT (id) DO NOTHING
+"""
+
 # endregion
 
 # region Profession
@@ -152,6 +296,10 @@ get_profession_stmt: LiteralString = """
     SELECT * FROM professions WHERE id = %(id)s
 """
 
+get_professions_by_ids_stmt: LiteralString = """
+    SELECT * FROM professions WHERE id = ANY(%(ids)s)
+"""
+
 get_professions_stmt: LiteralString = """
     SELECT * FROM professions
 """
@@ -184,6 +332,10 @@ get_company_stmt: LiteralString = """
     SELECT * FROM companies WHERE id = %(id)s
 """
 
+get_companies_by_ids_stmt: LiteralString = """
+    SELECT * FROM companies WHERE id = ANY(%(ids)s)
+"""
+
 get_companies_stmt: LiteralString = """
     SELECT * FROM companies
 """
@@ -264,3 +416,89 @@ delete_user_company_link_stmt: LiteralString = """
 """
 
 # endregion
+
+# region Lookup cache
+
+listen_lookup_changes_stmt: LiteralString = """
+    LISTEN lookup_changed
+"""
+
+# endregion
+
+# region Replica
+
+# replay lag of a standby in seconds, 0 once it has replayed all WAL it received
+# (an idle primary doesn't advance pg_last_xact_replay_timestamp)
+get_replica_lag_stmt: LiteralString = """
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END::float
+"""
+
+get_current_lsn_stmt: LiteralString = """
+    SELECT pg_current_wal_lsn()::text
+"""
+
+has_replayed_lsn_stmt: LiteralString = """
+    SELECT pg_last_wal_replay_lsn() >= %(lsn)s::pg_lsn
+"""
+
+# endregion
+
+# region Deadlines
+
+# SET LOCAL with parameters, session-wide (is_local false) on connections in autocommit mode
+set_timeouts_stmt: LiteralString = """
+    SELECT set_config('statement_timeout', %(statement_timeout)s, %(is_local)s),
+           set_config('lock_timeout', %(lock_timeout)s, %(is_local)s)
+"""
+
+# RESET of both settings as a single (preparable) statement
+reset_timeouts_stmt: LiteralString = """
+    SELECT set_config(name, reset_val, false)
+    FROM pg_settings
+    WHERE name IN ('statement_timeout', 'lock_timeout')
+"""
+
+# endregion
+
+# region Slow queries
+
+# first statement of the transaction running an EXPLAIN ANALYZE (common.slow_queries)
+set_transaction_read_only_stmt: LiteralString = """
+    SET TRANSACTION READ ONLY
+"""
+
+# endregion
+
+# region Index advisor
+
+# the most expensive statements of this database (needs the pg_stat_statements extension)
+get_statement_stats_stmt: LiteralString = """
+    SELECT query, calls, total_exec_time, mean_exec_time, rows
+    FROM pg_stat_statements
+    WHERE dbid = (SELECT oid FROM pg_database WHERE datname = current_database())
+    ORDER BY total_exec_time DESC
+    LIMIT %(limit)s
+"""
+
+get_table_scans_stmt: LiteralString = """
+    SELECT relname, seq_scan, seq_tup_read, COALESCE(idx_scan, 0), n_live_tup
+    FROM pg_stat_user_tables
+"""
+
+get_index_usage_stmt: LiteralString = """
+    SELECT s.relname, s.indexrelname, s.idx_scan, pg_relation_size(s.indexrelid),
+           i.indisunique,
+           EXISTS (
+               SELECT 1 FROM pg_constraint c
+               WHERE c.contype = 'f' AND c.conrelid = i.indrelid
+                 AND c.conkey[1] = i.indkey[0]
+           ),
+           pg_get_indexdef(s.indexrelid)
+    FROM pg_stat_user_indexes s
+    JOIN pg_index i ON i.indexrelid = s.indexrelid
+"""
+
+# endregion
@@ -0,0 +1,138 @@
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from psycopg import AsyncConnection
+from psycopg.abc import Query
+
+from app_psycopg.api.pagination import create_paginate_query, create_total_count_query
+from app_psycopg.api.sorting import create_order_by_query
+from app_psycopg.db import db_statements
+from common.index_advisor import normalize_statement
+from common.settings import PreparePolicy
+from common.sorting import Direction, OrderByField
+
+# upper bound for the list statement variants kept per process and prepared per connection
+MAX_PREPARED_STATEMENTS: int = 256
+
+OrderByKey = Tuple[Tuple[str, Direction], ...]
+
+# statements are module constants, their ids identify them without hashing the SQL
+STATEMENT_NAMES: Dict[int, str] = {
+    id(value): name
+    for name, value in vars(db_statements).items()
+    if name.endswith("_stmt")
+}
+
+# statements built elsewhere (e.g. by a route)
+UNNAMED_STATEMENT: str = "unnamed"
+
+# the normalized SQL of each statement, to recognize them in pg_stat_statements
+STATEMENT_TEXTS: Dict[str, str] = {
+    name: normalize_statement(value)
+    for name, value in vars(db_statements).items()
+    if name.endswith("_stmt")
+}
+
+
+def get_prepare_threshold(policy: PreparePolicy) -> Optional[int]:
+    """
+    Maps a PreparePolicy to psycopg's `prepare_threshold` connection parameter.
+
+    Args:
+        policy (PreparePolicy): The prepared statement policy of the pool.
+
+    Returns:
+        Optional[int]: The number of executions before preparing, None to never prepare.
+    """
+
+    return {
+        PreparePolicy.AUTO: 5,
+        PreparePolicy.EAGER: 0,
+        PreparePolicy.DISABLED: None,
+    }[policy]
+
+
+async def configure_prepared_statements(conn: AsyncConnection) -> None:
+    """
+    Pool `configure` callback: keeps every registered list statement prepared.
+
+    Args:
+        conn (AsyncConnection): The new connection of the pool.
+    """
+
+    conn.prepared_max = MAX_PREPARED_STATEMENTS
+
+
+def _get_order_by_key(order_by: Optional[List[OrderByField]]) -> OrderByKey:
+    return tuple((field.name, field.direction) for field in order_by or [])
+
+
+def _build_list_stmt(
+    stmt: Query, order_by_key: OrderByKey, paginate: bool, total_count: bool
+) -> Query:
+    if total_count:
+        stmt: Query = create_total_count_query(query=stmt)
+
+    if order_by_key:
+        stmt: Query = create_order_by_query(
+            query=stmt,
+            order_by_fields=[
+                OrderByField(name=name, direction=direction)
+                for name, direction in order_by_key
+            ],
+        )
+
+    if paginate:
+        stmt: Query = create_paginate_query(query=stmt)
+
+    return stmt
+
+
+# order_by fields come from the *_sortable_fields enums, so the variants are bounded
+_cached_build_list_stmt = lru_cache(maxsize=MAX_PREPARED_STATEMENTS)(_build_list_stmt)
+
+
+def get_list_stmt(
+    stmt: Query,
+    order_by: Optional[List[OrderByField]] = None,
+    paginate: bool = True,
+    total_count: bool = False,
+) -> Query:
+    """
+    Returns the list variant of a statement from `db_statements`.
+
+    The variants are built once and then reused, so that the same list request always
+    sends the same statement text, which psycopg prepares after `prepare_threshold`
+    executions. LIMIT and OFFSET are bound as the `limit` and `offset` parameters.
+
+    Args:
+        stmt (Query): The base statement (str, bytes, or psycopg.sql object).
+        order_by (Optional[List[OrderByField]]): A list of fields to order by.
+        paginate (bool): Whether to append LIMIT and OFFSET placeholders.
+        total_count (bool): Whether to add the `total_count` window column.
+
+    Returns:
+        Query: The list statement.
+    """
+
+    order_by_key: OrderByKey = _get_order_by_key(order_by)
+
+    if not isinstance(stmt, (str, bytes)):
+        # psycopg.sql objects are not hashable
+        return _build_list_stmt(stmt, order_by_key, paginate, total_count)
+
+    return _cached_build_list_stmt(stmt, order_by_key, paginate, total_count)
+
+
+def get_statement_name(stmt: Query) -> str:
+    """
+    Returns the name of a statement for the metrics (common.metrics).
+
+    Args:
+        stmt (Query): A statement of `db_statements`, before it is varied by get_list_stmt.
+
+    Returns:
+        str: The variable name in `db_statements`, e.g. "get_users_stmt".
+    """
+
+    return STATEMENT_NAMES.get(id(stmt), UNNAMED_STATEMENT)
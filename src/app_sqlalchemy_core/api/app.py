@@ -1,6 +1,8 @@
 import os
 
 from fastapi import FastAPI
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeout
 
 
 from app_sqlalchemy_core.api.routes import users, professions, companies
@@ -8,16 +10,41 @@ from app_sqlalchemy_core.api.routes import orders
 from app_sqlalchemy_core.api.routes import documents
 
 from app_sqlalchemy_core.api.routes import user_company_links
+from app_sqlalchemy_core.api.routes import admin
 
+from common.sqlalchemy.integrity import integrity_error_handler
+from common.deadlines import DeadlineExceeded, deadline_exceeded_handler
+from common.sqlalchemy.deadlines import operational_error_handler, pool_timeout_handler
 from common.sqlalchemy.lifespan import lifespan
+from common.db_cost import DatabaseCostMiddleware
+from common.disconnect import DisconnectMiddleware
+from common import metrics
+from common.metrics import MetricsMiddleware
+from common.replica import ReadYourWritesMiddleware
+from common.slow_queries import SlowQueryMiddleware
 
 app: FastAPI = FastAPI(lifespan=lifespan)
+# innermost: the statement hooks find the route of a request in its scope
+app.add_middleware(SlowQueryMiddleware)
+# sees the response before ReadYourWritesMiddleware holds back writes
+app.add_middleware(DisconnectMiddleware)
+app.add_middleware(ReadYourWritesMiddleware)
+# sees the response of a write after its commit (ReadYourWritesMiddleware holds it back)
+app.add_middleware(DatabaseCostMiddleware)
+# outermost: the latency includes every other middleware
+app.add_middleware(MetricsMiddleware)
+app.add_exception_handler(DeadlineExceeded, deadline_exceeded_handler)
+app.add_exception_handler(PoolTimeout, pool_timeout_handler)
+app.add_exception_handler(OperationalError, operational_error_handler)
+app.add_exception_handler(IntegrityError, integrity_error_handler)
 app.include_router(router=users.router)
 app.include_router(router=orders.router)
 app.include_router(router=documents.router)
 app.include_router(router=professions.router)
 app.include_router(router=companies.router)
 app.include_router(router=user_company_links.router)
+app.include_router(router=admin.router)
+app.include_router(router=metrics.router)
 
 if __name__ == "__main__":  # pragma: no cover
     import uvicorn
@@ -6,6 +6,7 @@ from sqlalchemy import select, Result, Select
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
+from app_sqlalchemy_core.db.identity_map import get_identity
 from app_sqlalchemy_core.db.models import companies
 from common.schemas import (
     CompanyInput,
@@ -23,10 +24,14 @@ async def validate_company_id(
     session: Annotated[AsyncSession, Depends(get_db_session)],
     company_id: UUID4,
 ) -> Company:
-    stmt: Select = select(companies).where(companies.c.id == company_id)  # type: ignore[arg-type]
-    result: Result = await session.execute(statement=stmt)
-
-    company: dict | None = result.mappings().one_or_none()
+    async def get_company() -> dict | None:
+        stmt: Select = select(companies).where(companies.c.id == company_id)  # type: ignore[arg-type]
+        result: Result = await session.execute(statement=stmt)
+        return result.mappings().one_or_none()
+
+    company: dict | None = await get_identity(
+        session, companies.name, company_id, get_company
+    )
 
     if company is None:
         raise HTTPException(
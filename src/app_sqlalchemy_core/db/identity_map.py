@@ -0,0 +1,44 @@
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session
+
+# Core statements bypass the identity map of the ORM session, rows looked up by id
+# are kept in `session.info` instead (a session lives as long as its request)
+IDENTITY_MAP_KEY: str = "identity_map"
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _clear_on_write(orm_execute_state: ORMExecuteState) -> None:
+    # INSERT, UPDATE and DELETE may change any of the remembered rows
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info.pop(IDENTITY_MAP_KEY, None)
+
+
+async def get_identity(
+    session: AsyncSession,
+    table: str,
+    id: Any,
+    get: Callable[[], Awaitable[Any]],
+) -> Any:
+    """
+    Returns the row of a table read earlier in this session, reads it with `get` otherwise.
+
+    Args:
+        session (AsyncSession): The request's session.
+        table (str): The table name.
+        id (Any): The primary key.
+        get (Callable[[], Awaitable[Any]]): Reads the row (None if it doesn't exist).
+
+    Returns:
+        Any: The row or None, a missing row is remembered too.
+    """
+
+    identity_map: Dict[Tuple[str, str], Any] = session.info.setdefault(
+        IDENTITY_MAP_KEY, {}
+    )
+    key: Tuple[str, str] = (table, str(id))
+    if key not in identity_map:
+        identity_map[key] = await get()
+    return identity_map[key]
@@ -0,0 +1,29 @@
+from typing import Annotated, List
+
+from fastapi import APIRouter, Depends, status
+
+from common.pool_metrics import PoolMetrics, PoolMonitor, get_pool_monitor
+from common.slow_queries import SlowQueryLog, StatementPlans, get_slow_query_log
+
+router: APIRouter = APIRouter(
+    tags=["Admin"],
+    prefix="/admin",
+)
+
+
+@router.get(path="/pool", response_model=PoolMetrics, status_code=status.HTTP_200_OK)
+async def get_pool_metrics(
+    pool_monitor: Annotated[PoolMonitor, Depends(get_pool_monitor)],
+) -> PoolMetrics:
+    return pool_monitor.get_metrics()
+
+
+@router.get(
+    path="/slow-queries",
+    response_model=List[StatementPlans],
+    status_code=status.HTTP_200_OK,
+)
+async def get_slow_queries(
+    slow_query_log: Annotated[SlowQueryLog, Depends(get_slow_query_log)],
+) -> List[StatementPlans]:
+    return slow_query_log.get_plans()
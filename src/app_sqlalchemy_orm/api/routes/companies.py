@@ -1,8 +1,8 @@
-from typing import Annotated, Sequence, Any
+from typing import Annotated, Sequence, Any, List, Optional
 
-from fastapi import APIRouter, Depends, status, Query
+from fastapi import APIRouter, Depends, status, Query, Request, Response
 from pydantic import UUID4
-from sqlalchemy import select, func, Select, Result, Row, RowMapping
+from sqlalchemy import select, Select, Result, Row, RowMapping
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app_sqlalchemy_orm.api.dependencies.companies import (
@@ -11,7 +11,24 @@ from app_sqlalchemy_orm.api.dependencies.companies import (
     validate_company_update,
     validate_company_patch,
 )
+from common.trusted_rows import TrustedJSONResponse, create_trusted_row
+from common.http_cache import (
+    LOOKUP_CACHE_CONTROL,
+    CacheValidators,
+    add_cache_headers,
+    create_not_modified_response,
+    create_list_response,
+    get_resource_validators,
+    is_not_modified,
+)
 from common.order_by_enums import OrderByCompany
+from common.batch import (
+    BatchResult,
+    BatchParams,
+    get_batch_params,
+    create_batch_result,
+)
+from common.sorting import OrderByField
 from common.schemas import (
     CompanyInput,
     CompanyUpdate,
@@ -21,9 +38,21 @@ from common.schemas import Company as CompanyResponseModel
 
 
 from app_sqlalchemy_orm.db.models import Company
-from common.pagination import LimitOffsetPage, PaginationParams
+from common.pagination import (
+    LimitOffsetPage,
+    PaginationParams,
+    CursorPage,
+    CursorPaginationParams,
+    decode_cursor,
+    create_cursor_page,
+)
 from common.sqlalchemy.dependencies import get_db_session
-from common.sqlalchemy.pagination import create_paginate_query
+from common.sqlalchemy.batch import create_batch_query
+from common.sqlalchemy.pagination import (
+    create_paginate_query,
+    create_keyset_query,
+    get_total_count,
+)
 from common.sqlalchemy.sorting import create_order_by_query
 
 router: APIRouter = APIRouter(
@@ -46,15 +75,91 @@ async def create_company(
     return company.id
 
 
+@router.get(
+    path=":batch",
+    response_model=BatchResult[CompanyResponseModel],
+    status_code=status.HTTP_200_OK,
+)
+async def get_companies_batch(
+    db_session: Annotated[AsyncSession, Depends(get_db_session)],
+    batch: Annotated[BatchParams, Depends(get_batch_params)],
+) -> TrustedJSONResponse:
+    query: Select = create_batch_query(
+        query=select(Company), ids=batch.ids, model=Company
+    )
+
+    result: Result = await db_session.execute(query)
+
+    companies: Sequence[Any] = result.scalars().all()
+
+    return TrustedJSONResponse(
+        create_batch_result(
+            ids=batch.ids,
+            items=[
+                create_trusted_row(CompanyResponseModel, company)
+                for company in companies
+            ],
+        )
+    )
+
+
+@router.get(
+    path="/cursor",
+    response_model=CursorPage[CompanyResponseModel],
+    status_code=status.HTTP_200_OK,
+)
+async def get_companies_by_cursor(
+    db_session: Annotated[AsyncSession, Depends(get_db_session)],
+    pagination: Annotated[CursorPaginationParams, Depends()],
+    order_by: Annotated[OrderByCompany, Query()] = None,
+) -> TrustedJSONResponse:
+    order_by_fields: List[OrderByField] = order_by or []
+    cursor_values: List[Any] | None = decode_cursor(
+        cursor=pagination.cursor, order_by_fields=order_by_fields
+    )
+
+    # fetch one extra row to find out whether there is a next page
+    query: Select = create_keyset_query(
+        query=select(Company),
+        order_by_fields=order_by_fields,
+        cursor_values=cursor_values,
+        limit=pagination.limit + 1,
+        model=Company,
+    )
+
+    result: Result = await db_session.execute(query)
+
+    companies: Sequence[Any] = result.scalars().all()
+
+    return TrustedJSONResponse(
+        create_cursor_page(
+            items=[
+                create_trusted_row(CompanyResponseModel, company)
+                for company in companies
+            ],
+            limit=pagination.limit,
+            order_by_fields=order_by_fields,
+        )
+    )
+
+
 @router.get(
     path="/{company_id}",
     response_model=CompanyResponseModel,
     status_code=status.HTTP_200_OK,
 )
 async def get_company(
+    request: Request,
     company: Annotated[Company, Depends(validate_company_id)],
-) -> Company:
-    return company
+) -> Response:
+    validators: CacheValidators = get_resource_validators(company)
+    if is_not_modified(request, validators):
+        return create_not_modified_response(validators, LOOKUP_CACHE_CONTROL)
+    return add_cache_headers(
+        TrustedJSONResponse(create_trusted_row(CompanyResponseModel, company)),
+        validators,
+        LOOKUP_CACHE_CONTROL,
+    )
 
 
 @router.get(
@@ -63,10 +168,11 @@ async def get_company(
     status_code=status.HTTP_200_OK,
 )
 async def get_companies(
+    request: Request,
     db_session: Annotated[AsyncSession, Depends(get_db_session)],
     pagination: Annotated[PaginationParams, Depends()],
     order_by: Annotated[OrderByCompany, Query()] = None,
-) -> LimitOffsetPage[CompanyResponseModel]:
+) -> Response:
     query: Select = create_paginate_query(
         query=select(Company), limit=pagination.limit, offset=pagination.offset
     )
@@ -80,17 +186,28 @@ async def get_companies(
 
     companies: Sequence[Row | RowMapping | Any] = result.scalars().all()
 
-    # Get total count
-    count_query: Select = select(func.count()).select_from(Company)
-    result: Result = await db_session.execute(count_query)
-    total: int = result.scalar()
-
-    return LimitOffsetPage(
-        items=companies,
-        items_count=len(companies),
-        total_count=total,
-        limit=pagination.limit,
-        offset=pagination.offset,
+    total_count: Optional[int] = await get_total_count(
+        session=db_session,
+        query=query,
+        count=pagination.count,
+        min_count=pagination.offset + len(companies),
+    )
+
+    return create_list_response(
+        request,
+        TrustedJSONResponse(
+            LimitOffsetPage(
+                items=[
+                    create_trusted_row(CompanyResponseModel, company)
+                    for company in companies
+                ],
+                items_count=len(companies),
+                total_count=total_count,
+                limit=pagination.limit,
+                offset=pagination.offset,
+            )
+        ),
+        LOOKUP_CACHE_CONTROL,
     )
 
 
@@ -1,6 +1,6 @@
 from typing import Annotated, List, Any
 
-from fastapi import APIRouter, Depends, status, Query
+from fastapi import APIRouter, Depends, status, Query, Request, Response
 from sqlalchemy import Select, Result, Sequence, Row, RowMapping
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
@@ -10,7 +10,24 @@ from app_sqlalchemy_orm.api.dependencies.documents import (
     validate_document_id,
     validate_document_update,
 )
+from common.trusted_rows import TrustedJSONResponse, create_trusted_row
+from common.http_cache import (
+    RESOURCE_CACHE_CONTROL,
+    CacheValidators,
+    add_cache_headers,
+    create_not_modified_response,
+    create_list_response,
+    get_resource_validators,
+    is_not_modified,
+)
 from common.order_by_enums import OrderByDocument
+from common.batch import (
+    BatchResult,
+    BatchParams,
+    get_batch_params,
+    create_batch_result,
+)
+from common.sorting import OrderByField
 from common.schemas import Document as DocumentResponseModel
 from common.schemas import (
     DocumentInput,
@@ -18,9 +35,16 @@ from common.schemas import (
 )
 
 from app_sqlalchemy_orm.db.models import Document
-from common.pagination import PaginationParams
+from common.pagination import (
+    PaginationParams,
+    CursorPage,
+    CursorPaginationParams,
+    decode_cursor,
+    create_cursor_page,
+)
 from common.sqlalchemy.dependencies import get_db_session
-from common.sqlalchemy.pagination import create_paginate_query
+from common.sqlalchemy.batch import create_batch_query
+from common.sqlalchemy.pagination import create_paginate_query, create_keyset_query
 from common.sqlalchemy.sorting import create_order_by_query
 
 router: APIRouter = APIRouter(
@@ -45,25 +69,102 @@ async def create_document(
     return new_document.id
 
 
+@router.get(
+    path=":batch",
+    response_model=BatchResult[DocumentResponseModel],
+    status_code=status.HTTP_200_OK,
+)
+async def get_documents_batch(
+    db_session: Annotated[AsyncSession, Depends(get_db_session)],
+    batch: Annotated[BatchParams, Depends(get_batch_params)],
+) -> TrustedJSONResponse:
+    query: Select = create_batch_query(
+        query=select(Document), ids=batch.ids, model=Document
+    )
+
+    result: Result = await db_session.execute(query)
+
+    documents: Sequence[Any] = result.scalars().all()
+
+    return TrustedJSONResponse(
+        create_batch_result(
+            ids=batch.ids,
+            items=[
+                create_trusted_row(DocumentResponseModel, document)
+                for document in documents
+            ],
+        )
+    )
+
+
+@router.get(
+    path="/cursor",
+    response_model=CursorPage[DocumentResponseModel],
+    status_code=status.HTTP_200_OK,
+)
+async def get_documents_by_cursor(
+    db_session: Annotated[AsyncSession, Depends(get_db_session)],
+    pagination: Annotated[CursorPaginationParams, Depends()],
+    order_by: Annotated[OrderByDocument, Query()] = None,
+) -> TrustedJSONResponse:
+    order_by_fields: List[OrderByField] = order_by or []
+    cursor_values: List[Any] | None = decode_cursor(
+        cursor=pagination.cursor, order_by_fields=order_by_fields
+    )
+
+    # fetch one extra row to find out whether there is a next page
+    query: Select = create_keyset_query(
+        query=select(Document),
+        order_by_fields=order_by_fields,
+        cursor_values=cursor_values,
+        limit=pagination.limit + 1,
+        model=Document,
+    )
+
+    result: Result = await db_session.execute(query)
+
+    documents: Sequence[Any] = result.scalars().all()
+
+    return TrustedJSONResponse(
+        create_cursor_page(
+            items=[
+                create_trusted_row(DocumentResponseModel, document)
+                for document in documents
+            ],
+            limit=pagination.limit,
+            order_by_fields=order_by_fields,
+        )
+    )
+
+
 @router.get(
     path="/{document_id}",
     response_model=DocumentResponseModel,
     status_code=status.HTTP_200_OK,
 )
 async def get_document(
+    request: Request,
     document: Annotated[Document, Depends(validate_document_id)],
-) -> DocumentResponseModel:
-    return DocumentResponseModel.model_validate(document)
+) -> Response:
+    validators: CacheValidators = get_resource_validators(document)
+    if is_not_modified(request, validators):
+        return create_not_modified_response(validators, RESOURCE_CACHE_CONTROL)
+    return add_cache_headers(
+        TrustedJSONResponse(create_trusted_row(DocumentResponseModel, document)),
+        validators,
+        RESOURCE_CACHE_CONTROL,
+    )
 
 
 @router.get(
     path="", response_model=List[DocumentResponseModel], status_code=status.HTTP_200_OK
 )
 async def get_documents(
+    request: Request,
     db_session: Annotated[AsyncSession, Depends(get_db_session)],
     pagination: Annotated[PaginationParams, Depends()],
     order_by: Annotated[OrderByDocument, Query()] = None,
-) -> List[DocumentResponseModel]:
+) -> Response:
     query: Select = create_paginate_query(
         query=select(Document), limit=pagination.limit, offset=pagination.offset
     )
@@ -77,7 +178,16 @@ async def get_documents(
 
     documents: Sequence[Row | RowMapping | Any] = result.scalars().all()
 
-    return [DocumentResponseModel.model_validate(document) for document in documents]
+    return create_list_response(
+        request,
+        TrustedJSONResponse(
+            [
+                create_trusted_row(DocumentResponseModel, document)
+                for document in documents
+            ]
+        ),
+        RESOURCE_CACHE_CONTROL,
+    )
 
 
 @router.put(path="/{document_id}", response_model=str, status_code=status.HTTP_200_OK)
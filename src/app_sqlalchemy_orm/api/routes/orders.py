@@ -1,20 +1,49 @@
-from typing import Annotated, Sequence, Any
+from typing import Annotated, Sequence, Any, List, Optional
 
-from fastapi import APIRouter, Depends, status, Query
-from sqlalchemy import select, func, Select, Result, Row, RowMapping
+from fastapi import APIRouter, Depends, status, Query, Request, Response
+from sqlalchemy import select, Select, Result, Row, RowMapping
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app_sqlalchemy_orm.api.dependencies.orders import (
     validate_order_input,
     validate_order_id,
 )
+from common.trusted_rows import TrustedJSONResponse, create_trusted_row
+from common.http_cache import (
+    RESOURCE_CACHE_CONTROL,
+    CacheValidators,
+    add_cache_headers,
+    create_not_modified_response,
+    create_list_response,
+    get_resource_validators,
+    is_not_modified,
+)
 from common.order_by_enums import OrderByOrder
+from common.batch import (
+    BatchResult,
+    BatchParams,
+    get_batch_params,
+    create_batch_result,
+)
+from common.sorting import OrderByField
 
 from common.schemas import OrderInputValidated
 from common.schemas import Order as OrderResponseModel
-from common.pagination import LimitOffsetPage, PaginationParams
+from common.pagination import (
+    LimitOffsetPage,
+    PaginationParams,
+    CursorPage,
+    CursorPaginationParams,
+    decode_cursor,
+    create_cursor_page,
+)
 from common.sqlalchemy.dependencies import get_db_session
-from common.sqlalchemy.pagination import create_paginate_query
+from common.sqlalchemy.batch import create_batch_query
+from common.sqlalchemy.pagination import (
+    create_paginate_query,
+    create_keyset_query,
+    get_total_count,
+)
 
 from app_sqlalchemy_orm.db.models import Order
 from common.sqlalchemy.sorting import create_order_by_query
@@ -46,15 +75,83 @@ async def create_order(
     return OrderResponseModel.model_validate(new_order)
 
 
+@router.get(
+    path=":batch",
+    response_model=BatchResult[OrderResponseModel],
+    status_code=status.HTTP_200_OK,
+)
+async def get_orders_batch(
+    db_session: Annotated[AsyncSession, Depends(get_db_session)],
+    batch: Annotated[BatchParams, Depends(get_batch_params)],
+) -> TrustedJSONResponse:
+    query: Select = create_batch_query(query=select(Order), ids=batch.ids, model=Order)
+
+    result: Result = await db_session.execute(query)
+
+    orders: Sequence[Any] = result.scalars().all()
+
+    return TrustedJSONResponse(
+        create_batch_result(
+            ids=batch.ids,
+            items=[create_trusted_row(OrderResponseModel, order) for order in orders],
+        )
+    )
+
+
+@router.get(
+    path="/cursor",
+    response_model=CursorPage[OrderResponseModel],
+    status_code=status.HTTP_200_OK,
+)
+async def get_orders_by_cursor(
+    db_session: Annotated[AsyncSession, Depends(get_db_session)],
+    pagination: Annotated[CursorPaginationParams, Depends()],
+    order_by: Annotated[OrderByOrder, Query()] = None,
+) -> TrustedJSONResponse:
+    order_by_fields: List[OrderByField] = order_by or []
+    cursor_values: List[Any] | None = decode_cursor(
+        cursor=pagination.cursor, order_by_fields=order_by_fields
+    )
+
+    # fetch one extra row to find out whether there is a next page
+    query: Select = create_keyset_query(
+        query=select(Order),
+        order_by_fields=order_by_fields,
+        cursor_values=cursor_values,
+        limit=pagination.limit + 1,
+        model=Order,
+    )
+
+    result: Result = await db_session.execute(query)
+
+    orders: Sequence[Any] = result.scalars().all()
+
+    return TrustedJSONResponse(
+        create_cursor_page(
+            items=[create_trusted_row(OrderResponseModel, order) for order in orders],
+            limit=pagination.limit,
+            order_by_fields=order_by_fields,
+        )
+    )
+
+
 @router.get(
     path="/{order_id}",
     response_model=OrderResponseModel,
     status_code=status.HTTP_200_OK,
 )
 async def get_order(
+    request: Request,
     order: Annotated[Order, Depends(validate_order_id)],
-) -> OrderResponseModel:
-    return OrderResponseModel.model_validate(order)
+) -> Response:
+    validators: CacheValidators = get_resource_validators(order, "payer", "payee")
+    if is_not_modified(request, validators):
+        return create_not_modified_response(validators, RESOURCE_CACHE_CONTROL)
+    return add_cache_headers(
+        TrustedJSONResponse(create_trusted_row(OrderResponseModel, order)),
+        validators,
+        RESOURCE_CACHE_CONTROL,
+    )
 
 
 @router.get(
@@ -63,10 +160,11 @@ async def get_order(
     status_code=status.HTTP_200_OK,
 )
 async def get_orders(
+    request: Request,
     db_session: Annotated[AsyncSession, Depends(get_db_session)],
     pagination: Annotated[PaginationParams, Depends()],
     order_by: Annotated[OrderByOrder, Query()] = None,
-) -> LimitOffsetPage[OrderResponseModel]:
+) -> Response:
     query: Select = create_paginate_query(
         query=select(Order), limit=pagination.limit, offset=pagination.offset
     )
@@ -80,17 +178,27 @@ async def get_orders(
 
     orders: Sequence[Row | RowMapping | Any] = result.scalars().all()
 
-    # Get total count
-    count_query = select(func.count()).select_from(Order)
-    result = await db_session.execute(count_query)
-    total = result.scalar()
-
-    return LimitOffsetPage(
-        items=orders,
-        items_count=len(orders),
-        total_count=total,
-        limit=pagination.limit,
-        offset=pagination.offset,
+    total_count: Optional[int] = await get_total_count(
+        session=db_session,
+        query=query,
+        count=pagination.count,
+        min_count=pagination.offset + len(orders),
+    )
+
+    return create_list_response(
+        request,
+        TrustedJSONResponse(
+            LimitOffsetPage(
+                items=[
+                    create_trusted_row(OrderResponseModel, order) for order in orders
+                ],
+                items_count=len(orders),
+                total_count=total_count,
+                limit=pagination.limit,
+                offset=pagination.offset,
+            )
+        ),
+        RESOURCE_CACHE_CONTROL,
     )
 
 
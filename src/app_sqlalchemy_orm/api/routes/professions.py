@@ -1,7 +1,7 @@
-from typing import Annotated, Sequence, Any
+from typing import Annotated, Sequence, Any, List, Optional
 
-from fastapi import APIRouter, Depends, status, Query
-from sqlalchemy import select, func, Select, Result, Row, RowMapping
+from fastapi import APIRouter, Depends, status, Query, Request, Response
+from sqlalchemy import select, Select, Result, Row, RowMapping
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app_sqlalchemy_orm.api.dependencies.professions import (
@@ -9,7 +9,24 @@ from app_sqlalchemy_orm.api.dependencies.professions import (
     validate_profession_id,
     validate_profession_update,
 )
+from common.trusted_rows import TrustedJSONResponse, create_trusted_row
+from common.http_cache import (
+    LOOKUP_CACHE_CONTROL,
+    CacheValidators,
+    add_cache_headers,
+    create_not_modified_response,
+    create_list_response,
+    get_resource_validators,
+    is_not_modified,
+)
 from common.order_by_enums import OrderByProfession
+from common.batch import (
+    BatchResult,
+    BatchParams,
+    get_batch_params,
+    create_batch_result,
+)
+from common.sorting import OrderByField
 
 from common.schemas import (
     ProfessionInput,
@@ -17,9 +34,21 @@ from common.schemas import (
 )
 from common.schemas import Profession as ProfessionResponseModel
 
-from common.pagination import LimitOffsetPage, PaginationParams
+from common.pagination import (
+    LimitOffsetPage,
+    PaginationParams,
+    CursorPage,
+    CursorPaginationParams,
+    decode_cursor,
+    create_cursor_page,
+)
 from common.sqlalchemy.dependencies import get_db_session
-from common.sqlalchemy.pagination import create_paginate_query
+from common.sqlalchemy.batch import create_batch_query
+from common.sqlalchemy.pagination import (
+    create_paginate_query,
+    create_keyset_query,
+    get_total_count,
+)
 
 from app_sqlalchemy_orm.db.models import Profession
 from common.sqlalchemy.sorting import create_order_by_query
@@ -44,15 +73,91 @@ async def create_profession(
     return profession.id
 
 
+@router.get(
+    path=":batch",
+    response_model=BatchResult[ProfessionResponseModel],
+    status_code=status.HTTP_200_OK,
+)
+async def get_professions_batch(
+    db_session: Annotated[AsyncSession, Depends(get_db_session)],
+    batch: Annotated[BatchParams, Depends(get_batch_params)],
+) -> TrustedJSONResponse:
+    query: Select = create_batch_query(
+        query=select(Profession), ids=batch.ids, model=Profession
+    )
+
+    result: Result = await db_session.execute(query)
+
+    professions: Sequence[Any] = result.scalars().all()
+
+    return TrustedJSONResponse(
+        create_batch_result(
+            ids=batch.ids,
+            items=[
+                create_trusted_row(ProfessionResponseModel, profession)
+                for profession in professions
+            ],
+        )
+    )
+
+
+@router.get(
+    path="/cursor",
+    response_model=CursorPage[ProfessionResponseModel],
+    status_code=status.HTTP_200_OK,
+)
+async def get_professions_by_cursor(
+    db_session: Annotated[AsyncSession, Depends(get_db_session)],
+    pagination: Annotated[CursorPaginationParams, Depends()],
+    order_by: Annotated[OrderByProfession, Query()] = None,
+) -> TrustedJSONResponse:
+    order_by_fields: List[OrderByField] = order_by or []
+    cursor_values: List[Any] | None = decode_cursor(
+        cursor=pagination.cursor, order_by_fields=order_by_fields
+    )
+
+    # fetch one extra row to find out whether there is a next page
+    query: Select = create_keyset_query(
+        query=select(Profession),
+        order_by_fields=order_by_fields,
+        cursor_values=cursor_values,
+        limit=pagination.limit + 1,
+        model=Profession,
+    )
+
+    result: Result = await db_session.execute(query)
+
+    professions: Sequence[Any] = result.scalars().all()
+
+    return TrustedJSONResponse(
+        create_cursor_page(
+            items=[
+                create_trusted_row(ProfessionResponseModel, profession)
+                for profession in professions
+            ],
+            limit=pagination.limit,
+            order_by_fields=order_by_fields,
+        )
+    )
+
+
 @router.get(
     path="/{profession_id}",
     response_model=ProfessionResponseModel,
     status_code=status.HTTP_200_OK,
 )
 async def get_profession(
+    request: Request,
     profession: Annotated[Profession, Depends(validate_profession_id)],
-) -> Profession:
-    return profession
+) -> Response:
+    validators: CacheValidators = get_resource_validators(profession)
+    if is_not_modified(request, validators):
+        return create_not_modified_response(validators, LOOKUP_CACHE_CONTROL)
+    return add_cache_headers(
+        TrustedJSONResponse(create_trusted_row(ProfessionResponseModel, profession)),
+        validators,
+        LOOKUP_CACHE_CONTROL,
+    )
 
 
 @router.get(
@@ -61,10 +166,11 @@ async def get_profession(
     status_code=status.HTTP_200_OK,
 )
 async def get_professions(
+    request: Request,
     db_session: Annotated[AsyncSession, Depends(get_db_session)],
     pagination: Annotated[PaginationParams, Depends()],
     order_by: Annotated[OrderByProfession, Query()] = None,
-) -> LimitOffsetPage[ProfessionResponseModel]:
+) -> Response:
     query: Select = create_paginate_query(
         query=select(Profession), limit=pagination.limit, offset=pagination.offset
     )
@@ -78,17 +184,28 @@ async def get_professions(
 
     professions: Sequence[Row | RowMapping | Any] = result.scalars().all()
 
-    # Get total count
-    count_query = select(func.count()).select_from(Profession)
-    result = await db_session.execute(count_query)
-    total = result.scalar()
-
-    return LimitOffsetPage(
-        items=professions,
-        items_count=len(professions),
-        total_count=total,
-        limit=pagination.limit,
-        offset=pagination.offset,
+    total_count: Optional[int] = await get_total_count(
+        session=db_session,
+        query=query,
+        count=pagination.count,
+        min_count=pagination.offset + len(professions),
+    )
+
+    return create_list_response(
+        request,
+        TrustedJSONResponse(
+            LimitOffsetPage(
+                items=[
+                    create_trusted_row(ProfessionResponseModel, profession)
+                    for profession in professions
+                ],
+                items_count=len(professions),
+                total_count=total_count,
+                limit=pagination.limit,
+                offset=pagination.offset,
+            )
+        ),
+        LOOKUP_CACHE_CONTROL,
     )
 
 
@@ -1,17 +1,46 @@
-from typing import Annotated, Any
+from typing import Annotated, Any, List, Optional
 
-from fastapi import APIRouter, Body, Depends, status, Query
-from sqlalchemy import Select, Result, Sequence, func
+from fastapi import APIRouter, Body, Depends, status, Query, Request, Response
+from sqlalchemy import Select, Result, Sequence
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from app_sqlalchemy_orm.api.dependencies.users import validate_user_id
+from common.trusted_rows import TrustedJSONResponse, create_trusted_row
+from common.http_cache import (
+    RESOURCE_CACHE_CONTROL,
+    CacheValidators,
+    add_cache_headers,
+    create_not_modified_response,
+    create_list_response,
+    get_resource_validators,
+    is_not_modified,
+)
 from common.order_by_enums import OrderByUser
+from common.batch import (
+    BatchResult,
+    BatchParams,
+    get_batch_params,
+    create_batch_result,
+)
+from common.sorting import OrderByField
 from common.schemas import User as UserResponseModel
 from common.schemas import UserInput, UserUpdate
-from common.pagination import LimitOffsetPage, PaginationParams
+from common.pagination import (
+    LimitOffsetPage,
+    PaginationParams,
+    CursorPage,
+    CursorPaginationParams,
+    decode_cursor,
+    create_cursor_page,
+)
 from common.sqlalchemy.dependencies import get_db_session
-from common.sqlalchemy.pagination import create_paginate_query
+from common.sqlalchemy.batch import create_batch_query
+from common.sqlalchemy.pagination import (
+    create_paginate_query,
+    create_keyset_query,
+    get_total_count,
+)
 
 from app_sqlalchemy_orm.db.models import User
 from common.sqlalchemy.sorting import create_order_by_query
@@ -38,13 +67,81 @@ async def create_user(
     return new_user.id
 
 
+@router.get(
+    path=":batch",
+    response_model=BatchResult[UserResponseModel],
+    status_code=status.HTTP_200_OK,
+)
+async def get_users_batch(
+    db_session: Annotated[AsyncSession, Depends(get_db_session)],
+    batch: Annotated[BatchParams, Depends(get_batch_params)],
+) -> TrustedJSONResponse:
+    query: Select = create_batch_query(query=select(User), ids=batch.ids, model=User)
+
+    result: Result = await db_session.execute(query)
+
+    users: Sequence[Any] = result.scalars().all()
+
+    return TrustedJSONResponse(
+        create_batch_result(
+            ids=batch.ids,
+            items=[create_trusted_row(UserResponseModel, user) for user in users],
+        )
+    )
+
+
+@router.get(
+    path="/cursor",
+    response_model=CursorPage[UserResponseModel],
+    status_code=status.HTTP_200_OK,
+)
+async def get_users_by_cursor(
+    db_session: Annotated[AsyncSession, Depends(get_db_session)],
+    pagination: Annotated[CursorPaginationParams, Depends()],
+    order_by: Annotated[OrderByUser, Query()] = None,
+) -> TrustedJSONResponse:
+    order_by_fields: List[OrderByField] = order_by or []
+    cursor_values: List[Any] | None = decode_cursor(
+        cursor=pagination.cursor, order_by_fields=order_by_fields
+    )
+
+    # fetch one extra row to find out whether there is a next page
+    query: Select = create_keyset_query(
+        query=select(User),
+        order_by_fields=order_by_fields,
+        cursor_values=cursor_values,
+        limit=pagination.limit + 1,
+        model=User,
+    )
+
+    result: Result = await db_session.execute(query)
+
+    users: Sequence[Any] = result.scalars().all()
+
+    return TrustedJSONResponse(
+        create_cursor_page(
+            items=[create_trusted_row(UserResponseModel, user) for user in users],
+            limit=pagination.limit,
+            order_by_fields=order_by_fields,
+        )
+    )
+
+
 @router.get(
     path="/{user_id}", response_model=UserResponseModel, status_code=status.HTTP_200_OK
 )
 async def get_user(
+    request: Request,
     user: Annotated[User, Depends(validate_user_id)],
-) -> UserResponseModel:
-    return UserResponseModel.model_validate(user)
+) -> Response:
+    validators: CacheValidators = get_resource_validators(user, "profession")
+    if is_not_modified(request, validators):
+        return create_not_modified_response(validators, RESOURCE_CACHE_CONTROL)
+    return add_cache_headers(
+        TrustedJSONResponse(create_trusted_row(UserResponseModel, user)),
+        validators,
+        RESOURCE_CACHE_CONTROL,
+    )
 
 
 @router.get(
@@ -53,10 +150,11 @@ async def get_user(
     status_code=status.HTTP_200_OK,
 )
 async def get_users(
+    request: Request,
     db_session: Annotated[AsyncSession, Depends(get_db_session)],
     pagination: Annotated[PaginationParams, Depends()],
     order_by: Annotated[OrderByUser, Query()] = None,
-) -> LimitOffsetPage[UserResponseModel]:
+) -> Response:
     query: Select = select(User)
 
     if order_by:
@@ -71,16 +169,25 @@ async def get_users(
     )
     users: Sequence[Any] = result.scalars().all()
 
-    count_query: Select = select(func.count()).select_from(query.subquery())
-    total_count_result: Result = await db_session.execute(count_query)
-    total_count: int = total_count_result.scalar_one()
+    total_count: Optional[int] = await get_total_count(
+        session=db_session,
+        query=query,
+        count=pagination.count,
+        min_count=pagination.offset + len(users),
+    )
 
-    return LimitOffsetPage(
-        items=[UserResponseModel.model_validate(user) for user in users],
-        items_count=len(users),
-        total_count=total_count,
-        limit=pagination.limit,
-        offset=pagination.offset,
+    return create_list_response(
+        request,
+        TrustedJSONResponse(
+            LimitOffsetPage(
+                items=[create_trusted_row(UserResponseModel, user) for user in users],
+                items_count=len(users),
+                total_count=total_count,
+                limit=pagination.limit,
+                offset=pagination.offset,
+            )
+        ),
+        RESOURCE_CACHE_CONTROL,
     )
 
 
@@ -0,0 +1,59 @@
+from typing import Annotated, Any, Generic, List, Sequence, TypeVar
+
+from fastapi import Query
+from pydantic import UUID4, BaseModel, conint
+
+from common.trusted_rows import get_field
+
+DataT: TypeVar = TypeVar("DataT")
+
+# upper bound for the ids of a single batch request
+MAX_BATCH_IDS: int = 200
+
+
+class BatchResult(BaseModel, Generic[DataT]):
+    items: Sequence[DataT]
+    items_count: conint(ge=0)
+    missing_ids: List[UUID4]
+
+
+class BatchParams(BaseModel):
+    ids: List[UUID4]
+
+
+def get_batch_params(
+    ids: Annotated[List[UUID4], Query(min_length=1, max_length=MAX_BATCH_IDS)],
+) -> BatchParams:
+    """
+    Reads the ids of a batch request (`?ids=...&ids=...`), dropping duplicates.
+
+    Args:
+        ids (List[UUID4]): The requested ids.
+
+    Returns:
+        BatchParams: The unique ids in request order.
+    """
+
+    return BatchParams(ids=list(dict.fromkeys(ids)))
+
+
+def create_batch_result(ids: List[UUID4], items: Sequence[Any]) -> BatchResult:
+    """
+    Builds a BatchResult with the items in the order of the requested ids.
+
+    Args:
+        ids (List[UUID4]): The requested (unique) ids.
+        items (Sequence[Any]): The found items in any order (models or trusted rows).
+
+    Returns:
+        BatchResult: The found items in request order and the ids that were not found.
+    """
+
+    items_by_id: dict = {get_field(item, "id"): item for item in items}
+    found: List[Any] = [items_by_id[id] for id in ids if id in items_by_id]
+
+    return BatchResult(
+        items=found,
+        items_count=len(found),
+        missing_ids=[id for id in ids if id not in items_by_id],
+    )
@@ -0,0 +1,192 @@
+import csv
+import json
+from enum import StrEnum
+from typing import (
+    Annotated,
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Tuple,
+    TypeVar,
+)
+
+from fastapi import Header, HTTPException
+from pydantic import BaseModel, ValidationError
+from starlette import status
+
+from common.schemas import BulkImportResult, RejectedRow
+
+ModelT: TypeVar = TypeVar("ModelT", bound=BaseModel)
+
+# upper bound for the rejected rows listed in a BulkImportResult
+MAX_REPORTED_REJECTED_ROWS: int = 1000
+
+
+class ImportFormat(StrEnum):
+    """
+    Supported request body formats (Content-Type) of the bulk import endpoints.
+
+    - NDJSON: one JSON object per line
+    - CSV: a header line with the field names, then one record per line
+    """
+
+    NDJSON = "application/x-ndjson"
+    CSV = "text/csv"
+
+
+# request body documentation of the bulk import endpoints (the body is streamed)
+IMPORT_OPENAPI_EXTRA: Dict[str, Any] = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            import_format.value: {"schema": {"type": "string"}}
+            for import_format in ImportFormat
+        },
+    }
+}
+
+
+def get_import_format(
+    content_type: Annotated[str, Header()] = ImportFormat.NDJSON,
+) -> ImportFormat:
+    """
+    Determines the format of a bulk import request body from its Content-Type.
+
+    Args:
+        content_type (str): The Content-Type header, parameters (e.g. charset) are ignored.
+
+    Returns:
+        ImportFormat: The format of the request body.
+
+    Raises:
+        HTTPException: If the Content-Type is not supported.
+    """
+
+    media_type: str = content_type.split(";")[0].strip().lower()
+    try:
+        return ImportFormat(media_type)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Content-Type must be one of: {', '.join(ImportFormat)}.",
+        ) from None
+
+
+def reject_row(result: BulkImportResult, line: int, error: str) -> None:
+    """
+    Counts a rejected row and lists it, as long as the report is not full.
+
+    Args:
+        result (BulkImportResult): The report of the running import.
+        line (int): The line number of the row in the request body.
+        error (str): Why the row was rejected.
+    """
+
+    result.rejected_count += 1
+    if len(result.rejected) < MAX_REPORTED_REJECTED_ROWS:
+        result.rejected.append(RejectedRow(line=line, error=error))
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, bytes]]:
+    """
+    Splits a streamed request body into numbered, non-empty lines.
+
+    Only the current incomplete line is kept in memory, every chunk is split once.
+    The lines are not decoded, so that an invalid line can be rejected on its own.
+
+    Args:
+        chunks (AsyncIterator[bytes]): The body chunks, e.g. `request.stream()`.
+
+    Yields:
+        Tuple[int, bytes]: The 1-based line number and the line (without its newline).
+    """
+
+    line_number: int = 0
+    # the parts of the incomplete line, joined once its end arrives
+    tail: List[bytes] = []
+    async for chunk in chunks:
+        *lines, rest = chunk.split(b"\n")
+        if lines:
+            lines[0] = b"".join([*tail, lines[0]])
+            tail = []
+        tail.append(rest)
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield line_number, line.rstrip(b"\r")
+
+    last_line: bytes = b"".join(tail)
+    if last_line.strip():
+        yield line_number + 1, last_line.rstrip(b"\r")
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(loc) for loc in e['loc']) or 'row'}: {e['msg']}"
+        for e in error.errors()
+    )
+
+
+async def iter_records(
+    chunks: AsyncIterator[bytes],
+    import_format: ImportFormat,
+    model_class: type[ModelT],
+    result: BulkImportResult,
+    json_fields: Iterable[str] = (),
+) -> AsyncIterator[Tuple[int, ModelT]]:
+    """
+    Parses and validates the records of a streamed NDJSON or CSV request body.
+
+    Records that can't be parsed or fail the validation of `model_class` are
+    reported in `result` and skipped.
+
+    Args:
+        chunks (AsyncIterator[bytes]): The body chunks, e.g. `request.stream()`.
+        import_format (ImportFormat): The format of the body.
+        model_class (type[ModelT]): The input model every record is validated with.
+        result (BulkImportResult): The report of the running import.
+        json_fields (Iterable[str]): CSV columns holding JSON values (e.g. objects).
+
+    Yields:
+        Tuple[int, ModelT]: The line number and the validated record.
+    """
+
+    header: list[str] | None = None
+
+    async for line_number, raw_line in iter_lines(chunks):
+        if import_format == ImportFormat.CSV and header is None:
+            try:
+                header = next(csv.reader([raw_line.decode()]))
+            except UnicodeDecodeError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"The CSV header is not valid UTF-8: {e}",
+                ) from e
+            continue
+
+        result.received_count += 1
+        try:
+            # a UnicodeDecodeError (ValueError) rejects the line
+            line: str = raw_line.decode()
+            if import_format == ImportFormat.CSV:
+                values: list[str] = next(csv.reader([line]))
+                if len(values) != len(header):
+                    raise ValueError(
+                        f"Expected {len(header)} values, got {len(values)}."
+                    )
+                # empty values are treated as missing
+                record: dict = {
+                    field: json.loads(value) if field in json_fields else value
+                    for field, value in zip(header, values, strict=True)
+                    if value != ""
+                }
+            else:
+                record: Any = json.loads(line)
+
+            yield line_number, model_class.model_validate(record)
+        except ValidationError as e:
+            reject_row(result, line_number, _format_validation_error(e))
+        except ValueError as e:
+            reject_row(result, line_number, str(e))
@@ -0,0 +1,110 @@
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from common.settings import get_settings
+
+# The database cost of a request: statements, their time and rows and the wait for the
+# pool. Counted by the connections (app_psycopg.api.db_cost.CostTrackingCursor, the
+# cursor events of common.sqlalchemy.metrics) into the DatabaseCost of the running
+# request, which the middleware sends back as headers.
+DEBUG_HEADER: str = "x-debug-db-cost"
+
+
+class DatabaseCost:
+    def __init__(self):
+        self.queries: int = 0
+        self.time_ms: float = 0.0
+        self.rows: int = 0
+        self.pool_wait_ms: float = 0.0
+
+    def get_headers(self) -> List[Tuple[bytes, bytes]]:
+        """
+        Renders the cost as a Server-Timing header (shown by browser dev tools) and
+        X-DB-* headers.
+
+        Returns:
+            List[Tuple[bytes, bytes]]: The ASGI headers.
+        """
+
+        server_timing: str = (
+            f'db;dur={self.time_ms:.1f};desc="{self.queries} queries", '
+            f"db-pool;dur={self.pool_wait_ms:.1f}"
+        )
+        return [
+            (b"server-timing", server_timing.encode()),
+            (b"x-db-queries", str(self.queries).encode()),
+            (b"x-db-time-ms", f"{self.time_ms:.1f}".encode()),
+            (b"x-db-rows", str(self.rows).encode()),
+            (b"x-db-pool-wait-ms", f"{self.pool_wait_ms:.1f}".encode()),
+        ]
+
+
+_db_cost: ContextVar[Optional[DatabaseCost]] = ContextVar("db_cost", default=None)
+
+
+def record_statement(seconds: float, rows: int) -> None:
+    """
+    Adds a statement to the cost of the running request (if it is tracked).
+
+    Args:
+        seconds (float): The time to execute the statement.
+        rows (int): The rows returned (or affected).
+    """
+
+    db_cost: Optional[DatabaseCost] = _db_cost.get()
+    if db_cost is not None:
+        db_cost.queries += 1
+        db_cost.time_ms += seconds * 1000
+        db_cost.rows += rows
+
+
+def record_pool_wait(wait_ms: float) -> None:
+    """
+    Adds the wait for a pooled connection to the cost of the running request.
+
+    Args:
+        wait_ms (float): The wait in milliseconds.
+    """
+
+    db_cost: Optional[DatabaseCost] = _db_cost.get()
+    if db_cost is not None:
+        db_cost.pool_wait_ms += wait_ms
+
+
+class DatabaseCostMiddleware:
+    """
+    Sends the database cost of a request as response headers, for every request with
+    `DB_COST_HEADERS` or for requests with the `X-Debug-DB-Cost` header.
+
+    Statements run by dependencies after the response has started (e.g. the commit)
+    are not included.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app: ASGIApp = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not (
+            get_settings().db_cost_headers
+            or any(name == DEBUG_HEADER.encode() for name, _ in scope["headers"])
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        db_cost: DatabaseCost = DatabaseCost()
+
+        async def send_with_cost(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message = {
+                    **message,
+                    "headers": [*message.get("headers", []), *db_cost.get_headers()],
+                }
+            await send(message)
+
+        token = _db_cost.set(db_cost)
+        try:
+            await self.app(scope, receive, send_with_cost)
+        finally:
+            _db_cost.reset(token)
@@ -0,0 +1,203 @@
+import time
+from enum import StrEnum
+from typing import Callable, Dict, Optional
+
+from fastapi import HTTPException, Request
+from fastapi.responses import JSONResponse
+from starlette import status
+
+from common.disconnect import DISCONNECT_WATCHER_KEY, DisconnectWatcher
+from common.settings import DatabaseSettings
+
+# A request may spend a budget (ms) in the database: the wait for the pool, for locks
+# and for its statements. The budget is `DatabaseSettings.request_budget`, a route or
+# router can set its own (request_budget) and a client can override both with the header
+# (up to `DatabaseSettings.request_budget_max`).
+DEADLINE_HEADER: str = "X-Request-Timeout"
+# budget of the bulk imports and exports: their COPY runs as a single statement
+BULK_REQUEST_BUDGET: int = 600_000
+
+
+class TimeoutPhase(StrEnum):
+    POOL = "pool"
+    LOCK = "lock"
+    STATEMENT = "statement"
+
+
+# nginx's status of requests whose client went away (common.disconnect)
+CLIENT_CLOSED_REQUEST: int = 499
+
+# waiting for a connection or a lock is a matter of load, a slow statement of the query
+TIMEOUT_STATUS_CODES: Dict[TimeoutPhase, int] = {
+    TimeoutPhase.POOL: status.HTTP_503_SERVICE_UNAVAILABLE,
+    TimeoutPhase.LOCK: status.HTTP_503_SERVICE_UNAVAILABLE,
+    TimeoutPhase.STATEMENT: status.HTTP_504_GATEWAY_TIMEOUT,
+}
+
+TIMEOUT_DETAILS: Dict[TimeoutPhase, str] = {
+    TimeoutPhase.POOL: "Timed out waiting for a database connection",
+    TimeoutPhase.LOCK: "Timed out waiting for a lock",
+    TimeoutPhase.STATEMENT: "The query timed out",
+}
+
+
+class Deadline:
+    """The budget of a request, counted from the moment it is first looked up."""
+
+    def __init__(self, budget_ms: int):
+        self.budget_ms: int = budget_ms
+        self._start: float = time.perf_counter()
+
+    @property
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self._start) * 1000
+
+    @property
+    def remaining_ms(self) -> int:
+        return max(int(self.budget_ms - self.elapsed_ms), 0)
+
+    @property
+    def remaining(self) -> float:
+        """The remaining budget in seconds (e.g. the timeout of a pool checkout)."""
+
+        return self.remaining_ms / 1000
+
+    def get_timeouts(self, lock_timeout: int) -> Dict[str, str]:
+        """
+        The statement_timeout and lock_timeout (ms) of the statements of the request.
+
+        Args:
+            lock_timeout (int): The configured lock timeout, 0 for the remaining budget.
+
+        Returns:
+            Dict[str, str]: The values of both settings, each at least 1 (0 would disable it).
+
+        Raises:
+            DeadlineExceeded: If nothing of the budget is left.
+        """
+
+        remaining_ms: int = self.remaining_ms
+        if remaining_ms == 0:
+            raise DeadlineExceeded(TimeoutPhase.POOL)
+
+        return {
+            "statement_timeout": str(remaining_ms),
+            "lock_timeout": str(
+                min(lock_timeout, remaining_ms) if lock_timeout else remaining_ms
+            ),
+        }
+
+
+class DeadlineExceeded(Exception):
+    """The budget of a request ran out before the database was reached."""
+
+    def __init__(self, phase: TimeoutPhase):
+        super().__init__(phase)
+        self.phase: TimeoutPhase = phase
+
+
+def request_budget(budget_ms: int) -> Callable[[Request], None]:
+    """
+    Sets the budget of the routes of a router (or of a single route), e.g.
+    `APIRouter(dependencies=[Depends(request_budget(60_000))])`.
+
+    Args:
+        budget_ms (int): The budget in milliseconds.
+
+    Returns:
+        Callable[[Request], None]: The dependency.
+    """
+
+    def set_request_budget(request: Request) -> None:
+        request.state.request_budget = budget_ms
+
+    return set_request_budget
+
+
+def _get_header_budget(request: Request, settings: DatabaseSettings) -> Optional[int]:
+    value: Optional[str] = request.headers.get(DEADLINE_HEADER)
+    if value is None:
+        return None
+
+    try:
+        budget_ms: int = int(value)
+    except ValueError:
+        budget_ms = 0
+    if budget_ms <= 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{DEADLINE_HEADER} must be a positive number of milliseconds",
+        )
+    return min(budget_ms, settings.request_budget_max)
+
+
+def get_deadline(request: Request, settings: DatabaseSettings) -> Optional[Deadline]:
+    """
+    Returns the deadline of a request: the header, the budget of its route or the default.
+
+    Args:
+        request (Request): The incoming request.
+        settings (DatabaseSettings): The default and the maximum budget.
+
+    Returns:
+        Optional[Deadline]: The deadline (the same for every call), None without a budget.
+
+    Raises:
+        HTTPException: If the header isn't a positive number.
+    """
+
+    if hasattr(request.state, "deadline"):
+        return request.state.deadline
+
+    budget_ms: Optional[int] = _get_header_budget(request, settings)
+    if budget_ms is None:
+        budget_ms = getattr(request.state, "request_budget", settings.request_budget)
+
+    deadline: Optional[Deadline] = Deadline(budget_ms) if budget_ms else None
+    request.state.deadline = deadline
+    return deadline
+
+
+def create_timeout_response(request: Request, phase: TimeoutPhase) -> JSONResponse:
+    """
+    Answers a request that ran out of time in the database.
+
+    Args:
+        request (Request): The request (its deadline, if it has one, is reported).
+        phase (TimeoutPhase): What the request was waiting for.
+
+    Returns:
+        JSONResponse: 503 (pool, lock) or 504 (statement) with the phase and the budget,
+            499 if the statement was cancelled because the client disconnected.
+    """
+
+    watcher: Optional[DisconnectWatcher] = getattr(
+        request.state, DISCONNECT_WATCHER_KEY, None
+    )
+    if phase == TimeoutPhase.STATEMENT and watcher is not None and watcher.disconnected:
+        return JSONResponse(
+            status_code=CLIENT_CLOSED_REQUEST,
+            content={"detail": "Client closed the request"},
+        )
+
+    deadline: Optional[Deadline] = getattr(request.state, "deadline", None)
+    status_code: int = TIMEOUT_STATUS_CODES[phase]
+
+    return JSONResponse(
+        status_code=status_code,
+        content={
+            "detail": TIMEOUT_DETAILS[phase],
+            "phase": phase,
+            "budget_ms": deadline.budget_ms if deadline else None,
+            "elapsed_ms": round(deadline.elapsed_ms) if deadline else None,
+        },
+        headers={"Retry-After": "1"}
+        if status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        else None,
+    )
+
+
+async def deadline_exceeded_handler(
+    request: Request, exc: DeadlineExceeded
+) -> JSONResponse:
+    return create_timeout_response(request, exc.phase)
@@ -0,0 +1,111 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from typing import AsyncIterator, Awaitable, Callable, List, Optional
+
+from fastapi import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from common.transactions import is_read_only
+
+# A client that disconnects (times out, navigates away) doesn't stop the statement its
+# request is running: the cursor runs to completion and keeps its connection checked out.
+# The statements of read-only requests are cancelled instead, their connection is rolled
+# back and returned to the pool right away. Writes run to completion (their body may
+# still be streaming, which the watcher must not consume).
+DISCONNECT_WATCHER_KEY: str = "disconnect_watcher"
+
+Cancel = Callable[[], Awaitable[None]]
+
+
+class DisconnectWatcher:
+    """Calls back when the client disconnects before its response is complete."""
+
+    def __init__(self, receive: Receive):
+        self._receive: Receive = receive
+        self._callbacks: List[Cancel] = []
+        self._task: Optional[asyncio.Task] = None
+        self._stopped: bool = False
+        self.disconnected: bool = False
+
+    def watch(self, callback: Cancel) -> None:
+        if self._stopped:
+            return
+        self._callbacks.append(callback)
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def unwatch(self, callback: Cancel) -> None:
+        with suppress(ValueError):
+            self._callbacks.remove(callback)
+
+    def stop(self) -> None:
+        self._stopped = True
+        if self._task is not None:
+            self._task.cancel()
+
+    async def _run(self) -> None:
+        message: Message = await self._receive()
+        while message["type"] != "http.disconnect":
+            # the (already read or empty) body of a read-only request
+            message = await self._receive()
+
+        self.disconnected = True
+        for callback in list(self._callbacks):
+            # e.g. the connection is broken, the request ends anyway
+            with suppress(Exception):
+                await callback()
+
+
+class DisconnectMiddleware:
+    """
+    Provides a DisconnectWatcher to the dependencies of a request (`request.state`),
+    stopped once the response is complete: from then on, a disconnect ends the request
+    regularly and nothing is cancelled.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app: ASGIApp = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        watcher: DisconnectWatcher = DisconnectWatcher(receive)
+        scope.setdefault("state", {})[DISCONNECT_WATCHER_KEY] = watcher
+
+        async def send_and_stop(message: Message) -> None:
+            if message["type"] == "http.response.body" and not message.get(
+                "more_body", False
+            ):
+                watcher.stop()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_and_stop)
+        finally:
+            watcher.stop()
+
+
+@asynccontextmanager
+async def cancel_on_disconnect(request: Request, cancel: Cancel) -> AsyncIterator[None]:
+    """
+    Cancels the statements of a read-only request if its client disconnects.
+
+    Args:
+        request (Request): The incoming request.
+        cancel (Cancel): Cancels the running statement, e.g. `AsyncConnection.cancel_safe`.
+    """
+
+    watcher: Optional[DisconnectWatcher] = getattr(
+        request.state, DISCONNECT_WATCHER_KEY, None
+    )
+    if watcher is None or not is_read_only(request):
+        yield
+        return
+
+    watcher.watch(cancel)
+    try:
+        yield
+    finally:
+        watcher.unwatch(cancel)
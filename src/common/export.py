@@ -0,0 +1,127 @@
+from datetime import datetime
+from decimal import Decimal
+from enum import StrEnum
+from typing import Annotated, Any, AsyncIterator, Dict, Optional
+
+from fastapi import Header, HTTPException
+from pydantic import UUID4, BaseModel
+from starlette import status
+from starlette.responses import StreamingResponse
+
+from common.schemas import UserName
+
+# rows fetched from the server-side cursor per round trip (and per streamed chunk)
+EXPORT_BATCH_SIZE: int = 1000
+
+
+class ExportFormat(StrEnum):
+    """
+    Supported response body formats (Accept) of the export endpoints.
+
+    - NDJSON: one JSON object per line, as rendered by the GET endpoints
+    - CSV: a header line with the field names, then one record per line (nested
+      objects as JSON)
+    """
+
+    NDJSON = "application/x-ndjson"
+    CSV = "text/csv"
+
+
+# response documentation of the export endpoints (the body is streamed)
+EXPORT_RESPONSES: Dict[int | str, Dict[str, Any]] = {
+    status.HTTP_200_OK: {
+        "content": {
+            export_format.value: {"schema": {"type": "string"}}
+            for export_format in ExportFormat
+        },
+    }
+}
+
+_FILE_EXTENSIONS: Dict[ExportFormat, str] = {
+    ExportFormat.NDJSON: "ndjson",
+    ExportFormat.CSV: "csv",
+}
+
+
+def get_export_format(
+    accept: Annotated[str, Header()] = ExportFormat.NDJSON,
+) -> ExportFormat:
+    """
+    Determines the format of an export response body from the Accept header.
+
+    The first supported media type wins, a wildcard (or no Accept header) means NDJSON.
+
+    Args:
+        accept (str): The Accept header, parameters (e.g. q) are ignored.
+
+    Returns:
+        ExportFormat: The format of the response body.
+
+    Raises:
+        HTTPException: If none of the accepted media types is supported.
+    """
+
+    for media_range in accept.split(","):
+        media_type: str = media_range.split(";")[0].strip().lower()
+        if media_type in ("*/*", "application/*"):
+            return ExportFormat.NDJSON
+        if media_type in _FILE_EXTENSIONS:
+            return ExportFormat(media_type)
+
+    raise HTTPException(
+        status_code=status.HTTP_406_NOT_ACCEPTABLE,
+        detail=f"Accept must be one of: {', '.join(ExportFormat)}.",
+    )
+
+
+def create_export_response(
+    chunks: AsyncIterator[bytes], export_format: ExportFormat, name: str
+) -> StreamingResponse:
+    """
+    Streams an export as a file download.
+
+    Args:
+        chunks (AsyncIterator[bytes]): The body chunks, e.g. `db.export_orders(...)`.
+        export_format (ExportFormat): The format of the chunks.
+        name (str): The file name without extension, e.g. "orders".
+
+    Returns:
+        StreamingResponse: The response streaming the chunks.
+    """
+
+    return StreamingResponse(
+        content=chunks,
+        media_type=export_format,
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="{name}.{_FILE_EXTENSIONS[export_format]}"'
+            )
+        },
+    )
+
+
+# region Filters
+
+# Query parameters of the export endpoints, "<column>__<op>" as in common.filtering
+
+
+class ExportFilters(BaseModel):
+    created_at__gte: Optional[datetime] = None
+    created_at__lt: Optional[datetime] = None
+
+
+class UserExportFilters(ExportFilters):
+    # normalized like the stored names
+    name__eq: Optional[UserName] = None
+
+
+class OrderExportFilters(ExportFilters):
+    amount__gte: Optional[Decimal] = None
+    amount__lt: Optional[Decimal] = None
+
+
+class DocumentExportFilters(ExportFilters):
+    user_id__eq: Optional[UUID4] = None
+
+
+# endregion
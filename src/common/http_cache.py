@@ -0,0 +1,192 @@
+import hashlib
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, List, Optional
+
+from pydantic import BaseModel
+from starlette import status
+from starlette.requests import Request
+from starlette.responses import Response
+
+from common.trusted_rows import get_field
+
+# lookup tables (professions, companies) rarely change, shared caches may keep them
+LOOKUP_CACHE_CONTROL: str = "public, max-age=60"
+# everything else may be stored, but is revalidated (If-None-Match) on every use
+RESOURCE_CACHE_CONTROL: str = "no-cache"
+
+
+class CacheValidators(BaseModel):
+    etag: str
+    last_modified: Optional[datetime] = None
+
+
+def create_etag(*parts: Any) -> str:
+    """
+    Builds a strong ETag from the parts that determine a response body.
+
+    Args:
+        *parts (Any): E.g. the id and the version (timestamp) of a row.
+
+    Returns:
+        str: The quoted ETag.
+    """
+
+    digest: str = hashlib.blake2b(
+        "\x1f".join(str(part) for part in parts).encode(), digest_size=16
+    ).hexdigest()
+    return f'"{digest}"'
+
+
+def _get_version(item: Any) -> datetime:
+    # orders have no last_updated_at, they are never updated
+    try:
+        last_updated_at: Optional[datetime] = get_field(item, "last_updated_at")
+    except (AttributeError, KeyError):
+        last_updated_at = None
+    return last_updated_at or get_field(item, "created_at")
+
+
+def get_resource_validators(item: Any, *nested: str) -> CacheValidators:
+    """
+    Validators of a single resource, derived from its id and version (last_updated_at,
+    or created_at), without serializing it.
+
+    Args:
+        item (Any): A model, a trusted (dict) row or an ORM instance.
+        *nested (str): Nested short models (id and name, e.g. `profession`) rendered
+            into the body, a rename doesn't change the version of the item.
+
+    Returns:
+        CacheValidators: The ETag and the Last-Modified timestamp.
+    """
+
+    version: datetime = _get_version(item)
+    parts: List[Any] = [get_field(item, "id"), version.isoformat()]
+    for name in nested:
+        value: Any = get_field(item, name)
+        parts.extend([get_field(value, "id"), get_field(value, "name")])
+
+    return CacheValidators(etag=create_etag(*parts), last_modified=version)
+
+
+def get_list_validators(body: bytes) -> CacheValidators:
+    """
+    Validators of a list page, derived from its rendered body: the ids, versions and
+    order of the items and the total. There is no Last-Modified, deleting a row other
+    than the newest doesn't change the newest version of a list.
+
+    Args:
+        body (bytes): The rendered page.
+
+    Returns:
+        CacheValidators: The ETag.
+    """
+
+    return CacheValidators(etag=create_etag(body))
+
+
+def _as_utc(value: datetime) -> datetime:
+    # naive timestamps (TIMESTAMP columns) are taken as UTC
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return value.astimezone(UTC)
+
+
+def is_not_modified(request: Request, validators: CacheValidators) -> bool:
+    """
+    Evaluates If-None-Match or, without it, If-Modified-Since (RFC 9110, 13.1).
+
+    Args:
+        request (Request): The GET request.
+        validators (CacheValidators): The validators of the current representation.
+
+    Returns:
+        bool: True if the client's copy is current and a 304 can be sent.
+    """
+
+    if_none_match: Optional[str] = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # weak comparison, W/ prefixes are ignored
+        etags: List[str] = [
+            etag.strip().removeprefix("W/") for etag in if_none_match.split(",")
+        ]
+        return "*" in etags or validators.etag in etags
+
+    if_modified_since: Optional[str] = request.headers.get("if-modified-since")
+    if if_modified_since is None or validators.last_modified is None:
+        return False
+
+    try:
+        since: datetime = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+
+    # HTTP dates have a resolution of seconds
+    return _as_utc(validators.last_modified).replace(microsecond=0) <= _as_utc(since)
+
+
+def add_cache_headers(
+    response: Response, validators: CacheValidators, cache_control: str
+) -> Response:
+    """
+    Sets ETag, Last-Modified and Cache-Control.
+
+    Args:
+        response (Response): The response (200 or 304).
+        validators (CacheValidators): The validators of the representation.
+        cache_control (str): E.g. LOOKUP_CACHE_CONTROL or RESOURCE_CACHE_CONTROL.
+
+    Returns:
+        Response: The response.
+    """
+
+    response.headers["ETag"] = validators.etag
+    response.headers["Cache-Control"] = cache_control
+    if validators.last_modified is not None:
+        response.headers["Last-Modified"] = format_datetime(
+            _as_utc(validators.last_modified), usegmt=True
+        )
+    return response
+
+
+def create_not_modified_response(
+    validators: CacheValidators, cache_control: str
+) -> Response:
+    """
+    Builds a 304 (no body) with the headers the 200 would have had.
+
+    Args:
+        validators (CacheValidators): The validators of the representation.
+        cache_control (str): The Cache-Control of the resource.
+
+    Returns:
+        Response: The 304 response.
+    """
+
+    return add_cache_headers(
+        Response(status_code=status.HTTP_304_NOT_MODIFIED), validators, cache_control
+    )
+
+
+def create_list_response(
+    request: Request, response: Response, cache_control: str
+) -> Response:
+    """
+    Answers a list GET with the page or, if the client's copy is current, a 304.
+
+    The page is read either way, only the body is saved.
+
+    Args:
+        request (Request): The list request.
+        response (Response): The rendered page.
+        cache_control (str): E.g. LOOKUP_CACHE_CONTROL or RESOURCE_CACHE_CONTROL.
+
+    Returns:
+        Response: The page or a 304.
+    """
+
+    validators: CacheValidators = get_list_validators(response.body)
+    if is_not_modified(request, validators):
+        return create_not_modified_response(validators, cache_control)
+    return add_cache_headers(response, validators, cache_control)
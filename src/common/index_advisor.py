@@ -0,0 +1,246 @@
+import re
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from pydantic import BaseModel
+
+from common.order_by_enums import sortable_fields_by_table
+from common.sorting import Direction
+
+# Cross-references the statistics of Postgres (pg_stat_statements, pg_stat_user_tables,
+# pg_stat_user_indexes) with the statements of the app and the sortable fields: lists
+# sorted by a field without a matching index, tables mostly read by sequential scans and
+# indexes that were never used. The statistics count since their last reset
+# (pg_stat_reset, pg_stat_statements_reset), so look at them after real traffic.
+
+# tables with fewer live rows are cheaper to scan than to read through an index
+MIN_SEQ_SCAN_ROWS: int = 1_000
+# statements read from pg_stat_statements (by total time)
+MAX_STATEMENTS: int = 50
+UNNAMED_STATEMENT: str = "unnamed"
+
+# placeholders of psycopg (%(name)s, %s) and of the server ($1, also normalized constants)
+_PLACEHOLDERS: re.Pattern = re.compile(r"%\(\w+\)s|%s|\$\d+")
+_WHITESPACE: re.Pattern = re.compile(r"\s+")
+_FIRST_TABLE: re.Pattern = re.compile(r"\bFROM\s+(\w+)", re.IGNORECASE)
+_LEADING_SORT_KEY: re.Pattern = re.compile(
+    r'\bORDER BY\s+"?(\w+)"?\s+(ASC|DESC)', re.IGNORECASE
+)
+_INDEX_COLUMNS: re.Pattern = re.compile(r"\((.*)\)")
+
+
+class StatementStats(BaseModel):
+    # the name in db_statements, e.g. "get_users_stmt"
+    name: str
+    query: str
+    calls: int
+    total_ms: float
+    mean_ms: float
+    rows: int
+
+
+class TableScans(BaseModel):
+    table: str
+    seq_scan: int
+    seq_tup_read: int
+    idx_scan: int
+    live_rows: int
+
+
+class IndexUsage(BaseModel):
+    table: str
+    index: str
+    idx_scan: int
+    size_bytes: int
+    is_unique: bool
+    # the leading column of the index references another table
+    leads_foreign_key: bool = False
+    definition: str
+
+
+class IndexProposal(BaseModel):
+    table: str
+    columns: str
+    # the statements sorted by the field and their calls
+    statements: List[str]
+    calls: int
+    create_statement: str
+
+
+class UnusedIndex(BaseModel):
+    table: str
+    index: str
+    size_bytes: int
+    drop_statement: str
+
+
+class IndexAdvice(BaseModel):
+    # False without the pg_stat_statements extension: no statements, no proposals
+    pg_stat_statements: bool
+    statements: List[StatementStats]
+    proposed_indexes: List[IndexProposal]
+    # tables with more sequential than index scans (and at least MIN_SEQ_SCAN_ROWS rows)
+    seq_scan_tables: List[TableScans]
+    unused_indexes: List[UnusedIndex]
+
+
+def normalize_statement(statement: str) -> str:
+    """
+    Normalizes placeholders and whitespace, so a statement of the app matches its entry
+    in pg_stat_statements.
+
+    Args:
+        statement (str): The SQL text.
+
+    Returns:
+        str: The normalized text.
+    """
+
+    return _WHITESPACE.sub(" ", _PLACEHOLDERS.sub("?", statement)).strip()
+
+
+def get_statement_name(query: str, known_statements: Mapping[str, str]) -> str:
+    """
+    Finds the statement of the app a query of pg_stat_statements was built from (lists
+    add ORDER BY, LIMIT or a keyset around it).
+
+    Args:
+        query (str): The query text of pg_stat_statements.
+        known_statements (Mapping[str, str]): The statements of the app by name.
+
+    Returns:
+        str: The name of the longest statement contained in the query, or "unnamed".
+    """
+
+    normalized: str = normalize_statement(query)
+    matches: List[Tuple[int, str]] = [
+        (len(text), name)
+        for name, text in known_statements.items()
+        if text and text in normalized
+    ]
+    return max(matches)[1] if matches else UNNAMED_STATEMENT
+
+
+def _get_sort_key(query: str) -> Optional[Tuple[str, str, Direction]]:
+    table: Optional[re.Match] = _FIRST_TABLE.search(query)
+    sort_key: Optional[re.Match] = _LEADING_SORT_KEY.search(query)
+    if table is None or sort_key is None:
+        return None
+    direction: Direction = (
+        Direction.ASC if sort_key.group(2).upper() == "ASC" else Direction.DESC
+    )
+    return table.group(1), sort_key.group(1), direction
+
+
+def _leads_index(index: IndexUsage, field: str, direction: Direction) -> bool:
+    columns: Optional[re.Match] = _INDEX_COLUMNS.search(index.definition)
+    if columns is None:
+        return False
+    leading: List[str] = columns.group(1).split(",")[0].split()
+    if leading[0].strip('"') != field:
+        return False
+    is_desc: bool = "DESC" in leading
+    # lists sort NULLS LAST, the default of ASC, while DESC defaults to NULLS FIRST
+    nulls_last: bool = "LAST" in leading or ("FIRST" not in leading and not is_desc)
+    return is_desc == (direction == Direction.DESC) and nulls_last
+
+
+def _get_columns(field: str, direction: Direction) -> str:
+    return f"{field} {'ASC' if direction == Direction.ASC else 'DESC'} NULLS LAST, id"
+
+
+def _get_index_name(table: str, field: str, direction: Direction) -> str:
+    # the names of db/migrations/001_indexes.sql
+    return f"{table}_{field}{'_desc' if direction == Direction.DESC else ''}_id_idx"
+
+
+def _is_required(index: IndexUsage) -> bool:
+    # unique indexes (primary keys) enforce constraints, the indexes of the foreign keys
+    # and of the sortable fields (db/migrations) serve deletes and lists, even if no
+    # such request was made since the statistics were reset
+    return (
+        index.is_unique
+        or index.leads_foreign_key
+        or any(
+            _leads_index(index, field, direction)
+            for field in sortable_fields_by_table.get(index.table, [])
+            for direction in Direction
+        )
+    )
+
+
+def advise_indexes(
+    statements: Optional[Sequence[StatementStats]],
+    tables: Sequence[TableScans],
+    indexes: Sequence[IndexUsage],
+) -> IndexAdvice:
+    """
+    Proposes indexes for the sorted lists of the app and flags seq-scanned tables and
+    unused indexes.
+
+    Args:
+        statements (Optional[Sequence[StatementStats]]): pg_stat_statements (named), None
+            without the extension.
+        tables (Sequence[TableScans]): pg_stat_user_tables.
+        indexes (Sequence[IndexUsage]): pg_stat_user_indexes with the index definitions.
+
+    Returns:
+        IndexAdvice: The statements, proposed indexes, seq-scanned tables and unused indexes.
+    """
+
+    proposals: Dict[Tuple[str, str, Direction], IndexProposal] = {}
+    for statement in statements or []:
+        sort_key: Optional[Tuple[str, str, Direction]] = _get_sort_key(statement.query)
+        if sort_key is None:
+            continue
+        table, field, direction = sort_key
+        # only the sortable fields (order_by) are sorted by clients
+        if field not in sortable_fields_by_table.get(table, []) or any(
+            index.table == table and _leads_index(index, field, direction)
+            for index in indexes
+        ):
+            continue
+
+        proposal: Optional[IndexProposal] = proposals.get(sort_key)
+        if proposal is None:
+            columns: str = _get_columns(field, direction)
+            proposal = proposals[sort_key] = IndexProposal(
+                table=table,
+                columns=columns,
+                statements=[],
+                calls=0,
+                create_statement=(
+                    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS "
+                    f"{_get_index_name(table, field, direction)} ON {table} ({columns})"
+                ),
+            )
+        if statement.name not in proposal.statements:
+            proposal.statements.append(statement.name)
+        proposal.calls += statement.calls
+
+    return IndexAdvice(
+        pg_stat_statements=statements is not None,
+        statements=list(statements or []),
+        proposed_indexes=sorted(
+            proposals.values(), key=lambda proposal: proposal.calls, reverse=True
+        ),
+        seq_scan_tables=sorted(
+            (
+                table
+                for table in tables
+                if table.seq_scan > table.idx_scan
+                and table.live_rows >= MIN_SEQ_SCAN_ROWS
+            ),
+            key=lambda table: table.seq_tup_read,
+            reverse=True,
+        ),
+        unused_indexes=[
+            UnusedIndex(
+                table=index.table,
+                index=index.index,
+                size_bytes=index.size_bytes,
+                drop_statement=f"DROP INDEX CONCURRENTLY IF EXISTS {index.index}",
+            )
+            for index in indexes
+            if index.idx_scan == 0 and not _is_required(index)
+        ],
+    )
@@ -0,0 +1,82 @@
+from typing import Any, Dict, Mapping, NamedTuple, Optional
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from starlette import status
+
+# Inserts don't check their references with SELECTs first, Postgres does when the row
+# is written. A violated constraint is answered like the validators used to.
+
+
+class ForeignKey(NamedTuple):
+    column: str
+    resource: str
+
+
+# constraint names as generated by Postgres for db/schema.sql (<table>_<column>_fkey)
+FOREIGN_KEYS: Dict[str, ForeignKey] = {
+    "users_profession_id_fkey": ForeignKey(
+        column="profession_id", resource="Profession"
+    ),
+    "orders_payer_id_fkey": ForeignKey(column="payer_id", resource="User"),
+    "orders_payee_id_fkey": ForeignKey(column="payee_id", resource="User"),
+    "documents_user_id_fkey": ForeignKey(column="user_id", resource="User"),
+    "users_companies_user_id_fkey": ForeignKey(column="user_id", resource="User"),
+    "users_companies_company_id_fkey": ForeignKey(
+        column="company_id", resource="Company"
+    ),
+}
+
+CHECK_CONSTRAINTS: Dict[str, str] = {
+    "orders_amount_check": "amount must be between 0 and 1000000",
+}
+
+
+class ConstraintViolation(Exception):
+    """A write violated a foreign key or check constraint."""
+
+    def __init__(self, constraint_name: Optional[str], params: Mapping[str, Any]):
+        super().__init__(constraint_name)
+        self.constraint_name: Optional[str] = constraint_name
+        self.params: Mapping[str, Any] = params
+
+
+def create_constraint_violation_response(
+    constraint_name: Optional[str], params: Mapping[str, Any]
+) -> JSONResponse:
+    """
+    Maps a violated constraint to the response of the matching validator.
+
+    Args:
+        constraint_name (Optional[str]): The name of the violated constraint.
+        params (Mapping[str, Any]): The parameters of the failed statement.
+
+    Returns:
+        JSONResponse: 404 for a foreign key (which one in `constraint` and `field`),
+            400 for a check constraint.
+    """
+
+    foreign_key: Optional[ForeignKey] = FOREIGN_KEYS.get(constraint_name)
+    if foreign_key is not None:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={
+                "detail": f"{foreign_key.resource} '{params.get(foreign_key.column)}' not found!",
+                "constraint": constraint_name,
+                "field": foreign_key.column,
+            },
+        )
+
+    detail: str = CHECK_CONSTRAINTS.get(
+        constraint_name, f"Constraint '{constraint_name}' violated!"
+    )
+    return JSONResponse(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        content={"detail": detail, "constraint": constraint_name},
+    )
+
+
+async def constraint_violation_handler(
+    request: Request, exc: ConstraintViolation
+) -> JSONResponse:
+    return create_constraint_violation_response(exc.constraint_name, exc.params)
@@ -0,0 +1,126 @@
+import json
+from typing import Any, Dict, Iterable, Optional
+from uuid import UUID
+
+from common.schemas import Company, Profession
+
+# channel of the notifications sent by the `notify_lookup_change` trigger (db/schema.sql)
+LOOKUP_CHANNEL: str = "lookup_changed"
+
+PROFESSIONS_TABLE: str = "professions"
+COMPANIES_TABLE: str = "companies"
+
+
+def _key(id: UUID | str) -> UUID:
+    return id if isinstance(id, UUID) else UUID(id)
+
+
+class LookupCacheMiss(Exception):
+    """A row references a lookup row that is not (yet) in the cache."""
+
+
+class LookupCache:
+    """
+    In-process copy of the small lookup tables (professions and companies).
+
+    Loaded at startup and kept current by the notifications of the
+    `notify_lookup_change` trigger. While not `ready` (not loaded yet, or the
+    listening connection was lost), every read goes to Postgres.
+    """
+
+    def __init__(self):
+        self._rows: Dict[str, Dict[UUID, Any]] = {
+            PROFESSIONS_TABLE: {},
+            COMPANIES_TABLE: {},
+        }
+        self.ready: bool = False
+
+    def load(
+        self, professions: Iterable[Profession], companies: Iterable[Company]
+    ) -> None:
+        """
+        Replaces the cached rows with a full copy of the tables.
+
+        Args:
+            professions (Iterable[Profession]): All professions.
+            companies (Iterable[Company]): All companies.
+        """
+
+        self._rows = {
+            PROFESSIONS_TABLE: {
+                profession.id: profession for profession in professions
+            },
+            COMPANIES_TABLE: {company.id: company for company in companies},
+        }
+        self.ready = True
+
+    def invalidate(self) -> None:
+        """Stops answering from memory until the next `load`."""
+        self.ready = False
+
+    def apply(self, payload: str) -> None:
+        """
+        Applies a change notification: {"table": ..., "op": ..., "row": {...}}.
+
+        Args:
+            payload (str): The payload of the notification.
+        """
+
+        change: Dict[str, Any] = json.loads(payload)
+        rows: Optional[Dict[UUID, Any]] = self._rows.get(change["table"])
+        if rows is None:
+            return
+
+        if change["op"] == "TRUNCATE":
+            rows.clear()
+            return
+
+        model_class: type = (
+            Profession if change["table"] == PROFESSIONS_TABLE else Company
+        )
+        row: Any = model_class.model_validate(change["row"])
+        if change["op"] == "DELETE":
+            rows.pop(row.id, None)
+        else:
+            rows[row.id] = row
+
+    def evict(self, table: str, id: UUID | str) -> None:
+        """
+        Drops a row this process is changing, it is read from Postgres until the
+        notification of the change arrives.
+
+        Args:
+            table (str): PROFESSIONS_TABLE or COMPANIES_TABLE.
+            id (UUID | str): The id of the row.
+        """
+
+        self._rows[table].pop(_key(id), None)
+
+    def get_profession(self, id: UUID | str) -> Optional[Profession]:
+        """Returns the cached profession, None if it is not cached."""
+        return self._rows[PROFESSIONS_TABLE].get(_key(id))
+
+    def get_company(self, id: UUID | str) -> Optional[Company]:
+        """Returns the cached company, None if it is not cached."""
+        return self._rows[COMPANIES_TABLE].get(_key(id))
+
+    def attach_profession(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Replaces the `profession_id` of a user row with the cached profession.
+
+        Args:
+            row (Dict[str, Any]): A user row without the professions join.
+
+        Returns:
+            Dict[str, Any]: The row with `profession` as in the join (id and name).
+
+        Raises:
+            LookupCacheMiss: If the profession is not cached.
+        """
+
+        profession: Optional[Profession] = self.get_profession(row.pop("profession_id"))
+        if profession is None:
+            raise LookupCacheMiss()
+
+        row["profession"] = {"id": profession.id, "name": profession.name}
+        return row
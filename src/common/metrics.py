@@ -0,0 +1,227 @@
+import bisect
+import time
+from typing import Annotated, Dict, Iterator, List, Optional, Tuple
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from common.pool_metrics import CHECKOUT_WAIT_BUCKETS_MS, PoolMetrics, PoolMonitor
+
+# Metrics in the Prometheus text format, kept in process memory: an observation is a
+# dict lookup and a bisect, cheap enough to stay on under full load. Every worker process
+# reports its own series (scrape them per process or add a `process` label upstream).
+CONTENT_TYPE: str = "text/plain; version=0.0.4; charset=utf-8"
+
+# upper bounds (s) of the latency histogram buckets, the last bucket is +Inf
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+)
+
+# upper bounds of the rows-per-statement histogram buckets
+ROWS_BUCKETS: tuple[float, ...] = (0, 1, 10, 100, 1000, 10_000)
+
+# requests that didn't match a route (404) share one label instead of their paths
+UNMATCHED_ROUTE: str = "unmatched"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    return ",".join(
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)
+    )
+
+
+def _format_bound(bound: Optional[float]) -> str:
+    return "+Inf" if bound is None else repr(float(bound))
+
+
+class Histogram:
+    """A Prometheus histogram with one series per combination of label values."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Tuple[str, ...],
+        buckets: tuple[float, ...],
+    ):
+        self.name: str = name
+        self.documentation: str = documentation
+        self.label_names: Tuple[str, ...] = label_names
+        self.buckets: tuple[float, ...] = buckets
+        # label values -> counts per bucket (not cumulative) and the sum
+        self._counts: Dict[Tuple[str, ...], List[int]] = {}
+        self._sums: Dict[Tuple[str, ...], float] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        counts: Optional[List[int]] = self._counts.get(label_values)
+        if counts is None:
+            counts = self._counts[label_values] = [0] * (len(self.buckets) + 1)
+            self._sums[label_values] = 0.0
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        self._sums[label_values] += value
+
+    def clear(self) -> None:
+        self._counts.clear()
+        self._sums.clear()
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        for label_values, counts in self._counts.items():
+            labels: str = _format_labels(self.label_names, label_values)
+            separator: str = "," if labels else ""
+            cumulative: int = 0
+            for bound, count in zip([*self.buckets, None], counts, strict=True):
+                cumulative += count
+                yield (
+                    f'{self.name}_bucket{{{labels}{separator}le="{_format_bound(bound)}"}}'
+                    f" {cumulative}"
+                )
+            yield f"{self.name}_sum{{{labels}}} {self._sums[label_values]}"
+            yield f"{self.name}_count{{{labels}}} {cumulative}"
+
+
+STATEMENT_DURATION: Histogram = Histogram(
+    name="db_statement_duration_seconds",
+    documentation="Time to execute a statement and fetch its rows.",
+    label_names=("statement",),
+    buckets=LATENCY_BUCKETS,
+)
+
+STATEMENT_ROWS: Histogram = Histogram(
+    name="db_statement_rows",
+    documentation="Rows returned (or affected) by a statement.",
+    label_names=("statement",),
+    buckets=ROWS_BUCKETS,
+)
+
+REQUEST_DURATION: Histogram = Histogram(
+    name="http_request_duration_seconds",
+    documentation="Time to answer a request, by route template.",
+    label_names=("method", "route", "status"),
+    buckets=LATENCY_BUCKETS,
+)
+
+HISTOGRAMS: Tuple[Histogram, ...] = (
+    STATEMENT_DURATION,
+    STATEMENT_ROWS,
+    REQUEST_DURATION,
+)
+
+
+def observe_statement(name: str, seconds: float, rows: int) -> None:
+    """
+    Records the execution of a statement.
+
+    Args:
+        name (str): The name of the statement (e.g. its `db_statements` variable).
+        seconds (float): The time to execute it and fetch its rows.
+        rows (int): The rows returned (or affected).
+    """
+
+    STATEMENT_DURATION.observe(seconds, name)
+    STATEMENT_ROWS.observe(rows, name)
+
+
+class MetricsMiddleware:
+    """Records the latency of every request, labelled by its route template."""
+
+    def __init__(self, app: ASGIApp):
+        self.app: ASGIApp = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start: float = time.perf_counter()
+        status_code: int = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            REQUEST_DURATION.observe(
+                time.perf_counter() - start,
+                scope["method"],
+                getattr(route, "path", UNMATCHED_ROUTE),
+                str(status_code),
+            )
+
+
+def _render_pool_metrics(pool_metrics: PoolMetrics) -> Iterator[str]:
+    name: str = "db_pool_checkout_wait_seconds"
+    yield f"# HELP {name} Time requests waited for a pooled connection."
+    yield f"# TYPE {name} histogram"
+    for bucket, bound in zip(
+        pool_metrics.checkout_wait.buckets,
+        [*CHECKOUT_WAIT_BUCKETS_MS, None],
+        strict=True,
+    ):
+        le: str = _format_bound(None if bound is None else bound / 1000)
+        yield f'{name}_bucket{{le="{le}"}} {bucket.count}'
+    yield f"{name}_sum {pool_metrics.checkout_wait.sum_ms / 1000}"
+    yield f"{name}_count {pool_metrics.checkout_wait.count}"
+
+    yield "# HELP db_pool_connections Connections of the pool by state."
+    yield "# TYPE db_pool_connections gauge"
+    current = pool_metrics.current
+    yield f'db_pool_connections{{state="in_use"}} {current.in_use}'
+    yield f'db_pool_connections{{state="idle"}} {current.idle}'
+    yield f"db_pool_max_connections {current.max_size}"
+    if current.waiting is not None:
+        yield f"db_pool_waiting_requests {current.waiting}"
+
+
+def render_metrics(pool_monitor: Optional[PoolMonitor] = None) -> str:
+    """
+    Renders all metrics in the Prometheus text format.
+
+    Args:
+        pool_monitor (Optional[PoolMonitor]): The monitor of the connection pool, if any.
+
+    Returns:
+        str: The exposition.
+    """
+
+    lines: List[str] = [line for histogram in HISTOGRAMS for line in histogram.render()]
+    if pool_monitor is not None:
+        lines.extend(_render_pool_metrics(pool_monitor.get_metrics()))
+    return "\n".join(lines) + "\n"
+
+
+def _get_optional_pool_monitor(request: Request) -> Optional[PoolMonitor]:
+    return getattr(request.state, "pool_monitor", None)
+
+
+router: APIRouter = APIRouter(tags=["Admin"])
+
+
+@router.get(path="/metrics", response_class=PlainTextResponse)
+async def get_metrics(
+    pool_monitor: Annotated[Optional[PoolMonitor], Depends(_get_optional_pool_monitor)],
+) -> PlainTextResponse:
+    return PlainTextResponse(render_metrics(pool_monitor), media_type=CONTENT_TYPE)
@@ -1,4 +1,4 @@
-from typing import Annotated, List, Type, Optional, Set
+from typing import Annotated, Dict, List, Type, Optional
 
 from pydantic import AfterValidator
 
@@ -6,13 +6,13 @@ from common.sorting import create_order_by_enum, validate_order_by_query_params
 
 company_sortable_fields: List[str] = ["name", "created_at", "last_updated_at"]
 OrderByCompany: Type = Annotated[
-    Optional[Set[create_order_by_enum(company_sortable_fields)]],
+    Optional[List[create_order_by_enum(company_sortable_fields)]],
     AfterValidator(validate_order_by_query_params),
 ]
 
 document_sortable_fields: List[str] = ["created_at", "last_updated_at"]
 OrderByDocument: Type = Annotated[
-    Optional[Set[create_order_by_enum(document_sortable_fields)]],
+    Optional[List[create_order_by_enum(document_sortable_fields)]],
     AfterValidator(validate_order_by_query_params),
 ]
 
@@ -20,13 +20,13 @@ order_sortable_fields: List[str] = [
     "amount",
 ]
 OrderByOrder: Type = Annotated[
-    Optional[Set[create_order_by_enum(order_sortable_fields)]],
+    Optional[List[create_order_by_enum(order_sortable_fields)]],
     AfterValidator(validate_order_by_query_params),
 ]
 
 profession_sortable_fields: List[str] = ["name"]
 OrderByProfession: Type = Annotated[
-    Optional[Set[create_order_by_enum(profession_sortable_fields)]],
+    Optional[List[create_order_by_enum(profession_sortable_fields)]],
     AfterValidator(validate_order_by_query_params),
 ]
 
@@ -36,6 +36,15 @@ user_sortable_fields: List[str] = [
     "last_updated_at",
 ]
 OrderByUser: Type = Annotated[
-    Optional[Set[create_order_by_enum(user_sortable_fields)]],
+    Optional[List[create_order_by_enum(user_sortable_fields)]],
     AfterValidator(validate_order_by_query_params),
 ]
+
+# the table of each list, every sortable field needs its indexes (db/migrations/001_indexes.sql)
+sortable_fields_by_table: Dict[str, List[str]] = {
+    "companies": company_sortable_fields,
+    "documents": document_sortable_fields,
+    "orders": order_sortable_fields,
+    "professions": profession_sortable_fields,
+    "users": user_sortable_fields,
+}
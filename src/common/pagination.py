@@ -1,18 +1,199 @@
-from typing import Generic, TypeVar, Sequence
+import base64
+import binascii
+import json
+from datetime import datetime
+from decimal import Decimal
+from enum import StrEnum
+from typing import Any, Dict, Generic, List, Optional, Set, TypeVar, Sequence
+from uuid import UUID
 
-from pydantic import conint, BaseModel, Field
+from fastapi import HTTPException
+from pydantic import (
+    conint,
+    BaseModel,
+    Field,
+    TypeAdapter,
+    model_serializer,
+)
+from pydantic_core import to_jsonable_python
+from starlette import status
+
+from common.sorting import OrderByField
+from common.trusted_rows import get_field
 
 DataT: TypeVar = TypeVar("DataT")
 
+# column that is always appended to the keyset so that page boundaries are stable
+CURSOR_TIE_BREAKER: str = "id"
+
+# sortable fields that can be NULL (sorted last), every other cursor key is NOT NULL
+NULLABLE_CURSOR_KEYS: Set[str] = {"last_updated_at"}
+
+# type of every sortable field (and the tie-breaker) to validate the values of a cursor
+CURSOR_KEY_TYPES: Dict[str, TypeAdapter] = {
+    "id": TypeAdapter(UUID),
+    "name": TypeAdapter(str),
+    "amount": TypeAdapter(Decimal),
+    "created_at": TypeAdapter(datetime),
+    "last_updated_at": TypeAdapter(Optional[datetime]),
+}
+
+
+class CountStrategy(StrEnum):
+    """
+    How the total_count of a LimitOffsetPage is determined.
+
+    - exact: COUNT(*) over all rows (full scan on large tables)
+    - estimate: the planner's row estimate (statistics, no scan)
+    - none: skip counting, total_count is omitted from the response
+    """
+
+    EXACT = "exact"
+    ESTIMATE = "estimate"
+    NONE = "none"
+
 
 class LimitOffsetPage(BaseModel, Generic[DataT]):
     items: Sequence[DataT]
     items_count: conint(ge=0)
-    total_count: conint(ge=0)
+    total_count: Optional[conint(ge=0)] = None
     limit: conint(ge=1, le=50)
     offset: conint(ge=0, le=1000)
 
+    @model_serializer(mode="wrap")
+    def _drop_skipped_total_count(self, handler):
+        # no return annotation, so that the OpenAPI schema stays the model's schema
+        data = handler(self)
+        if self.total_count is None:
+            data.pop("total_count", None)
+        return data
+
 
 class PaginationParams(BaseModel):
     limit: int = Field(10, ge=1, le=50)
     offset: int = Field(0, ge=0, le=1000)
+    count: CountStrategy = CountStrategy.EXACT
+
+
+class CursorPage(BaseModel, Generic[DataT]):
+    items: Sequence[DataT]
+    items_count: conint(ge=0)
+    limit: conint(ge=1, le=50)
+    next_cursor: Optional[str] = None
+
+
+class CursorPaginationParams(BaseModel):
+    limit: int = Field(10, ge=1, le=50)
+    cursor: Optional[str] = None
+
+
+def get_cursor_keys(order_by_fields: List[OrderByField]) -> List[str]:
+    """
+    Returns the column names that make up the keyset of a cursor.
+
+    Args:
+        order_by_fields (List[OrderByField]): The fields the page is ordered by.
+
+    Returns:
+        List[str]: The order_by field names followed by the tie-breaker column.
+    """
+
+    return [field.name for field in order_by_fields] + [CURSOR_TIE_BREAKER]
+
+
+def encode_cursor(item: Any, order_by_fields: List[OrderByField]) -> str:
+    """
+    Encodes the keyset of an item into an opaque, url-safe cursor.
+
+    Args:
+        item (Any): The last item of a page (a model or a trusted row).
+        order_by_fields (List[OrderByField]): The fields the page is ordered by.
+
+    Returns:
+        str: The cursor pointing right after the given item.
+    """
+
+    keys: List[str] = get_cursor_keys(order_by_fields)
+    payload: dict = {
+        "k": keys,
+        "v": to_jsonable_python([get_field(item, key) for key in keys]),
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def decode_cursor(
+    cursor: Optional[str], order_by_fields: List[OrderByField]
+) -> Optional[List[Any]]:
+    """
+    Decodes a cursor created by `encode_cursor` into its keyset values.
+
+    Args:
+        cursor (Optional[str]): The opaque cursor from the query parameters.
+        order_by_fields (List[OrderByField]): The fields the page is ordered by.
+
+    Returns:
+        Optional[List[Any]]: The keyset values (of the fields' types) or None if no cursor
+            was given.
+
+    Raises:
+        HTTPException: If the cursor is malformed, holds values of the wrong type or was
+            created for a different order_by.
+    """
+
+    if cursor is None:
+        return None
+
+    try:
+        payload: dict = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        keys, values = payload["k"], payload["v"]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor."
+        ) from None
+
+    if keys != get_cursor_keys(order_by_fields):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor does not match the requested order_by.",
+        )
+
+    # the values are bound as query parameters, a wrong type would fail in the database
+    if not isinstance(values, list):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor."
+        )
+    try:
+        return [
+            CURSOR_KEY_TYPES[key].validate_python(value)
+            for key, value in zip(keys, values, strict=True)
+        ]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor."
+        ) from None
+
+
+def create_cursor_page(
+    items: List[DataT], limit: int, order_by_fields: List[OrderByField]
+) -> CursorPage[DataT]:
+    """
+    Builds a CursorPage from a keyset query that fetched up to `limit + 1` items.
+
+    Args:
+        items (List[DataT]): The fetched items, one more than `limit` if there is a next page.
+        limit (int): The requested page size.
+        order_by_fields (List[OrderByField]): The fields the page is ordered by.
+
+    Returns:
+        CursorPage[DataT]: The page with `next_cursor` set if there are more items.
+    """
+
+    has_next: bool = len(items) > limit
+    items: List[DataT] = items[:limit]
+
+    return CursorPage(
+        items=items,
+        items_count=len(items),
+        limit=limit,
+        next_cursor=encode_cursor(items[-1], order_by_fields) if has_next else None,
+    )
@@ -0,0 +1,219 @@
+import asyncio
+import bisect
+import time
+from collections import deque
+from contextlib import suppress
+from datetime import UTC, datetime
+from typing import Callable, Deque, Dict, List, Optional, Self
+
+from fastapi import HTTPException, Request
+from pydantic import BaseModel, confloat, conint
+from starlette import status
+
+from common.db_cost import record_pool_wait
+
+# upper bounds (ms) of the checkout wait histogram buckets, the last bucket is +Inf
+CHECKOUT_WAIT_BUCKETS_MS: tuple[float, ...] = (
+    1,
+    5,
+    10,
+    25,
+    50,
+    100,
+    250,
+    500,
+    1000,
+    2500,
+    5000,
+)
+
+# number of samples kept per process (at the default interval: the last 5 minutes)
+MAX_POOL_SAMPLES: int = 300
+
+
+class PoolSample(BaseModel):
+    sampled_at: datetime
+    # open connections (in use + idle)
+    size: conint(ge=0)
+    max_size: conint(ge=0)
+    in_use: conint(ge=0)
+    idle: conint(ge=0)
+    # requests queued for a connection, None if the pool doesn't report it
+    waiting: Optional[conint(ge=0)] = None
+    # connections opened above the persistent pool size (SQLAlchemy only)
+    overflow: Optional[conint(ge=0)] = None
+    # in_use / max_size
+    utilization: confloat(ge=0)
+    # all connections in use or requests waiting for one
+    saturated: bool
+
+
+class HistogramBucket(BaseModel):
+    # upper bound in ms, None for +Inf
+    le: Optional[float]
+    # cumulative number of observations <= le
+    count: conint(ge=0)
+
+
+class CheckoutWaitHistogram(BaseModel):
+    buckets: List[HistogramBucket]
+    count: conint(ge=0)
+    sum_ms: confloat(ge=0)
+
+
+class PoolMetrics(BaseModel):
+    current: PoolSample
+    samples: List[PoolSample]
+    checkout_wait: CheckoutWaitHistogram
+    # cumulative counters reported by the pool itself (e.g. psycopg's get_stats())
+    counters: Dict[str, int] = {}
+
+
+def create_pool_sample(
+    size: int,
+    max_size: int,
+    in_use: int,
+    waiting: Optional[int] = None,
+    overflow: Optional[int] = None,
+) -> PoolSample:
+    """
+    Builds a PoolSample from the gauges of a connection pool.
+
+    Args:
+        size (int): The open connections.
+        max_size (int): The upper bound of open connections.
+        in_use (int): The connections checked out by requests.
+        waiting (Optional[int]): The requests waiting for a connection, if known.
+        overflow (Optional[int]): The connections above the persistent pool size, if any.
+
+    Returns:
+        PoolSample: The sample taken now.
+    """
+
+    return PoolSample(
+        sampled_at=datetime.now(UTC),
+        size=size,
+        max_size=max_size,
+        in_use=in_use,
+        idle=max(size - in_use, 0),
+        waiting=waiting,
+        overflow=overflow,
+        utilization=in_use / max_size if max_size else 0.0,
+        saturated=(bool(max_size) and in_use >= max_size) or bool(waiting),
+    )
+
+
+class PoolMonitor:
+    """
+    Samples a connection pool at a fixed interval in the background and records
+    how long requests wait to check out a connection.
+
+    The samples are kept in a ring buffer, so that pool saturation between two
+    scrapes of the metrics endpoint is not lost.
+    """
+
+    def __init__(
+        self,
+        sample: Callable[[], PoolSample],
+        counters: Callable[[], Dict[str, int]] = dict,
+        interval: float = 1.0,
+        max_samples: int = MAX_POOL_SAMPLES,
+    ):
+        self._sample: Callable[[], PoolSample] = sample
+        self._counters: Callable[[], Dict[str, int]] = counters
+        self._interval: float = interval
+        self._samples: Deque[PoolSample] = deque(maxlen=max_samples)
+        self._bucket_counts: List[int] = [0] * (len(CHECKOUT_WAIT_BUCKETS_MS) + 1)
+        self._wait_count: int = 0
+        self._wait_sum_ms: float = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    async def __aenter__(self) -> Self:
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+
+    async def _run(self) -> None:
+        while True:
+            self._samples.append(self._sample())
+            await asyncio.sleep(self._interval)
+
+    def observe_checkout_wait(self, wait_ms: float) -> None:
+        """
+        Records the time a request waited for a connection.
+
+        Args:
+            wait_ms (float): The wait in milliseconds.
+        """
+
+        self._bucket_counts[bisect.bisect_left(CHECKOUT_WAIT_BUCKETS_MS, wait_ms)] += 1
+        self._wait_count += 1
+        self._wait_sum_ms += wait_ms
+        record_pool_wait(wait_ms)
+
+    def get_metrics(self) -> PoolMetrics:
+        """
+        Returns the current state of the pool, the recent samples and the checkout waits.
+
+        Returns:
+            PoolMetrics: The pool metrics.
+        """
+
+        cumulative: int = 0
+        buckets: List[HistogramBucket] = []
+        for upper_bound, bucket_count in zip(
+            [*CHECKOUT_WAIT_BUCKETS_MS, None], self._bucket_counts, strict=True
+        ):
+            cumulative += bucket_count
+            buckets.append(HistogramBucket(le=upper_bound, count=cumulative))
+
+        return PoolMetrics(
+            current=self._sample(),
+            samples=list(self._samples),
+            checkout_wait=CheckoutWaitHistogram(
+                buckets=buckets, count=self._wait_count, sum_ms=self._wait_sum_ms
+            ),
+            counters=self._counters(),
+        )
+
+
+def get_pool_monitor(request: Request) -> PoolMonitor:
+    """
+    Provides the PoolMonitor of the application (created in the lifespan).
+
+    Args:
+        request (Request): The incoming FastAPI request.
+
+    Returns:
+        PoolMonitor: The monitor of the connection pool.
+
+    Raises:
+        HTTPException: If the pool is not monitored.
+    """
+
+    pool_monitor: Optional[PoolMonitor] = getattr(request.state, "pool_monitor", None)
+    if pool_monitor is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Connection pool metrics are not available.",
+        )
+    return pool_monitor
+
+
+def elapsed_ms(start: float) -> float:
+    """
+    Returns the milliseconds since `start` (a `time.perf_counter()` value).
+
+    Args:
+        start (float): The start time.
+
+    Returns:
+        float: The elapsed time in milliseconds.
+    """
+
+    return (time.perf_counter() - start) * 1000
@@ -0,0 +1,199 @@
+import asyncio
+import logging
+import math
+import re
+import time
+from contextlib import suppress
+from typing import Awaitable, Callable, List, Optional, Self, Tuple
+
+from fastapi import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from common.settings import DatabaseSettings, ReadYourWrites, get_settings
+from common.transactions import SAFE_METHODS, is_read_only
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# set after a write: the LSN of the commit (lsn) or the unix time of the write (time)
+LAST_WRITE_COOKIE: str = "db_last_write"
+
+# textual form of a pg_lsn, e.g. 16/B374D848
+LSN_PATTERN: re.Pattern = re.compile(r"^[0-9A-Fa-f]{1,8}/[0-9A-Fa-f]{1,8}$")
+
+
+class ReplicaMonitor:
+    """
+    Measures the replay lag of the replica at a fixed interval in the background.
+
+    Reads are routed to the replica only while the last measurement succeeded and
+    the lag is below `max_lag`.
+    """
+
+    def __init__(
+        self,
+        measure: Callable[[], Awaitable[float]],
+        max_lag: float,
+        interval: float = 1.0,
+    ):
+        self._measure: Callable[[], Awaitable[float]] = measure
+        self._max_lag: float = max_lag
+        self._interval: float = interval
+        self._lag: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def __aenter__(self) -> Self:
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                self._lag = await self._measure()
+            except Exception:
+                # unreachable replica: route the reads to the primary
+                if self._lag is not None:
+                    logger.warning(
+                        "Replica lag can't be measured, reads use the primary.",
+                        exc_info=True,
+                    )
+                self._lag = None
+            await asyncio.sleep(self._interval)
+
+    @property
+    def lag(self) -> Optional[float]:
+        """The last measured replay lag in seconds, None if unknown."""
+        return self._lag
+
+    @property
+    def available(self) -> bool:
+        """Whether reads may be routed to the replica."""
+        return self._lag is not None and self._lag <= self._max_lag
+
+
+def use_replica(request: Request, settings: DatabaseSettings) -> bool:
+    """
+    Decides whether a request reads from the replica.
+
+    Only read-only requests (GET, HEAD, OPTIONS, see common.transactions) are routed to
+    the replica, and only while its lag is below `replica_max_lag`. With the time-based
+    read-your-writes, the requests of a client that wrote within `read_your_writes_window`
+    use the primary.
+
+    Args:
+        request (Request): The incoming FastAPI request.
+        settings (DatabaseSettings): The database settings.
+
+    Returns:
+        bool: True for the replica, False for the primary.
+    """
+
+    replica_monitor: Optional[ReplicaMonitor] = getattr(
+        request.state, "replica_monitor", None
+    )
+    if (
+        replica_monitor is None
+        or not is_read_only(request)
+        or not replica_monitor.available
+    ):
+        return False
+
+    if settings.read_your_writes == ReadYourWrites.TIME:
+        with suppress(ValueError):
+            written_at: float = float(request.cookies.get(LAST_WRITE_COOKIE, ""))
+            return time.time() - written_at >= settings.read_your_writes_window
+
+    return True
+
+
+def get_required_lsn(request: Request, settings: DatabaseSettings) -> Optional[str]:
+    """
+    Returns the LSN the replica must have replayed to serve the request (lsn mode).
+
+    Args:
+        request (Request): The incoming FastAPI request.
+        settings (DatabaseSettings): The database settings.
+
+    Returns:
+        Optional[str]: The LSN of the client's last write, None if there is nothing to wait for.
+    """
+
+    if settings.read_your_writes != ReadYourWrites.LSN:
+        return None
+
+    lsn: Optional[str] = request.cookies.get(LAST_WRITE_COOKIE)
+    return lsn if lsn and LSN_PATTERN.match(lsn) else None
+
+
+def tracks_write_lsn(request: Request, settings: DatabaseSettings) -> bool:
+    """
+    Whether the LSN of the request's commit is needed (set it as `request.state.write_lsn`).
+
+    Args:
+        request (Request): The incoming FastAPI request.
+        settings (DatabaseSettings): The database settings.
+
+    Returns:
+        bool: True for writes while the lsn-based read-your-writes is active.
+    """
+
+    return (
+        settings.read_your_writes == ReadYourWrites.LSN
+        and not is_read_only(request)
+        and getattr(request.state, "replica_monitor", None) is not None
+    )
+
+
+class ReadYourWritesMiddleware:
+    """
+    Sets the LAST_WRITE_COOKIE on the successful responses of writes.
+
+    The response of a write is held back until the dependencies of the request have
+    exited, i.e. the transaction is committed and its LSN is known. Without a replica
+    (or with read-your-writes disabled) requests pass through.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app: ASGIApp = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        settings: DatabaseSettings = get_settings()
+        if (
+            scope["type"] != "http"
+            or scope["method"] in SAFE_METHODS
+            or settings.replica_dsn is None
+            or settings.read_your_writes == ReadYourWrites.DISABLED
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        messages: List[Message] = []
+
+        async def buffer(message: Message) -> None:
+            messages.append(message)
+
+        await self.app(scope, receive, buffer)
+
+        last_write: Optional[str] = (
+            str(time.time())
+            if settings.read_your_writes == ReadYourWrites.TIME
+            else scope.get("state", {}).get("write_lsn")
+        )
+        start: Message = messages[0]
+        if last_write and start["status"] < 400:
+            cookie: str = (
+                f"{LAST_WRITE_COOKIE}={last_write}; "
+                f"Max-Age={math.ceil(settings.read_your_writes_window)}; "
+                "Path=/; HttpOnly; SameSite=Lax"
+            )
+            headers: List[Tuple[bytes, bytes]] = list(start.get("headers", []))
+            headers.append((b"set-cookie", cookie.encode("latin-1")))
+            messages[0] = {**start, "headers": headers}
+
+        for message in messages:
+            await send(message)
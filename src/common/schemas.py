@@ -41,7 +41,7 @@ class BaseInput(BaseModel):
 import json
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional, Annotated, Type
+from typing import Optional, Annotated, Type, List
 from uuid import uuid4
 
 from pydantic import (
@@ -52,6 +52,7 @@ from pydantic import (
     Field,
     UUID4,
     model_validator,
+    conint,
 )
 
 # region Profession
@@ -323,3 +324,21 @@ class UserCompanyLinkResponse(BaseModel):
 
 
 # endregion
+
+# region Bulk import
+
+
+class RejectedRow(BaseModel):
+    line: conint(ge=1)
+    error: str
+
+
+class BulkImportResult(BaseModel):
+    received_count: conint(ge=0) = 0
+    imported_count: conint(ge=0) = 0
+    rejected_count: conint(ge=0) = 0
+    # only the first rejected rows are reported, see rejected_count for the total
+    rejected: List[RejectedRow] = []
+
+
+# endregion
@@ -0,0 +1,340 @@
+import asyncio
+import hashlib
+import logging
+import random
+import re
+from collections import deque
+from contextvars import Context, ContextVar
+from datetime import UTC, datetime
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Self,
+    Sequence,
+    Set,
+)
+
+from fastapi import HTTPException, Request
+from pydantic import BaseModel
+from starlette import status
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from common.settings import DatabaseSettings
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Statements that are slower than `DatabaseSettings.explain_threshold`, or picked at random
+# (`explain_sample_rate`), are run again as EXPLAIN ANALYZE on another connection in the
+# background. The plans are kept in a ring buffer and grouped by the fingerprint of the
+# statement (e.g. one per order_by of a list), see GET /admin/slow-queries.
+EXPLAIN_PREFIX: str = "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) "
+# milliseconds an EXPLAIN ANALYZE may run, at most the configured statement_timeout
+EXPLAIN_TIMEOUT_MS: int = 30_000
+# EXPLAIN ANALYZE executes the statement again: only one at a time, others are dropped
+MAX_PENDING_EXPLAINS: int = 1
+
+# only queries are run again (in a READ ONLY transaction)
+_EXPLAINABLE: re.Pattern = re.compile(r"^\s*(SELECT|WITH)\b", re.IGNORECASE)
+_LITERALS: re.Pattern = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_WHITESPACE: re.Pattern = re.compile(r"\s+")
+
+# runs EXPLAIN_PREFIX + statement with the parameters and returns the JSON plan
+Explain = Callable[[str, Any], Awaitable[Any]]
+
+
+class ExplainedStatement(BaseModel):
+    fingerprint: str
+    statement: str
+    # the types of the parameters: their values (e.g. of a user) are not kept
+    params: Optional[Dict[str, str] | List[str]] = None
+    route: Optional[str] = None
+    duration_ms: float
+    # "slow" (above the threshold) or "sampled"
+    reason: str
+    captured_at: datetime
+    plan: Any
+
+
+class StatementPlans(BaseModel):
+    fingerprint: str
+    statement: str
+    count: int
+    max_duration_ms: float
+    plans: List[ExplainedStatement]
+
+
+def get_fingerprint(statement: str) -> str:
+    """
+    Identifies a statement independent of its literals and whitespace.
+
+    Args:
+        statement (str): The SQL text (parameters are placeholders already).
+
+    Returns:
+        str: A short hash.
+    """
+
+    normalized: str = _WHITESPACE.sub(" ", _LITERALS.sub("?", statement)).strip()
+    return hashlib.blake2b(normalized.encode(), digest_size=8).hexdigest()
+
+
+def get_explain_timeout(settings: DatabaseSettings) -> int:
+    """
+    Returns the statement_timeout of an EXPLAIN ANALYZE.
+
+    Args:
+        settings (DatabaseSettings): The statement_timeout of the connections.
+
+    Returns:
+        int: EXPLAIN_TIMEOUT_MS, capped at the statement_timeout (if set).
+    """
+
+    if settings.statement_timeout:
+        return min(EXPLAIN_TIMEOUT_MS, settings.statement_timeout)
+    return EXPLAIN_TIMEOUT_MS
+
+
+def _format_params(params: Any) -> Optional[Dict[str, str] | List[str]]:
+    if isinstance(params, Mapping):
+        return {str(name): type(value).__name__ for name, value in params.items()}
+    if isinstance(params, Sequence) and not isinstance(params, (str, bytes)):
+        return [type(value).__name__ for value in params]
+    return None
+
+
+class SlowQueryLog:
+    """Explains slow or sampled statements in the background and keeps the plans."""
+
+    def __init__(
+        self,
+        explain: Explain,
+        threshold_ms: int,
+        sample_rate: float,
+        max_plans: int,
+    ):
+        self._explain: Explain = explain
+        self._threshold_ms: int = threshold_ms
+        self._sample_rate: float = sample_rate
+        self._plans: Deque[ExplainedStatement] = deque(maxlen=max_plans)
+        self._pending: Set[asyncio.Task] = set()
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        for task in self._pending:
+            task.cancel()
+        await asyncio.gather(*self._pending, return_exceptions=True)
+
+    def get_reason(self, duration_ms: float) -> Optional[str]:
+        """
+        Decides whether a statement is explained (cheap, called for every statement).
+
+        Args:
+            duration_ms (float): The time the statement took.
+
+        Returns:
+            Optional[str]: "slow", "sampled" or None.
+        """
+
+        if self._threshold_ms and duration_ms >= self._threshold_ms:
+            return "slow"
+        if self._sample_rate and random.random() < self._sample_rate:
+            return "sampled"
+        return None
+
+    def submit(
+        self,
+        statement: str,
+        params: Any,
+        duration_ms: float,
+        reason: str,
+        route: Optional[str],
+    ) -> None:
+        """
+        Explains a statement in the background, unless it isn't a query or another
+        statement is being explained.
+
+        Args:
+            statement (str): The SQL text with placeholders.
+            params (Any): The parameters of the execution.
+            duration_ms (float): The time the statement took.
+            reason (str): Why it is explained.
+            route (Optional[str]): The route template of the request.
+        """
+
+        if len(self._pending) >= MAX_PENDING_EXPLAINS or not _EXPLAINABLE.match(
+            statement
+        ):
+            return
+
+        # an empty context: the EXPLAIN is neither part of the request's cost nor observed
+        task: asyncio.Task = asyncio.create_task(
+            self._capture(statement, params, duration_ms, reason, route),
+            context=Context(),
+        )
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _capture(
+        self,
+        statement: str,
+        params: Any,
+        duration_ms: float,
+        reason: str,
+        route: Optional[str],
+    ) -> None:
+        try:
+            plan: Any = await self._explain(statement, params)
+        except Exception:
+            # e.g. the statement timed out again, there is nothing to keep
+            logger.warning("EXPLAIN of a %s query failed.", reason, exc_info=True)
+            return
+
+        self._plans.append(
+            ExplainedStatement(
+                fingerprint=get_fingerprint(statement),
+                statement=statement.strip(),
+                params=_format_params(params),
+                route=route,
+                duration_ms=duration_ms,
+                reason=reason,
+                captured_at=datetime.now(UTC),
+                plan=plan,
+            )
+        )
+
+    def get_plans(self) -> List[StatementPlans]:
+        """
+        Returns the kept plans grouped by statement fingerprint, slowest first.
+
+        Returns:
+            List[StatementPlans]: The groups, each with its plans (newest first).
+        """
+
+        groups: Dict[str, List[ExplainedStatement]] = {}
+        for explained in reversed(self._plans):
+            groups.setdefault(explained.fingerprint, []).append(explained)
+
+        plans: List[StatementPlans] = [
+            StatementPlans(
+                fingerprint=fingerprint,
+                statement=explained[0].statement,
+                count=len(explained),
+                max_duration_ms=max(item.duration_ms for item in explained),
+                plans=explained,
+            )
+            for fingerprint, explained in groups.items()
+        ]
+        return sorted(plans, key=lambda group: group.max_duration_ms, reverse=True)
+
+
+def create_slow_query_log(
+    explain: Explain, settings: DatabaseSettings
+) -> Optional[SlowQueryLog]:
+    """
+    Creates the SlowQueryLog of an app (in the lifespan).
+
+    Args:
+        explain (Explain): Runs EXPLAIN ANALYZE on a connection of the primary.
+        settings (DatabaseSettings): The threshold, the sample rate and the ring size.
+
+    Returns:
+        Optional[SlowQueryLog]: The log, None if neither threshold nor sampling is set.
+    """
+
+    if not settings.explain_threshold and not settings.explain_sample_rate:
+        return None
+    return SlowQueryLog(
+        explain=explain,
+        threshold_ms=settings.explain_threshold,
+        sample_rate=settings.explain_sample_rate,
+        max_plans=settings.explain_max_plans,
+    )
+
+
+# the scope of the running request: the statement hooks (cursors, engine events) find
+# the SlowQueryLog of the app in its state and the route template in it
+_request_scope: ContextVar[Optional[Scope]] = ContextVar("request_scope", default=None)
+
+
+class SlowQueryMiddleware:
+    """Makes the scope of a request available to the statement hooks."""
+
+    def __init__(self, app: ASGIApp):
+        self.app: ASGIApp = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = _request_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_scope.reset(token)
+
+
+def observe_slow_query(
+    get_statement: Callable[[], str], params: Any, duration_ms: float
+) -> None:
+    """
+    Passes a statement of the running request to the SlowQueryLog of its app, if it is
+    slow or sampled.
+
+    Args:
+        get_statement (Callable[[], str]): Returns the SQL text (only called if needed).
+        params (Any): The parameters of the execution.
+        duration_ms (float): The time the statement took.
+    """
+
+    scope: Optional[Scope] = _request_scope.get()
+    if scope is None:
+        return
+    slow_query_log: Optional[SlowQueryLog] = scope.get("state", {}).get(
+        "slow_query_log"
+    )
+    if slow_query_log is None:
+        return
+
+    reason: Optional[str] = slow_query_log.get_reason(duration_ms)
+    if reason is not None:
+        slow_query_log.submit(
+            get_statement(),
+            params,
+            duration_ms,
+            reason,
+            getattr(scope.get("route"), "path", None),
+        )
+
+
+def get_slow_query_log(request: Request) -> SlowQueryLog:
+    """
+    Provides the SlowQueryLog of the application (created in the lifespan).
+
+    Args:
+        request (Request): The incoming FastAPI request.
+
+    Returns:
+        SlowQueryLog: The log of explained statements.
+
+    Raises:
+        HTTPException: If neither DB_EXPLAIN_THRESHOLD nor DB_EXPLAIN_SAMPLE_RATE is set.
+    """
+
+    slow_query_log: Optional[SlowQueryLog] = getattr(
+        request.state, "slow_query_log", None
+    )
+    if slow_query_log is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Slow query capture is disabled (DB_EXPLAIN_THRESHOLD, DB_EXPLAIN_SAMPLE_RATE).",
+        )
+    return slow_query_log
@@ -35,8 +35,10 @@ def _parse_str_order_by(name: StrEnum) -> OrderByField:
     return OrderByField(name=name.value[1:], direction=Direction(name.value[0]))
 
 
-def parse_order_by(order_by: Set[StrEnum]) -> List[OrderByField]:
-    return [_parse_str_order_by(ob) for ob in order_by]
+def parse_order_by(order_by: List[StrEnum]) -> List[OrderByField]:
+    # in the order of the query (the first field is the primary sort key), which the
+    # ORDER BY, the cursor and the keyset predicate share on every worker
+    return [_parse_str_order_by(ob) for ob in dict.fromkeys(order_by)]
 
 
 def check_for_duplicates(fields: List[OrderByField]):
@@ -59,15 +61,15 @@ def check_for_duplicates(fields: List[OrderByField]):
         )
 
 
-def validate_order_by_query_params(order_by: Set[StrEnum]) -> List[OrderByField]:
+def validate_order_by_query_params(order_by: List[StrEnum]) -> List[OrderByField]:
     """
     Validates the order_by query parameters and checks for conflicting sorting directions.
 
     Args:
-        order_by (Set[StrEnum]): A set of order_by parameters.
+        order_by (List[StrEnum]): The order_by parameters, in the order of the query.
 
     Returns:
-        List[OrderByField]: A list of validated order_by fields.
+        List[OrderByField]: The validated order_by fields, without repeated parameters.
 
     Raises:
         ValueError: If a field is sorted in both ascending and descending order.
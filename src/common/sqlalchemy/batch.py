@@ -0,0 +1,28 @@
+from typing import Any, List
+
+from pydantic import UUID4
+from sqlalchemy import ARRAY, Select, any_, bindparam
+
+
+def create_batch_query(query: Select, ids: List[UUID4], model: Any) -> Select:
+    """
+    Restricts a SQLAlchemy Select query to the given ids with `id = ANY(:ids)`.
+
+    The ids are bound as a single array parameter, so the statement is the same
+    for any number of ids (unlike an expanding IN clause).
+
+    Args:
+        query (Select): The SQLAlchemy query to modify.
+        ids (List[UUID4]): The requested ids.
+        model (Any): The SQLAlchemy model class or Core table.
+
+    Returns:
+        Select: The modified query with the WHERE clause.
+    """
+
+    tbl = getattr(model, "__table__", model)
+    id_column = tbl.c.id
+
+    return query.where(
+        id_column == any_(bindparam("ids", value=ids, type_=ARRAY(id_column.type)))
+    )
@@ -0,0 +1,115 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from typing import AsyncIterator, Optional
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from psycopg.errors import LockNotAvailable, QueryCanceled
+from sqlalchemy import TextClause, text
+from sqlalchemy.exc import DBAPIError, OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from common.deadlines import (
+    Deadline,
+    DeadlineExceeded,
+    TimeoutPhase,
+    create_timeout_response,
+)
+
+# SET LOCAL with parameters, session-wide (is_local false) on connections in autocommit mode
+set_timeouts_query: TextClause = text(
+    """
+    SELECT set_config('statement_timeout', :statement_timeout, :is_local),
+           set_config('lock_timeout', :lock_timeout, :is_local)
+    """
+)
+
+reset_timeouts_query: TextClause = text(
+    """
+    SELECT set_config(name, reset_val, false)
+    FROM pg_settings
+    WHERE name IN ('statement_timeout', 'lock_timeout')
+    """
+)
+
+
+@asynccontextmanager
+async def checkout_deadline(deadline: Optional[Deadline]) -> AsyncIterator[None]:
+    """
+    Bounds the wait for a pooled connection by the remaining budget (the engine's
+    pool_timeout can't be set per checkout).
+
+    Args:
+        deadline (Optional[Deadline]): The deadline of the request, None keeps pool_timeout.
+
+    Raises:
+        DeadlineExceeded: If no connection became available in time.
+    """
+
+    if deadline is None:
+        yield
+        return
+
+    try:
+        async with asyncio.timeout(deadline.remaining):
+            yield
+    except TimeoutError as exc:
+        raise DeadlineExceeded(TimeoutPhase.POOL) from exc
+
+
+@asynccontextmanager
+async def statement_deadline(
+    connection: AsyncConnection | AsyncSession,
+    deadline: Optional[Deadline],
+    lock_timeout: int,
+    autocommit: bool,
+) -> AsyncIterator[None]:
+    """
+    Limits the statements of a request to the remaining budget (statement_timeout,
+    lock_timeout), for its transaction or, in autocommit mode, until the request ends.
+
+    Args:
+        connection (AsyncConnection | AsyncSession): A connection or session with a checked out connection.
+        deadline (Optional[Deadline]): The deadline of the request, None keeps the defaults.
+        lock_timeout (int): The configured lock timeout (ms), 0 for the remaining budget.
+        autocommit (bool): Whether the connection runs in autocommit mode.
+
+    Raises:
+        DeadlineExceeded: If nothing of the budget is left.
+    """
+
+    if deadline is None:
+        yield
+        return
+
+    await connection.execute(
+        set_timeouts_query,
+        {**deadline.get_timeouts(lock_timeout), "is_local": not autocommit},
+    )
+    try:
+        yield
+    finally:
+        if autocommit:
+            # the pool doesn't reset session settings, a broken connection is discarded
+            with suppress(DBAPIError):
+                await connection.execute(reset_timeouts_query)
+
+
+async def pool_timeout_handler(request: Request, exc: PoolTimeout) -> JSONResponse:
+    return create_timeout_response(request, TimeoutPhase.POOL)
+
+
+async def operational_error_handler(
+    request: Request, exc: OperationalError
+) -> JSONResponse:
+    """
+    Answers a statement cancelled by statement_timeout or lock_timeout, other
+    operational errors are raised again.
+    """
+
+    if isinstance(exc.orig, LockNotAvailable):
+        return create_timeout_response(request, TimeoutPhase.LOCK)
+    if isinstance(exc.orig, QueryCanceled):
+        return create_timeout_response(request, TimeoutPhase.STATEMENT)
+    raise exc
@@ -1,13 +1,61 @@
-from typing import AsyncGenerator
+import time
+from contextlib import AsyncExitStack
+from typing import Any, AsyncGenerator, Dict, Optional
 
 from fastapi import Request
 from sqlalchemy.ext.asyncio import AsyncSession, AsyncConnection
 
+from common.deadlines import Deadline, get_deadline
+from common.disconnect import cancel_on_disconnect
+from common.pool_metrics import elapsed_ms
+from common.replica import get_required_lsn, tracks_write_lsn, use_replica
+from common.settings import DatabaseSettings, ReadTransactions, get_settings
+from common.sqlalchemy.deadlines import checkout_deadline, statement_deadline
+from common.sqlalchemy.disconnect import get_cancel
+from common.sqlalchemy.replica import get_current_lsn, has_replayed_lsn
+from common.transactions import is_read_only
+
+
+def get_read_execution_options(read_transactions: ReadTransactions) -> Dict[str, Any]:
+    """
+    Execution options of the connection of a read-only request (common.transactions),
+    reset by the pool when the connection is returned.
+
+    Args:
+        read_transactions (ReadTransactions): Autocommit, READ ONLY or a regular transaction.
+
+    Returns:
+        Dict[str, Any]: The options for `AsyncConnection.execution_options`.
+    """
+
+    if read_transactions == ReadTransactions.AUTOCOMMIT:
+        # begin() and commit() don't reach the server
+        return {"isolation_level": "AUTOCOMMIT"}
+    if read_transactions == ReadTransactions.READ_ONLY:
+        return {"postgresql_readonly": True}
+    return {}
+
+
+def is_autocommit(execution_options: Dict[str, Any]) -> bool:
+    return execution_options.get("isolation_level") == "AUTOCOMMIT"
+
 
 async def get_db_connection(request: Request) -> AsyncGenerator[AsyncConnection, None]:
     """
     Provides an asynchronous SQLAlchemy connection from the request's engine.
 
+    With a replica, safe requests get a connection to the replica (see common.replica)
+    unless it lags behind or hasn't replayed the client's last write yet. Everything
+    else uses the primary.
+
+    Read-only requests (common.transactions) run in autocommit mode or in a READ ONLY
+    transaction (`DB_READ_TRANSACTIONS`), all others in a transaction that is committed
+    at the end of the request.
+
+    The deadline of the request (common.deadlines) bounds the wait for the pool and
+    limits its statements (SET LOCAL statement_timeout and lock_timeout). The statements
+    of read-only requests are cancelled if the client disconnects (common.disconnect).
+
     Args:
         request (Request): The incoming FastAPI request containing the connection pool.
 
@@ -15,14 +63,74 @@ async def get_db_connection(request: Request) -> AsyncGenerator[AsyncConnection,
         AsyncGenerator[AsyncConnection, None]: An asynchronous generator yielding a database connection.
     """
 
-    async with request.state.conn_pool._engine.begin() as connection:
-        yield connection
+    settings: DatabaseSettings = get_settings()
+    read_execution_options: Dict[str, Any] = get_read_execution_options(
+        settings.read_transactions
+    )
+    deadline: Optional[Deadline] = get_deadline(request=request, settings=settings)
+
+    if use_replica(request=request, settings=settings):
+        async with AsyncExitStack() as stack:
+            async with checkout_deadline(deadline):
+                connection: AsyncConnection = await stack.enter_async_context(
+                    request.state.replica_pool._engine.connect()
+                )
+            await connection.execution_options(**read_execution_options)
+            async with (
+                connection.begin(),
+                statement_deadline(
+                    connection,
+                    deadline,
+                    settings.lock_timeout,
+                    autocommit=is_autocommit(read_execution_options),
+                ),
+                cancel_on_disconnect(request, await get_cancel(connection)),
+            ):
+                lsn: Optional[str] = get_required_lsn(
+                    request=request, settings=settings
+                )
+                if lsn is None or await has_replayed_lsn(
+                    connection=connection, lsn=lsn
+                ):
+                    yield connection
+                    return
+
+    read_only: bool = is_read_only(request)
+    checkout_start: float = time.perf_counter()
+    async with AsyncExitStack() as stack:
+        async with checkout_deadline(deadline):
+            connection = await stack.enter_async_context(
+                request.state.conn_pool._engine.connect()
+            )
+        request.state.pool_monitor.observe_checkout_wait(elapsed_ms(checkout_start))
+        if read_only:
+            await connection.execution_options(**read_execution_options)
+
+        async with (
+            connection.begin(),
+            statement_deadline(
+                connection,
+                deadline,
+                settings.lock_timeout,
+                autocommit=read_only and is_autocommit(read_execution_options),
+            ),
+            cancel_on_disconnect(request, await get_cancel(connection)),
+        ):
+            yield connection
+
+        if tracks_write_lsn(request=request, settings=settings):
+            # reads of the client wait for the replica to replay this commit
+            request.state.write_lsn = await get_current_lsn(connection=connection)
 
 
 async def get_db_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
     """
     Provides an asynchronous SQLAlchemy session with an active transaction.
 
+    Routed like `get_db_connection`: safe requests use the replica if it is available.
+    Read-only requests run as configured by `DB_READ_TRANSACTIONS`, within the deadline
+    of the request.
+
     Args:
         request (Request): The incoming FastAPI request containing the sessionmaker.
 
@@ -30,6 +138,56 @@ async def get_db_session(request: Request) -> AsyncGenerator[AsyncSession, None]
         AsyncGenerator[AsyncSession, None]: An asynchronous generator yielding a database session.
     """
 
+    settings: DatabaseSettings = get_settings()
+    read_execution_options: Dict[str, Any] = get_read_execution_options(
+        settings.read_transactions
+    )
+    deadline: Optional[Deadline] = get_deadline(request=request, settings=settings)
+
+    if use_replica(request=request, settings=settings):
+        async with (
+            request.state.replica_pool._sessionmaker() as session,
+            session.begin(),
+        ):
+            async with checkout_deadline(deadline):
+                await session.connection(execution_options=read_execution_options)
+            async with (
+                statement_deadline(
+                    session,
+                    deadline,
+                    settings.lock_timeout,
+                    autocommit=is_autocommit(read_execution_options),
+                ),
+                cancel_on_disconnect(request, await get_cancel(session)),
+            ):
+                lsn: Optional[str] = get_required_lsn(
+                    request=request, settings=settings
+                )
+                if lsn is None or await has_replayed_lsn(connection=session, lsn=lsn):
+                    yield session
+                    return
+
+    read_only: bool = is_read_only(request)
     async with request.state.conn_pool._sessionmaker() as session:
         async with session.begin():
-            yield session
+            # check out the connection up front to measure the wait for the pool
+            checkout_start: float = time.perf_counter()
+            async with checkout_deadline(deadline):
+                await session.connection(
+                    execution_options=read_execution_options if read_only else None
+                )
+            request.state.pool_monitor.observe_checkout_wait(elapsed_ms(checkout_start))
+            async with (
+                statement_deadline(
+                    session,
+                    deadline,
+                    settings.lock_timeout,
+                    autocommit=read_only and is_autocommit(read_execution_options),
+                ),
+                cancel_on_disconnect(request, await get_cancel(session)),
+            ):
+                yield session
+
+        if tracks_write_lsn(request=request, settings=settings):
+            # reads of the client wait for the replica to replay this commit
+            request.state.write_lsn = await get_current_lsn(connection=session)
@@ -0,0 +1,22 @@
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from common.disconnect import Cancel
+
+
+async def get_cancel(connection: AsyncConnection | AsyncSession) -> Cancel:
+    """
+    Returns the cancellation of the statement running on a connection (for
+    common.disconnect.cancel_on_disconnect): psycopg's `cancel_safe` of the driver
+    connection, which leaves the connection usable for the rollback.
+
+    Args:
+        connection (AsyncConnection | AsyncSession): A connection or session with a checked out connection.
+
+    Returns:
+        Cancel: The cancellation.
+    """
+
+    if isinstance(connection, AsyncSession):
+        connection = await connection.connection()
+    raw_connection = await connection.get_raw_connection()
+    return raw_connection.driver_connection.cancel_safe
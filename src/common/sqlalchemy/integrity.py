@@ -0,0 +1,23 @@
+from typing import Any, Mapping
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from psycopg.errors import CheckViolation, ForeignKeyViolation
+from sqlalchemy.exc import IntegrityError
+
+from common.integrity import create_constraint_violation_response
+
+
+async def integrity_error_handler(
+    request: Request, exc: IntegrityError
+) -> JSONResponse:
+    """
+    Answers a violated foreign key or check constraint of a Core statement like the
+    validators (common.integrity), other integrity errors are raised again.
+    """
+
+    if not isinstance(exc.orig, (ForeignKeyViolation, CheckViolation)):
+        raise exc
+
+    params: Mapping[str, Any] = exc.params if isinstance(exc.params, Mapping) else {}
+    return create_constraint_violation_response(exc.orig.diag.constraint_name, params)
@@ -0,0 +1,92 @@
+import time
+import weakref
+from typing import Any, List, MutableMapping, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Compiled, Connection, ExecutionContext
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.sql import FromClause
+
+from common.db_cost import record_statement
+from common.metrics import observe_statement
+from common.slow_queries import observe_slow_query
+
+# There are no named statement constants (db_statements) here: statements are named by
+# their kind and first table, e.g. "select users" or "insert orders". Compiled statements
+# are cached by the engine, so is their name.
+UNNAMED_STATEMENT: str = "unnamed"
+
+# set on the execution context, which lives as long as one execution
+STATEMENT_START_ATTRIBUTE: str = "_statement_start"
+
+_statement_names: MutableMapping[Compiled, str] = weakref.WeakKeyDictionary()
+
+
+def _get_table_name(from_clause: Optional[FromClause]) -> Optional[str]:
+    # the left-most table of a join
+    while from_clause is not None and hasattr(from_clause, "left"):
+        from_clause = from_clause.left
+    return getattr(from_clause, "name", None)
+
+
+def get_statement_name(context: ExecutionContext) -> str:
+    """
+    Returns the name of the statement of an execution for the metrics (common.metrics).
+
+    Args:
+        context (ExecutionContext): The execution context.
+
+    Returns:
+        str: The kind and the first table of the statement, e.g. "select users".
+    """
+
+    compiled: Optional[Compiled] = context.compiled
+    if compiled is None:
+        return UNNAMED_STATEMENT
+
+    name: Optional[str] = _statement_names.get(compiled)
+    if name is None:
+        statement: Any = compiled.statement
+        table: Optional[FromClause] = getattr(statement, "table", None)
+        if table is None and hasattr(statement, "get_final_froms"):
+            froms: List[FromClause] = statement.get_final_froms()
+            table = froms[0] if froms else None
+        table_name: Optional[str] = _get_table_name(table)
+        kind: str = statement.__visit_name__
+        name = f"{kind} {table_name}" if table_name else kind
+        _statement_names[compiled] = name
+    return name
+
+
+def _before_cursor_execute(
+    conn: Connection, cursor, statement, parameters, context, executemany
+) -> None:
+    setattr(context, STATEMENT_START_ATTRIBUTE, time.perf_counter())
+
+
+def _after_cursor_execute(
+    conn: Connection, cursor, statement, parameters, context, executemany
+) -> None:
+    seconds: float = time.perf_counter() - getattr(context, STATEMENT_START_ATTRIBUTE)
+    # rows of a SELECT are known after execute (client-side cursor)
+    rows: int = max(cursor.rowcount, 0)
+    observe_statement(get_statement_name(context), seconds, rows)
+    # the cost of the running request (common.db_cost)
+    record_statement(seconds, rows)
+    # slow or sampled queries are explained (common.slow_queries), not batches
+    if not executemany:
+        observe_slow_query(lambda: statement, parameters, seconds * 1000)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """
+    Records the latency and the rows of every statement of an engine (common.metrics),
+    adds them to the cost of the running request (common.db_cost) and passes slow or
+    sampled queries on to be explained (common.slow_queries).
+
+    Args:
+        engine (AsyncEngine): The engine of the primary or the replica.
+    """
+
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
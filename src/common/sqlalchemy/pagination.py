@@ -1,4 +1,42 @@
-from sqlalchemy import Select
+from typing import Any, List, Optional
+
+from pydantic import TypeAdapter
+from sqlalchemy import (
+    ClauseElement,
+    Executable,
+    Result,
+    Select,
+    and_,
+    asc,
+    desc,
+    false,
+    func,
+    nulls_last,
+    or_,
+    select,
+    tuple_,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+
+from common.pagination import CountStrategy, get_cursor_keys
+from common.sorting import Direction, OrderByField
+
+
+class Explain(Executable, ClauseElement):
+    """
+    EXPLAIN (FORMAT JSON) for a SQLAlchemy Select query.
+    """
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement: Select = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler, **kwargs) -> str:
+    return f"EXPLAIN (FORMAT JSON) {compiler.process(element.statement, **kwargs)}"
 
 
 def create_paginate_query(query: Select, limit: int, offset: int) -> Select:
@@ -18,3 +56,135 @@ def create_paginate_query(query: Select, limit: int, offset: int) -> Select:
     paginated_query: Select = query.limit(limit).offset(offset)
 
     return paginated_query
+
+
+def _after(col: Any, direction: Direction, value: Any, inclusive: bool = False) -> Any:
+    """
+    Creates the condition of the rows sorted after a value of a keyset column.
+
+    Args:
+        col (Any): The column.
+        direction (Direction): The sort direction of the column.
+        value (Any): The (non-NULL) value.
+        inclusive (bool): Whether the rows equal to the value are included.
+
+    Returns:
+        Any: The condition, including the NULLs (sorted last) of a nullable column.
+    """
+
+    if direction is Direction.ASC:
+        after: Any = col >= value if inclusive else col > value
+    else:
+        after = col <= value if inclusive else col < value
+    return or_(after, col.is_(None)) if col.nullable else after
+
+
+def create_keyset_query(
+    query: Select,
+    order_by_fields: List[OrderByField],
+    cursor_values: Optional[List[Any]],
+    limit: int,
+    model: Any,
+) -> Select:
+    """
+    Applies keyset (seek) pagination to a SQLAlchemy Select query.
+
+    The `id` column is always appended as the last sort key (ascending) to make page
+    boundaries stable. NULL values are sorted last, which matches `create_order_by_query`.
+
+    Args:
+        query (Select): The SQLAlchemy query to modify (without ORDER BY).
+        order_by_fields (List[OrderByField]): A list of fields to order by.
+        cursor_values (Optional[List[Any]]): The keyset of the last row of the previous page.
+        limit (int): The maximum number of rows to return (LIMIT).
+        model (Any): The SQLAlchemy model class or Core table.
+
+    Returns:
+        Select: The modified query with WHERE, ORDER BY and LIMIT clauses.
+    """
+
+    tbl = getattr(model, "__table__", model)
+    cols = getattr(tbl, "c", tbl)
+
+    keys: List[str] = get_cursor_keys(order_by_fields)
+    directions: List[Direction] = [field.direction for field in order_by_fields] + [
+        Direction.ASC
+    ]
+    columns: List[Any] = [getattr(cols, key) for key in keys]
+
+    if cursor_values is not None:
+        # cursor values are JSON encoded, restore the columns' python types
+        cursor_values = [
+            value
+            if value is None
+            else TypeAdapter(col.type.python_type).validate_python(value)
+            for col, value in zip(columns, cursor_values, strict=True)
+        ]
+
+        if (
+            all(direction is Direction.ASC for direction in directions)
+            and None not in cursor_values
+            and not any(col.nullable for col in columns)
+        ):
+            # (k1, ..., id) > (v1, ..., v2) is a single range of the (k1, ..., id) index
+            query = query.where(tuple_(*columns) > tuple_(*cursor_values))
+        else:
+            # (k1 after v1) OR (k1 = v1 AND k2 after v2) OR ...
+            disjuncts: List[Any] = []
+            equalities: List[Any] = []
+            for col, direction, value in zip(
+                columns, directions, cursor_values, strict=True
+            ):
+                # nothing comes after a NULL value because NULLs are sorted last
+                if value is not None:
+                    disjuncts.append(and_(*equalities, _after(col, direction, value)))
+
+                equalities.append(col.is_(None) if value is None else col == value)
+
+            # the redundant bound of the leading key is the range of its index scan
+            bound: Any = (
+                columns[0].is_(None)
+                if cursor_values[0] is None
+                else _after(columns[0], directions[0], cursor_values[0], inclusive=True)
+            )
+            query = query.where(bound, or_(*disjuncts) if disjuncts else false())
+
+    order_clauses: List[Any] = [
+        nulls_last(asc(col) if direction is Direction.ASC else desc(col))
+        for col, direction in zip(columns, directions, strict=True)
+    ]
+
+    return query.order_by(*order_clauses).limit(limit)
+
+
+async def get_total_count(
+    session: AsyncSession, query: Select, count: CountStrategy, min_count: int = 0
+) -> Optional[int]:
+    """
+    Determines the total number of rows of a SQLAlchemy Select query.
+
+    Args:
+        session (AsyncSession): The session to run the count in.
+        query (Select): The (possibly ordered and paginated) list query.
+        count (CountStrategy): Whether to count exactly, estimate or skip counting.
+        min_count (int): Rows known to exist (offset + items), the lower bound of an estimate.
+
+    Returns:
+        Optional[int]: The total count or None if counting was skipped.
+    """
+
+    if count == CountStrategy.NONE:
+        return None
+
+    # ORDER BY, LIMIT and OFFSET don't change the number of rows
+    query: Select = query.order_by(None).limit(None).offset(None)
+
+    if count == CountStrategy.ESTIMATE:
+        # planner statistics instead of a full scan
+        result: Result = await session.execute(Explain(query))
+        plan: list = result.scalar_one()
+        return max(int(plan[0]["Plan"]["Plan Rows"]), min_count)
+
+    count_query: Select = select(func.count()).select_from(query.subquery())
+    result: Result = await session.execute(count_query)
+    return result.scalar_one()
@@ -0,0 +1,35 @@
+from sqlalchemy.pool import Pool, QueuePool
+
+from common.pool_metrics import PoolSample, create_pool_sample
+from common.sqlalchemy.db import DatabaseEngine
+
+
+def sample_pool(conn_pool: DatabaseEngine) -> PoolSample:
+    """
+    Takes a PoolSample of the QueuePool of a DatabaseEngine.
+
+    QueuePool doesn't report the requests waiting for a connection; those show up
+    in the checkout wait histogram instead.
+
+    Args:
+        conn_pool (DatabaseEngine): The database engine.
+
+    Returns:
+        PoolSample: The sample taken now.
+    """
+
+    pool: Pool = conn_pool._engine.pool
+    if not isinstance(pool, QueuePool):
+        # e.g. NullPool: no persistent connections to report
+        return create_pool_sample(size=0, max_size=0, in_use=0)
+
+    in_use: int = pool.checkedout()
+    # overflow() starts at -pool_size and counts up with every opened connection
+    overflow: int = pool.overflow()
+
+    return create_pool_sample(
+        size=in_use + pool.checkedin(),
+        max_size=pool.size() + pool._max_overflow,
+        in_use=in_use,
+        overflow=max(overflow, 0),
+    )
@@ -0,0 +1,68 @@
+from sqlalchemy import TextClause, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from common.sqlalchemy.db import DatabaseEngine
+
+# replay lag of a standby in seconds, 0 once it has replayed all WAL it received
+# (an idle primary doesn't advance pg_last_xact_replay_timestamp)
+replica_lag_query: TextClause = text(
+    """
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END::float
+    """
+)
+
+current_lsn_query: TextClause = text("SELECT pg_current_wal_lsn()::text")
+
+has_replayed_lsn_query: TextClause = text(
+    "SELECT pg_last_wal_replay_lsn() >= CAST(:lsn AS pg_lsn)"
+)
+
+
+async def measure_replica_lag(replica_pool: DatabaseEngine) -> float:
+    """
+    Measures the replay lag of the replica (the `measure` of a ReplicaMonitor).
+
+    Args:
+        replica_pool (DatabaseEngine): The engine of the replica.
+
+    Returns:
+        float: The replay lag in seconds.
+    """
+
+    async with replica_pool._engine.connect() as connection:
+        return (await connection.execute(replica_lag_query)).scalar_one()
+
+
+async def get_current_lsn(connection: AsyncConnection | AsyncSession) -> str:
+    """
+    Returns the current WAL location of the primary (call it after the commit).
+
+    Args:
+        connection (AsyncConnection | AsyncSession): A connection or session of the primary.
+
+    Returns:
+        str: The LSN, e.g. "16/B374D848".
+    """
+
+    return (await connection.execute(current_lsn_query)).scalar_one()
+
+
+async def has_replayed_lsn(
+    connection: AsyncConnection | AsyncSession, lsn: str
+) -> bool:
+    """
+    Checks whether the replica has replayed the WAL up to an LSN.
+
+    Args:
+        connection (AsyncConnection | AsyncSession): A connection or session of the replica.
+        lsn (str): The LSN of a write on the primary.
+
+    Returns:
+        bool: True if the write is visible on the replica.
+    """
+
+    result = await connection.execute(has_replayed_lsn_query, {"lsn": lsn})
+    return bool(result.scalar_one())
@@ -0,0 +1,45 @@
+from typing import Any
+
+from sqlalchemy import TextClause, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from common.slow_queries import EXPLAIN_PREFIX
+from common.sqlalchemy.db import DatabaseEngine
+from common.sqlalchemy.deadlines import set_timeouts_query
+
+# first statement of the transaction running an EXPLAIN ANALYZE (common.slow_queries)
+set_transaction_read_only_query: TextClause = text("SET TRANSACTION READ ONLY")
+
+
+async def explain_statement(
+    conn_pool: DatabaseEngine, statement: str, params: Any, timeout_ms: int
+) -> Any:
+    """
+    Runs EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) of a query on a connection of the
+    primary, in a READ ONLY transaction that is rolled back.
+
+    Args:
+        conn_pool (DatabaseEngine): The engine of the primary.
+        statement (str): The query as sent to the driver (with its placeholders).
+        params (Any): The parameters of the original execution.
+        timeout_ms (int): The statement_timeout (and lock_timeout) of the EXPLAIN.
+
+    Returns:
+        Any: The JSON plan.
+    """
+
+    connection: AsyncConnection
+    # not committed: the transaction is rolled back when the connection is closed
+    async with conn_pool._engine.connect() as connection:
+        await connection.execute(set_transaction_read_only_query)
+        await connection.execute(
+            set_timeouts_query,
+            {
+                "statement_timeout": str(timeout_ms),
+                "lock_timeout": str(timeout_ms),
+                "is_local": True,
+            },
+        )
+        return (
+            await connection.exec_driver_sql(EXPLAIN_PREFIX + statement, params)
+        ).scalar_one()
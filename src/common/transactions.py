@@ -0,0 +1,51 @@
+from typing import Callable, Optional, TypeVar
+
+from fastapi import Request
+
+F = TypeVar("F", bound=Callable)
+
+# requests without side effects
+SAFE_METHODS: frozenset[str] = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# Requests are read-only by their method (SAFE_METHODS), a route can override it. Read-only
+# requests run as configured by `DatabaseSettings.read_transactions`, all others in a
+# transaction that is committed (or rolled back) at the end of the request.
+READ_ONLY_MARKER: str = "__read_only__"
+
+
+def read_only(value: bool = True) -> Callable[[F], F]:
+    """
+    Marks a route as read-only (e.g. a POST search) or, with False, as a write
+    (e.g. a GET with side effects), whatever its method.
+
+    Args:
+        value (bool): Whether the route only reads.
+
+    Returns:
+        Callable[[F], F]: A decorator for the endpoint function.
+    """
+
+    def mark(endpoint: F) -> F:
+        setattr(endpoint, READ_ONLY_MARKER, value)
+        return endpoint
+
+    return mark
+
+
+def is_read_only(request: Request) -> bool:
+    """
+    Tells whether a request only reads: the marker of its route or else its method.
+
+    Args:
+        request (Request): The incoming request.
+
+    Returns:
+        bool: True if the request runs without a read-write transaction.
+    """
+
+    marker: Optional[bool] = getattr(
+        request.scope.get("endpoint"), READ_ONLY_MARKER, None
+    )
+    if marker is not None:
+        return marker
+    return request.method in SAFE_METHODS
@@ -0,0 +1,81 @@
+from collections.abc import Mapping
+from functools import cache
+from typing import Any, Dict, Tuple
+
+from pydantic import BaseModel
+from pydantic_core import to_json
+from starlette.responses import Response
+
+# Rows read from our own tables were validated on the way in (e.g. `UserName` is
+# already stripped and upper case) and already have the field types of the response
+# models. On the read path they are kept as plain dicts ("trusted rows") instead of
+# being validated into models, and serialized as is.
+
+
+@cache
+def _get_fields(
+    model_class: type[BaseModel],
+) -> Tuple[Tuple[str, ...], Dict[str, type[BaseModel]]]:
+    nested_models: Dict[str, type[BaseModel]] = {
+        name: field.annotation
+        for name, field in model_class.model_fields.items()
+        if isinstance(field.annotation, type)
+        and issubclass(field.annotation, BaseModel)
+    }
+    return tuple(model_class.model_fields), nested_models
+
+
+def create_trusted_row(model_class: type[BaseModel], data: Any) -> Dict[str, Any]:
+    """
+    Builds a trusted row with the fields of a response model, without validation.
+
+    Args:
+        model_class (type[BaseModel]): The response model (its fields are picked).
+        data (Any): A mapping (e.g. a RowMapping) or an object with attributes (e.g. an ORM instance).
+
+    Returns:
+        Dict[str, Any]: The row, nested models (e.g. `User.profession`) as dicts.
+    """
+
+    field_names, nested_models = _get_fields(model_class)
+
+    if isinstance(data, Mapping):
+        row: Dict[str, Any] = {name: data[name] for name in field_names if name in data}
+    else:
+        row: Dict[str, Any] = {name: getattr(data, name) for name in field_names}
+
+    for name, nested_model_class in nested_models.items():
+        if row.get(name) is not None:
+            row[name] = create_trusted_row(nested_model_class, row[name])
+
+    return row
+
+
+def get_field(item: Any, name: str) -> Any:
+    """
+    Reads a field of a model or of a trusted row.
+
+    Args:
+        item (Any): A model instance or a trusted (dict) row.
+        name (str): The field name.
+
+    Returns:
+        Any: The value of the field.
+    """
+
+    return item[name] if isinstance(item, Mapping) else getattr(item, name)
+
+
+class TrustedJSONResponse(Response):
+    """
+    JSON response rendered by pydantic-core, skipping the validation FastAPI runs
+    against the `response_model` of a route. For content built from trusted rows or
+    from models we validated ourselves.
+
+    Keep the `response_model` on the route for the OpenAPI schema.
+    """
+
+    media_type: str = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
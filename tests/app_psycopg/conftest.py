@@ -5,7 +5,7 @@ from fastapi import FastAPI, Depends
 from fastapi.testclient import TestClient
 
 from app_psycopg.api.app import app as psycopg_app
-from app_psycopg.api.dependencies import get_db_conn, get_db
+from app_psycopg.api.dependencies.db import get_db_conn, get_db, get_export_db
 from app_psycopg.db.db import Database
 
 
@@ -43,6 +43,7 @@ def client(app: FastAPI, mock_conn, mock_db) -> TestClient:
 
     app.dependency_overrides[get_db_conn] = override_get_conn
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_export_db] = override_get_db
 
     with TestClient(app) as test_client:
         yield test_client
@@ -0,0 +1,111 @@
+import json
+import uuid
+
+import pytest
+
+from common.bulk_import import (
+    MAX_REPORTED_REJECTED_ROWS,
+    ImportFormat,
+    iter_lines,
+    iter_records,
+    reject_row,
+)
+from common.schemas import BulkImportResult, DocumentInput, OrderInput
+
+
+async def _chunks(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+@pytest.mark.asyncio
+async def test_iter_lines_across_chunks():
+    """Test iter_lines joins lines that are split across chunks."""
+    lines = [line async for line in iter_lines(_chunks(b"a\nb", b"c\n\nd\r\n", b"e"))]
+    assert lines == [(1, b"a"), (2, b"bc"), (4, b"d"), (5, b"e")]
+
+    lines = [line async for line in iter_lines(_chunks(b"ab", b"cd", b"e\nf"))]
+    assert lines == [(1, b"abcde"), (2, b"f")]
+
+
+@pytest.mark.asyncio
+async def test_iter_records_invalid_utf8():
+    """Test iter_records rejects a line that isn't valid UTF-8 and goes on."""
+    user_id = str(uuid.uuid4())
+    valid_line = json.dumps({"document": {"a": 1}, "user_id": user_id}).encode()
+    result = BulkImportResult()
+
+    records = [
+        record
+        async for record in iter_records(
+            chunks=_chunks(valid_line + b"\n" + b'{"document": "\xff"}\n' + valid_line),
+            import_format=ImportFormat.NDJSON,
+            model_class=DocumentInput,
+            result=result,
+        )
+    ]
+
+    assert [line for line, _ in records] == [1, 3]
+    assert result.received_count == 3
+    assert result.rejected_count == 1
+    assert result.rejected[0].line == 2
+    assert "can't decode byte 0xff" in result.rejected[0].error
+
+
+@pytest.mark.asyncio
+async def test_iter_records_csv():
+    """Test iter_records with a CSV body, including a JSON column."""
+    user_id = uuid.uuid4()
+    body = f'document,user_id\n"{{""a"": 1}}",{user_id}\n"{{}}",{user_id}\n'.encode()
+    result = BulkImportResult()
+
+    records = [
+        record
+        async for record in iter_records(
+            chunks=_chunks(body),
+            import_format=ImportFormat.CSV,
+            model_class=DocumentInput,
+            result=result,
+            json_fields=["document"],
+        )
+    ]
+
+    assert [line for line, _ in records] == [2]
+    assert records[0][1].document == {"a": 1}
+    assert records[0][1].user_id == user_id
+    assert result.received_count == 2
+    assert result.rejected_count == 1
+    assert result.rejected[0].line == 3
+    assert result.rejected[0].error.startswith("document:")
+
+
+@pytest.mark.asyncio
+async def test_iter_records_ndjson_model_validation():
+    """Test iter_records rejects records failing model validators."""
+    user_id = str(uuid.uuid4())
+    body = json.dumps({"amount": "10.00", "payer_id": user_id, "payee_id": user_id})
+    result = BulkImportResult()
+
+    records = [
+        record
+        async for record in iter_records(
+            chunks=_chunks(body.encode()),
+            import_format=ImportFormat.NDJSON,
+            model_class=OrderInput,
+            result=result,
+        )
+    ]
+
+    assert records == []
+    assert result.rejected_count == 1
+    assert "payer_id and payee_id must be different" in result.rejected[0].error
+
+
+def test_reject_row_bounded_report():
+    """Test reject_row keeps counting once the report is full."""
+    result = BulkImportResult()
+    for line in range(1, MAX_REPORTED_REJECTED_ROWS + 3):
+        reject_row(result, line, "error")
+
+    assert result.rejected_count == MAX_REPORTED_REJECTED_ROWS + 2
+    assert len(result.rejected) == MAX_REPORTED_REJECTED_ROWS
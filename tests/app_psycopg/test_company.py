@@ -2,11 +2,12 @@ import uuid
 from unittest.mock import patch
 
 import pytest
+from common.schemas import Company
 from fastapi.testclient import TestClient
 from polyfactory.factories.pydantic_factory import ModelFactory
 from starlette import status
 
-from app_psycopg.api.models import Company
+from common.pagination import CountStrategy, LimitOffsetPage
 
 
 class CompanyFactory(ModelFactory[Company]):
@@ -51,7 +52,7 @@ def test_get_company(client: TestClient, mock_db, company):
 
     # Patch the validate_company_id dependency
     with patch(
-        "app_psycopg.api.routes.company.validate_company_id",
+        "app_psycopg.api.routes.companies.validate_company_id",
         return_value=company,
     ):
         # Make request
@@ -69,8 +70,9 @@ def test_get_company(client: TestClient, mock_db, company):
 def test_get_companies(client: TestClient, mock_db, company):
     """Test getting a list of companies."""
     # Setup mock
-    mock_db.get_companies.return_value = [company]
-    mock_db.get_companies_count.return_value = 1
+    mock_db.get_companies_page.return_value = LimitOffsetPage(
+        items=[company], items_count=1, total_count=1, limit=10, offset=0
+    )
 
     # Make request
     response = client.get("/companies")
@@ -88,8 +90,9 @@ def test_get_companies(client: TestClient, mock_db, company):
     assert "total_count" in response_json
 
     # Assert mock calls
-    mock_db.get_companies.assert_called_once_with(limit=10, offset=0, order_by=None)
-    mock_db.get_companies_count.assert_called_once()
+    mock_db.get_companies_page.assert_called_once_with(
+        limit=10, offset=0, order_by=None, count=CountStrategy.EXACT
+    )
 
 
 def test_update_company(client: TestClient, mock_db, company):
@@ -106,7 +109,7 @@ def test_update_company(client: TestClient, mock_db, company):
 
     # Patch only the validate_company_id dependency
     with patch(
-        "app_psycopg.api.routes.company.validate_company_id",
+        "app_psycopg.api.routes.companies.validate_company_id",
         return_value=company,
     ):
         # Make request
@@ -137,7 +140,7 @@ def test_patch_company(client: TestClient, mock_db, company):
 
     # Patch only the validate_company_id dependency
     with patch(
-        "app_psycopg.api.routes.company.validate_company_id",
+        "app_psycopg.api.routes.companies.validate_company_id",
         return_value=company,
     ):
         # Make request
@@ -161,7 +164,7 @@ def test_delete_company(client: TestClient, mock_db, company):
 
     # Patch only the validate_company_id dependency
     with patch(
-        "app_psycopg.api.routes.company.validate_company_id",
+        "app_psycopg.api.routes.companies.validate_company_id",
         return_value=company,
     ):
         # Make request
@@ -215,8 +218,9 @@ def test_get_companies_with_pagination_and_sorting(
 ):
     """Test getting a list of companies with pagination and sorting."""
     # Setup mock
-    mock_db.get_companies.return_value = [company]
-    mock_db.get_companies_count.return_value = 1
+    mock_db.get_companies_page.return_value = LimitOffsetPage(
+        items=[company], items_count=1, total_count=1, limit=5, offset=0
+    )
 
     # Make request with pagination and sorting
     response = client.get("/companies?limit=5&offset=0&order_by=%2Bname")
@@ -228,9 +232,9 @@ def test_get_companies_with_pagination_and_sorting(
     assert response_json["offset"] == 0
 
     # Assert mock calls with correct parameters
-    mock_db.get_companies.assert_called_once()
+    mock_db.get_companies_page.assert_called_once()
     # Extract the call arguments
-    call_args = mock_db.get_companies.call_args[1]
+    call_args = mock_db.get_companies_page.call_args[1]
     assert call_args["limit"] == 5
     assert call_args["offset"] == 0
     assert "order_by" in call_args
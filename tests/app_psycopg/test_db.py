@@ -1,15 +1,18 @@
 import pytest
 import uuid
 from decimal import Decimal
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from polyfactory.factories.pydantic_factory import ModelFactory
+from psycopg.errors import ForeignKeyViolation
 
-from app_psycopg.db.db import (
-    Database,
-    create_paginate_query,
-)
-from app_psycopg.api.models import UserInput, UserUpdate, OrderInput, User, Order
+from app_psycopg.api.pagination import create_paginate_query
+from app_psycopg.db.db import Database
+from common.schemas import UserInput, UserUpdate, OrderInput, User, Order
+from common.pagination import CountStrategy
+from common.export import ExportFormat
+from common.integrity import ConstraintViolation
 
 
 class UserFactory(ModelFactory[User]):
@@ -29,12 +32,12 @@ async def test_create_paginate_query_from_text():
     """Test create_paginate_query_from_text function."""
     # Test with both limit and offset
     query = "SELECT * FROM users"
-    result = create_paginate_query(query, 10, 5)
+    result = create_paginate_query(query)
     # Use a more flexible assertion that ignores whitespace
     assert (
         "SELECT * FROM users" in result
-        and "LIMIT 10" in result
-        and "OFFSET 5" in result
+        and "LIMIT %(limit)s" in result
+        and "OFFSET %(offset)s" in result
     )
 
 
@@ -315,3 +318,315 @@ async def test_get_orders():
     # Assert
     assert len(result) == 1
     db._get_resources.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_get_resources_page():
+    """Test _get_resources_page method."""
+    # Arrange
+    conn_mock = AsyncMock()
+    cursor_mock = AsyncMock()
+    user = UserFactory.build()
+    cursor_mock.fetchall.return_value = [{**user.model_dump(), "total_count": 42}]
+
+    # Make sure cursor() returns the context manager directly, not a coroutine
+    conn_mock.cursor = MagicMock(
+        return_value=AsyncCursorContextManagerMock(cursor_mock)
+    )
+
+    db = Database(conn_mock)
+    query = "SELECT * FROM users"
+
+    # Act
+    result = await db._get_resources_page(
+        query, "SELECT COUNT(*) FROM users", User, limit=10, offset=0
+    )
+
+    # Assert
+    assert result.items == [user]
+    assert result.items_count == 1
+    assert result.total_count == 42
+    conn_mock.cursor.assert_called_once()
+    cursor_mock.execute.assert_called_once()
+    assert "COUNT(*) OVER()" in cursor_mock.execute.call_args[1]["query"]
+    assert cursor_mock.execute.call_args[1]["params"] == {"limit": 10, "offset": 0}
+
+
+@pytest.mark.asyncio
+async def test_get_resources_page_trusted_rows():
+    """Test _get_resources_page returns the dict rows as is with trusted rows."""
+    # Arrange
+    conn_mock = AsyncMock()
+    cursor_mock = AsyncMock()
+    row = UserFactory.build().model_dump()
+    cursor_mock.fetchall.return_value = [{**row, "total_count": 1}]
+
+    # Make sure cursor() returns the context manager directly, not a coroutine
+    conn_mock.cursor = MagicMock(
+        return_value=AsyncCursorContextManagerMock(cursor_mock)
+    )
+
+    db = Database(conn_mock, trusted_rows=True)
+
+    # Act
+    result = await db._get_resources_page(
+        "SELECT * FROM users", "SELECT COUNT(*) FROM users", User, limit=10, offset=0
+    )
+
+    # Assert
+    assert result.items == [row]
+    assert result.total_count == 1
+
+
+@pytest.mark.asyncio
+async def test_get_resources_page_json():
+    """Test _get_resources_page_json returns the bytes rendered by Postgres."""
+    # Arrange
+    conn_mock = AsyncMock()
+    cursor_mock = AsyncMock()
+    cursor_mock.fetchone.side_effect = [
+        ([{"Plan": {"Plan Rows": 1000}}],),
+        (b'{"items": []}',),
+    ]
+
+    # Make sure cursor() returns the context manager directly, not a coroutine
+    conn_mock.cursor = MagicMock(
+        return_value=AsyncCursorContextManagerMock(cursor_mock)
+    )
+
+    db = Database(conn_mock)
+
+    # Act
+    result = await db._get_resources_page_json(
+        "SELECT * FROM users",
+        "SELECT COUNT(*) FROM users",
+        limit=10,
+        offset=0,
+        count=CountStrategy.ESTIMATE,
+    )
+
+    # Assert
+    assert result == b'{"items": []}'
+    assert cursor_mock.execute.call_args[1]["binary"] is True
+    assert cursor_mock.execute.call_args[1]["params"] == {
+        "limit": 10,
+        "offset": 0,
+        "estimated_count": 1000,
+    }
+
+
+@pytest.mark.asyncio
+async def test_export_resources_ndjson():
+    """Test _export_resources streams the JSON lines of a server-side cursor."""
+    # Arrange
+    conn_mock = AsyncMock()
+    cursor_mock = AsyncMock()
+    cursor_mock.fetchmany.side_effect = [[(b'{"id": 1}\n',), (b'{"id": 2}\n',)], []]
+
+    conn_mock.cursor = MagicMock(
+        return_value=AsyncCursorContextManagerMock(cursor_mock)
+    )
+    # in the REPEATABLE READ transaction of get_export_conn
+    conn_mock.autocommit = False
+
+    db = Database(conn_mock)
+
+    # Act
+    chunks = [
+        chunk
+        async for chunk in db._export_resources(
+            "SELECT * FROM users",
+            export_format=ExportFormat.NDJSON,
+            filters={"name__eq": "JOHN"},
+        )
+    ]
+
+    # Assert
+    assert chunks == [b'{"id": 1}\n{"id": 2}\n']
+    conn_mock.cursor.assert_called_once_with(name="export")
+    conn_mock.transaction.assert_not_called()
+    assert cursor_mock.execute.call_args[1]["binary"] is True
+    assert cursor_mock.execute.call_args[1]["params"] == {"filter_0": "JOHN"}
+
+    # without a transaction, the snapshot would end with every statement
+    conn_mock.autocommit = True
+    with pytest.raises(ValueError):
+        await anext(db._export_resources("SELECT * FROM users", ExportFormat.NDJSON))
+
+
+@pytest.mark.asyncio
+async def test_get_resources_page_beyond_last_page():
+    """Test _get_resources_page falls back to the count query past the last row."""
+    # Arrange
+    conn_mock = AsyncMock()
+    cursor_mock = AsyncMock()
+    cursor_mock.fetchall.return_value = []
+    cursor_mock.fetchone.return_value = (5,)
+
+    # Make sure cursor() returns the context manager directly, not a coroutine
+    conn_mock.cursor = MagicMock(
+        return_value=AsyncCursorContextManagerMock(cursor_mock)
+    )
+
+    db = Database(conn_mock)
+
+    # Act
+    result = await db._get_resources_page(
+        "SELECT * FROM users", "SELECT COUNT(*) FROM users", User, limit=10, offset=20
+    )
+
+    # Assert
+    assert result.items == []
+    assert result.total_count == 5
+    assert cursor_mock.execute.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_resources_page_estimate():
+    """Test _get_resources_page uses the planner's row estimate as total count."""
+    # Arrange
+    conn_mock = AsyncMock()
+    cursor_mock = AsyncMock()
+    user = UserFactory.build()
+    cursor_mock.fetchall.return_value = [user]
+    cursor_mock.fetchone.return_value = ([{"Plan": {"Plan Rows": 1000}}],)
+
+    # Make sure cursor() returns the context manager directly, not a coroutine
+    conn_mock.cursor = MagicMock(
+        return_value=AsyncCursorContextManagerMock(cursor_mock)
+    )
+
+    db = Database(conn_mock)
+
+    # Act
+    result = await db._get_resources_page(
+        "SELECT * FROM users",
+        "SELECT COUNT(*) FROM users",
+        User,
+        limit=10,
+        offset=0,
+        count=CountStrategy.ESTIMATE,
+    )
+
+    # Assert
+    assert result.items == [user]
+    assert result.total_count == 1000
+    assert cursor_mock.execute.call_args[1]["query"].startswith("EXPLAIN")
+
+
+@pytest.mark.asyncio
+async def test_get_resources_page_without_count():
+    """Test _get_resources_page skips counting with count=none."""
+    # Arrange
+    conn_mock = AsyncMock()
+    cursor_mock = AsyncMock()
+    cursor_mock.fetchall.return_value = []
+
+    # Make sure cursor() returns the context manager directly, not a coroutine
+    conn_mock.cursor = MagicMock(
+        return_value=AsyncCursorContextManagerMock(cursor_mock)
+    )
+
+    db = Database(conn_mock)
+
+    # Act
+    result = await db._get_resources_page(
+        "SELECT * FROM users",
+        "SELECT COUNT(*) FROM users",
+        User,
+        limit=10,
+        offset=20,
+        count=CountStrategy.NONE,
+    )
+
+    # Assert
+    assert result.total_count is None
+    assert "total_count" not in result.model_dump()
+    cursor_mock.execute.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_get_resources_pipelined():
+    """Test _get_resources_pipelined executes all lookups before fetching."""
+    # Arrange
+    conn_mock = MagicMock()
+    conn_mock.pipeline.return_value = AsyncCursorContextManagerMock(None)
+    user_cursor_mock = AsyncMock()
+    count_cursor_mock = AsyncMock()
+    user = UserFactory.build()
+    user_cursor_mock.fetchone.return_value = user
+    count_cursor_mock.fetchone.return_value = (2,)
+    calls = []
+    user_cursor_mock.execute.side_effect = lambda **kwargs: calls.append("execute")
+    count_cursor_mock.execute.side_effect = lambda **kwargs: calls.append("execute")
+    user_cursor_mock.fetchone.side_effect = lambda: calls.append("fetch") or user
+
+    conn_mock.cursor.side_effect = [
+        AsyncCursorContextManagerMock(user_cursor_mock),
+        AsyncCursorContextManagerMock(count_cursor_mock),
+    ]
+
+    db = Database(conn_mock)
+
+    # Act
+    result = await db._get_resources_pipelined(
+        ("SELECT * FROM users WHERE id = %(id)s", User, {"id": user.id}),
+        ("SELECT COUNT(*) FROM users", None, {}),
+    )
+
+    # Assert
+    assert result == [user, (2,)]
+    assert calls == ["execute", "execute", "fetch"]
+    conn_mock.pipeline.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_get_user_identity_map():
+    """Test a user is read once per Database (request) until a write."""
+    # Arrange
+    user = UserFactory.build()
+    get_resource = AsyncMock(return_value=user)
+    cursor_mock = AsyncMock()
+    cursor_mock.fetchone.return_value = (user.id,)
+    conn_mock = MagicMock()
+    conn_mock.cursor.return_value = AsyncCursorContextManagerMock(cursor_mock)
+
+    # Act
+    with patch("app_psycopg.db.db.Database._get_resource", get_resource):
+        db = Database(conn_mock)
+        first = await db.get_user(id=user.id)
+        second = await db.get_user(id=str(user.id))
+        calls_before_update = get_resource.call_count
+
+        await db.update_user(
+            user.id, UserUpdate(name="Updated User", profession_id=uuid.uuid4())
+        )
+        await db.get_user(id=user.id)
+
+    # Assert
+    assert first is second is user
+    assert calls_before_update == 1
+    assert get_resource.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_insert_resource_foreign_key_violation():
+    """Test a violated foreign key of an insert is raised as a ConstraintViolation."""
+
+    class ProfessionIdViolation(ForeignKeyViolation):
+        diag = SimpleNamespace(constraint_name="users_profession_id_fkey")
+
+    # Arrange
+    cursor_mock = AsyncMock()
+    cursor_mock.execute.side_effect = ProfessionIdViolation()
+    conn_mock = MagicMock()
+    conn_mock.cursor.return_value = AsyncCursorContextManagerMock(cursor_mock)
+    user_input = UserInput(name="Test User", profession_id=uuid.uuid4())
+
+    # Act
+    with pytest.raises(ConstraintViolation) as exc_info:
+        await Database(conn_mock).insert_user(user_input)
+
+    # Assert
+    assert exc_info.value.constraint_name == "users_profession_id_fkey"
+    assert exc_info.value.params["profession_id"] == user_input.profession_id
@@ -0,0 +1,41 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from common.db_cost import DatabaseCostMiddleware, record_pool_wait, record_statement
+
+
+def create_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(DatabaseCostMiddleware)
+
+    @app.get("/links")
+    async def get_links() -> dict:
+        record_pool_wait(0.5)
+        record_statement(0.002, 1)
+        record_statement(0.0035, 3)
+        return {}
+
+    return app
+
+
+def test_db_cost_headers():
+    """Test the statements of a request are reported with the debug header."""
+    with TestClient(create_app()) as client:
+        response = client.get("/links", headers={"X-Debug-DB-Cost": "1"})
+
+    assert response.headers["X-DB-Queries"] == "2"
+    assert response.headers["X-DB-Time-Ms"] == "5.5"
+    assert response.headers["X-DB-Rows"] == "4"
+    assert response.headers["X-DB-Pool-Wait-Ms"] == "0.5"
+    assert response.headers["Server-Timing"] == (
+        'db;dur=5.5;desc="2 queries", db-pool;dur=0.5'
+    )
+
+
+def test_db_cost_headers_disabled():
+    """Test requests without the debug header aren't tracked by default."""
+    with TestClient(create_app()) as client:
+        response = client.get("/links")
+
+    assert "X-DB-Queries" not in response.headers
+    assert "Server-Timing" not in response.headers
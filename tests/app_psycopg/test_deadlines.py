@@ -0,0 +1,184 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import Depends, FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+from psycopg import IsolationLevel
+from psycopg.errors import LockNotAvailable, QueryCanceled
+from psycopg_pool import PoolTimeout
+from starlette import status
+
+from app_psycopg.api.dependencies.db import get_db_conn, get_export_conn
+from app_psycopg.api.routes import documents, orders, users
+from common.deadlines import (
+    BULK_REQUEST_BUDGET,
+    DeadlineExceeded,
+    TimeoutPhase,
+    get_deadline,
+    request_budget,
+)
+from common.settings import load_settings
+
+
+def create_request(headers: list[tuple[bytes, bytes]]) -> Request:
+    return Request(
+        {"type": "http", "method": "GET", "path": "/", "headers": headers, "state": {}}
+    )
+
+
+def test_get_deadline():
+    """Test the header overrides the budget of the route, which overrides the default."""
+    settings = load_settings(
+        environ={"DB_REQUEST_BUDGET": "2000", "DB_REQUEST_BUDGET_MAX": "5000"}
+    )
+
+    assert get_deadline(create_request([]), settings).budget_ms == 2000
+    assert get_deadline(create_request([]), load_settings(environ={})) is None
+
+    request = create_request([])
+    request_budget(3000)(request)
+    assert get_deadline(request, settings).budget_ms == 3000
+
+    request = create_request([(b"x-request-timeout", b"9000")])
+    request_budget(3000)(request)
+    assert get_deadline(request, settings).budget_ms == 5000
+    # the deadline runs from the first lookup
+    assert get_deadline(request, settings) is request.state.deadline
+
+    with pytest.raises(HTTPException) as exc_info:
+        get_deadline(create_request([(b"x-request-timeout", b"soon")]), settings)
+    assert exc_info.value.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_get_db_conn_deadline():
+    """Test the pool checkout and the statements are limited to the budget."""
+    conn = AsyncMock()
+    conn.closed = False
+    conn.autocommit = False
+    pool = MagicMock()
+    pool.connection.return_value.__aenter__.return_value = conn
+    request = Request(
+        {
+            "type": "http",
+            "method": "POST",
+            "path": "/",
+            "headers": [(b"x-request-timeout", b"1500")],
+            "state": {"conn_pool": pool, "pool_monitor": MagicMock()},
+        }
+    )
+    settings = load_settings(environ={"DB_LOCK_TIMEOUT": "100"})
+
+    with patch("app_psycopg.api.dependencies.db.get_settings", return_value=settings):
+        dependency = get_db_conn(request)
+        assert await anext(dependency) is conn
+        with pytest.raises(StopAsyncIteration):
+            await anext(dependency)
+
+    assert 1.4 < pool.connection.call_args.kwargs["timeout"] <= 1.5
+    params = conn.execute.await_args.args[1]
+    assert 1400 < int(params["statement_timeout"]) <= 1500
+    assert params["lock_timeout"] == "100"
+    # SET LOCAL, nothing to reset
+    assert params["is_local"] is True
+    conn.execute.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_get_export_conn():
+    """Test exports read a REPEATABLE READ, READ ONLY snapshot within their budget."""
+    conn = AsyncMock()
+    conn.closed = False
+    conn.autocommit = False
+    pool = MagicMock()
+    pool.connection.return_value.__aenter__.return_value = conn
+    request = Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/users/export",
+            "headers": [],
+            "state": {"conn_pool": pool, "pool_monitor": MagicMock()},
+        }
+    )
+    request_budget(BULK_REQUEST_BUDGET)(request)
+    settings = load_settings(environ={"DB_PROFILE": "prod"})
+
+    with patch("app_psycopg.api.dependencies.db.get_settings", return_value=settings):
+        dependency = get_export_conn(request)
+        assert await anext(dependency) is conn
+        conn.set_isolation_level.assert_awaited_once_with(
+            IsolationLevel.REPEATABLE_READ
+        )
+        conn.set_read_only.assert_awaited_once_with(True)
+        with pytest.raises(StopAsyncIteration):
+            await anext(dependency)
+
+    # the budget of the export, not the statement_timeout of the profile
+    params = conn.execute.await_args.args[1]
+    assert int(params["statement_timeout"]) > settings.statement_timeout
+    assert params["is_local"] is True
+    conn.rollback.assert_awaited_once()
+    conn.set_isolation_level.assert_awaited_with(None)
+    conn.set_read_only.assert_awaited_with(None)
+
+
+@pytest.mark.parametrize(
+    "exc, status_code, phase",
+    [
+        (
+            QueryCanceled("canceling statement due to statement timeout"),
+            504,
+            "statement",
+        ),
+        (LockNotAvailable("canceling statement due to lock timeout"), 503, "lock"),
+        (PoolTimeout("couldn't get a connection after 1.00 sec"), 503, "pool"),
+        (DeadlineExceeded(TimeoutPhase.POOL), 503, "pool"),
+    ],
+)
+def test_timeout_response(client: TestClient, mock_db, exc, status_code, phase):
+    """Test timeouts of the database are answered with 503/504 and what timed out."""
+    mock_db.get_users_page.side_effect = exc
+
+    response = client.get("/users")
+
+    assert response.status_code == status_code
+    assert response.json()["phase"] == phase
+    # only the 503s are worth retrying
+    assert ("retry-after" in response.headers) == (status_code == 503)
+
+
+def test_request_budget_router():
+    """Test a router sets the budget of its routes."""
+    app = FastAPI()
+
+    @app.get("/export", dependencies=[Depends(request_budget(60_000))])
+    async def export(request: Request) -> int:
+        return get_deadline(request, load_settings(environ={})).budget_ms
+
+    with TestClient(app) as client:
+        assert client.get("/export").json() == 60_000
+
+
+def test_bulk_routes_budget():
+    """Test imports and exports get a budget above the default of the prod profile."""
+    settings = load_settings(environ={"DB_PROFILE": "prod"})
+    bulk_paths = {
+        f"/{resource}/{operation}"
+        for resource in ("users", "orders", "documents")
+        for operation in ("import", "export")
+    }
+    routes = [
+        route
+        for router in (users.router, orders.router, documents.router)
+        for route in router.routes
+        if route.path in bulk_paths
+    ]
+    assert {route.path for route in routes} == bulk_paths
+
+    for route in routes:
+        request = create_request([])
+        for dependency in route.dependencies:
+            dependency.dependency(request)
+        deadline = get_deadline(request, settings)
+        assert deadline.budget_ms == BULK_REQUEST_BUDGET > settings.request_budget
@@ -5,22 +5,22 @@ from unittest.mock import AsyncMock, patch, MagicMock
 from fastapi import HTTPException, Request
 from psycopg import Connection, AsyncConnection
 
-from app_psycopg.api.dependencies import (
-    validate_document_id,
-    validate_user_id,
-    get_db_conn,
-    get_db,
-    validate_order_input,
+from app_psycopg.api.dependencies.db import get_db_conn, get_db
+from app_psycopg.api.dependencies.documents import validate_document_id
+from app_psycopg.api.dependencies.orders import validate_order_input
+from app_psycopg.api.dependencies.professions import (
     validate_profession_id,
     validate_profession_input,
     validate_profession_update,
+)
+from app_psycopg.api.dependencies.users import (
+    validate_user_id,
     validate_user_input,
     validate_user_update,
     validate_user_patch,
 )
-from app_psycopg.api.models import OrderInputValidated
 from app_psycopg.db.db import Database
-from app_psycopg.api.models import (
+from common.schemas import (
     OrderInput,
     Document,
     User,
@@ -32,6 +32,7 @@ from app_psycopg.api.models import (
     UserUpdate,
     UserPatch,
 )
+from common.settings import load_settings
 from polyfactory.factories.pydantic_factory import ModelFactory
 
 
@@ -80,12 +81,23 @@ async def test_get_conn():
     mock_conn_pool = MagicMock()
     mock_conn_pool.connection.return_value = AsyncContextManagerMock(mock_connection)
 
-    mock_request = MagicMock(spec=Request)
-    mock_request.state.conn_pool = mock_conn_pool
+    mock_request = Request(
+        {
+            "type": "http",
+            "method": "POST",
+            "path": "/",
+            "headers": [],
+            "state": {"conn_pool": mock_conn_pool, "pool_monitor": MagicMock()},
+        }
+    )
 
     # Act
-    conn_generator = get_db_conn(mock_request)
-    conn = await conn_generator.__anext__()
+    with patch(
+        "app_psycopg.api.dependencies.db.get_settings",
+        return_value=load_settings(environ={}),
+    ):
+        conn_generator = get_db_conn(mock_request)
+        conn = await conn_generator.__anext__()
 
     # Assert
     assert conn == mock_connection
@@ -97,13 +109,15 @@ async def test_get_db():
     """Test get_db."""
     # Arrange
     mock_conn = MagicMock(spec=AsyncConnection)
+    mock_request = MagicMock(spec=Request)
 
     # Act
-    db = await get_db(mock_conn)
+    db = await get_db(mock_request, mock_conn)
 
     # Assert
     assert isinstance(db, Database)
     assert db.conn == mock_conn
+    assert db.lookup_cache is mock_request.state.lookup_cache
 
 
 @pytest.mark.asyncio
@@ -242,24 +256,15 @@ async def test_validate_profession_update():
 
 @pytest.mark.asyncio
 async def test_validate_user_input():
-    """Test validate_user_input."""
+    """Test validate_user_input leaves the profession to the foreign key."""
     # Arrange
-    profession_id = uuid.uuid4()
-    user_input = UserInput(name="Test User", profession_id=profession_id)
-    profession = ProfessionFactory.build(id=profession_id)
-
-    mock_db = AsyncMock()
-
-    # Mock validate_profession_id to return the profession
-    with patch("app_psycopg.api.dependencies.validate_profession_id") as mock_validate:
-        mock_validate.return_value = profession
+    user_input = UserInput(name="Test User", profession_id=uuid.uuid4())
 
-        # Act
-        result = await validate_user_input(db=mock_db, user_input=user_input)
+    # Act
+    result = await validate_user_input(user_input=user_input)
 
-        # Assert
-        assert result == user_input
-        mock_validate.assert_called_once_with(db=mock_db, profession_id=profession_id)
+    # Assert
+    assert result == user_input
 
 
 @pytest.mark.asyncio
@@ -273,7 +278,9 @@ async def test_validate_user_update():
     mock_db = AsyncMock()
 
     # Mock validate_profession_id to return the profession
-    with patch("app_psycopg.api.dependencies.validate_profession_id") as mock_validate:
+    with patch(
+        "app_psycopg.api.dependencies.users.validate_profession_id"
+    ) as mock_validate:
         mock_validate.return_value = profession
 
         # Act
@@ -295,7 +302,9 @@ async def test_validate_user_patch_with_profession():
     mock_db = AsyncMock()
 
     # Mock validate_profession_id to return the profession
-    with patch("app_psycopg.api.dependencies.validate_profession_id") as mock_validate:
+    with patch(
+        "app_psycopg.api.dependencies.users.validate_profession_id"
+    ) as mock_validate:
         mock_validate.return_value = profession
 
         # Act
@@ -322,31 +331,15 @@ async def test_validate_user_patch_without_profession():
 
 
 @pytest.mark.asyncio
-async def test_validate_order_input_success():
-    """Test validate_order_input when both payer and payee exist."""
+async def test_validate_order_input():
+    """Test validate_order_input leaves the payer and payee to the foreign keys."""
     # Arrange
-    payer_id = uuid.uuid4()
-    payee_id = uuid.uuid4()
-    payer = UserFactory.build(id=payer_id)
-    payee = UserFactory.build(id=payee_id)
     order_input = OrderInput(
-        amount=Decimal("100.00"), payer_id=payer_id, payee_id=payee_id
+        amount=Decimal("100.00"), payer_id=uuid.uuid4(), payee_id=uuid.uuid4()
     )
 
-    mock_db = AsyncMock()
-
-    # Mock validate_user_id to return the users
-    with patch("app_psycopg.api.dependencies.validate_user_id") as mock_validate:
-        mock_validate.side_effect = [payer, payee]
-
-        # Act
-        result = await validate_order_input(db=mock_db, order_input=order_input)
+    # Act
+    result = await validate_order_input(order_input=order_input)
 
-        # Assert
-        assert isinstance(result, OrderInputValidated)
-        assert result.order_input == order_input
-        assert result.payer == payer
-        assert result.payee == payee
-        assert mock_validate.call_count == 2
-        mock_validate.assert_any_call(db=mock_db, user_id=payer_id)
-        mock_validate.assert_any_call(db=mock_db, user_id=payee_id)
+    # Assert
+    assert result == order_input
@@ -0,0 +1,74 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import Request
+
+from app_psycopg.api.dependencies.db import get_db_conn
+from common.disconnect import DISCONNECT_WATCHER_KEY, DisconnectWatcher
+
+
+def create_request(method: str, receive) -> tuple[Request, AsyncMock]:
+    conn = AsyncMock()
+    conn.closed = False
+    pool = MagicMock()
+    pool.connection.return_value.__aenter__.return_value = conn
+    request = Request(
+        {
+            "type": "http",
+            "method": method,
+            "path": "/",
+            "headers": [],
+            "state": {
+                "conn_pool": pool,
+                "pool_monitor": MagicMock(),
+                DISCONNECT_WATCHER_KEY: DisconnectWatcher(receive),
+            },
+        }
+    )
+    return request, conn
+
+
+@pytest.mark.asyncio
+async def test_cancel_on_disconnect():
+    """Test the statement of a read is cancelled when the client disconnects."""
+    messages: asyncio.Queue = asyncio.Queue()
+    await messages.put({"type": "http.request", "body": b"", "more_body": False})
+    request, conn = create_request("GET", messages.get)
+
+    dependency = get_db_conn(request)
+    assert await anext(dependency) is conn
+
+    await messages.put({"type": "http.disconnect"})
+    await asyncio.sleep(0)
+
+    conn.cancel_safe.assert_awaited_once()
+    assert request.state.disconnect_watcher.disconnected is True
+    with pytest.raises(StopAsyncIteration):
+        await anext(dependency)
+
+
+@pytest.mark.asyncio
+async def test_no_cancel_after_response():
+    """Test nothing is cancelled once the response is complete, or for writes."""
+    messages: asyncio.Queue = asyncio.Queue()
+    request, conn = create_request("GET", messages.get)
+
+    dependency = get_db_conn(request)
+    await anext(dependency)
+    request.state.disconnect_watcher.stop()
+    await messages.put({"type": "http.disconnect"})
+    await asyncio.sleep(0)
+
+    conn.cancel_safe.assert_not_called()
+
+    # the body of a write is never read by the watcher
+    messages = asyncio.Queue()
+    request, conn = create_request("POST", messages.get)
+    dependency = get_db_conn(request)
+    await anext(dependency)
+    await messages.put({"type": "http.disconnect"})
+    await asyncio.sleep(0)
+
+    conn.cancel_safe.assert_not_called()
+    assert messages.qsize() == 1
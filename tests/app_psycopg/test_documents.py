@@ -6,7 +6,8 @@ from fastapi.testclient import TestClient
 from polyfactory.factories.pydantic_factory import ModelFactory
 from starlette import status
 
-from app_psycopg.api.models import Document
+from common.pagination import CountStrategy, LimitOffsetPage
+from common.schemas import Document
 
 
 class DocumentFactory(ModelFactory[Document]):
@@ -49,7 +50,10 @@ def test_create_document(client: TestClient, mock_db, document_id, document_resp
     # Make request
     response = client.post(
         "/documents",
-        json={"document": document_response.document},
+        json={
+            "document": document_response.document,
+            "user_id": str(document_response.user_id),
+        },
     )
 
     # Assert response
@@ -87,8 +91,9 @@ def test_get_document(client: TestClient, mock_db, document, document_response):
 def test_get_documents(client: TestClient, mock_db, document):
     """Test getting a list of documents."""
     # Setup mock
-    mock_db.get_documents.return_value = [document]
-    mock_db.get_documents_count.return_value = 1
+    mock_db.get_documents_page.return_value = LimitOffsetPage(
+        items=[document], items_count=1, total_count=1, limit=10, offset=0
+    )
 
     # Make request
     response = client.get("/documents")
@@ -106,15 +111,17 @@ def test_get_documents(client: TestClient, mock_db, document):
     assert "total_count" in response_json
 
     # Assert mock calls
-    mock_db.get_documents.assert_called_once_with(limit=10, offset=0, order_by=None)
-    mock_db.get_documents_count.assert_called_once()
+    mock_db.get_documents_page.assert_called_once_with(
+        limit=10, offset=0, order_by=None, count=CountStrategy.EXACT
+    )
 
 
 def test_get_documents_with_pagination(client: TestClient, mock_db, document):
     """Test getting a list of documents with pagination."""
     # Setup mock
-    mock_db.get_documents.return_value = [document]
-    mock_db.get_documents_count.return_value = 1
+    mock_db.get_documents_page.return_value = LimitOffsetPage(
+        items=[document], items_count=1, total_count=1, limit=5, offset=0
+    )
 
     # Make request
     response = client.get("/documents?limit=5&offset=0")
@@ -126,14 +133,17 @@ def test_get_documents_with_pagination(client: TestClient, mock_db, document):
     assert response_json["offset"] == 0
 
     # Assert mock calls
-    mock_db.get_documents.assert_called_once_with(limit=5, offset=0, order_by=None)
+    mock_db.get_documents_page.assert_called_once_with(
+        limit=5, offset=0, order_by=None, count=CountStrategy.EXACT
+    )
 
 
 def test_get_documents_with_sorting(client: TestClient, mock_db, document):
     """Test getting a list of documents with sorting."""
     # Setup mock
-    mock_db.get_documents.return_value = [document]
-    mock_db.get_documents_count.return_value = 1
+    mock_db.get_documents_page.return_value = LimitOffsetPage(
+        items=[document], items_count=1, total_count=1, limit=10, offset=0
+    )
 
     # Make request
     response = client.get("/documents?order_by=%2Bcreated_at")
@@ -143,7 +153,7 @@ def test_get_documents_with_sorting(client: TestClient, mock_db, document):
 
     # Assert mock calls
     # We can't check the exact order_by parameter because it's processed by the dependency
-    mock_db.get_documents.assert_called_once()
+    mock_db.get_documents_page.assert_called_once()
 
 
 def test_update_document(client: TestClient, mock_db, document, document_id):
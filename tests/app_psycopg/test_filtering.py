@@ -0,0 +1,35 @@
+import pytest
+from psycopg import sql
+
+from app_psycopg.api.filtering import create_filter_query
+
+
+def test_create_filter_query():
+    """Test create_filter_query binds the filter values as parameters."""
+    query, params = create_filter_query(
+        "SELECT * FROM orders",
+        {"amount__gte": 10, "created_at__lt": None, "id__in_": [1, 2], "name": "A"},
+    )
+
+    assert isinstance(query, sql.Composed)
+    text = query.as_string(None)
+    assert text.startswith("SELECT * FROM (SELECT * FROM orders) AS filtered WHERE")
+    assert '"amount" >= %(filter_0)s' in text
+    assert '"id" = ANY(%(filter_2)s)' in text
+    assert '"name" = %(filter_3)s' in text
+    assert "created_at" not in text
+    assert params == {"filter_0": 10, "filter_2": [1, 2], "filter_3": "A"}
+
+
+def test_create_filter_query_without_filters():
+    """Test create_filter_query without filters adds no WHERE clause."""
+    query, params = create_filter_query("SELECT * FROM orders", {})
+
+    assert query.as_string(None) == "SELECT * FROM (SELECT * FROM orders) AS filtered"
+    assert params == {}
+
+
+def test_create_filter_query_unsupported_operator():
+    """Test create_filter_query rejects unknown operators."""
+    with pytest.raises(ValueError):
+        create_filter_query("SELECT * FROM orders", {"name__icontains": "a"})
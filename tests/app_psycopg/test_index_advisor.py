@@ -0,0 +1,142 @@
+from app_psycopg.db.db_statements import get_users_stmt
+from app_psycopg.db.statement_registry import STATEMENT_TEXTS
+from common.index_advisor import (
+    IndexAdvice,
+    IndexUsage,
+    StatementStats,
+    TableScans,
+    advise_indexes,
+    get_statement_name,
+)
+
+USERS_PKEY = IndexUsage(
+    table="users",
+    index="users_pkey",
+    idx_scan=0,
+    size_bytes=8192,
+    is_unique=True,
+    definition="CREATE UNIQUE INDEX users_pkey ON public.users USING btree (id)",
+)
+
+
+def create_statement(order_by: str, calls: int = 10) -> StatementStats:
+    query: str = (
+        get_users_stmt.replace("%(", "$").replace(")s", "")
+        + f" ORDER BY {order_by} NULLS LAST LIMIT $1 OFFSET $2"
+    )
+    return StatementStats(
+        name=get_statement_name(query, STATEMENT_TEXTS),
+        query=query,
+        calls=calls,
+        total_ms=calls * 12.5,
+        mean_ms=12.5,
+        rows=calls * 10,
+    )
+
+
+def test_get_statement_name():
+    """Test queries of pg_stat_statements are named after their db_statements."""
+    assert create_statement("name ASC").name == "get_users_stmt"
+    assert get_statement_name("SELECT 1", STATEMENT_TEXTS) == "unnamed"
+
+
+def test_advise_indexes():
+    """Test sorted lists without a matching index get a proposal."""
+    statements = [
+        create_statement("name DESC", calls=5),
+        create_statement("name DESC", calls=7),
+        create_statement("created_at ASC"),
+        # profession_id isn't sortable by clients
+        create_statement("profession_id ASC"),
+    ]
+    created_at_index = IndexUsage(
+        table="users",
+        index="users_created_at_id_idx",
+        idx_scan=3,
+        size_bytes=8192,
+        is_unique=False,
+        definition=(
+            "CREATE INDEX users_created_at_id_idx ON public.users "
+            "USING btree (created_at, id)"
+        ),
+    )
+    # an ascending index doesn't serve DESC NULLS LAST
+    name_index = created_at_index.model_copy(
+        update={
+            "index": "users_name_id_idx",
+            "definition": "CREATE INDEX users_name_id_idx ON public.users USING btree (name, id)",
+        }
+    )
+
+    advice: IndexAdvice = advise_indexes(
+        statements=statements,
+        tables=[],
+        indexes=[USERS_PKEY, created_at_index, name_index],
+    )
+
+    assert advice.pg_stat_statements
+    assert len(advice.proposed_indexes) == 1
+    assert advice.proposed_indexes[0].columns == "name DESC NULLS LAST, id"
+    assert advice.proposed_indexes[0].statements == ["get_users_stmt"]
+    assert advice.proposed_indexes[0].calls == 12
+    assert advice.proposed_indexes[0].create_statement == (
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS users_name_desc_id_idx "
+        "ON users (name DESC NULLS LAST, id)"
+    )
+
+
+def test_advise_indexes_without_pg_stat_statements():
+    """Test seq-scanned tables and unused indexes are flagged without the extension."""
+    unused_index = USERS_PKEY.model_copy(
+        update={"index": "users_name_id_idx", "is_unique": False}
+    )
+    tables = [
+        TableScans(
+            table="users",
+            seq_scan=50,
+            seq_tup_read=500_000,
+            idx_scan=2,
+            live_rows=10_000,
+        ),
+        # small tables are scanned
+        TableScans(
+            table="professions", seq_scan=50, seq_tup_read=500, idx_scan=0, live_rows=10
+        ),
+    ]
+
+    # the indexes of db/migrations serve lists and foreign keys, even if never scanned
+    sortable_index = USERS_PKEY.model_copy(
+        update={
+            "index": "users_created_at_desc_id_idx",
+            "is_unique": False,
+            "definition": (
+                "CREATE INDEX users_created_at_desc_id_idx ON public.users "
+                "USING btree (created_at DESC NULLS LAST, id)"
+            ),
+        }
+    )
+    foreign_key_index = USERS_PKEY.model_copy(
+        update={
+            "index": "users_profession_id_idx",
+            "is_unique": False,
+            "leads_foreign_key": True,
+            "definition": (
+                "CREATE INDEX users_profession_id_idx ON public.users "
+                "USING btree (profession_id)"
+            ),
+        }
+    )
+
+    advice: IndexAdvice = advise_indexes(
+        statements=None,
+        tables=tables,
+        indexes=[USERS_PKEY, unused_index, sortable_index, foreign_key_index],
+    )
+
+    assert not advice.pg_stat_statements
+    assert advice.proposed_indexes == []
+    assert [table.table for table in advice.seq_scan_tables] == ["users"]
+    assert [index.index for index in advice.unused_indexes] == ["users_name_id_idx"]
+    assert advice.unused_indexes[0].drop_statement == (
+        "DROP INDEX CONCURRENTLY IF EXISTS users_name_id_idx"
+    )
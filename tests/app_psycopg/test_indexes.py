@@ -0,0 +1,67 @@
+import re
+from pathlib import Path
+from typing import Dict, List, Set
+
+import common
+from common import order_by_enums
+from common.order_by_enums import sortable_fields_by_table
+
+DB_DIR: Path = Path(common.__file__).parents[2] / "db"
+
+INDEX_PATTERN: re.Pattern = re.compile(
+    r"CREATE INDEX CONCURRENTLY IF NOT EXISTS \w+ ON (\w+) \(\s*([^;]*?)\s*\);"
+)
+TABLE_PATTERN: re.Pattern = re.compile(
+    r"CREATE TABLE IF NOT EXISTS (\w+)\s*\((.*?)\n\);", re.DOTALL
+)
+
+
+def get_index_columns() -> Dict[str, Set[str]]:
+    """The column lists of the indexes of each table (primary keys included)."""
+    indexes: Dict[str, Set[str]] = {}
+    schema: str = (DB_DIR / "schema.sql").read_text()
+    for table, body in TABLE_PATTERN.findall(schema):
+        for primary_key in re.findall(r"PRIMARY KEY \(([^)]*)\)", body):
+            indexes.setdefault(table, set()).add(primary_key)
+        if re.search(r"^\s*id UUID PRIMARY KEY", body, re.MULTILINE):
+            indexes.setdefault(table, set()).add("id")
+
+    for migration in sorted((DB_DIR / "migrations").glob("*.sql")):
+        for table, columns in INDEX_PATTERN.findall(migration.read_text()):
+            indexes.setdefault(table, set()).add(re.sub(r"\s+", " ", columns))
+    return indexes
+
+
+def test_sortable_fields_are_indexed():
+    """Test every sortable field has an index per direction with the id tie-break."""
+    indexes: Dict[str, Set[str]] = get_index_columns()
+
+    for table, fields in sortable_fields_by_table.items():
+        for field in fields:
+            assert f"{field} ASC NULLS LAST, id" in indexes[table], (table, field)
+            assert f"{field} DESC NULLS LAST, id" in indexes[table], (table, field)
+
+
+def test_sortable_fields_by_table():
+    """Test every list of sortable fields is mapped to its table."""
+    sortable_fields: List[List[str]] = [
+        value
+        for name, value in vars(order_by_enums).items()
+        if name.endswith("_sortable_fields")
+    ]
+
+    assert len(sortable_fields) == len(sortable_fields_by_table)
+    for fields in sortable_fields:
+        assert any(fields is mapped for mapped in sortable_fields_by_table.values())
+
+
+def test_foreign_keys_are_indexed():
+    """Test every foreign key column leads an index."""
+    indexes: Dict[str, Set[str]] = get_index_columns()
+    schema: str = (DB_DIR / "schema.sql").read_text()
+
+    for table, body in TABLE_PATTERN.findall(schema):
+        for column in re.findall(r"^\s*(\w+) UUID REFERENCES", body, re.MULTILINE):
+            assert any(
+                columns.split(",")[0].strip() == column for columns in indexes[table]
+            ), (table, column)
@@ -0,0 +1,68 @@
+import pytest
+
+from app_psycopg.api.json_passthrough import (
+    create_json_page_query,
+    create_json_row_query,
+)
+from common.pagination import CountStrategy
+from common.sorting import Direction, OrderByField
+
+
+def test_create_json_page_query_exact_count():
+    """Test the page envelope embeds the count statement."""
+    result = create_json_page_query(
+        "SELECT * FROM users LIMIT %(limit)s OFFSET %(offset)s",
+        "SELECT COUNT(*) FROM users",
+    )
+    assert "COALESCE(json_agg(to_json(page)), '[]'::json)" in result
+    assert "'total_count', (SELECT COUNT(*) FROM users)," in result
+    assert result.strip().endswith(
+        "FROM (SELECT * FROM users LIMIT %(limit)s OFFSET %(offset)s) AS page"
+    )
+
+
+def test_create_json_page_query_order_by():
+    """Test the items are aggregated in the order of the page."""
+    result = create_json_page_query(
+        "SELECT * FROM users ORDER BY name DESC NULLS LAST LIMIT %(limit)s",
+        None,
+        count=CountStrategy.NONE,
+        order_by=[
+            OrderByField(name="name", direction=Direction.DESC),
+            OrderByField(name="created_at", direction=Direction.ASC),
+        ],
+    )
+    assert (
+        "json_agg(to_json(page) ORDER BY page.name DESC NULLS LAST, "
+        "page.created_at ASC NULLS LAST)"
+    ) in result
+
+
+def test_create_json_page_query_estimate_and_none():
+    """Test the estimate is bound as a parameter and none omits total_count."""
+    estimate = create_json_page_query(
+        "SELECT * FROM users", None, count=CountStrategy.ESTIMATE
+    )
+    assert "GREATEST(%(estimated_count)s::bigint" in estimate
+
+    no_count = create_json_page_query(
+        "SELECT * FROM users", None, count=CountStrategy.NONE
+    )
+    assert "total_count" not in no_count
+
+
+def test_create_json_row_query_custom_row():
+    """Test a custom row expression replaces to_json(page)."""
+    result = create_json_row_query(
+        "SELECT * FROM orders", row="json_build_object('id', page.id)"
+    )
+    assert result == (
+        "SELECT convert_to(json_build_object('id', page.id)::text, 'UTF8') "
+        "FROM (SELECT * FROM orders) AS page"
+    )
+
+
+def test_create_json_page_query_requires_str():
+    """Test psycopg.sql objects are rejected."""
+    with pytest.raises(TypeError):
+        create_json_page_query(b"SELECT * FROM users", None)
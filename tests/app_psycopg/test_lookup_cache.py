@@ -0,0 +1,155 @@
+import json
+import uuid
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from psycopg.errors import ForeignKeyViolation
+
+from app_psycopg.db.db import Database
+from app_psycopg.db.db_statements import get_users_plain_stmt, get_users_stmt
+from common.lookup_cache import LookupCache, LookupCacheMiss
+from common.schemas import Company, Profession
+
+
+class AsyncCursorContextManagerMock:
+    """Mock for async cursor context manager."""
+
+    def __init__(self, cursor_mock):
+        self.cursor_mock = cursor_mock
+
+    async def __aenter__(self):
+        return self.cursor_mock
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+@pytest.fixture
+def profession() -> Profession:
+    return Profession(id=uuid.uuid4(), name="Engineer", created_at=datetime.now())
+
+
+@pytest.fixture
+def lookup_cache(profession) -> LookupCache:
+    lookup_cache = LookupCache()
+    lookup_cache.load(professions=[profession], companies=[])
+    return lookup_cache
+
+
+def create_notification(table: str, op: str, row: dict | None) -> str:
+    return json.dumps({"table": table, "op": op, "row": row}, default=str)
+
+
+def test_lookup_cache_apply(lookup_cache, profession):
+    """Test the notifications of the trigger are applied to the cached rows."""
+    company = Company(id=uuid.uuid4(), name="ACME", created_at=datetime.now())
+
+    lookup_cache.apply(
+        create_notification("companies", "INSERT", company.model_dump(mode="json"))
+    )
+    assert lookup_cache.get_company(company.id) == company
+    assert lookup_cache.get_company(str(company.id)) == company
+
+    renamed = profession.model_copy(update={"name": "Architect"})
+    lookup_cache.apply(
+        create_notification("professions", "UPDATE", renamed.model_dump(mode="json"))
+    )
+    assert lookup_cache.get_profession(profession.id).name == "Architect"
+
+    lookup_cache.apply(
+        create_notification("professions", "DELETE", renamed.model_dump(mode="json"))
+    )
+    assert lookup_cache.get_profession(profession.id) is None
+
+    lookup_cache.apply(create_notification("companies", "TRUNCATE", None))
+    assert lookup_cache.get_company(company.id) is None
+
+
+def test_lookup_cache_attach_profession(lookup_cache, profession):
+    """Test the profession of a user row is attached from memory."""
+    row = {"id": uuid.uuid4(), "name": "JOHN", "profession_id": profession.id}
+
+    assert lookup_cache.attach_profession(row)["profession"] == {
+        "id": profession.id,
+        "name": profession.name,
+    }
+    assert "profession_id" not in row
+
+    with pytest.raises(LookupCacheMiss):
+        lookup_cache.attach_profession({"profession_id": uuid.uuid4()})
+
+
+@pytest.mark.asyncio
+async def test_get_profession_from_lookup_cache(lookup_cache, profession):
+    """Test a cached profession is returned without a query."""
+    conn_mock = AsyncMock()
+    conn_mock.cursor = MagicMock(
+        return_value=AsyncCursorContextManagerMock(AsyncMock())
+    )
+    db = Database(conn_mock, lookup_cache=lookup_cache)
+
+    assert await db.get_profession(profession.id) == profession
+    conn_mock.cursor.assert_not_called()
+
+    await db.delete_profession(profession.id)
+    assert lookup_cache.get_profession(profession.id) is None
+
+
+@pytest.mark.asyncio
+async def test_failed_write_keeps_lookup_cache(lookup_cache, profession):
+    """Test a cached row is only evicted once its write succeeded."""
+    conn_mock = AsyncMock()
+    cursor_mock = AsyncMock()
+    cursor_mock.execute.side_effect = ForeignKeyViolation("still referenced")
+    conn_mock.cursor = MagicMock(
+        return_value=AsyncCursorContextManagerMock(cursor_mock)
+    )
+    db = Database(conn_mock, lookup_cache=lookup_cache)
+
+    with pytest.raises(ForeignKeyViolation):
+        await db.delete_profession(profession.id)
+    assert lookup_cache.get_profession(profession.id) == profession
+
+
+@pytest.mark.asyncio
+async def test_get_users_page_with_lookup_cache(lookup_cache, profession):
+    """Test user rows are read without the join and get the cached profession."""
+    conn_mock = AsyncMock()
+    cursor_mock = AsyncMock()
+    row = {
+        "id": uuid.uuid4(),
+        "name": "JOHN",
+        "created_at": datetime.now(),
+        "last_updated_at": None,
+        "profession_id": profession.id,
+    }
+    cursor_mock.fetchall.return_value = [{**row, "total_count": 1}]
+    conn_mock.cursor = MagicMock(
+        return_value=AsyncCursorContextManagerMock(cursor_mock)
+    )
+
+    db = Database(conn_mock, lookup_cache=lookup_cache)
+
+    result = await db.get_users_page(limit=10, offset=0)
+
+    assert get_users_plain_stmt in cursor_mock.execute.call_args[1]["query"]
+    assert result.items[0].profession.id == profession.id
+    assert result.items[0].profession.name == profession.name
+
+
+@pytest.mark.asyncio
+async def test_get_users_page_without_ready_lookup_cache():
+    """Test user rows are read with the join while the cache is not loaded."""
+    conn_mock = AsyncMock()
+    cursor_mock = AsyncMock()
+    cursor_mock.fetchall.return_value = []
+    conn_mock.cursor = MagicMock(
+        return_value=AsyncCursorContextManagerMock(cursor_mock)
+    )
+
+    db = Database(conn_mock, lookup_cache=LookupCache())
+
+    await db.get_users_page(limit=10, offset=0)
+
+    assert get_users_stmt in cursor_mock.execute.call_args[1]["query"]
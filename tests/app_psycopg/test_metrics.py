@@ -0,0 +1,94 @@
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette import status
+
+from app_psycopg.db.db import Database
+from app_psycopg.db.db_statements import get_users_stmt
+from app_psycopg.db.statement_registry import get_statement_name
+from common.metrics import (
+    HISTOGRAMS,
+    STATEMENT_DURATION,
+    STATEMENT_ROWS,
+    Histogram,
+)
+from common.pagination import LimitOffsetPage
+
+
+@pytest.fixture(autouse=True)
+def clear_metrics():
+    for histogram in HISTOGRAMS:
+        histogram.clear()
+
+
+def test_histogram_render():
+    """Test a histogram is rendered with cumulative buckets, sum and count."""
+    histogram = Histogram("latency_seconds", "Latency.", ("route",), (0.1, 1))
+    histogram.observe(0.05, "/users")
+    histogram.observe(0.5, "/users")
+    histogram.observe(5, "/users")
+
+    assert list(histogram.render()) == [
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{route="/users",le="0.1"} 1',
+        'latency_seconds_bucket{route="/users",le="1.0"} 2',
+        'latency_seconds_bucket{route="/users",le="+Inf"} 3',
+        'latency_seconds_sum{route="/users"} 5.55',
+        'latency_seconds_count{route="/users"} 3',
+    ]
+
+
+@pytest.mark.asyncio
+async def test_statement_metrics():
+    """Test statements are observed under their db_statements name."""
+    cursor_mock = AsyncMock()
+    cursor_mock.fetchall.return_value = [{"id": 1}, {"id": 2}]
+    conn_mock = MagicMock()
+    conn_mock.cursor.return_value.__aenter__.return_value = cursor_mock
+
+    await Database(conn_mock, trusted_rows=True)._get_resources(
+        query=get_users_stmt, model_class=dict, limit=10, offset=0
+    )
+
+    assert get_statement_name(get_users_stmt) == "get_users_stmt"
+    rendered: str = "\n".join(STATEMENT_DURATION.render())
+    assert (
+        'db_statement_duration_seconds_count{statement="get_users_stmt"} 1' in rendered
+    )
+    assert (
+        'db_statement_rows_bucket{statement="get_users_stmt",le="1.0"} 0'
+        in "\n".join(STATEMENT_ROWS.render())
+    )
+
+
+def test_get_metrics(client: TestClient, mock_db):
+    """Test /metrics reports the latency of each route by its template."""
+    mock_db.get_users_page.return_value = LimitOffsetPage(
+        items=[], items_count=0, total_count=0, limit=10, offset=0
+    )
+    mock_db.get_user.return_value = None
+    client.get("/users")
+    client.get(f"/users/{uuid.uuid4()}")
+    client.get(f"/users/{uuid.uuid4()}")
+    client.get("/no-such-route")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/users",status="200"} 1'
+        in response.text
+    )
+    # a single series for every user id, and for every unmatched path
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/users/{user_id}",status="404"} 2'
+        in response.text
+    )
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="unmatched",status="404"} 1'
+        in response.text
+    )
@@ -8,13 +8,15 @@ from fastapi.testclient import TestClient
 from polyfactory.factories.pydantic_factory import ModelFactory
 from starlette import status
 
-from app_psycopg.api.models import (
+from common.export import ExportFormat
+from common.integrity import ConstraintViolation
+from common.pagination import LimitOffsetPage, CountStrategy
+
+from common.schemas import (
     OrderInput,
     User,
     Order,
-    OrderInputValidated,
     UserShort,
-    ProfessionShort,
 )
 
 
@@ -22,10 +24,6 @@ class UserFactory(ModelFactory[User]):
     __model__ = User
 
 
-class ProfessionShortFactory(ModelFactory[ProfessionShort]):
-    __model__ = ProfessionShort
-
-
 class UserShortFactory(ModelFactory[UserShort]):
     __model__ = UserShort
 
@@ -90,61 +88,21 @@ def order(order_id, payer_response, payee_response):
     )
 
 
-@pytest.fixture
-def validated_order(order_input, payer, payee):
-    """Create a validated order."""
-    # Create proper User objects with ProfessionShort
-    payer_with_profession = UserFactory.build(
-        id=payer.id,
-        name=payer.name,
-        created_at=datetime.now(),
-        profession=ProfessionShortFactory.build(),
-    )
-    payee_with_profession = UserFactory.build(
-        id=payee.id,
-        name=payee.name,
-        created_at=datetime.now(),
-        profession=ProfessionShortFactory.build(),
-    )
-
-    return OrderInputValidated(
-        order_input=order_input,
-        payer=payer_with_profession,
-        payee=payee_with_profession,
-    )
-
-
-def test_create_order(client: TestClient, mock_db, order, validated_order):
+def test_create_order(client: TestClient, mock_db, order, order_input):
     """Test creating an order."""
     # Setup mock
     mock_db.insert_order.return_value = order.id
     mock_db.get_order.return_value = order
 
-    # We need to patch both validate_order_input and validate_user_id
-    # to avoid the validation error
-    with (
-        patch(
-            "app_psycopg.api.dependencies.validate_user_id",
-            side_effect=[validated_order.payer, validated_order.payee],
-        ),
-        patch(
-            "app_psycopg.api.routes.orders.validate_order_input",
-            return_value=validated_order,
-        ),
-    ):
-        # Make request
-        response = client.post(
-            "/orders",
-            json={
-                "amount": str(validated_order.order_input.amount),
-                "payer_id": str(validated_order.order_input.payer_id),
-                "payee_id": str(validated_order.order_input.payee_id),
-            },
-        )
-
-    # Print response content for debugging
-    print(f"Response status: {response.status_code}")
-    print(f"Response content: {response.content}")
+    # Make request
+    response = client.post(
+        "/orders",
+        json={
+            "amount": str(order_input.amount),
+            "payer_id": str(order_input.payer_id),
+            "payee_id": str(order_input.payee_id),
+        },
+    )
 
     # Assert response
     assert response.status_code == status.HTTP_201_CREATED
@@ -156,9 +114,57 @@ def test_create_order(client: TestClient, mock_db, order, validated_order):
     assert response_json["payee"]["id"] == str(order.payee.id)
     assert response_json["payee"]["name"] == order.payee.name
 
-    # Assert mock calls
-    mock_db.insert_order.assert_called_once_with(validated_order.order_input)
+    # Assert mock calls: the users are checked by the foreign keys, not looked up
+    mock_db.insert_order.assert_called_once_with(order_input)
     mock_db.get_order.assert_called_once_with(order.id)
+    mock_db.get_user.assert_not_called()
+
+
+def test_create_order_unknown_payee(client: TestClient, mock_db, order_input):
+    """Test a violated foreign key of the insert is answered with a 404 naming it."""
+    mock_db.insert_order.side_effect = ConstraintViolation(
+        "orders_payee_id_fkey", {"payee_id": order_input.payee_id}
+    )
+
+    response = client.post(
+        "/orders",
+        json={
+            "amount": str(order_input.amount),
+            "payer_id": str(order_input.payer_id),
+            "payee_id": str(order_input.payee_id),
+        },
+    )
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json() == {
+        "detail": f"User '{order_input.payee_id}' not found!",
+        "constraint": "orders_payee_id_fkey",
+        "field": "payee_id",
+    }
+    mock_db.get_order.assert_not_called()
+
+
+def test_create_order_amount_check(client: TestClient, mock_db, order_input):
+    """Test a violated check constraint of the insert is answered with a 400."""
+    mock_db.insert_order.side_effect = ConstraintViolation(
+        "orders_amount_check", {"amount": order_input.amount}
+    )
+
+    response = client.post(
+        "/orders",
+        json={
+            "amount": str(order_input.amount),
+            "payer_id": str(order_input.payer_id),
+            "payee_id": str(order_input.payee_id),
+        },
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {
+        "detail": "amount must be between 0 and 1000000",
+        "constraint": "orders_amount_check",
+    }
+    mock_db.get_order.assert_not_called()
 
 
 def test_get_order(client: TestClient, mock_db, order):
@@ -200,8 +206,9 @@ def test_get_order(client: TestClient, mock_db, order):
 def test_get_orders(client: TestClient, mock_db, order):
     """Test getting a list of orders."""
     # Setup mock
-    mock_db.get_orders.return_value = [order]
-    mock_db.get_orders_count.return_value = 1
+    mock_db.get_orders_page.return_value = LimitOffsetPage(
+        items=[order], items_count=1, total_count=1, limit=10, offset=0
+    )
 
     # Make request
     response = client.get("/orders")
@@ -219,8 +226,68 @@ def test_get_orders(client: TestClient, mock_db, order):
     assert "total_count" in response_json
 
     # Assert mock calls
-    mock_db.get_orders.assert_called_once_with(limit=10, offset=0, order_by=None)
-    mock_db.get_orders_count.assert_called_once()
+    mock_db.get_orders_page.assert_called_once_with(
+        limit=10, offset=0, order_by=None, count=CountStrategy.EXACT
+    )
+
+
+def test_export_orders(client: TestClient, mock_db):
+    """Test streaming all orders as NDJSON."""
+    # Setup mock
+    lines = [b'{"id": 1}\n', b'{"id": 2}\n']
+
+    async def chunks():
+        for line in lines:
+            yield line
+
+    mock_db.export_orders.return_value = chunks()
+
+    # Make request
+    response = client.get(
+        "/orders/export",
+        params={"amount__gte": "10.00", "order_by": "+amount"},
+    )
+
+    # Assert response
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.headers["content-disposition"] == (
+        'attachment; filename="orders.ndjson"'
+    )
+    assert response.content == b"".join(lines)
+
+    # Assert mock calls
+    call_kwargs = mock_db.export_orders.call_args[1]
+    assert call_kwargs["export_format"] == ExportFormat.NDJSON
+    assert call_kwargs["filters"] == {"amount__gte": Decimal("10.00")}
+    assert [field.name for field in call_kwargs["order_by"]] == ["amount"]
+
+
+def test_export_orders_csv(client: TestClient, mock_db):
+    """Test the export format is negotiated with the Accept header."""
+
+    # Setup mock
+    async def chunks():
+        yield b"id,amount\r\n"
+
+    mock_db.export_orders.return_value = chunks()
+
+    # Make request
+    response = client.get("/orders/export", headers={"Accept": "text/csv"})
+
+    # Assert response
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.content == b"id,amount\r\n"
+    assert mock_db.export_orders.call_args[1]["export_format"] == ExportFormat.CSV
+
+
+def test_export_orders_not_acceptable(client: TestClient, mock_db):
+    """Test an unsupported Accept header returns 406."""
+    response = client.get("/orders/export", headers={"Accept": "application/xml"})
+
+    assert response.status_code == status.HTTP_406_NOT_ACCEPTABLE
+    mock_db.export_orders.assert_not_called()
 
 
 def test_delete_order(client: TestClient, mock_db, order):
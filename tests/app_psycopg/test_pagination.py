@@ -1,6 +1,25 @@
+import base64
+import json
+import uuid
+from types import SimpleNamespace
+
 import pytest
+from fastapi import HTTPException
 from psycopg import sql
-from app_psycopg.api.pagination import LimitOffsetPage, create_paginate_query
+from app_psycopg.api.pagination import (
+    create_paginate_query,
+    create_keyset_query,
+    create_total_count_query,
+)
+from common.order_by_enums import sortable_fields_by_table
+from common.pagination import (
+    CURSOR_KEY_TYPES,
+    LimitOffsetPage,
+    encode_cursor,
+    decode_cursor,
+    create_cursor_page,
+)
+from common.sorting import OrderByField, Direction
 
 
 def test_limit_offset_page():
@@ -34,38 +53,193 @@ def test_limit_offset_page():
 def test_create_paginate_query_with_string():
     """Test create_paginate_query with string input."""
     query = "SELECT * FROM users"
-    result = create_paginate_query(query, 10, 5)
-    assert result == "SELECT * FROM users LIMIT 10 OFFSET 5"
+    result = create_paginate_query(query)
+    assert result == "SELECT * FROM users LIMIT %(limit)s OFFSET %(offset)s"
 
 
 def test_create_paginate_query_with_bytes():
     """Test create_paginate_query with bytes input."""
     query = b"SELECT * FROM users"
-    result = create_paginate_query(query, 10, 5)
-    assert result == b"SELECT * FROM users LIMIT 10 OFFSET 5"
+    result = create_paginate_query(query)
+    assert result == b"SELECT * FROM users LIMIT %(limit)s OFFSET %(offset)s"
 
 
 def test_create_paginate_query_with_sql():
     """Test create_paginate_query with sql.SQL input."""
     query = sql.SQL("SELECT * FROM users")
-    result = create_paginate_query(query, 10, 5)
+    result = create_paginate_query(query)
     # Convert result to string for comparison
-    assert result.as_string(None) == "SELECT * FROM users LIMIT 10 OFFSET 5"
+    assert (
+        result.as_string(None)
+        == "SELECT * FROM users LIMIT %(limit)s OFFSET %(offset)s"
+    )
 
 
 def test_create_paginate_query_with_composed():
     """Test create_paginate_query with sql.Composed input."""
     query = sql.Composed([sql.SQL("SELECT * FROM users")])
-    result = create_paginate_query(query, 10, 5)
+    result = create_paginate_query(query)
     # Convert result to string for comparison
-    assert result.as_string(None) == "SELECT * FROM users LIMIT 10 OFFSET 5"
+    assert (
+        result.as_string(None)
+        == "SELECT * FROM users LIMIT %(limit)s OFFSET %(offset)s"
+    )
 
 
 def test_create_paginate_query_invalid_type():
     """Test create_paginate_query with invalid input type."""
     query = 123  # Invalid type
     with pytest.raises(TypeError) as exc_info:
-        create_paginate_query(query, 10, 5)
+        create_paginate_query(query)
     assert "Query must be a LiteralString, bytes, sql.SQL, or sql.Composed" in str(
         exc_info.value
     )
+
+
+def test_create_keyset_query_first_page():
+    """Test create_keyset_query without a cursor."""
+    query = "SELECT * FROM users"
+    fields = [OrderByField(name="name", direction=Direction.DESC)]
+    result, params = create_keyset_query(query, fields, None, 11)
+    assert result.as_string(None) == (
+        'SELECT * FROM (SELECT * FROM users) AS keyset ORDER BY "name" DESC NULLS LAST, '
+        '"id" ASC NULLS LAST LIMIT %(keyset_limit)s'
+    )
+    assert params == {"keyset_limit": 11}
+
+
+def test_create_keyset_query_with_cursor():
+    """Test create_keyset_query seeks after the cursor values with a row comparison."""
+    query = "SELECT * FROM users"
+    fields = [OrderByField(name="name", direction=Direction.ASC)]
+    result, params = create_keyset_query(query, fields, ["BOB", "some-id"], 11)
+    assert result.as_string(None) == (
+        "SELECT * FROM (SELECT * FROM users) AS keyset WHERE "
+        '("name", "id") > (%(keyset_0)s, %(keyset_1)s) '
+        'ORDER BY "name" ASC NULLS LAST, "id" ASC NULLS LAST LIMIT %(keyset_limit)s'
+    )
+    assert params == {"keyset_limit": 11, "keyset_0": "BOB", "keyset_1": "some-id"}
+
+
+def test_create_keyset_query_with_mixed_directions():
+    """Test create_keyset_query bounds the leading key if the directions differ."""
+    query = "SELECT * FROM users"
+    fields = [OrderByField(name="name", direction=Direction.DESC)]
+    result, params = create_keyset_query(query, fields, ["BOB", "some-id"], 11)
+    assert result.as_string(None) == (
+        "SELECT * FROM (SELECT * FROM users) AS keyset WHERE "
+        '"name" <= %(keyset_0)s AND (("name" < %(keyset_0)s) OR '
+        '("name" = %(keyset_0)s AND "id" > %(keyset_1)s)) '
+        'ORDER BY "name" DESC NULLS LAST, "id" ASC NULLS LAST LIMIT %(keyset_limit)s'
+    )
+    assert params == {"keyset_limit": 11, "keyset_0": "BOB", "keyset_1": "some-id"}
+
+
+def test_create_keyset_query_with_nullable_key():
+    """Test create_keyset_query keeps the NULLs, sorted last, of a nullable key."""
+    query = "SELECT * FROM users"
+    fields = [OrderByField(name="last_updated_at", direction=Direction.ASC)]
+    result, _ = create_keyset_query(query, fields, ["2025-01-01", "some-id"], 11)
+    assert (
+        'WHERE ("last_updated_at" >= %(keyset_0)s OR "last_updated_at" IS NULL) AND '
+        '((("last_updated_at" > %(keyset_0)s OR "last_updated_at" IS NULL)) OR '
+        '("last_updated_at" = %(keyset_0)s AND "id" > %(keyset_1)s)) '
+        in result.as_string(None)
+    )
+
+
+def test_create_keyset_query_with_null_cursor_value():
+    """Test create_keyset_query stays within the NULLs once the cursor reached them."""
+    query = "SELECT * FROM users"
+    fields = [OrderByField(name="last_updated_at", direction=Direction.ASC)]
+    result, params = create_keyset_query(query, fields, [None, "some-id"], 11)
+    assert (
+        'WHERE "last_updated_at" IS NULL AND '
+        '(("last_updated_at" IS NULL AND "id" > %(keyset_1)s))'
+        in result.as_string(None)
+    )
+    assert "keyset_0" not in params
+
+
+def test_cursor_round_trip():
+    """Test encode_cursor and decode_cursor."""
+    fields = [OrderByField(name="name", direction=Direction.ASC)]
+    item = SimpleNamespace(id=uuid.uuid4(), name="BOB")
+
+    cursor = encode_cursor(item, fields)
+
+    assert decode_cursor(cursor, fields) == ["BOB", item.id]
+    assert decode_cursor(None, fields) is None
+
+
+def test_decode_cursor_invalid():
+    """Test decode_cursor with a malformed or mismatching cursor."""
+    fields = [OrderByField(name="name", direction=Direction.ASC)]
+    cursor = encode_cursor(SimpleNamespace(id=uuid.uuid4(), name="BOB"), fields)
+
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor("not-a-cursor", fields)
+    assert exc_info.value.status_code == 400
+
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(cursor, [])
+    assert exc_info.value.status_code == 400
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        1,
+        ["BOB"],
+        [1, str(uuid.uuid4())],
+        ["BOB", "not-a-uuid"],
+    ],
+)
+def test_decode_cursor_invalid_values(values):
+    """Test decode_cursor rejects values that don't match the sort fields' types."""
+    fields = [OrderByField(name="name", direction=Direction.ASC)]
+    payload = {"k": ["name", "id"], "v": values}
+    cursor = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(cursor, fields)
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.detail == "Invalid cursor."
+
+
+def test_cursor_key_types():
+    """Test the values of every sortable field can be validated."""
+    for fields in sortable_fields_by_table.values():
+        assert set(fields) <= CURSOR_KEY_TYPES.keys()
+
+
+def test_create_cursor_page():
+    """Test create_cursor_page sets next_cursor only if there are more items."""
+    items = [SimpleNamespace(id=uuid.uuid4()) for _ in range(3)]
+
+    page = create_cursor_page(items=items, limit=2, order_by_fields=[])
+    assert page.items_count == 2
+    assert decode_cursor(page.next_cursor, []) == [items[1].id]
+
+    page = create_cursor_page(items=items, limit=3, order_by_fields=[])
+    assert page.items_count == 3
+    assert page.next_cursor is None
+
+
+def test_create_total_count_query_with_string():
+    """Test create_total_count_query with string input."""
+    query = "SELECT * FROM users"
+    result = create_total_count_query(query)
+    assert (
+        result
+        == "SELECT *, COUNT(*) OVER() AS total_count FROM (SELECT * FROM users) AS page"
+    )
+
+
+def test_create_total_count_query_with_sql():
+    """Test create_total_count_query with sql.SQL input."""
+    query = sql.SQL("SELECT * FROM users")
+    result = create_total_count_query(query)
+    assert result.as_string(None) == (
+        "SELECT *, COUNT(*) OVER() AS total_count FROM (SELECT * FROM users) AS page"
+    )
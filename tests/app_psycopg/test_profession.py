@@ -2,11 +2,12 @@ import uuid
 from unittest.mock import patch
 
 import pytest
+from common.schemas import Profession
 from fastapi.testclient import TestClient
 from polyfactory.factories.pydantic_factory import ModelFactory
 from starlette import status
 
-from app_psycopg.api.models import Profession
+from common.pagination import CountStrategy, LimitOffsetPage
 
 
 class ProfessionFactory(ModelFactory[Profession]):
@@ -51,7 +52,7 @@ def test_get_profession(client: TestClient, mock_db, profession):
 
     # Patch the validate_profession_id dependency
     with patch(
-        "app_psycopg.api.routes.profession.validate_profession_id",
+        "app_psycopg.api.routes.professions.validate_profession_id",
         return_value=profession,
     ):
         # Make request
@@ -69,8 +70,9 @@ def test_get_profession(client: TestClient, mock_db, profession):
 def test_get_professions(client: TestClient, mock_db, profession):
     """Test getting a list of professions."""
     # Setup mock
-    mock_db.get_professions.return_value = [profession]
-    mock_db.get_professions_count.return_value = 1
+    mock_db.get_professions_page.return_value = LimitOffsetPage(
+        items=[profession], items_count=1, total_count=1, limit=10, offset=0
+    )
 
     # Make request
     response = client.get("/professions")
@@ -86,10 +88,12 @@ def test_get_professions(client: TestClient, mock_db, profession):
     assert "offset" in response_json
     assert "items_count" in response_json
     assert "total_count" in response_json
+    assert response.headers["cache-control"] == "public, max-age=60"
 
     # Assert mock calls
-    mock_db.get_professions.assert_called_once_with(limit=10, offset=0, order_by=None)
-    mock_db.get_professions_count.assert_called_once()
+    mock_db.get_professions_page.assert_called_once_with(
+        limit=10, offset=0, order_by=None, count=CountStrategy.EXACT
+    )
 
 
 def test_update_profession(client: TestClient, mock_db, profession):
@@ -106,7 +110,7 @@ def test_update_profession(client: TestClient, mock_db, profession):
 
     # Patch only the validate_profession_id dependency
     with patch(
-        "app_psycopg.api.routes.profession.validate_profession_id",
+        "app_psycopg.api.routes.professions.validate_profession_id",
         return_value=profession,
     ):
         # Make request
@@ -130,7 +134,7 @@ def test_delete_profession(client: TestClient, mock_db, profession):
 
     # Patch only the validate_profession_id dependency
     with patch(
-        "app_psycopg.api.routes.profession.validate_profession_id",
+        "app_psycopg.api.routes.professions.validate_profession_id",
         return_value=profession,
     ):
         # Make request
@@ -0,0 +1,190 @@
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app_psycopg.api.dependencies.db import get_db_conn
+from common.replica import (
+    LAST_WRITE_COOKIE,
+    ReadYourWritesMiddleware,
+    ReplicaMonitor,
+    get_required_lsn,
+    use_replica,
+)
+from common.settings import load_settings
+
+
+def create_request(method: str = "GET", cookie: str | None = None, state=None):
+    headers = [(b"cookie", f"{LAST_WRITE_COOKIE}={cookie}".encode())] if cookie else []
+    return Request(
+        {
+            "type": "http",
+            "method": method,
+            "path": "/",
+            "headers": headers,
+            "state": state if state is not None else {},
+        }
+    )
+
+
+def create_monitor(lag: float | None, max_lag: float = 5.0) -> ReplicaMonitor:
+    replica_monitor = ReplicaMonitor(measure=AsyncMock(), max_lag=max_lag)
+    replica_monitor._lag = lag
+    return replica_monitor
+
+
+@pytest.mark.asyncio
+async def test_replica_monitor():
+    """Test the monitor measures the lag and treats failures as unavailable."""
+    measure = AsyncMock(side_effect=[1.0, ConnectionError()])
+
+    async with ReplicaMonitor(measure=measure, max_lag=5.0, interval=0.01) as monitor:
+        assert not monitor.available
+        await asyncio.sleep(0)
+        assert monitor.lag == 1.0
+        assert monitor.available
+        await asyncio.sleep(0.02)
+        assert monitor.lag is None
+        assert not monitor.available
+
+
+def test_use_replica():
+    """Test only safe requests are routed to an available replica."""
+    settings = load_settings(environ={})
+    state = {"replica_monitor": create_monitor(lag=0.5)}
+
+    assert use_replica(create_request("GET", state=state), settings)
+    assert not use_replica(create_request("POST", state=state), settings)
+    assert not use_replica(create_request("GET"), settings)
+    assert not use_replica(
+        create_request("GET", state={"replica_monitor": create_monitor(lag=10.0)}),
+        settings,
+    )
+
+
+def test_use_replica_time_based_read_your_writes():
+    """Test a client reads from the primary within the window after its write."""
+    settings = load_settings(environ={"DB_READ_YOUR_WRITES": "time"})
+    state = {"replica_monitor": create_monitor(lag=0.5)}
+
+    recent = create_request("GET", cookie=str(time.time()), state=state)
+    old = create_request("GET", cookie=str(time.time() - 60), state=state)
+
+    assert not use_replica(recent, settings)
+    assert use_replica(old, settings)
+
+
+def test_get_required_lsn():
+    """Test the LSN of the cookie is only used in lsn mode and if well-formed."""
+    settings = load_settings(environ={})
+
+    assert get_required_lsn(create_request(cookie="16/B374D848"), settings) == (
+        "16/B374D848"
+    )
+    assert get_required_lsn(create_request(cookie="1; DROP"), settings) is None
+    assert (
+        get_required_lsn(
+            create_request(cookie="16/B374D848"),
+            load_settings(environ={"DB_READ_YOUR_WRITES": "time"}),
+        )
+        is None
+    )
+
+
+def create_pool(conn):
+    pool = MagicMock()
+    pool.connection.return_value.__aenter__.return_value = conn
+    return pool
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("replayed, expected", [(True, "replica"), (False, "primary")])
+async def test_get_db_conn_read_your_writes(replayed, expected):
+    """Test a lagging replica falls back to the primary for the client's reads."""
+    connections = {"primary": AsyncMock(), "replica": AsyncMock()}
+    request = create_request(
+        "GET",
+        cookie="16/B374D848",
+        state={
+            "conn_pool": create_pool(connections["primary"]),
+            "replica_pool": create_pool(connections["replica"]),
+            "pool_monitor": MagicMock(),
+            "replica_monitor": create_monitor(lag=0.5),
+        },
+    )
+
+    with (
+        patch(
+            "app_psycopg.api.dependencies.db.get_settings",
+            return_value=load_settings(environ={}),
+        ),
+        patch(
+            "app_psycopg.api.dependencies.db.has_replayed_lsn",
+            AsyncMock(return_value=replayed),
+        ),
+    ):
+        conn = await anext(get_db_conn(request))
+
+    assert conn is connections[expected]
+
+
+def test_read_your_writes_middleware():
+    """Test the LSN of a write is returned as a cookie once the response is complete."""
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware)
+
+    @app.post("/items")
+    async def create_item(request: Request) -> dict:
+        request.state.write_lsn = "16/B374D848"
+        return {}
+
+    @app.get("/items")
+    async def get_items() -> list:
+        return []
+
+    settings = load_settings(environ={"DB_REPLICA_DSN": "postgresql://replica/db"})
+    with (
+        patch("common.replica.get_settings", return_value=settings),
+        TestClient(app) as client,
+    ):
+        response = client.post("/items")
+        assert response.cookies[LAST_WRITE_COOKIE] == "16/B374D848"
+
+        response = client.get("/items")
+        assert "set-cookie" not in response.headers
+
+
+def test_read_your_writes_middleware_without_replica():
+    """Test requests pass through without a replica."""
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware)
+
+    @app.post("/items")
+    async def create_item(request: Request) -> dict:
+        request.state.write_lsn = "16/B374D848"
+        return {}
+
+    with (
+        patch("common.replica.get_settings", return_value=load_settings(environ={})),
+        TestClient(app) as client,
+    ):
+        assert "set-cookie" not in client.post("/items").headers
+
+
+def test_replica_settings():
+    """Test the replica settings are read from the environment."""
+    settings = load_settings(
+        environ={
+            "DB_REPLICA_DSN": "postgresql://replica/db",
+            "DB_REPLICA_MAX_LAG": "2.5",
+            "DB_READ_YOUR_WRITES": "disabled",
+        }
+    )
+
+    assert settings.replica_dsn == "postgresql://replica/db"
+    assert settings.replica_max_lag == 2.5
+    assert settings.read_your_writes == "disabled"
+    assert settings.read_your_writes_window == 5.0
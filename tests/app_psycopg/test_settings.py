@@ -0,0 +1,67 @@
+import pytest
+from pydantic import ValidationError
+
+from common.settings import PreparePolicy, Profile, load_settings
+
+
+def test_load_settings_defaults_to_dev_profile():
+    """Test load_settings without any configuration uses the dev profile."""
+    settings = load_settings(environ={})
+    assert settings.profile == Profile.DEV
+    assert settings.pool_max_size == 2
+    assert settings.echo is True
+    assert settings.connection_options is None
+
+
+def test_load_settings_prod_profile():
+    """Test the prod profile bounds the pool and sets a statement timeout."""
+    settings = load_settings(environ={"DB_PROFILE": "prod"})
+    assert settings.pool_min_size == 4
+    assert settings.pool_max_size == 16
+    assert settings.echo is False
+    assert settings.connection_options == "-c statement_timeout=10000"
+
+
+def test_load_settings_environment_overrides_profile():
+    """Test DB_* environment variables take precedence over the profile."""
+    settings = load_settings(
+        environ={
+            "DB_PROFILE": "bench",
+            "DB_POOL_MAX_SIZE": "20",
+            "DB_PREPARE_POLICY": "disabled",
+            "DB_ECHO": "true",
+        }
+    )
+    assert settings.pool_min_size == 10
+    assert settings.pool_max_size == 20
+    assert settings.prepare_policy == PreparePolicy.DISABLED
+    assert settings.echo is True
+
+
+def test_load_settings_config_file(tmp_path):
+    """Test the config file overrides the profile and is overridden by the environment."""
+    config_file = tmp_path / "db.toml"
+    config_file.write_text(
+        'profile = "prod"\ndsn = "postgresql://app@db:5432/app"\npool_max_size = 32\n'
+    )
+    settings = load_settings(
+        environ={"DB_CONFIG_FILE": str(config_file), "DB_POOL_MAX_SIZE": "8"}
+    )
+    assert settings.profile == Profile.PROD
+    assert settings.dsn == "postgresql://app@db:5432/app"
+    assert settings.pool_max_size == 8
+
+
+@pytest.mark.parametrize(
+    "environ",
+    [
+        {"DB_PROFILE": "staging"},
+        {"DB_POOL_MAX_SIZE": "0"},
+        {"DB_POOL_MIN_SIZE": "5", "DB_POOL_MAX_SIZE": "4"},
+        {"DB_STATEMENT_TIMEOUT": "-1"},
+    ],
+)
+def test_load_settings_invalid(environ):
+    """Test invalid settings are rejected at startup."""
+    with pytest.raises((ValidationError, ValueError)):
+        load_settings(environ=environ)
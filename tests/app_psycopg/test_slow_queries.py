@@ -0,0 +1,111 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, List
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from common.settings import load_settings
+from common.slow_queries import (
+    EXPLAIN_TIMEOUT_MS,
+    SlowQueryLog,
+    SlowQueryMiddleware,
+    StatementPlans,
+    get_explain_timeout,
+    get_fingerprint,
+    observe_slow_query,
+)
+
+
+def create_slow_query_log(explained: List[str]) -> SlowQueryLog:
+    async def explain(statement: str, params: Any) -> Any:
+        explained.append(statement)
+        return [{"Plan": {"Node Type": "Seq Scan"}}]
+
+    return SlowQueryLog(explain=explain, threshold_ms=100, sample_rate=0, max_plans=10)
+
+
+async def wait_for_explains(slow_query_log: SlowQueryLog) -> None:
+    await asyncio.gather(*slow_query_log._pending)
+
+
+@pytest.mark.asyncio
+async def test_slow_query_log():
+    """Test slow queries are explained and grouped by their fingerprint."""
+    explained: List[str] = []
+    slow_query_log = create_slow_query_log(explained)
+
+    assert slow_query_log.get_reason(99) is None
+    assert slow_query_log.get_reason(100) == "slow"
+
+    for duration_ms in (150, 300):
+        slow_query_log.submit(
+            "SELECT * FROM users WHERE id = %(id)s",
+            {"id": "a"},
+            duration_ms,
+            "slow",
+            "/users/{user_id}",
+        )
+        await wait_for_explains(slow_query_log)
+    # statements that aren't queries are never run again
+    slow_query_log.submit("DELETE FROM users", None, 500, "slow", None)
+    await wait_for_explains(slow_query_log)
+
+    plans: List[StatementPlans] = slow_query_log.get_plans()
+    assert len(explained) == 2
+    assert len(plans) == 1
+    assert plans[0].count == 2
+    assert plans[0].max_duration_ms == 300
+    # only the types of the parameters are kept
+    assert plans[0].plans[0].params == {"id": "str"}
+    assert plans[0].plans[0].route == "/users/{user_id}"
+    assert plans[0].plans[0].plan == [{"Plan": {"Node Type": "Seq Scan"}}]
+
+
+def test_fingerprint():
+    """Test statements differing in literals and whitespace share a fingerprint."""
+    assert get_fingerprint("SELECT * FROM users LIMIT 10") == get_fingerprint(
+        "SELECT *\n    FROM users LIMIT 50"
+    )
+    assert get_fingerprint("SELECT * FROM users") != get_fingerprint(
+        "SELECT * FROM orders"
+    )
+
+
+def test_get_explain_timeout():
+    """Test an EXPLAIN ANALYZE runs at most as long as the statement_timeout."""
+    assert get_explain_timeout(load_settings(environ={})) == EXPLAIN_TIMEOUT_MS
+    assert (
+        get_explain_timeout(load_settings(environ={"DB_STATEMENT_TIMEOUT": "10000"}))
+        == 10_000
+    )
+
+
+def test_observe_slow_query():
+    """Test the statements of a request are explained with the route template."""
+    explained: List[str] = []
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        async with create_slow_query_log(explained) as slow_query_log:
+            yield {"slow_query_log": slow_query_log}
+
+    app = FastAPI(lifespan=lifespan)
+    app.add_middleware(SlowQueryMiddleware)
+
+    @app.get("/users/{user_id}")
+    async def get_user(user_id: str, request: Request) -> dict:
+        observe_slow_query(lambda: "SELECT 1", None, 10)
+        observe_slow_query(lambda: "SELECT * FROM users", None, 250)
+        await wait_for_explains(request.state.slow_query_log)
+        return {}
+
+    with TestClient(app) as client:
+        client.get("/users/a")
+        slow_query_log: SlowQueryLog = client.app_state["slow_query_log"]
+        plans: List[StatementPlans] = slow_query_log.get_plans()
+
+    assert explained == ["SELECT * FROM users"]
+    assert plans[0].plans[0].route == "/users/{user_id}"
+    assert plans[0].plans[0].reason == "slow"
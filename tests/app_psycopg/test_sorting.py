@@ -1,10 +1,13 @@
 import pytest
 from psycopg import sql
-from app_psycopg.api.sorting import (
+from pydantic import TypeAdapter
+
+from app_psycopg.api.sorting import create_order_by_query
+from common.order_by_enums import OrderByUser
+from common.sorting import (
     create_order_by_enum,
     _parse_str_order_by,
     parse_order_by,
-    create_order_by_query,
     check_for_duplicates,
     validate_order_by_query_params,
     Direction,
@@ -52,15 +55,27 @@ def test_parse_order_by():
     # Create a test enum
     TestEnum = create_order_by_enum(["name", "age"])
 
-    # Test with multiple fields
-    fields = parse_order_by({TestEnum["+name"], TestEnum["-age"]})
-    assert len(fields) == 2
+    # Test with multiple fields, the order of the query is kept
+    fields = parse_order_by([TestEnum["-age"], TestEnum["+name"], TestEnum["-age"]])
+    assert fields == [
+        OrderByField(name="age", direction=Direction.DESC),
+        OrderByField(name="name", direction=Direction.ASC),
+    ]
+
 
-    # Check that the fields are parsed correctly
-    name_field = next(f for f in fields if f.name == "name")
-    age_field = next(f for f in fields if f.name == "age")
-    assert name_field.direction == Direction.ASC
-    assert age_field.direction == Direction.DESC
+@pytest.mark.parametrize(
+    "query_params",
+    [
+        ["+name", "-created_at", "+last_updated_at"],
+        ["+last_updated_at", "-created_at", "+name"],
+        ["-created_at", "+name"],
+    ],
+)
+def test_order_by_query_order(query_params):
+    """Test the order_by parameters are sorted by in the order of the query."""
+    fields = TypeAdapter(OrderByUser).validate_python(query_params)
+
+    assert [f"{field.direction.value}{field.name}" for field in fields] == query_params
 
 
 def test_create_order_by_query_with_string():
@@ -141,16 +156,13 @@ def test_validate_order_by_query_params():
     TestEnum = create_order_by_enum(["name", "age"])
 
     # Test with valid parameters
-    fields = validate_order_by_query_params({TestEnum["+name"], TestEnum["-age"]})
-    assert len(fields) == 2
-
-    # Check that the fields are validated correctly
-    name_field = next(f for f in fields if f.name == "name")
-    age_field = next(f for f in fields if f.name == "age")
-    assert name_field.direction == Direction.ASC
-    assert age_field.direction == Direction.DESC
+    fields = validate_order_by_query_params([TestEnum["+name"], TestEnum["-age"]])
+    assert fields == [
+        OrderByField(name="name", direction=Direction.ASC),
+        OrderByField(name="age", direction=Direction.DESC),
+    ]
 
     # Test with conflicting parameters
     with pytest.raises(ValueError) as exc_info:
-        validate_order_by_query_params({TestEnum["+name"], TestEnum["-name"]})
+        validate_order_by_query_params([TestEnum["+name"], TestEnum["-name"]])
     assert "Conflicting order_by parameters detected: name" in str(exc_info.value)
@@ -0,0 +1,61 @@
+from psycopg import sql
+
+from app_psycopg.db.statement_registry import (
+    PreparePolicy,
+    get_list_stmt,
+    get_prepare_threshold,
+)
+from common.sorting import Direction, OrderByField
+
+
+def test_get_list_stmt_binds_pagination():
+    """Test get_list_stmt binds LIMIT and OFFSET as parameters."""
+    result = get_list_stmt("SELECT * FROM users")
+    assert result == "SELECT * FROM users LIMIT %(limit)s OFFSET %(offset)s"
+
+
+def test_get_list_stmt_with_order_by():
+    """Test get_list_stmt appends ORDER BY before LIMIT and OFFSET."""
+    fields = [OrderByField(name="name", direction=Direction.DESC)]
+    result = get_list_stmt("SELECT * FROM users", order_by=fields)
+    assert result == (
+        "SELECT * FROM users ORDER BY name DESC NULLS LAST "
+        "LIMIT %(limit)s OFFSET %(offset)s"
+    )
+
+
+def test_get_list_stmt_with_total_count():
+    """Test get_list_stmt wraps the statement for the total count window."""
+    result = get_list_stmt("SELECT * FROM users", paginate=False, total_count=True)
+    assert result == (
+        "SELECT *, COUNT(*) OVER() AS total_count FROM (SELECT * FROM users) AS page"
+    )
+
+
+def test_get_list_stmt_is_reused():
+    """Test get_list_stmt returns the same statement for equal order_by fields."""
+    first = get_list_stmt(
+        "SELECT * FROM users",
+        order_by=[OrderByField(name="name", direction=Direction.ASC)],
+    )
+    second = get_list_stmt(
+        "SELECT * FROM users",
+        order_by=[OrderByField(name="name", direction=Direction.ASC)],
+    )
+    assert first is second
+
+
+def test_get_list_stmt_with_composed():
+    """Test get_list_stmt with a (not hashable) sql.Composed statement."""
+    query = sql.Composed([sql.SQL("SELECT * FROM users")])
+    result = get_list_stmt(query)
+    assert result.as_string(None) == (
+        "SELECT * FROM users LIMIT %(limit)s OFFSET %(offset)s"
+    )
+
+
+def test_get_prepare_threshold():
+    """Test the prepare_threshold of every PreparePolicy."""
+    assert get_prepare_threshold(PreparePolicy.AUTO) == 5
+    assert get_prepare_threshold(PreparePolicy.EAGER) == 0
+    assert get_prepare_threshold(PreparePolicy.DISABLED) is None
@@ -0,0 +1,95 @@
+from unittest.mock import AsyncMock, MagicMock, call, patch
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app_psycopg.api.dependencies.db import get_db_conn
+from common.settings import load_settings
+from common.transactions import is_read_only, read_only
+
+
+def test_is_read_only():
+    """Test requests are read-only by their method unless their route is marked."""
+    app = FastAPI()
+
+    @app.get("/items")
+    async def get_items(request: Request) -> bool:
+        return is_read_only(request)
+
+    @app.post("/items/search")
+    @read_only()
+    async def search_items(request: Request) -> bool:
+        return is_read_only(request)
+
+    @app.post("/items")
+    async def create_item(request: Request) -> bool:
+        return is_read_only(request)
+
+    with TestClient(app) as client:
+        assert client.get("/items").json() is True
+        assert client.post("/items/search").json() is True
+        assert client.post("/items").json() is False
+
+
+def create_request(method: str) -> tuple[Request, AsyncMock]:
+    conn = AsyncMock()
+    conn.closed = False
+    pool = MagicMock()
+    pool.connection.return_value.__aenter__.return_value = conn
+    request = Request(
+        {
+            "type": "http",
+            "method": method,
+            "path": "/",
+            "headers": [],
+            "state": {"conn_pool": pool, "pool_monitor": MagicMock()},
+        }
+    )
+    return request, conn
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "read_transactions, expected",
+    [
+        ("autocommit", [call.set_autocommit(True)]),
+        ("read_only", [call.set_read_only(True)]),
+        ("read_write", []),
+    ],
+)
+async def test_get_db_conn_read_transactions(read_transactions, expected):
+    """Test GET requests run as configured and the connection is reset for the pool."""
+    request, conn = create_request("GET")
+    settings = load_settings(environ={"DB_READ_TRANSACTIONS": read_transactions})
+
+    with patch("app_psycopg.api.dependencies.db.get_settings", return_value=settings):
+        dependency = get_db_conn(request)
+        assert await anext(dependency) is conn
+        assert conn.mock_calls == expected
+
+        with pytest.raises(StopAsyncIteration):
+            await anext(dependency)
+
+    if expected:
+        conn.rollback.assert_awaited_once()
+        conn.set_autocommit.assert_awaited_with(False)
+        conn.set_read_only.assert_awaited_with(None)
+
+
+@pytest.mark.asyncio
+async def test_get_db_conn_write():
+    """Test writes keep the transaction the pool commits."""
+    request, conn = create_request("POST")
+
+    with patch(
+        "app_psycopg.api.dependencies.db.get_settings",
+        return_value=load_settings(environ={}),
+    ):
+        dependency = get_db_conn(request)
+        await anext(dependency)
+        with pytest.raises(StopAsyncIteration):
+            await anext(dependency)
+
+    conn.set_autocommit.assert_not_called()
+    conn.rollback.assert_not_called()
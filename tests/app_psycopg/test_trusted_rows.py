@@ -0,0 +1,64 @@
+import datetime
+import uuid
+from decimal import Decimal
+from types import SimpleNamespace
+
+from pydantic import TypeAdapter
+
+from common.pagination import LimitOffsetPage
+from common.schemas import Order, User
+from common.trusted_rows import TrustedJSONResponse, create_trusted_row, get_field
+
+
+def _user_row() -> dict:
+    return {
+        "id": uuid.uuid4(),
+        "name": "DAN",
+        "created_at": datetime.datetime(2024, 1, 1, 12, 30),
+        "last_updated_at": None,
+        "profession": {"id": uuid.uuid4(), "name": "ENGINEER"},
+    }
+
+
+def test_create_trusted_row_from_attributes():
+    """Test create_trusted_row picks the model fields of an object (e.g. an ORM instance)."""
+    row = _user_row()
+    orm_user = SimpleNamespace(
+        **{**row, "profession": SimpleNamespace(**row["profession"], created_at=None)},
+        profession_id=row["profession"]["id"],
+    )
+
+    assert create_trusted_row(User, orm_user) == row
+
+
+def test_create_trusted_row_from_mapping():
+    """Test create_trusted_row drops the columns that are not model fields."""
+    row = _user_row()
+    assert create_trusted_row(User, {**row, "total_count": 1}) == row
+
+
+def test_get_field():
+    """Test get_field reads models and trusted rows alike."""
+    row = _user_row()
+    assert get_field(row, "name") == "DAN"
+    assert get_field(User(**row), "name") == "DAN"
+
+
+def test_trusted_response_matches_validated_response():
+    """Test the trusted response renders the same JSON as the response_model path."""
+    order_row = {
+        "id": uuid.uuid4(),
+        "amount": Decimal("12.50"),
+        "payer": {"id": str(uuid.uuid4()), "name": "DAN"},
+        "payee": {"id": str(uuid.uuid4()), "name": "ANN"},
+        "created_at": datetime.datetime(2024, 1, 1, 12, 30),
+    }
+    page = {"items_count": 1, "limit": 10, "offset": 0}
+
+    adapter = TypeAdapter(LimitOffsetPage[Order])
+    validated = adapter.dump_json(
+        adapter.validate_python({**page, "items": [order_row]})
+    )
+    trusted = LimitOffsetPage(**page, items=[order_row])
+
+    assert TrustedJSONResponse(trusted).body == validated
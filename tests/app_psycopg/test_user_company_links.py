@@ -1,12 +1,14 @@
 import uuid
-from unittest.mock import patch
+from unittest.mock import patch, MagicMock
 
 import pytest
 from fastapi.testclient import TestClient
 from polyfactory.factories.pydantic_factory import ModelFactory
 from starlette import status
 
-from app_psycopg.api.models import (
+from common.pagination import LimitOffsetPage
+
+from common.schemas import (
     UserCompanyLinkWithCompany,
     UserCompanyLinkWithUser,
     Company,
@@ -79,7 +81,11 @@ def test_create_user_company_link(client: TestClient, mock_db, user_id, company_
     """Test creating a user-company link."""
     # Setup mock
     mock_db.insert_user_company_link.return_value = (user_id, company_id)
-    mock_db.get_user_company_links_count_by_user.return_value = 0
+    mock_db.get_user_company_link_references.return_value = (
+        MagicMock(),
+        MagicMock(),
+        0,
+    )
 
     # Make request
     response = client.post(
@@ -97,6 +103,25 @@ def test_create_user_company_link(client: TestClient, mock_db, user_id, company_
     mock_db.insert_user_company_link.assert_called_once()
 
 
+def test_create_user_company_link_company_not_found(
+    client: TestClient, mock_db, user_id, company_id
+):
+    """Test creating a user-company link for a company that does not exist."""
+    # Setup mock
+    mock_db.get_user_company_link_references.return_value = (MagicMock(), None, 0)
+
+    # Make request
+    response = client.post(
+        "/user-company-links",
+        json={"user_id": user_id, "company_id": company_id},
+    )
+
+    # Assert response
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json()["detail"] == f"Company '{uuid.UUID(company_id)}' not found!"
+    mock_db.insert_user_company_link.assert_not_called()
+
+
 def test_delete_user_company_link(
     client: TestClient, mock_db, user_id, company_id, user_company_link_with_company
 ):
@@ -125,10 +150,13 @@ def test_get_user_company_links_by_user(
 ):
     """Test getting companies linked to a user."""
     # Setup mocks
-    mock_db.get_user_company_links_by_user.return_value = [
-        user_company_link_with_company
-    ]
-    mock_db.get_user_company_links_count_by_user.return_value = 1
+    mock_db.get_user_company_links_by_user_page.return_value = LimitOffsetPage(
+        items=[user_company_link_with_company],
+        items_count=1,
+        total_count=1,
+        limit=10,
+        offset=0,
+    )
     mock_db.get_user.return_value = True  # Just need a truthy value for validation
 
     # Patch the validate_get_user_company_links dependency
@@ -163,10 +191,13 @@ def test_get_user_company_links_by_company(
 ):
     """Test getting users linked to a company."""
     # Setup mocks
-    mock_db.get_user_company_links_by_company.return_value = [
-        user_company_link_with_user
-    ]
-    mock_db.get_user_company_links_count_by_company.return_value = 1
+    mock_db.get_user_company_links_by_company_page.return_value = LimitOffsetPage(
+        items=[user_company_link_with_user],
+        items_count=1,
+        total_count=1,
+        limit=10,
+        offset=0,
+    )
     mock_db.get_company.return_value = True  # Just need a truthy value for validation
 
     # Patch the validate_get_user_company_links dependency
@@ -213,10 +244,13 @@ def test_get_user_company_links_with_pagination(
 ):
     """Test getting user-company links with pagination."""
     # Setup mocks
-    mock_db.get_user_company_links_by_user.return_value = [
-        user_company_link_with_company
-    ]
-    mock_db.get_user_company_links_count_by_user.return_value = 1
+    mock_db.get_user_company_links_by_user_page.return_value = LimitOffsetPage(
+        items=[user_company_link_with_company],
+        items_count=1,
+        total_count=1,
+        limit=5,
+        offset=0,
+    )
     mock_db.get_user.return_value = True  # Just need a truthy value for validation
 
     # Patch the validate_get_user_company_links dependency
@@ -1,3 +1,4 @@
+import json
 import uuid
 from unittest.mock import patch
 
@@ -6,7 +7,10 @@ from fastapi.testclient import TestClient
 from polyfactory.factories.pydantic_factory import ModelFactory
 from starlette import status
 
-from app_psycopg.api.models import User
+from common.pagination import CountStrategy, LimitOffsetPage, decode_cursor
+from common.schemas import User
+from common.settings import load_settings
+from common.sorting import Direction, OrderByField
 
 
 class UserFactory(ModelFactory[User]):
@@ -44,6 +48,79 @@ def test_create_user(client: TestClient, mock_db, user):
     mock_db.insert_user.assert_called_once()
 
 
+def test_import_users(client: TestClient, mock_db, user):
+    """Test importing users from an NDJSON body."""
+
+    # Setup mock: consume the streamed rows like the COPY would
+    async def bulk_import_users(rows, result):
+        result.imported_count = len([row async for row in rows])
+        return result
+
+    mock_db.bulk_import_users.side_effect = bulk_import_users
+
+    body = "\n".join(
+        [
+            json.dumps({"name": user.name, "profession_id": str(user.profession.id)}),
+            json.dumps({"name": "", "profession_id": str(user.profession.id)}),
+            "not json",
+        ]
+    )
+
+    # Make request
+    response = client.post(
+        "/users/import",
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    # Assert response
+    assert response.status_code == status.HTTP_200_OK
+    response_json = response.json()
+    assert response_json["received_count"] == 3
+    assert response_json["imported_count"] == 1
+    assert response_json["rejected_count"] == 2
+    assert [row["line"] for row in response_json["rejected"]] == [2, 3]
+
+
+def test_import_users_unsupported_content_type(client: TestClient, mock_db):
+    """Test importing users with an unsupported Content-Type."""
+    response = client.post(
+        "/users/import", content="<users/>", headers={"Content-Type": "text/xml"}
+    )
+
+    assert response.status_code == status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+    mock_db.bulk_import_users.assert_not_called()
+
+
+def test_get_users_batch(client: TestClient, mock_db, user):
+    """Test getting multiple users by id in request order."""
+    # Setup mock
+    other_user = UserFactory.build()
+    missing_id = uuid.uuid4()
+    mock_db.get_users_by_ids.return_value = [other_user, user]
+
+    # Make request
+    response = client.get(
+        "/users:batch",
+        params={"ids": [str(user.id), str(missing_id), str(other_user.id), user.id]},
+    )
+
+    # Assert response
+    assert response.status_code == status.HTTP_200_OK
+    response_json = response.json()
+    assert [item["id"] for item in response_json["items"]] == [
+        str(user.id),
+        str(other_user.id),
+    ]
+    assert response_json["items_count"] == 2
+    assert response_json["missing_ids"] == [str(missing_id)]
+
+    # Assert mock calls: duplicates are resolved once
+    mock_db.get_users_by_ids.assert_called_once_with(
+        ids=[user.id, missing_id, other_user.id]
+    )
+
+
 def test_get_user(client: TestClient, mock_db, user):
     """Test getting a user by ID."""
     # Setup mock
@@ -66,7 +143,9 @@ def test_get_user(client: TestClient, mock_db, user):
 def test_get_users(client: TestClient, mock_db, user):
     """Test getting a list of users."""
     # Setup mock
-    mock_db.get_users.return_value = [user]
+    mock_db.get_users_page.return_value = LimitOffsetPage(
+        items=[user], items_count=1, total_count=1, limit=10, offset=0
+    )
 
     # Make request
     response = client.get("/users")
@@ -84,7 +163,101 @@ def test_get_users(client: TestClient, mock_db, user):
     assert "total_count" in response_json
 
     # Assert mock calls
-    mock_db.get_users.assert_called_once_with(limit=10, offset=0, order_by=None)
+    mock_db.get_users_page.assert_called_once_with(
+        limit=10, offset=0, order_by=None, count=CountStrategy.EXACT
+    )
+
+
+def test_get_user_not_modified(client: TestClient, mock_db, user):
+    """Test a user is answered with a 304 if the client's ETag is current."""
+    mock_db.get_user.return_value = user
+
+    response = client.get(f"/users/{user.id}")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["cache-control"] == "no-cache"
+
+    response = client.get(
+        f"/users/{user.id}", headers={"If-None-Match": response.headers["etag"]}
+    )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.content == b""
+
+
+def test_get_users_not_modified(client: TestClient, mock_db, user):
+    """Test the ETag of a list is derived from the page, a deleted row changes it."""
+    mock_db.get_users_page.return_value = LimitOffsetPage(
+        items=[user], items_count=1, total_count=1, limit=10, offset=0
+    )
+
+    response = client.get("/users")
+    etag: str = response.headers["etag"]
+    # the newest change of a table doesn't move when another row is deleted
+    assert "last-modified" not in response.headers
+
+    response = client.get("/users", headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    response = client.get(
+        "/users", headers={"If-Modified-Since": "Wed, 01 Jan 2025 12:00:00 GMT"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    mock_db.get_users_page.return_value = LimitOffsetPage(
+        items=[], items_count=0, total_count=0, limit=10, offset=0
+    )
+    response = client.get("/users", headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["etag"] != etag
+
+
+@pytest.fixture
+def json_passthrough():
+    """Let Postgres render the JSON of the users routes."""
+    with patch(
+        "app_psycopg.api.routes.users.get_settings",
+        return_value=load_settings(environ={"DB_JSON_PASSTHROUGH": "true"}),
+    ):
+        yield
+
+
+def test_get_users_json_passthrough(
+    client: TestClient, mock_db, user, json_passthrough
+):
+    """Test the page rendered by Postgres is sent as is."""
+    # Setup mock
+    page = LimitOffsetPage(
+        items=[user], items_count=1, total_count=1, limit=10, offset=0
+    )
+    mock_db.get_users_page_json.return_value = page.model_dump_json().encode()
+
+    # Make request
+    response = client.get("/users", params={"count": "none"})
+
+    # Assert response
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/json"
+    assert response.content == page.model_dump_json().encode()
+
+    # Assert mock calls
+    mock_db.get_users_page.assert_not_called()
+    mock_db.get_users_page_json.assert_called_once_with(
+        limit=10, offset=0, order_by=None, count=CountStrategy.NONE
+    )
+
+
+def test_get_user_json_passthrough_not_found(
+    client: TestClient, mock_db, user_id, json_passthrough
+):
+    """Test a user missing in the JSON passthrough mode returns 404."""
+    # Setup mock
+    mock_db.get_user_json.return_value = None
+
+    # Make request
+    response = client.get(f"/users/{user_id}")
+
+    # Assert response
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json()["detail"] == f"User '{uuid.UUID(user_id)}' not found!"
 
 
 def test_update_user(client: TestClient, mock_db, user):
@@ -159,3 +332,44 @@ def test_patch_user(client: TestClient, mock_db, user):
 
     # Assert mock calls
     mock_db.patch_user.assert_called_once()
+
+
+def test_get_users_by_cursor_order(client: TestClient, mock_db):
+    """Test the sort keys and the cursor follow the order of the order_by parameters."""
+    users = UserFactory.batch(2)
+    mock_db.get_users_by_cursor.return_value = users
+    order_by = [
+        OrderByField(name="created_at", direction=Direction.DESC),
+        OrderByField(name="name", direction=Direction.ASC),
+    ]
+
+    # Make request
+    response = client.get(
+        "/users/cursor", params={"order_by": ["-created_at", "+name"], "limit": 1}
+    )
+
+    # Assert response
+    assert response.status_code == status.HTTP_200_OK
+    next_cursor = response.json()["next_cursor"]
+    assert decode_cursor(next_cursor, order_by) == [
+        users[0].created_at,
+        users[0].name,
+        users[0].id,
+    ]
+
+    # Assert mock calls
+    mock_db.get_users_by_cursor.assert_called_once_with(
+        limit=1, order_by=order_by, cursor_values=None
+    )
+
+    # the cursor of the first page is accepted for the next one
+    response = client.get(
+        "/users/cursor",
+        params={
+            "order_by": ["-created_at", "+name"],
+            "limit": 1,
+            "cursor": next_cursor,
+        },
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert mock_db.get_users_by_cursor.call_args.kwargs["cursor_values"] is not None